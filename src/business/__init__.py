@@ -1,9 +1,22 @@
 """
 Módulo de lógica de negocio - Procesamiento y categorización
+
+Las clases se importan al pedirlas: importar src.business.auth_manager al
+arrancar no carga el procesador ni el generador de reportes.
 """
 
-from src.business.categorizer import TransactionCategorizer
-from src.business.processor import TransactionProcessor
-from .report_generator import ReportGenerator
+import importlib
+
+_MODULES = {
+    "TransactionCategorizer": "src.business.categorizer",
+    "TransactionProcessor": "src.business.processor",
+    "ReportGenerator": "src.business.report_generator",
+}
 
 __all__ = ["TransactionCategorizer", "TransactionProcessor" , "ReportGenerator"]
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        return getattr(importlib.import_module(_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
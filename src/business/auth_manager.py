@@ -4,12 +4,18 @@ Archivo: src/business/auth_manager.py
 
 ✅ COMPLETAMENTE REESCRITO - Sin dependencia de cryptography
 Sistema de login seguro con:
-- Hashing PBKDF2-HMAC-SHA256 (100,000 iteraciones)
+- Hashing PBKDF2-HMAC-SHA256 con iteraciones calibradas por dispositivo
 - Contador de intentos fallidos
 - Reseteo automático de BD al 7º intento fallido
+
+Formato del hash: "pbkdf2_sha256$iteraciones$salt_hex$hash_hex". Los
+hashes antiguos "salt_hex$hash_hex" (100,000 iteraciones) se siguen
+aceptando y se recalculan con el costo calibrado al iniciar sesión.
 """
 
 import os
+import hmac
+import time
 import hashlib
 import binascii
 from typing import Optional, Tuple
@@ -18,15 +24,45 @@ from sqlalchemy import text
 
 class AuthManager:
     """Maneja la autenticación usando Hashing Seguro (PBKDF2)"""
+
+    HASH_ALGORITHM = "pbkdf2_sha256"
+
+    # Iteraciones de los hashes sin costo guardado ("salt$hash")
+    LEGACY_ITERATIONS = 100_000
+
+    # Calibración: iteraciones para que verificar tarde ~TARGET_SECONDS
+    # en este dispositivo, dentro de [MIN_ITERATIONS, MAX_ITERATIONS].
+    # El mínimo nunca baja del costo de los hashes antiguos.
+    TARGET_SECONDS = 0.25
+    MIN_ITERATIONS = LEGACY_ITERATIONS
+    MAX_ITERATIONS = 1_000_000
+    CALIBRATION_PROBE = 20_000
+
+    # Clave de la tabla meta con las iteraciones calibradas
+    ITERATIONS_META_KEY = "auth_pbkdf2_iterations"
     
     def __init__(self, db_manager):
         self.db = db_manager
         self._ensure_auth_table()
+
+    @property
+    def session(self):
+        """
+        Sesión del hilo que llama (DatabaseManager.thread_session)
+
+        LoginView verifica la contraseña en un BackgroundJob, así que aquí
+        no se usa la sesión de la UI. El hilo la libera con release_session().
+        """
+        return self.db.thread_session()
+
+    def release_session(self):
+        """Cierra la sesión del hilo actual (al terminar un BackgroundJob)"""
+        self.db.release_thread_session()
     
     def _ensure_auth_table(self):
         """Crea la tabla de autenticación si no existe"""
         try:
-            cursor = self.db.session.execute(
+            cursor = self.session.execute(
                 text("""
                 CREATE TABLE IF NOT EXISTS auth_config (
                     id INTEGER PRIMARY KEY CHECK (id = 1),
@@ -38,38 +74,101 @@ class AuthManager:
                 )
                 """)
             )
-            self.db.session.commit()
+            self.session.commit()
             print("✅ Tabla de autenticación inicializada")
         except Exception as e:
             print(f"⚠️ Tabla auth_config ya existe o error: {e}")
     
-    def _hash_password(self, password: str, salt: bytes = None) -> str:
+    def calibrate_iterations(self, target_seconds: float = None) -> int:
+        """
+        Mide PBKDF2 en este dispositivo y guarda las iteraciones que tardan
+        ~target_seconds (las usan los hashes nuevos y los recalculados)
+
+        Returns:
+            int: Iteraciones calibradas
+        """
+        target_seconds = target_seconds or self.TARGET_SECONDS
+
+        # Mejor de dos mediciones (la primera puede incluir arranque en frío)
+        elapsed = min(
+            self._time_pbkdf2(self.CALIBRATION_PROBE) for _ in range(2)
+        )
+        iterations = int(self.CALIBRATION_PROBE * target_seconds / max(elapsed, 1e-6))
+        iterations = max(self.MIN_ITERATIONS, min(self.MAX_ITERATIONS, iterations))
+        iterations -= iterations % 1000
+
+        try:
+            self.db.set_meta(self.ITERATIONS_META_KEY, iterations, session=self.session)
+        except Exception as e:
+            print(f"⚠️ No se pudo guardar la calibración: {e}")
+            self.session.rollback()
+
+        print(f"⏱️ PBKDF2 calibrado: {iterations} iteraciones (~{target_seconds:.2f}s)")
+        return iterations
+
+    def _time_pbkdf2(self, iterations: int) -> float:
+        started = time.perf_counter()
+        hashlib.pbkdf2_hmac('sha256', b"calibracion", b"0" * 16, iterations)
+        return time.perf_counter() - started
+
+    def get_target_iterations(self) -> int:
+        """Iteraciones calibradas para este dispositivo (calibra la primera vez)"""
+        try:
+            stored = self.db.get_meta(self.ITERATIONS_META_KEY, session=self.session)
+            if stored:
+                return max(int(stored), self.MIN_ITERATIONS)
+        except Exception as e:
+            print(f"⚠️ No se pudo leer la calibración: {e}")
+        return self.calibrate_iterations()
+
+    def _hash_password(self, password: str, salt: bytes = None, iterations: int = None) -> str:
         """
         Hashea una contraseña usando PBKDF2-HMAC-SHA256
         
         Args:
             password: Contraseña en texto plano
             salt: Salt opcional (se genera si no se provee)
+            iterations: Costo (default: el calibrado del dispositivo)
         
         Returns:
-            str: "salt_hex$hash_hex"
+            str: "pbkdf2_sha256$iteraciones$salt_hex$hash_hex"
         """
         if salt is None:
             salt = os.urandom(16)  # 16 bytes de salt aleatorio
+        if iterations is None:
+            iterations = self.get_target_iterations()
         
-        # 100,000 iteraciones de PBKDF2 con SHA256
         pwd_hash = hashlib.pbkdf2_hmac(
             'sha256',
             password.encode('utf-8'),
             salt,
-            100000
+            iterations
         )
         
         # Convertir a hexadecimal
         salt_hex = binascii.hexlify(salt).decode('ascii')
         hash_hex = binascii.hexlify(pwd_hash).decode('ascii')
         
-        return f"{salt_hex}${hash_hex}"
+        return f"{self.HASH_ALGORITHM}${iterations}${salt_hex}${hash_hex}"
+
+    def _parse_hash(self, stored_hash: str) -> Tuple[int, bytes, bytes]:
+        """
+        Separa un hash almacenado en (iteraciones, salt, hash)
+
+        Raises:
+            ValueError: Si el formato no es válido
+        """
+        parts = stored_hash.split("$")
+        if len(parts) == 4 and parts[0] == self.HASH_ALGORITHM:
+            _, iterations, salt_hex, hash_hex = parts
+            iterations = int(iterations)
+        elif len(parts) == 2:
+            iterations = self.LEGACY_ITERATIONS
+            salt_hex, hash_hex = parts
+        else:
+            raise ValueError("Formato de hash inválido")
+
+        return iterations, binascii.unhexlify(salt_hex), binascii.unhexlify(hash_hex)
     
     def _verify_hash(self, password: str, stored_hash: str) -> bool:
         """
@@ -77,38 +176,52 @@ class AuthManager:
         
         Args:
             password: Contraseña ingresada
-            stored_hash: Hash almacenado ("salt$hash")
+            stored_hash: Hash almacenado (con o sin costo)
         
         Returns:
             bool: True si la contraseña es correcta
         """
         try:
-            # Separar salt y hash
-            if "$" not in stored_hash:
-                print("❌ Formato de hash inválido")
-                return False
-            
-            salt_hex, hash_hex = stored_hash.split("$", 1)
-            
-            # Convertir salt de hex a bytes
-            salt = binascii.unhexlify(salt_hex)
-            
-            # Calcular hash de la contraseña ingresada
-            new_hash = self._hash_password(password, salt)
-            
-            # Comparar de forma segura
-            return new_hash == stored_hash
+            iterations, salt, expected = self._parse_hash(stored_hash)
+
+            candidate = hashlib.pbkdf2_hmac(
+                'sha256', password.encode('utf-8'), salt, iterations
+            )
+
+            # Comparación en tiempo constante
+            return hmac.compare_digest(candidate, expected)
             
         except Exception as e:
             print(f"❌ Error verificando hash: {e}")
             return False
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        """
+        Indica si el hash es del formato antiguo o más barato que el costo
+        calibrado (nunca se recalcula a la baja)
+        """
+        try:
+            iterations, _, _ = self._parse_hash(stored_hash)
+        except ValueError:
+            return False
+        return (
+            not stored_hash.startswith(self.HASH_ALGORITHM + "$")
+            or iterations < self.get_target_iterations()
+        )
     
     def is_password_set(self) -> bool:
-        """Verifica si ya existe una contraseña configurada"""
+        """
+        Verifica si ya existe una contraseña configurada
+
+        Solo lectura: usa una sesión corta (read_session), así LoginView
+        puede consultarlo desde el hilo de la UI sin dejar abierta una
+        sesión de hilo.
+        """
         try:
-            result = self.db.session.execute(
-                text("SELECT COUNT(*) FROM auth_config WHERE id = 1")
-            ).fetchone()
+            with self.db.read_session() as session:
+                result = session.execute(
+                    text("SELECT COUNT(*) FROM auth_config WHERE id = 1")
+                ).fetchone()
             return result[0] > 0 if result else False
         except Exception as e:
             print(f"❌ Error verificando contraseña: {e}")
@@ -135,7 +248,7 @@ class AuthManager:
             # Guardar en BD
             if self.is_password_set():
                 # Actualizar existente
-                self.db.session.execute(
+                self.session.execute(
                     text("""
                     UPDATE auth_config 
                     SET password_hash = :hash,
@@ -148,7 +261,7 @@ class AuthManager:
                 )
             else:
                 # Insertar nueva
-                self.db.session.execute(
+                self.session.execute(
                     text("""
                     INSERT INTO auth_config (id, password_hash, failed_attempts, is_locked)
                     VALUES (1, :hash, 0, 0)
@@ -156,13 +269,13 @@ class AuthManager:
                     {"hash": hashed_data}
                 )
             
-            self.db.session.commit()
+            self.session.commit()
             print("✅ Contraseña configurada correctamente")
             return True
             
         except Exception as e:
             print(f"❌ Error configurando contraseña: {e}")
-            self.db.session.rollback()
+            self.session.rollback()
             return False
     
     def verify_password(self, password: str) -> Tuple[bool, str, int]:
@@ -177,7 +290,7 @@ class AuthManager:
         """
         try:
             # Obtener configuración
-            result = self.db.session.execute(
+            result = self.session.execute(
                 text("SELECT password_hash, failed_attempts, is_locked FROM auth_config WHERE id = 1")
             ).fetchone()
             
@@ -193,10 +306,23 @@ class AuthManager:
             # Verificar contraseña
             if self._verify_hash(password, stored_hash):
                 # ✅ Contraseña correcta - resetear intentos
-                self.db.session.execute(
+                self.session.execute(
                     text("UPDATE auth_config SET failed_attempts = 0, updated_at = CURRENT_TIMESTAMP WHERE id = 1")
                 )
-                self.db.session.commit()
+
+                # Recalcular con el costo calibrado (solo aquí se conoce la
+                # contraseña), sin bajar nunca el costo que ya tenía
+                if self.needs_rehash(stored_hash):
+                    iterations = max(
+                        self.get_target_iterations(), self._parse_hash(stored_hash)[0]
+                    )
+                    self.session.execute(
+                        text("UPDATE auth_config SET password_hash = :hash WHERE id = 1"),
+                        {"hash": self._hash_password(password, iterations=iterations)}
+                    )
+                    print("🔄 Hash de contraseña recalculado con el costo calibrado")
+
+                self.session.commit()
                 return True, "✅ Acceso concedido", 0
             else:
                 # ❌ Contraseña incorrecta
@@ -233,11 +359,11 @@ class AuthManager:
             
             elif new_attempts == 6:
                 # ⚠️ 6º intento - ADVERTENCIA CRÍTICA
-                self.db.session.execute(
+                self.session.execute(
                     text("UPDATE auth_config SET failed_attempts = :attempts, updated_at = CURRENT_TIMESTAMP WHERE id = 1"),
                     {"attempts": new_attempts}
                 )
-                self.db.session.commit()
+                self.session.commit()
                 
                 return False, (
                     "⚠️ ADVERTENCIA CRÍTICA\n\n"
@@ -251,11 +377,11 @@ class AuthManager:
             
             else:
                 # Intentos 1-5
-                self.db.session.execute(
+                self.session.execute(
                     text("UPDATE auth_config SET failed_attempts = :attempts, updated_at = CURRENT_TIMESTAMP WHERE id = 1"),
                     {"attempts": new_attempts}
                 )
-                self.db.session.commit()
+                self.session.commit()
                 
                 remaining = 7 - new_attempts
                 return False, (
@@ -280,38 +406,39 @@ class AuthManager:
         
         try:
             # Eliminar transacciones
-            self.db.session.execute(text("DELETE FROM transactions"))
+            self.session.execute(text("DELETE FROM transactions"))
             
             # Eliminar presupuestos
-            self.db.session.execute(text("DELETE FROM monthly_budgets"))
+            self.session.execute(text("DELETE FROM monthly_budgets"))
             
             # Eliminar presupuestos por categoría
             try:
-                self.db.session.execute(text("DELETE FROM category_budgets"))
+                self.session.execute(text("DELETE FROM category_budgets"))
             except:
                 pass
             
             # Eliminar categorías personalizadas
-            self.db.session.execute(text("DELETE FROM categories WHERE is_default = 0"))
+            self.session.execute(text("DELETE FROM categories WHERE is_default = 0"))
             
             # Resetear auth_config
-            self.db.session.execute(text("DELETE FROM auth_config WHERE id = 1"))
+            self.session.execute(text("DELETE FROM auth_config WHERE id = 1"))
             
-            self.db.session.commit()
+            self.session.commit()
             
             print("✅ Base de datos reseteada completamente")
             print("="*60 + "\n")
             
         except Exception as e:
             print(f"❌ Error reseteando base de datos: {e}")
-            self.db.session.rollback()
+            self.session.rollback()
     
     def get_failed_attempts(self) -> int:
-        """Obtiene el número actual de intentos fallidos"""
+        """Obtiene el número actual de intentos fallidos (sesión corta, como is_password_set)"""
         try:
-            result = self.db.session.execute(
-                text("SELECT failed_attempts FROM auth_config WHERE id = 1")
-            ).fetchone()
+            with self.db.read_session() as session:
+                result = session.execute(
+                    text("SELECT failed_attempts FROM auth_config WHERE id = 1")
+                ).fetchone()
             return result[0] if result else 0
         except:
             return 0
@@ -345,10 +472,10 @@ class AuthManager:
     def reset_failed_attempts(self):
         """Resetea el contador de intentos fallidos (uso administrativo)"""
         try:
-            self.db.session.execute(
+            self.session.execute(
                 text("UPDATE auth_config SET failed_attempts = 0, is_locked = 0, updated_at = CURRENT_TIMESTAMP WHERE id = 1")
             )
-            self.db.session.commit()
+            self.session.commit()
             print("✅ Intentos fallidos reseteados")
         except Exception as e:
             print(f"❌ Error reseteando intentos: {e}")
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+Rasterizado de gráficos de barras a PNG (sin dependencias)
+Archivo: src/business/chart_raster.py
+
+Gráficos simples para el estado de cuenta PDF: solo barras y ejes; las
+etiquetas las escribe el PDF como texto. Los rectángulos se rellenan por
+filas sobre un bytearray RGB, por lo que un gráfico tarda milisegundos.
+"""
+
+import struct
+import zlib
+from typing import List, Tuple
+
+
+BACKGROUND = "#ffffff"
+TRACK_COLOR = "#e5e7eb"
+AXIS_COLOR = "#9ca3af"
+INCOME_COLOR = "#22c55e"
+EXPENSE_COLOR = "#ef4444"
+
+
+def _rgb(color: str) -> bytes:
+    color = color.lstrip("#")
+    try:
+        return bytes(int(color[i:i + 2], 16) for i in (0, 2, 4))
+    except (ValueError, IndexError):
+        return bytes((102, 126, 234))  # color de la app (#667eea)
+
+
+class Canvas:
+    """Lienzo RGB con relleno de rectángulos"""
+
+    def __init__(self, width: int, height: int, background: str = BACKGROUND):
+        self.width = width
+        self.height = height
+        self.pixels = bytearray(_rgb(background) * (width * height))
+
+    def fill_rect(self, x: int, y: int, w: int, h: int, color: str):
+        """Rellena un rectángulo (origen arriba a la izquierda), recortado al lienzo"""
+        x0, y0 = max(0, int(x)), max(0, int(y))
+        x1, y1 = min(self.width, int(x + w)), min(self.height, int(y + h))
+        if x1 <= x0 or y1 <= y0:
+            return
+        row = _rgb(color) * (x1 - x0)
+        for yy in range(y0, y1):
+            start = (yy * self.width + x0) * 3
+            self.pixels[start:start + len(row)] = row
+
+    def to_png(self) -> bytes:
+        """Codifica el lienzo como PNG RGB de 8 bits (filtro None)"""
+        stride = self.width * 3
+        raw = b"".join(
+            b"\x00" + bytes(self.pixels[y * stride:(y + 1) * stride]) for y in range(self.height)
+        )
+
+        def chunk(kind: bytes, data: bytes) -> bytes:
+            return (
+                struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+            )
+
+        return (
+            b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, 6))
+            + chunk(b"IEND", b"")
+        )
+
+
+def render_category_bars(items: List[Tuple[float, str]], width: int = 520,
+                         row_height: int = 36, bar_height: int = 20) -> bytes:
+    """
+    Barras horizontales proporcionales al mayor valor, una por fila
+
+    Args:
+        items: Lista de (valor, color hex)
+        row_height: Alto de cada fila en píxeles (el PDF alinea las etiquetas)
+
+    Returns:
+        PNG de width x (len(items) * row_height)
+    """
+    canvas = Canvas(width, max(1, len(items)) * row_height)
+    top = max((value for value, _ in items), default=0)
+    offset = (row_height - bar_height) // 2
+
+    for i, (value, color) in enumerate(items):
+        y = i * row_height + offset
+        canvas.fill_rect(0, y, width, bar_height, TRACK_COLOR)
+        if top > 0 and value > 0:
+            canvas.fill_rect(0, y, max(2, round(width * value / top)), bar_height, color)
+
+    return canvas.to_png()
+
+
+def render_trend_bars(months: List[Tuple[float, float]], width: int = 1030,
+                      height: int = 240) -> bytes:
+    """
+    Barras verticales agrupadas (ingreso, gasto) por mes sobre un eje
+
+    Args:
+        months: Lista de (ingresos, gastos), del mes más antiguo al actual
+
+    Returns:
+        PNG de width x height; cada mes ocupa width / len(months)
+    """
+    canvas = Canvas(width, height)
+    axis_y = height - 2
+    canvas.fill_rect(0, axis_y, width, 2, AXIS_COLOR)
+
+    if not months:
+        return canvas.to_png()
+
+    top = max(max(income, expense) for income, expense in months)
+    slot = width / len(months)
+    bar_width = slot * 0.3
+    usable = axis_y - 4
+
+    for i, (income, expense) in enumerate(months):
+        center = slot * i + slot / 2
+        for value, color, x in (
+            (income, INCOME_COLOR, center - bar_width - 2),
+            (expense, EXPENSE_COLOR, center + 2),
+        ):
+            if top > 0 and value > 0:
+                bar = max(2, round(usable * value / top))
+                canvas.fill_rect(x, axis_y - bar, bar_width, bar, color)
+
+    return canvas.to_png()
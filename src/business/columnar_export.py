@@ -0,0 +1,202 @@
+"""
+Exportación columnar de transacciones (para análisis)
+Archivo: src/business/columnar_export.py
+
+Escribe las transacciones por bloques en un archivo columnar compacto:
+- Parquet (zstd) si está instalado pyarrow (dependencia opcional)
+- NumPy .npz comprimido si solo está numpy
+
+En ambos casos "category" y "type" van codificadas con diccionario
+(códigos enteros + lista de valores), como en Parquet.
+
+Columnas: date, description, category, type, amount, notes
+
+pyarrow y numpy se importan al escribir o leer el primer archivo (no al
+arrancar la app); available_format() solo comprueba que estén instalados.
+"""
+
+from importlib.util import find_spec
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Diccionario fijo de la columna type
+TRANSACTION_TYPES = ["expense", "income"]
+
+
+def available_format() -> Optional[str]:
+    """Formato columnar disponible: "parquet", "npz" o None (sin importarlos)"""
+    if find_spec("pyarrow") is not None:
+        return "parquet"
+    if find_spec("numpy") is not None:
+        return "npz"
+    return None
+
+
+class _DictionaryEncoder:
+    """Asigna códigos enteros a valores repetidos en orden de aparición"""
+
+    def __init__(self, values: Optional[List[str]] = None):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+        for value in values or []:
+            self.encode(value)
+
+    def encode(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+
+def write_parquet(f, chunks: Iterable[List[Tuple]]) -> int:
+    """
+    Escribe los bloques como row groups de un Parquet (zstd)
+
+    Args:
+        f: Archivo binario abierto
+        chunks: Bloques de tuplas (date, description, category, type, amount, notes)
+
+    Returns:
+        int: Filas escritas
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("pyarrow no disponible")
+
+    category_type = pa.dictionary(pa.int32(), pa.string())
+    type_type = pa.dictionary(pa.int8(), pa.string())
+    schema = pa.schema([
+        ("date", pa.timestamp("s")),
+        ("description", pa.string()),
+        ("category", category_type),
+        ("type", type_type),
+        ("amount", pa.float64()),
+        ("notes", pa.string()),
+    ])
+
+    categories = _DictionaryEncoder()
+    types = _DictionaryEncoder(TRANSACTION_TYPES)
+    count = 0
+
+    with pq.ParquetWriter(f, schema, compression="zstd") as writer:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            dates, descriptions, category_names, transaction_types, amounts, notes = zip(*chunk)
+
+            table = pa.Table.from_arrays(
+                [
+                    pa.array(dates, pa.timestamp("s")),
+                    pa.array(descriptions, pa.string()),
+                    pa.DictionaryArray.from_arrays(
+                        pa.array([categories.encode(c or "Sin Categoría") for c in category_names], pa.int32()),
+                        pa.array(categories.values, pa.string()),
+                    ),
+                    pa.DictionaryArray.from_arrays(
+                        pa.array([types.encode(t) for t in transaction_types], pa.int8()),
+                        pa.array(types.values, pa.string()),
+                    ),
+                    pa.array(amounts, pa.float64()),
+                    pa.array([n or "" for n in notes], pa.string()),
+                ],
+                schema=schema,
+            )
+            writer.write_table(table)
+
+            count += len(chunk)
+
+    return count
+
+
+def write_npz(f, chunks: Iterable[List[Tuple]]) -> int:
+    """
+    Escribe los bloques en un .npz comprimido (sin pickle)
+
+    Cada bloque se convierte a arrays tipados al leerlo; al final se
+    concatenan. Los textos se guardan como UTF-8 concatenado + offsets
+    (<col>_data, <col>_offsets); usar load_npz_export() para leerlo.
+
+    Returns:
+        int: Filas escritas
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("numpy no disponible")
+
+    categories = _DictionaryEncoder()
+    types = _DictionaryEncoder(TRANSACTION_TYPES)
+    columns = {"date": [], "amount": [], "category_codes": [], "type_codes": []}
+    texts = {"description": [[], []], "notes": [[], []]}  # [bytes, longitudes]
+    count = 0
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        dates, descriptions, category_names, transaction_types, amounts, notes = zip(*chunk)
+
+        columns["date"].append(np.array(dates, dtype="datetime64[s]"))
+        columns["amount"].append(np.array(amounts, dtype=np.float64))
+        columns["category_codes"].append(
+            np.array([categories.encode(c or "Sin Categoría") for c in category_names], dtype=np.int32)
+        )
+        columns["type_codes"].append(
+            np.array([types.encode(t) for t in transaction_types], dtype=np.int8)
+        )
+        for name, values in (("description", descriptions), ("notes", notes)):
+            encoded = [(v or "").encode("utf-8") for v in values]
+            texts[name][0].append(b"".join(encoded))
+            texts[name][1].append(np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded)))
+
+        count += len(chunk)
+
+    arrays = {
+        name: np.concatenate(parts) if parts else np.array([], dtype=dtype)
+        for (name, parts), dtype in zip(
+            columns.items(), ("datetime64[s]", np.float64, np.int32, np.int8)
+        )
+    }
+    arrays["categories"] = np.array(categories.values, dtype=str)
+    arrays["types"] = np.array(types.values, dtype=str)
+
+    for name, (blobs, lengths) in texts.items():
+        lengths = np.concatenate(lengths) if lengths else np.array([], dtype=np.int64)
+        arrays[f"{name}_offsets"] = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        arrays[f"{name}_data"] = np.frombuffer(b"".join(blobs), dtype=np.uint8)
+
+    np.savez_compressed(f, **arrays)
+    return count
+
+
+def load_npz_export(path: str) -> Dict:
+    """
+    Lee un .npz de write_npz() y devuelve sus columnas decodificadas
+
+    Returns:
+        Dict {date, description, category, type, amount, notes}; category y
+        type se devuelven como arrays de texto (decodificando el diccionario)
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("numpy no disponible")
+
+    with np.load(path, allow_pickle=False) as data:
+        result = {
+            "date": data["date"],
+            "amount": data["amount"],
+            "category": data["categories"][data["category_codes"]],
+            "type": data["types"][data["type_codes"]],
+        }
+        for name in ("description", "notes"):
+            blob = data[f"{name}_data"].tobytes()
+            offsets = data[f"{name}_offsets"]
+            result[name] = [
+                blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)
+            ]
+
+    return result
@@ -0,0 +1,109 @@
+"""
+Formatos de extractos bancarios (perfiles de importación)
+Archivo: src/business/import_profiles.py
+
+Un perfil describe un formato conocido para importarlo sin inferencia:
+- headers: encabezados exactos del archivo (definen la huella)
+- columns: índices de columnas {"fecha", "descripcion", "monto", "tipo"?,
+  "abono"?, "descripcion_ingreso"?}
+- date_format: formato strptime de la fecha (None = detección automática)
+- decimal: separador decimal ("." o ",")
+- sign: cómo se determina el tipo de transacción
+    "signed"       -> monto negativo = gasto, positivo = ingreso
+    "debit_credit" -> columna "monto" = cargo (gasto), "abono" = ingreso
+    "type_column"  -> columna "tipo" (type_values + mapeo estándar);
+                      sin columna tipo, todo es gasto
+- type_values: valores propios de la columna tipo {"pagaste": "expense"}
+"""
+
+import hashlib
+import unicodedata
+from typing import Dict, List, Optional
+
+
+SIGN_MODES = ("signed", "debit_credit", "type_column")
+
+
+def normalize_header(value) -> str:
+    """Normaliza un encabezado: sin tildes, minúsculas y espacios simples"""
+    text = unicodedata.normalize("NFKD", str(value if value is not None else ""))
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(text.lower().split())
+
+
+def header_fingerprint(headers: List) -> str:
+    """
+    Huella de una fila de encabezados
+
+    Ignora mayúsculas, tildes, espacios y columnas vacías al final.
+    """
+    names = [normalize_header(h) for h in headers]
+    while names and not names[-1]:
+        names.pop()
+    return hashlib.sha256("|".join(names).encode("utf-8")).hexdigest()
+
+
+def build_profile(name: str, headers: List, columns: Dict[str, int],
+                  date_format: Optional[str] = None, decimal: str = ".",
+                  sign: str = "type_column",
+                  type_values: Optional[Dict[str, str]] = None) -> Dict:
+    """Crea un perfil validado con su huella calculada"""
+    if sign not in SIGN_MODES:
+        raise ValueError(f"Modo de signo inválido: {sign}")
+    for field in ("fecha", "descripcion", "monto"):
+        if field not in columns:
+            raise ValueError(f"Falta la columna '{field}' en el perfil")
+    if sign == "debit_credit" and "abono" not in columns:
+        raise ValueError("El modo cargo/abono requiere la columna 'abono'")
+
+    return {
+        "name": name,
+        "headers": [str(h) if h is not None else "" for h in headers],
+        "fingerprint": header_fingerprint(headers),
+        "columns": {field: int(idx) for field, idx in columns.items()},
+        "date_format": date_format,
+        "decimal": decimal,
+        "sign": sign,
+        "type_values": {normalize_header(k): v for k, v in (type_values or {}).items()},
+    }
+
+
+# Formatos de exportación de los bancos más usados. Si un banco cambia sus
+# encabezados la huella deja de coincidir y se vuelve a la inferencia.
+BUILTIN_PROFILES = [
+    build_profile(
+        "BCP",
+        ["Fecha", "Fecha valuta", "Descripción operación", "Monto", "Saldo",
+         "Sucursal - agencia", "Operación - Número", "Operación - Hora",
+         "Usuario", "UTC", "Referencia2"],
+        {"fecha": 0, "descripcion": 2, "monto": 3},
+        date_format="%d/%m/%Y",
+        sign="signed",
+    ),
+    build_profile(
+        "Interbank",
+        ["Fecha de operación", "Fecha de proceso", "Nro. de operación",
+         "Movimiento", "Descripción", "Canal", "Cargo", "Abono", "Saldo contable"],
+        {"fecha": 0, "descripcion": 4, "monto": 6, "abono": 7},
+        date_format="%d/%m/%Y",
+        sign="debit_credit",
+    ),
+    build_profile(
+        "BBVA",
+        ["F. Operación", "F. Valor", "Código", "Nº. Doc.", "Concepto",
+         "Importe", "Oficina"],
+        {"fecha": 0, "descripcion": 4, "monto": 5},
+        date_format="%d/%m/%Y",
+        decimal=",",
+        sign="signed",
+    ),
+    build_profile(
+        "Yape",
+        ["Tipo de Transacción", "Origen", "Destino", "Monto", "Mensaje",
+         "Fecha de operación"],
+        {"fecha": 5, "descripcion": 2, "monto": 3, "tipo": 0, "descripcion_ingreso": 1},
+        date_format="%d/%m/%Y %H:%M:%S",
+        sign="type_column",
+        type_values={"pagaste": "expense", "te pagó": "income"},
+    ),
+]
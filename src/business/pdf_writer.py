@@ -0,0 +1,266 @@
+"""
+Escritor PDF mínimo en streaming (sin dependencias)
+Archivo: src/business/pdf_writer.py
+
+Cada página se escribe al archivo en cuanto se completa (add_page), así
+que la memoria no crece con el número de páginas. Soporta texto con las
+fuentes estándar Helvetica/Helvetica-Bold (WinAnsi), rectángulos, líneas
+e imágenes PNG RGB de 8 bits (se incrustan sin recomprimir).
+"""
+
+import struct
+import zlib
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+
+# Anchos Helvetica (AFM, milésimas de em) para caracteres ASCII 32-126
+_HELVETICA_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+_CHAR_WIDTHS = {chr(32 + i): width for i, width in enumerate(_HELVETICA_WIDTHS)}
+_DEFAULT_WIDTH = 556
+
+
+def text_width(text: str, size: float, bold: bool = False) -> float:
+    """Ancho aproximado de un texto en puntos (Helvetica)"""
+    units = sum(_CHAR_WIDTHS.get(c, _DEFAULT_WIDTH) for c in text)
+    return units * size / 1000 * (1.05 if bold else 1.0)
+
+
+def fit_text(text: str, size: float, max_width: float, bold: bool = False) -> str:
+    """Recorta el texto con "..." para que quepa en max_width (una sola pasada)"""
+    limit = max_width / (size / 1000 * (1.05 if bold else 1.0))
+    ellipsis = 3 * _CHAR_WIDTHS["."]
+    used = 0
+    cut = None
+    for i, c in enumerate(text):
+        used += _CHAR_WIDTHS.get(c, _DEFAULT_WIDTH)
+        if cut is None and used > limit - ellipsis:
+            cut = i  # último corte en el que aún caben los "..."
+        if used > limit:
+            return text[:cut] + "..."
+    return text
+
+
+@lru_cache(maxsize=64)
+def _hex_to_rgb(color: str) -> Tuple[float, float, float]:
+    color = color.lstrip("#")
+    return tuple(int(color[i:i + 2], 16) / 255 for i in (0, 2, 4))
+
+
+def _escape(text: str) -> bytes:
+    """Codifica un texto para un string literal PDF (WinAnsi)"""
+    data = text.encode("cp1252", errors="replace")
+    return data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def read_png(data: bytes) -> Tuple[int, int, bytes]:
+    """
+    Extrae ancho, alto y datos IDAT de un PNG RGB de 8 bits sin entrelazar
+
+    Raises:
+        ValueError: Si el PNG no es de ese tipo
+    """
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        raise ValueError("No es un PNG")
+
+    pos = 8
+    width = height = None
+    idat = []
+    while pos < len(data):
+        length, = struct.unpack(">I", data[pos:pos + 4])
+        kind = data[pos + 4:pos + 8]
+        chunk = data[pos + 8:pos + 8 + length]
+        if kind == b"IHDR":
+            width, height, depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", chunk)
+            if depth != 8 or color_type != 2 or interlace != 0:
+                raise ValueError("Solo se admiten PNG RGB de 8 bits sin entrelazar")
+        elif kind == b"IDAT":
+            idat.append(chunk)
+        elif kind == b"IEND":
+            break
+        pos += 12 + length
+
+    if width is None or not idat:
+        raise ValueError("PNG incompleto")
+    return width, height, b"".join(idat)
+
+
+class PDFPage:
+    """Acumula las operaciones de dibujo de una página"""
+
+    def __init__(self, width: float, height: float):
+        self.width = width
+        self.height = height
+        self._ops: List[bytes] = []
+
+    def text(self, x: float, y: float, text: str, size: float = 10,
+             bold: bool = False, color: str = "#000000"):
+        """Escribe texto con la línea base en (x, y)"""
+        r, g, b = _hex_to_rgb(color)
+        font = b"/F2" if bold else b"/F1"
+        self._ops.append(
+            b"BT %s %.1f Tf %.3f %.3f %.3f rg %.2f %.2f Td (%s) Tj ET"
+            % (font, size, r, g, b, x, y, _escape(text))
+        )
+
+    def text_right(self, x: float, y: float, text: str, size: float = 10,
+                   bold: bool = False, color: str = "#000000"):
+        """Escribe texto alineado a la derecha en x"""
+        self.text(x - text_width(text, size, bold), y, text, size, bold, color)
+
+    def rect(self, x: float, y: float, w: float, h: float, fill: str):
+        """Rectángulo relleno (x, y = esquina inferior izquierda)"""
+        r, g, b = _hex_to_rgb(fill)
+        self._ops.append(b"%.3f %.3f %.3f rg %.2f %.2f %.2f %.2f re f" % (r, g, b, x, y, w, h))
+
+    def line(self, x1: float, y1: float, x2: float, y2: float,
+             color: str = "#000000", width: float = 0.5):
+        """Línea recta"""
+        r, g, b = _hex_to_rgb(color)
+        self._ops.append(
+            b"%.3f %.3f %.3f RG %.2f w %.2f %.2f m %.2f %.2f l S" % (r, g, b, width, x1, y1, x2, y2)
+        )
+
+    def image(self, name: str, x: float, y: float, w: float, h: float):
+        """Dibuja una imagen registrada con PDFWriter.add_png"""
+        self._ops.append(b"q %.2f 0 0 %.2f %.2f %.2f cm /%s Do Q" % (w, h, x, y, name.encode()))
+
+    def content(self) -> bytes:
+        return b"\n".join(self._ops)
+
+
+class PDFWriter:
+    """
+    Escribe un PDF objeto por objeto
+
+    Uso:
+        writer = PDFWriter(f)
+        page = writer.new_page()
+        page.text(40, 800, "Hola")
+        writer.add_page(page)
+        writer.close()
+    """
+
+    # A4 en puntos
+    PAGE_WIDTH = 595.28
+    PAGE_HEIGHT = 841.89
+
+    # Objetos fijos; el resto se numera desde 5
+    _CATALOG_ID = 1
+    _PAGES_ID = 2
+    _FONT_REGULAR_ID = 3
+    _FONT_BOLD_ID = 4
+
+    def __init__(self, f, title: str = ""):
+        self.f = f
+        self.title = title
+        self.page_count = 0
+        self._offsets: Dict[int, int] = {}
+        self._next_id = 5
+        self._page_ids: List[int] = []
+        self._images: Dict[str, int] = {}
+        self._written = 0
+
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._write_object(
+            self._FONT_REGULAR_ID,
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        )
+        self._write_object(
+            self._FONT_BOLD_ID,
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+        )
+
+    def new_page(self) -> PDFPage:
+        return PDFPage(self.PAGE_WIDTH, self.PAGE_HEIGHT)
+
+    def add_png(self, name: str, png_data: bytes) -> Tuple[int, int]:
+        """
+        Registra una imagen PNG (se escribe una sola vez)
+
+        Returns:
+            (ancho, alto) en píxeles
+        """
+        width, height, idat = read_png(png_data)
+        if name not in self._images:
+            obj_id = self._allocate_id()
+            self._write_stream(
+                obj_id,
+                b"/Type /XObject /Subtype /Image /Width %d /Height %d "
+                b"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /FlateDecode "
+                b"/DecodeParms << /Predictor 15 /Colors 3 /BitsPerComponent 8 /Columns %d >>"
+                % (width, height, width),
+                idat,
+            )
+            self._images[name] = obj_id
+        return width, height
+
+    def add_page(self, page: PDFPage):
+        """Escribe la página (contenido + objeto página) al archivo"""
+        content_id = self._allocate_id()
+        self._write_stream(content_id, b"/Filter /FlateDecode", zlib.compress(page.content(), 6))
+
+        xobjects = b" ".join(b"/%s %d 0 R" % (name.encode(), obj_id) for name, obj_id in self._images.items())
+        page_id = self._allocate_id()
+        self._write_object(
+            page_id,
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %.2f %.2f] "
+            b"/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> /XObject << %s >> >> "
+            b"/Contents %d 0 R >>"
+            % (self._PAGES_ID, page.width, page.height,
+               self._FONT_REGULAR_ID, self._FONT_BOLD_ID, xobjects, content_id),
+        )
+        self._page_ids.append(page_id)
+        self.page_count += 1
+
+    def close(self):
+        """Escribe el árbol de páginas, el catálogo y la tabla xref"""
+        kids = b" ".join(b"%d 0 R" % page_id for page_id in self._page_ids)
+        self._write_object(
+            self._PAGES_ID,
+            b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self._page_ids)),
+        )
+        self._write_object(self._CATALOG_ID, b"<< /Type /Catalog /Pages %d 0 R >>" % self._PAGES_ID)
+
+        info_id = self._allocate_id()
+        self._write_object(
+            info_id,
+            b"<< /Title (%s) /Producer (TermoWallet) >>" % _escape(self.title),
+        )
+
+        xref_offset = self._written
+        size = self._next_id
+        lines = [b"xref", b"0 %d" % size, b"0000000000 65535 f "]
+        for obj_id in range(1, size):
+            lines.append(b"%010d 00000 n " % self._offsets[obj_id])
+        self._write(b"\n".join(lines) + b"\n")
+        self._write(
+            b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (size, self._CATALOG_ID, info_id, xref_offset)
+        )
+
+    def _allocate_id(self) -> int:
+        obj_id = self._next_id
+        self._next_id += 1
+        return obj_id
+
+    def _write(self, data: bytes):
+        self.f.write(data)
+        self._written += len(data)
+
+    def _write_object(self, obj_id: int, body: bytes):
+        self._offsets[obj_id] = self._written
+        self._write(b"%d 0 obj\n%s\nendobj\n" % (obj_id, body))
+
+    def _write_stream(self, obj_id: int, dictionary: bytes, data: bytes):
+        self._offsets[obj_id] = self._written
+        self._write(b"%d 0 obj\n<< %s /Length %d >>\nstream\n" % (obj_id, dictionary, len(data)))
+        self._write(data)
+        self._write(b"\nendstream\nendobj\n")
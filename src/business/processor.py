@@ -5,57 +5,147 @@ Archivo: src/business/processor.py
 
 import csv
 import re
-from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from datetime import datetime, date
+from typing import Dict, List, Tuple, Optional, Iterator
 from src.business.categorizer import TransactionCategorizer
+from src.business.import_profiles import (
+    BUILTIN_PROFILES,
+    build_profile,
+    header_fingerprint,
+    normalize_header,
+)
 
 
 class TransactionProcessor:
     """Clase para procesar y limpiar archivos de transacciones bancarias"""
 
+    # Palabras clave para detectar columnas por nombre
+    DATE_KEYWORDS = ["fecha", "date", "dia", "day", "when", "datetime"]
+    DESC_KEYWORDS = ["descripcion", "description", "concepto", "detalle", "detail", "desc", "memo", "nota", "note"]
+    AMOUNT_KEYWORDS = ["monto", "amount", "importe", "valor", "value", "precio", "price", "total", "cantidad", "quantity"]
+    TYPE_KEYWORDS = ["tipo", "type", "categoria", "category"]
+
+    TYPE_MAPPING = {
+        "gasto": "expense", "gastos": "expense", "expense": "expense",
+        "egreso": "expense", "egresos": "expense", "salida": "expense",
+        "ingreso": "income", "ingresos": "income", "income": "income",
+        "entrada": "income"
+    }
+
+    # Filas vacías consecutivas tras las cuales se asume el fin de la hoja
+    MAX_BLANK_ROWS = 50
+
+    # Máximo de mensajes de error guardados durante una importación en streaming
+    MAX_STREAM_ERRORS = 10
+
     def __init__(self):
         self.categorizer = TransactionCategorizer()
         self.data = []  # Lista de diccionarios en lugar de DataFrame
         self.errors = []
         self.original_count = 0
+        self.stream_source = None
+        self.stream_stats = {}
+        self.profiles = {p["fingerprint"]: p for p in BUILTIN_PROFILES}
+        self.profile = None
+        self.headers = []
+        self.column_indices = {}
+        self.detected_date_format = None
+
+    @staticmethod
+    def is_excel(file_path: str) -> bool:
+        """Indica si el archivo es un libro de Excel"""
+        return file_path.lower().endswith((".xlsx", ".xls"))
+
+    def register_profiles(self, profiles: List[Dict]):
+        """Agrega perfiles de importación (p. ej. los guardados por el usuario)"""
+        for profile in profiles:
+            self.profiles[profile["fingerprint"]] = profile
+
+    def match_profile(self, headers: List) -> Optional[Dict]:
+        """Busca el perfil cuya huella coincide con los encabezados"""
+        return self.profiles.get(header_fingerprint(headers))
+
+    def read_headers(self, file_path: str, sheet_name: Optional[str] = None) -> List[str]:
+        """Lee solo la fila de encabezados de un CSV o de una hoja de Excel"""
+        if self.is_excel(file_path):
+            import openpyxl
+
+            wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                ws = wb[sheet_name] if sheet_name else wb.active
+                headers = next(ws.iter_rows(max_row=1, values_only=True), None) or ()
+            finally:
+                wb.close()
+            return [str(h) if h is not None else "" for h in headers]
+
+        encoding, delimiter = self._detect_csv_format(file_path)
+        with open(file_path, "r", encoding=encoding, newline="") as f:
+            return next(csv.reader(f, delimiter=delimiter), [])
+
+    def _detect_csv_format(self, file_path: str) -> Tuple[str, str]:
+        """
+        Detecta encoding y delimitador (",", ";" o tabulador) de un CSV
+
+        Raises:
+            UnicodeDecodeError: Si ningún encoding soportado lo decodifica
+        """
+        encodings = ["utf-8", "latin-1", "iso-8859-1", "cp1252"]
+        for encoding in encodings:
+            try:
+                with open(file_path, "r", encoding=encoding, newline="") as f:
+                    sample = f.read(4096)
+            except UnicodeDecodeError:
+                continue
+
+            first_line = sample.splitlines()[0] if sample else ""
+            delimiter = max([",", ";", "\t"], key=first_line.count)
+            if first_line.count(delimiter) == 0:
+                delimiter = ","
+            return encoding, delimiter
+
+        raise UnicodeDecodeError("csv", b"", 0, 1, "No se pudo decodificar el archivo CSV")
 
-    def load_file(self, file_path: str) -> Tuple[bool, str]:
+    def load_file(self, file_path: str, sheet_name: Optional[str] = None) -> Tuple[bool, str]:
         """
-        Carga un archivo CSV o Excel
+        Carga un archivo CSV o Excel completo en memoria
+
+        Para libros grandes use prepare_excel_stream() + iter_import_chunks().
+
+        Args:
+            file_path: Ruta del archivo
+            sheet_name: Hoja de Excel a leer (default: hoja activa)
+
         Returns: (success, message)
         """
         try:
             self.errors = []
             self.data = []
+            self.profile = None
+            self.detected_date_format = None
 
             if file_path.endswith(".csv"):
-                # Intentar diferentes encodings
-                encodings = ["utf-8", "latin-1", "iso-8859-1", "cp1252"]
-                for encoding in encodings:
-                    try:
-                        with open(file_path, 'r', encoding=encoding) as f:
-                            reader = csv.DictReader(f)
-                            self.data = list(reader)
-                        break
-                    except UnicodeDecodeError:
-                        continue
-                else:
+                # Intentar diferentes encodings y delimitadores
+                try:
+                    encoding, delimiter = self._detect_csv_format(file_path)
+                except UnicodeDecodeError:
                     return False, "No se pudo decodificar el archivo CSV"
 
+                with open(file_path, 'r', encoding=encoding, newline="") as f:
+                    reader = csv.DictReader(f, delimiter=delimiter)
+                    self.data = list(reader)
+
             elif file_path.endswith((".xlsx", ".xls")):
                 try:
                     import openpyxl
-                    wb = openpyxl.load_workbook(file_path, read_only=True)
-                    ws = wb.active
+                    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+                    ws = wb[sheet_name] if sheet_name else wb.active
+                    rows = ws.iter_rows(values_only=True)
                     
                     # Leer encabezados
-                    headers = [cell.value for cell in next(ws.iter_rows(min_row=1, max_row=1))]
+                    headers = next(rows, None) or ()
                     
                     # Leer datos
-                    self.data = []
-                    for row in ws.iter_rows(min_row=2, values_only=True):
-                        row_dict = {headers[i]: row[i] for i in range(len(headers)) if i < len(row)}
-                        self.data.append(row_dict)
+                    self.data = [dict(zip(headers, row)) for row in rows]
                     
                     wb.close()
                 except ImportError:
@@ -74,40 +164,42 @@ class TransactionProcessor:
         except Exception as e:
             return False, f"Error al cargar archivo: {str(e)}"
 
-    def validate_columns(self) -> Tuple[bool, str]:
+    def validate_columns(self, column_indices: Optional[Dict[str, int]] = None) -> Tuple[bool, str]:
         """
         Valida que el archivo tenga las columnas necesarias
+
+        Orden de resolución: mapeo manual (column_indices) > perfil de banco
+        reconocido por la huella de encabezados > búsqueda por palabras clave.
         """
         if not self.data:
             return False, "No hay datos cargados"
 
         # Obtener columnas del primer registro
-        columns = list(self.data[0].keys())
-        columns_lower = [col.lower().strip() for col in columns]
+        columns = [col for col in self.data[0].keys() if col is not None]
+        self.headers = [str(col) for col in columns]
 
-        # Buscar columnas
-        date_keywords = ["fecha", "date", "dia", "day", "when", "datetime"]
-        desc_keywords = ["descripcion", "description", "concepto", "detalle", "detail", "desc", "memo", "nota", "note"]
-        amount_keywords = ["monto", "amount", "importe", "valor", "value", "precio", "price", "total", "cantidad", "quantity"]
-        type_keywords = ["tipo", "type", "categoria", "category"]
+        if column_indices is None:
+            self.profile = self.match_profile(columns)
+            if self.profile:
+                return self._apply_profile_to_data(columns)
 
-        date_cols = [col for col in columns_lower if any(kw in col for kw in date_keywords)]
-        desc_cols = [col for col in columns_lower if any(kw in col for kw in desc_keywords)]
-        amount_cols = [col for col in columns_lower if any(kw in col for kw in amount_keywords)]
-        type_cols = [col for col in columns_lower if any(kw in col for kw in type_keywords)]
+        indices = column_indices if column_indices is not None else self.detect_column_indices(columns)
+        if any(idx >= len(columns) for idx in indices.values()):
+            return False, "El mapeo de columnas no coincide con el archivo"
+        self.column_indices = dict(indices)
 
         # Validaciones
-        if not date_cols:
-            return False, f"No se encontró columna de fecha. Columnas: {', '.join(columns)}"
-        if not desc_cols:
-            return False, f"No se encontró columna de descripción. Columnas: {', '.join(columns)}"
-        if not amount_cols:
-            return False, f"No se encontró columna de monto. Columnas: {', '.join(columns)}"
+        if "fecha" not in indices:
+            return False, f"No se encontró columna de fecha. Columnas: {', '.join(map(str, columns))}"
+        if "descripcion" not in indices:
+            return False, f"No se encontró columna de descripción. Columnas: {', '.join(map(str, columns))}"
+        if "monto" not in indices:
+            return False, f"No se encontró columna de monto. Columnas: {', '.join(map(str, columns))}"
 
         # Renombrar columnas
-        original_date = columns[columns_lower.index(date_cols[0])]
-        original_desc = columns[columns_lower.index(desc_cols[0])]
-        original_amount = columns[columns_lower.index(amount_cols[0])]
+        original_date = columns[indices["fecha"]]
+        original_desc = columns[indices["descripcion"]]
+        original_amount = columns[indices["monto"]]
         
         rename_map = {
             original_date: "fecha",
@@ -115,8 +207,9 @@ class TransactionProcessor:
             original_amount: "monto"
         }
         
-        if type_cols:
-            original_type = columns[columns_lower.index(type_cols[0])]
+        has_type = "tipo" in indices
+        if has_type:
+            original_type = columns[indices["tipo"]]
             rename_map[original_type] = "tipo"
 
         # Aplicar renombrado
@@ -131,17 +224,138 @@ class TransactionProcessor:
         self.data = new_data
 
         message = f"Columnas validadas: fecha='{original_date}', descripcion='{original_desc}', monto='{original_amount}'"
-        if type_cols:
+        if has_type:
             message += f", tipo='{original_type}'"
 
         return True, message
 
-    def _parse_date(self, date_str) -> Optional[datetime]:
-        """Intenta parsear una fecha en múltiples formatos"""
+    def _apply_profile_to_data(self, columns: List) -> Tuple[bool, str]:
+        """Convierte las filas cargadas con el perfil reconocido (sin inferencia)"""
+        profile = self.profile
+        self.column_indices = dict(profile["columns"])
+        width = len(columns)
+
+        new_data = []
+        for row in self.data:
+            values = [row.get(col) for col in columns]
+            values += [None] * (width - len(values))
+            fecha, descripcion, monto, tipo = self._convert_row(values, profile["columns"], profile)
+            new_data.append({
+                "fecha": fecha,
+                "descripcion": descripcion,
+                "monto": monto,
+                "tipo": tipo,
+            })
+
+        self.data = new_data
+        return True, f"Formato reconocido: {profile['name']}"
+
+    def _convert_row(self, row, columns: Dict[str, int],
+                     profile: Optional[Dict] = None) -> Tuple[Optional[datetime], str, Optional[float], str]:
+        """
+        Extrae (fecha, descripcion, monto, tipo) de una fila por índices
+
+        Con perfil se aplican su formato de fecha, separador decimal y
+        semántica de signo; el monto se devuelve siempre en positivo.
+        """
+        date_format = profile.get("date_format") if profile else None
+        decimal = profile.get("decimal", ".") if profile else "."
+        sign = profile.get("sign", "type_column") if profile else "type_column"
+        type_values = profile.get("type_values") if profile else None
+
+        fecha = self._parse_date(row[columns["fecha"]], date_format)
+        raw_desc = row[columns["descripcion"]]
+        descripcion = str(raw_desc).strip() if raw_desc is not None else ""
+
+        if sign == "debit_credit":
+            cargo = self._parse_amount(row[columns["monto"]], decimal)
+            abono = self._parse_amount(row[columns["abono"]], decimal)
+            if cargo:
+                monto, tipo = cargo, "expense"
+            elif abono:
+                monto, tipo = abono, "income"
+            else:
+                monto, tipo = None, "expense"
+        else:
+            monto = self._parse_amount(row[columns["monto"]], decimal)
+            if sign == "signed" and monto is not None:
+                tipo = "income" if monto > 0 else "expense"
+            elif "tipo" in columns:
+                tipo = self._normalize_type(row[columns["tipo"]], type_values)
+            else:
+                tipo = "expense"
+
+        # Descripción distinta para ingresos (p. ej. el remitente en Yape)
+        if tipo == "income" and "descripcion_ingreso" in columns:
+            raw_desc = row[columns["descripcion_ingreso"]]
+            if raw_desc is not None and str(raw_desc).strip():
+                descripcion = str(raw_desc).strip()
+
+        if monto is not None:
+            monto = abs(monto)
+
+        return fecha, descripcion, monto, tipo
+
+    def build_profile_from_mapping(self, name: str) -> Optional[Dict]:
+        """
+        Crea un perfil con el mapeo usado en la última importación, para
+        reconocer el mismo formato la próxima vez
+
+        Returns:
+            Dict del perfil o None si no hay mapeo disponible
+        """
+        if not self.headers or not self.column_indices:
+            return None
+
+        return build_profile(
+            name,
+            self.headers,
+            self.column_indices,
+            date_format=self.detected_date_format,
+        )
+
+    def detect_column_indices(self, headers: List) -> Dict[str, int]:
+        """
+        Busca por palabras clave la posición de cada columna necesaria
+
+        Returns:
+            Dict {"fecha"|"descripcion"|"monto"|"tipo": índice} con las
+            columnas encontradas (gana la primera coincidencia)
+        """
+        columns_lower = [str(col).lower().strip() if col is not None else "" for col in headers]
+
+        indices = {}
+        for field, keywords in (
+            ("fecha", self.DATE_KEYWORDS),
+            ("descripcion", self.DESC_KEYWORDS),
+            ("monto", self.AMOUNT_KEYWORDS),
+            ("tipo", self.TYPE_KEYWORDS),
+        ):
+            for idx, col in enumerate(columns_lower):
+                if col and any(kw in col for kw in keywords):
+                    indices[field] = idx
+                    break
+
+        return indices
+
+    def _parse_date(self, date_str, date_format: Optional[str] = None) -> Optional[datetime]:
+        """Intenta parsear una fecha con el formato indicado o en múltiples formatos"""
+        # Celdas de Excel ya tipadas
+        if isinstance(date_str, datetime):
+            return date_str
+        if isinstance(date_str, date):
+            return datetime(date_str.year, date_str.month, date_str.day)
+
         if not date_str or str(date_str).strip() == "":
             return None
         
         date_str = str(date_str).strip()
+
+        if date_format:
+            try:
+                return datetime.strptime(date_str, date_format)
+            except ValueError:
+                pass
         
         formats = [
             "%Y-%m-%d",
@@ -155,16 +369,23 @@ class TransactionProcessor:
         
         for fmt in formats:
             try:
-                return datetime.strptime(date_str, fmt)
+                parsed = datetime.strptime(date_str, fmt)
             except ValueError:
                 continue
+            if self.detected_date_format is None:
+                self.detected_date_format = fmt
+            return parsed
         
         return None
 
-    def _parse_amount(self, amount_str) -> Optional[float]:
-        """Limpia y convierte un monto a float"""
+    def _parse_amount(self, amount_str, decimal: str = ".") -> Optional[float]:
+        """Limpia y convierte un monto a float (decimal: "." o ",")"""
         if not amount_str:
             return None
+
+        # Celdas numéricas de Excel
+        if isinstance(amount_str, (int, float)) and not isinstance(amount_str, bool):
+            return float(amount_str)
         
         amount_str = str(amount_str)
         
@@ -173,8 +394,12 @@ class TransactionProcessor:
         for symbol in currency_symbols:
             amount_str = amount_str.replace(symbol, "")
         
-        # Eliminar espacios y comas
-        amount_str = amount_str.replace(" ", "").replace(",", "")
+        # Eliminar espacios y separadores de miles
+        amount_str = amount_str.replace(" ", "")
+        if decimal == ",":
+            amount_str = amount_str.replace(".", "").replace(",", ".")
+        else:
+            amount_str = amount_str.replace(",", "")
         
         try:
             return float(amount_str)
@@ -224,14 +449,7 @@ class TransactionProcessor:
                 continue
             
             # Procesar columna tipo
-            tipo = str(row.get("tipo", "expense")).lower().strip()
-            type_mapping = {
-                "gasto": "expense", "gastos": "expense", "expense": "expense",
-                "egreso": "expense", "egresos": "expense", "salida": "expense",
-                "ingreso": "income", "ingresos": "income", "income": "income",
-                "entrada": "income"
-            }
-            tipo = type_mapping.get(tipo, "expense")
+            tipo = self._normalize_type(row.get("tipo", "expense"))
             
             # Crear registro limpio
             cleaned_row = {
@@ -271,6 +489,14 @@ class TransactionProcessor:
 
         return True, message
 
+    def _normalize_type(self, value, type_values: Optional[Dict[str, str]] = None) -> str:
+        """Normaliza el valor de la columna tipo a expense/income"""
+        if type_values:
+            mapped = type_values.get(normalize_header(value))
+            if mapped:
+                return mapped
+        return self.TYPE_MAPPING.get(str(value).lower().strip(), "expense")
+
     def categorize_transactions(self, categories_map_expense: Dict[int, str], 
                                 categories_map_income: Dict[int, str]) -> bool:
         """
@@ -280,30 +506,12 @@ class TransactionProcessor:
             return False
 
         try:
-            # Invertir mapas
-            name_to_id_expense = {str(v).strip().lower(): int(k) for k, v in categories_map_expense.items()}
-            name_to_id_income = {str(v).strip().lower(): int(k) for k, v in categories_map_income.items()}
+            lookup = self._build_category_lookup(categories_map_expense, categories_map_income)
 
             for row in self.data:
-                desc = row.get("descripcion", "").lower()
-                transaction_type = row.get("tipo", "expense")
-                
-                # Categorizar
-                category_name = self.categorizer.categorize(desc, transaction_type)
-                category_name_lower = category_name.lower().strip()
-                
-                # Elegir mapa correcto
-                if transaction_type == "income":
-                    name_to_id = name_to_id_income
-                    default_id = next(iter(name_to_id_income.values())) if name_to_id_income else 1
-                else:
-                    name_to_id = name_to_id_expense
-                    default_id = name_to_id.get("otros gastos", 
-                                 name_to_id.get("otros", 
-                                 next(iter(name_to_id.values())) if name_to_id else 1))
-                
-                category_id = name_to_id.get(category_name_lower, default_id)
-                row["categoria_id"] = category_id
+                row["categoria_id"] = self._resolve_category_id(
+                    row.get("descripcion", ""), row.get("tipo", "expense"), lookup
+                )
 
             return True
 
@@ -311,6 +519,229 @@ class TransactionProcessor:
             print(f"❌ Error en categorización: {e}")
             return False
 
+    def _build_category_lookup(self, categories_map_expense: Dict[int, str],
+                               categories_map_income: Dict[int, str]) -> Dict:
+        """Invierte los mapas de categorías y calcula las categorías por defecto"""
+        name_to_id_expense = {str(v).strip().lower(): int(k) for k, v in categories_map_expense.items()}
+        name_to_id_income = {str(v).strip().lower(): int(k) for k, v in categories_map_income.items()}
+
+        return {
+            "expense": name_to_id_expense,
+            "income": name_to_id_income,
+            "default_expense": name_to_id_expense.get(
+                "otros gastos",
+                name_to_id_expense.get("otros", next(iter(name_to_id_expense.values())) if name_to_id_expense else 1)
+            ),
+            "default_income": next(iter(name_to_id_income.values())) if name_to_id_income else 1,
+        }
+
+    def _resolve_category_id(self, description: str, transaction_type: str, lookup: Dict) -> int:
+        """Categoriza una descripción y devuelve el id de categoría correspondiente"""
+        category_name = self.categorizer.categorize(str(description).lower(), transaction_type)
+        category_name_lower = category_name.lower().strip()
+
+        # Elegir mapa correcto
+        if transaction_type == "income":
+            return lookup["income"].get(category_name_lower, lookup["default_income"])
+        return lookup["expense"].get(category_name_lower, lookup["default_expense"])
+
+    def get_excel_sheets(self, file_path: str) -> List[str]:
+        """Lista las hojas de un libro de Excel sin cargar sus datos"""
+        import openpyxl
+
+        wb = openpyxl.load_workbook(file_path, read_only=True)
+        try:
+            return list(wb.sheetnames)
+        finally:
+            wb.close()
+
+    def prepare_excel_stream(self, file_path: str, sheet_name: Optional[str] = None,
+                             column_indices: Optional[Dict[str, int]] = None) -> Tuple[bool, str]:
+        """
+        Lee solo la fila de encabezados de una hoja y resuelve los índices
+        de las columnas necesarias para iter_excel_rows()
+
+        Usa el mapeo manual si se indica; si no, el perfil de banco
+        reconocido por la huella de encabezados o, en último caso, la
+        búsqueda por palabras clave.
+
+        Args:
+            file_path: Ruta del libro (.xlsx)
+            sheet_name: Hoja a importar (default: hoja activa)
+            column_indices: Mapeo manual {"fecha", "descripcion", "monto", "tipo"?}
+
+        Returns: (success, message)
+        """
+        self.reset()
+
+        try:
+            import openpyxl
+        except ImportError:
+            return False, "openpyxl no está instalado"
+
+        try:
+            wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                if sheet_name and sheet_name not in wb.sheetnames:
+                    return False, f"La hoja '{sheet_name}' no existe"
+
+                ws = wb[sheet_name] if sheet_name else wb.active
+                sheet_title = ws.title
+                headers = next(ws.iter_rows(max_row=1, values_only=True), None)
+                # Según la dimensión guardada en el archivo (puede faltar o
+                # incluir filas vacías con formato): solo para el progreso
+                estimated_rows = ws.max_row - 1 if ws.max_row else None
+            finally:
+                wb.close()
+
+            if not headers:
+                return False, "El archivo está vacío"
+
+            self.headers = [str(h) if h is not None else "" for h in headers]
+
+            if column_indices is None:
+                self.profile = self.match_profile(headers)
+            if self.profile:
+                indices = dict(self.profile["columns"])
+            elif column_indices is not None:
+                indices = dict(column_indices)
+            else:
+                indices = self.detect_column_indices(headers)
+            self.column_indices = indices
+            columns = ", ".join(str(h) for h in headers if h is not None)
+
+            if "fecha" not in indices:
+                return False, f"No se encontró columna de fecha. Columnas: {columns}"
+            if "descripcion" not in indices:
+                return False, f"No se encontró columna de descripción. Columnas: {columns}"
+            if "monto" not in indices:
+                return False, f"No se encontró columna de monto. Columnas: {columns}"
+
+            self.stream_source = {
+                "file_path": file_path,
+                "sheet_name": sheet_title,
+                "indices": indices,
+                "estimated_rows": estimated_rows,
+            }
+
+            if self.profile:
+                return True, f"Hoja '{sheet_title}' lista: formato {self.profile['name']}"
+
+            mapped = ", ".join(f"{field}='{headers[idx]}'" for field, idx in indices.items())
+            return True, f"Hoja '{sheet_title}' lista: {mapped}"
+
+        except Exception as e:
+            return False, f"Error al leer el archivo: {str(e)}"
+
+    def iter_excel_rows(self) -> Iterator[Tuple[datetime, str, float, str]]:
+        """
+        Recorre la hoja preparada con prepare_excel_stream() sin cargarla
+        en memoria
+
+        Solo se leen las celdas hasta la última columna necesaria y se
+        corta tras MAX_BLANK_ROWS filas vacías seguidas (rango usado
+        inflado por formato en filas vacías).
+
+        Yields:
+            Tuplas (fecha, descripcion, monto, tipo) ya tipadas; las filas
+            inválidas se cuentan en stream_stats["skipped"]
+        """
+        if not self.stream_source:
+            return
+
+        import openpyxl
+
+        indices = self.stream_source["indices"]
+        i_date = indices["fecha"]
+        i_desc = indices["descripcion"]
+        i_amount = indices["monto"]
+        max_col = max(indices.values()) + 1
+
+        wb = openpyxl.load_workbook(self.stream_source["file_path"], read_only=True, data_only=True)
+        try:
+            ws = wb[self.stream_source["sheet_name"]]
+            blank_rows = 0
+            self.original_count = 0
+
+            for row_number, row in enumerate(
+                ws.iter_rows(min_row=2, max_col=max_col, values_only=True), start=2
+            ):
+                row = tuple(row) + (None,) * (max_col - len(row))
+                raw_date, raw_desc, raw_amount = row[i_date], row[i_desc], row[i_amount]
+
+                if all(v is None or str(v).strip() == "" for v in (raw_date, raw_desc, raw_amount)):
+                    blank_rows += 1
+                    if blank_rows >= self.MAX_BLANK_ROWS:
+                        break
+                    continue
+                blank_rows = 0
+
+                self.original_count += 1
+
+                fecha, descripcion, monto, tipo = self._convert_row(row, indices, self.profile)
+
+                if (fecha is None or monto is None or abs(monto) <= 0.001
+                        or descripcion.lower() in ["", "nan", "none", "null", "n/a", "na"]):
+                    self.stream_stats["skipped"] = self.stream_stats.get("skipped", 0) + 1
+                    if len(self.errors) < self.MAX_STREAM_ERRORS:
+                        self.errors.append(f"Fila {row_number} ignorada: datos inválidos")
+                    continue
+
+                yield fecha, descripcion, monto, tipo
+        finally:
+            wb.close()
+
+    def iter_import_chunks(self, categories_map_expense: Dict[int, str],
+                           categories_map_income: Dict[int, str],
+                           chunk_size: int = 1000) -> Iterator[List[Dict]]:
+        """
+        Convierte la hoja preparada en lotes listos para
+        DatabaseManager.import_transactions_bulk()
+
+        La memoria usada queda acotada por chunk_size; los totales se
+        acumulan en stream_stats (mismas claves de conteo que get_summary()).
+        """
+        lookup = self._build_category_lookup(categories_map_expense, categories_map_income)
+        self.stream_stats = {
+            "status": "success",
+            "processed_count": 0,
+            "count_expenses": 0,
+            "count_income": 0,
+            "total_expenses": 0.0,
+            "total_income": 0.0,
+            "skipped": 0,
+        }
+
+        chunk = []
+        for fecha, descripcion, monto, tipo in self.iter_excel_rows():
+            chunk.append({
+                "date": fecha,
+                "description": descripcion,
+                "amount": monto,
+                "category_id": self._resolve_category_id(descripcion, tipo, lookup),
+                "transaction_type": tipo,
+                "source": "imported",
+                "original_description": descripcion,
+            })
+
+            self.stream_stats["processed_count"] += 1
+            if tipo == "income":
+                self.stream_stats["count_income"] += 1
+                self.stream_stats["total_income"] += monto
+            else:
+                self.stream_stats["count_expenses"] += 1
+                self.stream_stats["total_expenses"] += monto
+
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+        self.stream_stats["original_count"] = self.original_count
+        self.stream_stats["errors"] = self.errors
+
     def get_processed_data(self) -> List[Dict]:
         """
         Retorna los datos procesados listos para insertar en la BD
@@ -386,4 +817,10 @@ class TransactionProcessor:
         """Resetea el procesador"""
         self.data = []
         self.errors = []
-        self.original_count = 0
\ No newline at end of file
+        self.original_count = 0
+        self.stream_source = None
+        self.stream_stats = {}
+        self.profile = None
+        self.headers = []
+        self.column_indices = {}
+        self.detected_date_format = None
\ No newline at end of file
@@ -0,0 +1,194 @@
+"""
+Caché de reportes generados
+Archivo: src/business/report_cache.py
+
+Cada entrada guarda un archivo de reporte junto con la versión de datos
+(DatabaseManager.get_data_version) con la que se generó. La clave es
+(tipo, período, formato): si la versión actual coincide, el archivo se
+sirve sin regenerarlo; si no, el reporte se regenera y reemplaza la entrada.
+
+El índice se persiste en JSON junto a los archivos y se expulsan las
+entradas menos usadas recientemente (LRU) al superar el tamaño o el
+número máximo de entradas.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+
+class ReportCache:
+    """Caché LRU de archivos de reporte acotada por tamaño"""
+
+    INDEX_FILENAME = "Reporte_TermoWallet_cache.json"
+    FILE_PREFIX = "Reporte_TermoWallet"
+
+    # Una instancia por directorio (compartida entre generadores)
+    _instances: Dict[str, "ReportCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, directory: str, max_bytes: int, max_entries: int):
+        """
+        Args:
+            directory: Directorio donde viven los reportes
+            max_bytes: Tamaño total máximo de los archivos en caché
+            max_entries: Número máximo de reportes en caché
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+        self._sweep_untracked()
+
+    @classmethod
+    def for_directory(cls, directory: str, max_bytes: int, max_entries: int) -> "ReportCache":
+        """Devuelve la caché del directorio, creándola la primera vez"""
+        directory = os.path.abspath(directory)
+        with cls._instances_lock:
+            cache = cls._instances.get(directory)
+            if cache is None:
+                cache = cls(directory, max_bytes, max_entries)
+                cls._instances[directory] = cache
+            return cache
+
+    @staticmethod
+    def make_key(report_type: str, period: str, format: str) -> str:
+        """Clave de una entrada: tipo|período|formato"""
+        return f"{report_type}|{period}|{format}"
+
+    @property
+    def total_bytes(self) -> int:
+        """Tamaño total de los archivos en caché"""
+        return sum(entry["size"] for entry in self._entries.values())
+
+    def get(self, key: str, version: int) -> Optional[str]:
+        """
+        Ruta del reporte en caché si se generó con la versión de datos dada
+
+        Una entrada de otra versión (o cuyo archivo ya no existe) se descarta.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            path = os.path.join(self.directory, entry["filename"])
+            if entry["version"] != version or not os.path.exists(path):
+                self._remove_entry(key, delete_file=entry["version"] != version)
+                self._save_index()
+                return None
+
+            entry["last_used"] = time.time()
+            self._save_index()
+            return path
+
+    def put(self, key: str, version: int, filepath: str):
+        """
+        Registra un reporte recién generado y aplica la expulsión LRU
+
+        El archivo debe estar ya en el directorio de la caché.
+        """
+        filename = os.path.basename(filepath)
+
+        with self._lock:
+            # Otra clave con el mismo archivo quedó reemplazada por este
+            for other_key, entry in list(self._entries.items()):
+                if other_key != key and entry["filename"] == filename:
+                    del self._entries[other_key]
+
+            previous = self._entries.get(key)
+            if previous and previous["filename"] != filename:
+                self._remove_entry(key, delete_file=True)
+
+            self._entries[key] = {
+                "filename": filename,
+                "version": version,
+                "size": os.path.getsize(filepath),
+                "last_used": time.time(),
+            }
+            self._evict(keep=key)
+            self._save_index()
+
+    def clear(self):
+        """Elimina todos los reportes en caché"""
+        with self._lock:
+            for key in list(self._entries):
+                self._remove_entry(key, delete_file=True)
+            self._save_index()
+
+    def _evict(self, keep: str):
+        """Expulsa las entradas menos usadas hasta cumplir los límites"""
+        lru = sorted(
+            (k for k in self._entries if k != keep),
+            key=lambda k: self._entries[k]["last_used"],
+        )
+        for key in lru:
+            if len(self._entries) <= self.max_entries and self.total_bytes <= self.max_bytes:
+                break
+            print(f"  🗑️ Reporte expulsado de la caché: {self._entries[key]['filename']}")
+            self._remove_entry(key, delete_file=True)
+
+    def _remove_entry(self, key: str, delete_file: bool):
+        """Quita una entrada del índice (y opcionalmente su archivo)"""
+        entry = self._entries.pop(key, None)
+        if entry and delete_file:
+            try:
+                os.remove(os.path.join(self.directory, entry["filename"]))
+            except OSError:
+                pass
+
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, self.INDEX_FILENAME)
+
+    def _load_index(self):
+        """Carga el índice; descarta entradas cuyo archivo ya no existe"""
+        try:
+            with open(self._index_path(), encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+
+        self._entries = {
+            key: entry
+            for key, entry in entries.items()
+            if isinstance(entry, dict)
+            and os.path.exists(os.path.join(self.directory, entry.get("filename", "")))
+        }
+
+    def _save_index(self):
+        """Escribe el índice de forma atómica (temporal + rename)"""
+        tmp_path = self._index_path() + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self._index_path())
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar el índice de la caché de reportes: {e}")
+
+    def _sweep_untracked(self):
+        """
+        Elimina reportes que no están en el índice (versiones anteriores de
+        la app) y temporales de escrituras interrumpidas
+        """
+        tracked = {entry["filename"] for entry in self._entries.values()}
+        removed = 0
+
+        for filename in os.listdir(self.directory):
+            if not filename.startswith(self.FILE_PREFIX) or filename == self.INDEX_FILENAME:
+                continue
+            if filename in tracked or not filename.endswith((".xlsx", ".csv", ".parquet", ".npz", ".pdf", ".png", ".tmp")):
+                continue
+            try:
+                os.remove(os.path.join(self.directory, filename))
+                removed += 1
+            except OSError:
+                pass
+
+        if removed:
+            print(f"  🧹 {removed} reporte(s) huérfano(s) eliminado(s)")
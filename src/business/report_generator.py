@@ -10,150 +10,161 @@ import sys
 import os
 import tempfile
 import shutil
+import time
+import zipfile
 from datetime import datetime, timedelta
-from typing import Dict, List
-try:
-    import openpyxl
-    from openpyxl.styles import Font, PatternFill
-except ImportError:
-    openpyxl = None
+from functools import wraps
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Tuple
 import flet as ft
 
+from src.utils.background import JobCancelled
+from src.business.report_cache import ReportCache
+from src.business import chart_raster
+from src.business.statement_pdf import write_statement
+
+
+def _timed_report(method):
+    """Registra el tiempo total de generación y lo agrega al resultado (elapsed)"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        result = method(self, *args, **kwargs)
+        elapsed = time.perf_counter() - started
+        if isinstance(result, dict):
+            result["elapsed"] = elapsed
+        print(f"⏱️ {method.__name__}: {elapsed:.3f}s")
+        return result
+    return wrapper
+
 
 class ReportGenerator:
     """Generador de reportes con sistema nativo de compartir"""
+
+    # Columnas de la hoja/archivo de transacciones
+    TRANSACTION_HEADERS = ["Fecha", "Descripción", "Categoría", "Tipo", "Monto", "Notas"]
+
+    # Filas iniciales usadas para calcular el ancho de las columnas
+    WIDTH_SAMPLE_ROWS = 200
+
+    # Partes mínimas de un .xlsx válido (directorio central del zip)
+    XLSX_REQUIRED_PARTS = ("[Content_Types].xml", "xl/workbook.xml")
+
+    # Cada cuántas filas se informa el avance y se atiende la cancelación
+    PROGRESS_EVERY_ROWS = 500
+
+    # Filas por bloque (row group) en la exportación columnar
+    EXPORT_CHUNK_ROWS = 10000
+
+    # Buffer del archivo CSV (se escribe al disco en bloques de este tamaño)
+    CSV_BUFFER_BYTES = 64 * 1024
+
+    # Nombre del cursor de la exportación incremental por defecto
+    INCREMENTAL_EXPORT_NAME = "csv"
+
+    # Estado de cuenta PDF: categorías en el gráfico y meses de tendencia
+    STATEMENT_TOP_CATEGORIES = 8
+    STATEMENT_TREND_MONTHS = 6
     
     def __init__(self, db_manager, page=None):
         self.db = db_manager
         self.page = page
         from src.utils.config import Config
         self.is_android = Config.is_android()
+        self._cache = None
 
-    def _clean_old_reports(self):
-        """Limpia reportes antiguos del directorio de caché"""
-        try:
-            from src.utils.android_permissions import get_app_storage_path
-            
-            if self.is_android:
-                cache_dir = get_app_storage_path().replace("/files", "/cache")
-            else:
-                cache_dir = tempfile.gettempdir()
-            
-            if not os.path.exists(cache_dir):
-                return
-            
-            print(f"\n  LIMPIANDO REPORTES ANTIGUOS")
-            now = datetime.now()
-            cutoff_time = now - timedelta(hours=24)
-            cleaned_count = 0
-            
-            for filename in os.listdir(cache_dir):
-                if not filename.startswith("Reporte_TermoWallet"):
-                    continue
-                if not (filename.endswith(".xlsx") or filename.endswith(".csv")):
-                    continue
-                
-                filepath = os.path.join(cache_dir, filename)
-                
-                try:
-                    file_mtime = datetime.fromtimestamp(os.path.getmtime(filepath))
-                    if file_mtime < cutoff_time:
-                        os.remove(filepath)
-                        cleaned_count += 1
-                        print(f"  Eliminado: {filename}")
-                except Exception as file_error:
-                    print(f" Error procesando {filename}: {file_error}")
-                    continue
-            
-            if cleaned_count > 0:
-                print(f" {cleaned_count} archivo(s) antiguo(s) eliminado(s)")
-            
-        except Exception as e:
-            print(f" Error en limpieza de reportes: {e}")
+    def _reports_dir(self) -> str:
+        """Directorio de caché donde se generan los reportes"""
+        from src.utils.config import Config
+        return Config.get_cache_dir()
+
+    @property
+    def cache(self) -> ReportCache:
+        """Caché de reportes (LRU por tamaño) del directorio de reportes"""
+        if self._cache is None:
+            from src.utils.config import Config
+            self._cache = ReportCache.for_directory(
+                self._reports_dir(),
+                max_bytes=Config.REPORT_CACHE_MAX_MB * 1024 * 1024,
+                max_entries=Config.REPORT_CACHE_MAX_ENTRIES,
+            )
+        return self._cache
 
+    @_timed_report
     def generate_monthly_report(
         self,
         year: int,
         month: int,
         format: str = "xlsx",
         callback_success = None,
-        callback_error = None
+        callback_error = None,
+        job = None
     ) -> Dict:
         """Genera reporte mensual"""
+        session = self._open_job_session(job)
         try:
             print(f"\n Generando reporte mensual: {month}/{year}")
             
-            transactions = self.db.get_transactions_by_month(year, month)
-            summary = self.db.get_monthly_summary(year, month)
-            expenses_by_cat = self.db.get_expenses_by_category(year, month)
-            income_by_cat = self.db.get_income_by_category(year, month)
+            month_start = datetime(year, month, 1)
+            next_month = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+            start_date, end_date = month_start, next_month - timedelta(microseconds=1)
+
+            cache_key = ReportCache.make_key("monthly", f"{year}-{month:02d}", format)
+            data_version = self.db.get_data_version(session)
+            cached = self._serve_cached(cache_key, data_version, callback_success)
+            if cached:
+                return cached
+
+            if job:
+                job.update(stage="Consultando datos")
+            data = self._build_report_data(start_date, end_date, session)
             
-            if not transactions:
-                error_msg = "âŒ No hay transacciones en este mes"
+            if data["transaction_count"] == 0:
+                error_msg = "âŒ No hay transacciones en este mes"
                 print(error_msg)
                 if callback_error:
                     callback_error(error_msg)
                 return {"success": False, "filepath": None, "message": error_msg}
             
-            # Preparar datos
-            transactions_data = []
-            for t in transactions:
-                category = self.db.get_category_by_id(t.category_id)
-                transactions_data.append({
-                    "Fecha": t.date.strftime("%d/%m/%Y"),
-                    "Descripción": t.description,
-                    "Categoría": category.name if category else "Sin Categoría",
-                    "Tipo": "Ingreso" if t.transaction_type == "income" else "Gasto",
-                    "Monto": t.amount,
-                    "Notas": t.notes or "",
-                })
-            
             summary_data = [
-                {"Concepto": "Total Ingresos", "Valor": summary["total_income"]},
-                {"Concepto": "Total Gastos", "Valor": summary["total_expenses"]},
-                {"Concepto": "Balance", "Valor": summary["savings"]},
-                {"Concepto": "Tasa de Ahorro (%)", "Valor": summary["savings_rate"]},
-                {"Concepto": "NÂº Transacciones", "Valor": summary["transaction_count"]}
+                {"Concepto": "Total Ingresos", "Valor": data["total_income"]},
+                {"Concepto": "Total Gastos", "Valor": data["total_expenses"]},
+                {"Concepto": "Balance", "Valor": data["balance"]},
+                {"Concepto": "Tasa de Ahorro (%)", "Valor": data["savings_rate"]},
+                {"Concepto": "NÂº Transacciones", "Valor": data["transaction_count"]}
             ]
             
-            expenses_data = []
-            if summary["total_expenses"] > 0:
-                for cat in expenses_by_cat:
-                    percentage = (cat["total"] / summary["total_expenses"] * 100)
-                    expenses_data.append({
-                        "Categoría": cat["category"],
-                        "Total": cat["total"],
-                        "Porcentaje (%)": round(percentage, 2)
-                    })
-            
-            income_data = []
-            if summary["total_income"] > 0:
-                for cat in income_by_cat:
-                    percentage = (cat["total"] / summary["total_income"] * 100)
-                    income_data.append({
-                        "Categoría": cat["category"],
-                        "Total": cat["total"],
-                        "Porcentaje (%)": round(percentage, 2)
-                    })
-            
             month_names = [
                 "Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
                 "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"
             ]
             filename = f"Reporte_TermoWallet_{month_names[month-1]}_{year}.{format}"
+
+            document = None
+            if format == "pdf":
+                if job:
+                    job.update(stage="Preparando gráficos")
+                document = self._build_statement(year, month, end_date, data, data_version, session)
             
             # âœ… GENERAR DIRECTAMENTE (sin FilePicker)
             return self._generate_and_share_report(
                 filename,
                 format,
-                transactions_data,
+                self._iter_transaction_rows(start_date, end_date, session),
+                data["transaction_count"],
                 summary_data,
-                expenses_data,
-                income_data,
+                data["expenses_data"],
+                data["income_data"],
                 callback_success,
-                callback_error
+                callback_error,
+                job,
+                cache_key,
+                data_version,
+                document
             )
             
+        except JobCancelled:
+            raise
         except Exception as e:
             print(f" Error generando reporte: {e}")
             import traceback
@@ -162,104 +173,73 @@ class ReportGenerator:
             if callback_error:
                 callback_error(error_msg)
             return {"success": False, "filepath": None, "message": error_msg}
+        finally:
+            if session is not None:
+                session.close()
 
+    @_timed_report
     def generate_custom_range_report(
         self,
         start_date: datetime,
         end_date: datetime,
         format: str = "xlsx",
         callback_success = None,
-        callback_error = None
+        callback_error = None,
+        job = None
     ) -> Dict:
         """Genera reporte de rango personalizado"""
+        session = self._open_job_session(job)
         try:
             print(f"\n Generando reporte personalizado: {start_date.strftime('%d/%m/%Y')} - {end_date.strftime('%d/%m/%Y')}")
             
-            transactions = self.db.get_transactions_by_date_range(start_date, end_date)
+            cache_key = ReportCache.make_key(
+                "custom", f"{start_date.isoformat()}_{end_date.isoformat()}", format
+            )
+            data_version = self.db.get_data_version(session)
+            cached = self._serve_cached(cache_key, data_version, callback_success)
+            if cached:
+                return cached
+
+            if job:
+                job.update(stage="Consultando datos")
+            data = self._build_report_data(start_date, end_date, session)
             
-            if not transactions:
+            if data["transaction_count"] == 0:
                 error_msg = " No hay transacciones en este rango de fechas"
                 print(error_msg)
                 if callback_error:
                     callback_error(error_msg)
                 return {"success": False, "filepath": None, "message": error_msg}
             
-            total_income = sum(t.amount for t in transactions if t.transaction_type == "income")
-            total_expenses = sum(t.amount for t in transactions if t.transaction_type == "expense")
-            
-            transactions_data = []
-            for t in transactions:
-                category = self.db.get_category_by_id(t.category_id)
-                transactions_data.append({
-                    "Fecha": t.date.strftime("%d/%m/%Y"),
-                    "Descripción": t.description,
-                    "Categoría": category.name if category else "Sin Categoría",
-                    "Tipo": "Ingreso" if t.transaction_type == "income" else "Gasto",
-                    "Monto": t.amount,
-                    "Notas": t.notes or "",
-                })
-            
             summary_data = [
                 {"Concepto": "Fecha Inicio", "Valor": start_date.strftime("%d/%m/%Y")},
                 {"Concepto": "Fecha Fin", "Valor": end_date.strftime("%d/%m/%Y")},
                 {"Concepto": "Días", "Valor": (end_date - start_date).days + 1},
-                {"Concepto": "Total Ingresos", "Valor": total_income},
-                {"Concepto": "Total Gastos", "Valor": total_expenses},
-                {"Concepto": "Balance", "Valor": total_income - total_expenses},
-                {"Concepto": "NÂº Transacciones", "Valor": len(transactions)}
+                {"Concepto": "Total Ingresos", "Valor": data["total_income"]},
+                {"Concepto": "Total Gastos", "Valor": data["total_expenses"]},
+                {"Concepto": "Balance", "Valor": data["balance"]},
+                {"Concepto": "NÂº Transacciones", "Valor": data["transaction_count"]}
             ]
             
-            expenses_by_cat = {}
-            for t in transactions:
-                if t.transaction_type == "expense":
-                    category = self.db.get_category_by_id(t.category_id)
-                    cat_name = category.name if category else "Sin Categoría"
-                    if cat_name not in expenses_by_cat:
-                        expenses_by_cat[cat_name] = 0
-                    expenses_by_cat[cat_name] += t.amount
-            
-            expenses_data = []
-            if total_expenses > 0:
-                for cat_name, total in sorted(expenses_by_cat.items(), key=lambda x: x[1], reverse=True):
-                    percentage = (total / total_expenses * 100)
-                    expenses_data.append({
-                        "Categoría": cat_name,
-                        "Total": total,
-                        "Porcentaje (%)": round(percentage, 2)
-                    })
-            
-            income_by_cat = {}
-            for t in transactions:
-                if t.transaction_type == "income":
-                    category = self.db.get_category_by_id(t.category_id)
-                    cat_name = category.name if category else "Sin Categoría"
-                    if cat_name not in income_by_cat:
-                        income_by_cat[cat_name] = 0
-                    income_by_cat[cat_name] += t.amount
-            
-            income_data = []
-            if total_income > 0:
-                for cat_name, total in sorted(income_by_cat.items(), key=lambda x: x[1], reverse=True):
-                    percentage = (total / total_income * 100)
-                    income_data.append({
-                        "Categoría": cat_name,
-                        "Total": total,
-                        "Porcentaje (%)": round(percentage, 2)
-                    })
-            
             filename = f"Reporte_TermoWallet_{start_date.strftime('%d%m%Y')}_al_{end_date.strftime('%d%m%Y')}.{format}"
             
             return self._generate_and_share_report(
                 filename,
                 format,
-                transactions_data,
+                self._iter_transaction_rows(start_date, end_date, session),
+                data["transaction_count"],
                 summary_data,
-                expenses_data,
-                income_data,
+                data["expenses_data"],
+                data["income_data"],
                 callback_success,
-                callback_error
+                callback_error,
+                job,
+                cache_key,
+                data_version
             )
             
+        except JobCancelled:
+            raise
         except Exception as e:
             print(f"Error generando reporte personalizado: {e}")
             import traceback
@@ -268,105 +248,72 @@ class ReportGenerator:
             if callback_error:
                 callback_error(error_msg)
             return {"success": False, "filepath": None, "message": error_msg}
+        finally:
+            if session is not None:
+                session.close()
 
+    @_timed_report
     def generate_annual_report(
         self,
         year: int,
         format: str = "xlsx",
         callback_success = None,
-        callback_error = None
+        callback_error = None,
+        job = None
     ) -> Dict:
         """Genera reporte anual"""
+        session = self._open_job_session(job)
         try:
             print(f"\n Generando reporte anual: {year}")
             
-            all_transactions = []
-            for month in range(1, 13):
-                monthly_trans = self.db.get_transactions_by_month(year, month)
-                all_transactions.extend(monthly_trans)
+            start_date = datetime(year, 1, 1)
+            end_date = datetime(year + 1, 1, 1) - timedelta(microseconds=1)
+
+            cache_key = ReportCache.make_key("annual", str(year), format)
+            data_version = self.db.get_data_version(session)
+            cached = self._serve_cached(cache_key, data_version, callback_success)
+            if cached:
+                return cached
+
+            if job:
+                job.update(stage="Consultando datos")
+            data = self._build_report_data(start_date, end_date, session)
             
-            if not all_transactions:
+            if data["transaction_count"] == 0:
                 error_msg = f" No hay transacciones en el año {year}"
                 print(error_msg)
                 if callback_error:
                     callback_error(error_msg)
                 return {"success": False, "filepath": None, "message": error_msg}
             
-            total_income = sum(t.amount for t in all_transactions if t.transaction_type == "income")
-            total_expenses = sum(t.amount for t in all_transactions if t.transaction_type == "expense")
-            
-            transactions_data = []
-            for t in all_transactions:
-                category = self.db.get_category_by_id(t.category_id)
-                transactions_data.append({
-                    "Fecha": t.date.strftime("%d/%m/%Y"),
-                    "Descripción": t.description,
-                    "Categoría": category.name if category else "Sin Categoría",
-                    "Tipo": "Ingreso" if t.transaction_type == "income" else "Gasto",
-                    "Monto": t.amount,
-                    "Notas": t.notes or "",
-                })
-            
             summary_data = [
                 {"Concepto": "AÃ±o", "Valor": year},
-                {"Concepto": "Total Ingresos", "Valor": total_income},
-                {"Concepto": "Total Gastos", "Valor": total_expenses},
-                {"Concepto": "Balance", "Valor": total_income - total_expenses},
-                {"Concepto": "Tasa de Ahorro (%)", "Valor": round((total_income - total_expenses) / total_income * 100, 2) if total_income > 0 else 0},
-                {"Concepto": "NÂº Transacciones", "Valor": len(all_transactions)}
+                {"Concepto": "Total Ingresos", "Valor": data["total_income"]},
+                {"Concepto": "Total Gastos", "Valor": data["total_expenses"]},
+                {"Concepto": "Balance", "Valor": data["balance"]},
+                {"Concepto": "Tasa de Ahorro (%)", "Valor": data["savings_rate"]},
+                {"Concepto": "NÂº Transacciones", "Valor": data["transaction_count"]}
             ]
             
-            expenses_by_cat = {}
-            for t in all_transactions:
-                if t.transaction_type == "expense":
-                    category = self.db.get_category_by_id(t.category_id)
-                    cat_name = category.name if category else "Sin Categoría"
-                    if cat_name not in expenses_by_cat:
-                        expenses_by_cat[cat_name] = 0
-                    expenses_by_cat[cat_name] += t.amount
-            
-            expenses_data = []
-            if total_expenses > 0:
-                for cat_name, total in sorted(expenses_by_cat.items(), key=lambda x: x[1], reverse=True):
-                    percentage = (total / total_expenses * 100)
-                    expenses_data.append({
-                        "Categoría": cat_name,
-                        "Total": total,
-                        "Porcentaje (%)": round(percentage, 2)
-                    })
-            
-            income_by_cat = {}
-            for t in all_transactions:
-                if t.transaction_type == "income":
-                    category = self.db.get_category_by_id(t.category_id)
-                    cat_name = category.name if category else "Sin Categoría"
-                    if cat_name not in income_by_cat:
-                        income_by_cat[cat_name] = 0
-                    income_by_cat[cat_name] += t.amount
-            
-            income_data = []
-            if total_income > 0:
-                for cat_name, total in sorted(income_by_cat.items(), key=lambda x: x[1], reverse=True):
-                    percentage = (total / total_income * 100)
-                    income_data.append({
-                        "Categoría": cat_name,
-                        "Total": total,
-                        "Porcentaje (%)": round(percentage, 2)
-                    })
-            
             filename = f"Reporte_TermoWallet_Anual_{year}.{format}"
             
             return self._generate_and_share_report(
                 filename,
                 format,
-                transactions_data,
+                self._iter_transaction_rows(start_date, end_date, session),
+                data["transaction_count"],
                 summary_data,
-                expenses_data,
-                income_data,
+                data["expenses_data"],
+                data["income_data"],
                 callback_success,
-                callback_error
+                callback_error,
+                job,
+                cache_key,
+                data_version
             )
             
+        except JobCancelled:
+            raise
         except Exception as e:
             print(f" Error generando reporte anual: {e}")
             import traceback
@@ -375,61 +322,466 @@ class ReportGenerator:
             if callback_error:
                 callback_error(error_msg)
             return {"success": False, "filepath": None, "message": error_msg}
+        finally:
+            if session is not None:
+                session.close()
+
+    @_timed_report
+    def generate_columnar_export(
+        self,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        callback_success = None,
+        callback_error = None,
+        job = None
+    ) -> Dict:
+        """
+        Exporta las transacciones en formato columnar para análisis
+
+        Parquet si está pyarrow, si no .npz (numpy). Sin fechas exporta
+        todo el historial, de la más antigua a la más reciente.
+        """
+        session = self._open_job_session(job)
+        try:
+            # Como openpyxl: el módulo columnar se carga al exportar (no al arrancar)
+            from src.business import columnar_export
+
+            format = columnar_export.available_format()
+            if format is None:
+                error_msg = "❌ Instala pyarrow o numpy para exportar en formato columnar"
+                print(error_msg)
+                if callback_error:
+                    callback_error(error_msg)
+                return {"success": False, "filepath": None, "message": error_msg}
+
+            print(f"\n Generando exportación columnar ({format})")
+
+            period = "_".join(d.isoformat() if d else "" for d in (start_date, end_date))
+            cache_key = ReportCache.make_key("columnar", period, format)
+            data_version = self.db.get_data_version(session)
+            cached = self._serve_cached(cache_key, data_version, callback_success)
+            if cached:
+                return cached
+
+            if job:
+                job.update(stage="Consultando datos")
+            count = sum(
+                g["count"] for g in self.db.get_category_totals_by_range(start_date, end_date, session=session)
+            )
+
+            if count == 0:
+                error_msg = " No hay transacciones para exportar"
+                print(error_msg)
+                if callback_error:
+                    callback_error(error_msg)
+                return {"success": False, "filepath": None, "message": error_msg}
+
+            if start_date and end_date:
+                filename = f"Reporte_TermoWallet_{start_date.strftime('%d%m%Y')}_al_{end_date.strftime('%d%m%Y')}.{format}"
+            else:
+                filename = f"Reporte_TermoWallet_Historial.{format}"
+
+            return self._generate_and_share_report(
+                filename,
+                format,
+                self.db.iter_report_transactions(
+                    start_date, end_date,
+                    batch_size=self.EXPORT_CHUNK_ROWS,
+                    session=session,
+                    newest_first=False
+                ),
+                count,
+                [],
+                [],
+                [],
+                callback_success,
+                callback_error,
+                job,
+                cache_key,
+                data_version
+            )
+
+        except JobCancelled:
+            raise
+        except Exception as e:
+            print(f" Error en exportación columnar: {e}")
+            import traceback
+            traceback.print_exc()
+            error_msg = f"Error: {str(e)}"
+            if callback_error:
+                callback_error(error_msg)
+            return {"success": False, "filepath": None, "message": error_msg}
+        finally:
+            if session is not None:
+                session.close()
+
+    def generate_incremental_csv(
+        self,
+        name: str = None,
+        callback_success = None,
+        callback_error = None,
+        job = None
+    ) -> Dict:
+        """
+        Exporta a CSV solo las transacciones nuevas desde la última
+        exportación con el mismo nombre (delta para respaldos u hojas de
+        cálculo que se van completando)
+
+        El cursor guardado es el mayor id exportado: entran las
+        transacciones dadas de alta después, aunque su fecha sea anterior.
+        Lee la BD por páginas (date, id) y escribe en streaming; el cursor
+        solo avanza cuando el archivo quedó completo. La primera exportación
+        incluye todo el historial.
+        """
+        name = name or self.INCREMENTAL_EXPORT_NAME
+        session = self._open_job_session(job)
+        try:
+            print(f"\n Generando exportación incremental '{name}'")
+
+            if job:
+                job.update(stage="Consultando datos")
+            after = self.db.get_export_cursor(name, session=session)
+            since_id = after[1] if after else None
+            count = self.db.count_transactions_after(since_id, session=session)
+
+            if count == 0:
+                error_msg = " No hay transacciones nuevas desde la última exportación"
+                print(error_msg)
+                if callback_error:
+                    callback_error(error_msg)
+                return {"success": False, "filepath": None, "message": error_msg}
+
+            # Fila de mayor id escrita y total escrito (el cursor guarda lo real)
+            written = {"last": after, "count": 0}
+
+            def rows():
+                for transaction_id, *row in self.db.iter_transactions_after(
+                    since_id, batch_size=self.EXPORT_CHUNK_ROWS, session=session
+                ):
+                    if written["last"] is None or transaction_id > written["last"][1]:
+                        written["last"] = (row[0], transaction_id)
+                    written["count"] += 1
+                    yield self._format_transaction_row(*row)
+
+            since = after[0].strftime('%d%m%Y') if after else "inicio"
+            filename = f"Reporte_TermoWallet_Nuevas_{since}_{datetime.now().strftime('%d%m%Y_%H%M%S')}.csv"
+
+            result = self._generate_and_share_report(
+                filename,
+                "csv",
+                rows(),
+                count,
+                [],
+                [],
+                [],
+                callback_success,
+                callback_error,
+                job
+            )
+
+            if result["success"]:
+                last_date, last_id = written["last"]
+                self.db.save_export_cursor(name, last_date, last_id, written["count"])
+                result["count"] = written["count"]
+            return result
+
+        except JobCancelled:
+            raise
+        except Exception as e:
+            print(f" Error en exportación incremental: {e}")
+            import traceback
+            traceback.print_exc()
+            error_msg = f"Error: {str(e)}"
+            if callback_error:
+                callback_error(error_msg)
+            return {"success": False, "filepath": None, "message": error_msg}
+        finally:
+            if session is not None:
+                session.close()
+
+    def _build_report_data(self, start_date: datetime, end_date: datetime, session=None) -> Dict:
+        """
+        Resumen y tablas por categoría de un rango con un solo GROUP BY
+
+        Las filas de transacciones no se cargan aquí: se leen del cursor
+        (_iter_transaction_rows) mientras se escribe el archivo.
+        """
+        groups = self.db.get_category_totals_by_range(start_date, end_date, session=session)
+
+        total_income = sum(g["total"] for g in groups if g["transaction_type"] == "income")
+        total_expenses = sum(g["total"] for g in groups if g["transaction_type"] == "expense")
+        balance = total_income - total_expenses
+
+        def category_table(transaction_type: str, type_total: float) -> List[Dict]:
+            if type_total <= 0:
+                return []
+
+            # Agrupar por nombre ("Sin Categoría" reúne las huérfanas)
+            totals = {}
+            for g in groups:
+                if g["transaction_type"] == transaction_type:
+                    name = g["category"] or "Sin Categoría"
+                    totals[name] = totals.get(name, 0) + g["total"]
+
+            return [
+                {
+                    "Categoría": name,
+                    "Total": total,
+                    "Porcentaje (%)": round(total / type_total * 100, 2)
+                }
+                for name, total in sorted(totals.items(), key=lambda x: x[1], reverse=True)
+            ]
+
+        return {
+            "groups": groups,
+            "total_income": total_income,
+            "total_expenses": total_expenses,
+            "balance": balance,
+            "savings_rate": round(balance / total_income * 100, 2) if total_income > 0 else 0,
+            "transaction_count": sum(g["count"] for g in groups),
+            "expenses_data": category_table("expense", total_expenses),
+            "income_data": category_table("income", total_income),
+        }
+
+    def _build_statement(
+        self, year: int, month: int, end_date: datetime, data: Dict, data_version: int, session=None
+    ) -> Dict:
+        """
+        Contexto del estado de cuenta PDF (ver statement_pdf.write_statement)
+
+        Los gráficos se rasterizan una vez por (período, versión de datos) y
+        se guardan en la caché de reportes.
+        """
+        from src.utils.config import Config
+        from src.utils.helpers import get_month_name
+
+        period = f"{year}-{month:02d}"
+        expenses = [g for g in data["groups"] if g["transaction_type"] == "expense"]
+        expenses = expenses[:self.STATEMENT_TOP_CATEGORIES]
+
+        # Meses de la tendencia (el actual y los anteriores), con ceros si no hay datos
+        months = []
+        y, m = year, month
+        for _ in range(self.STATEMENT_TREND_MONTHS):
+            months.append((y, m))
+            y, m = (y - 1, 12) if m == 1 else (y, m - 1)
+        months.reverse()
+
+        totals = {
+            row["month"]: row
+            for row in self.db.get_monthly_totals_by_range(
+                datetime(*months[0], 1), end_date, session=session
+            )
+        }
+        trend = []
+        for y, m in months:
+            row = totals.get(f"{y}-{m:02d}", {})
+            trend.append((
+                get_month_name(m)[:3],
+                row.get("total_income", 0.0),
+                row.get("total_expenses", 0.0),
+            ))
+
+        charts = {
+            "categories": self._cached_chart(
+                "categorias", period, data_version,
+                lambda: chart_raster.render_category_bars(
+                    [(g["total"], g["color"] or "#667eea") for g in expenses], width=400
+                ),
+            ),
+            "trend": self._cached_chart(
+                "tendencia", period, data_version,
+                lambda: chart_raster.render_trend_bars(
+                    [(income, expense) for _, income, expense in trend]
+                ),
+            ),
+        }
+
+        currency = Config.CURRENCY_SYMBOL
+        total_expenses = data["total_expenses"]
+        return {
+            "title": "Estado de cuenta",
+            "period_label": f"{get_month_name(month)} {year}",
+            "currency": currency,
+            "summary": [
+                ("Total ingresos", f"{currency} {data['total_income']:,.2f}"),
+                ("Total gastos", f"{currency} {total_expenses:,.2f}"),
+                ("Balance", f"{currency} {data['balance']:,.2f}"),
+                ("Tasa de ahorro", f"{data['savings_rate']:.1f}%"),
+                ("Transacciones", str(data["transaction_count"])),
+            ],
+            "categories": [
+                {
+                    "name": g["category"] or "Sin Categoría",
+                    "total": g["total"],
+                    "percentage": g["total"] / total_expenses * 100 if total_expenses > 0 else 0,
+                }
+                for g in expenses
+            ],
+            "trend": trend,
+            "charts": charts,
+        }
+
+    def _cached_chart(self, name: str, period: str, data_version: int, render) -> bytes:
+        """PNG de un gráfico desde la caché; si no está, lo rasteriza y lo guarda"""
+        cache_key = ReportCache.make_key(f"chart-{name}", period, "png")
+        path = self.cache.get(cache_key, data_version)
+        if path:
+            with open(path, "rb") as f:
+                return f.read()
+
+        png = render()
+        path = os.path.join(self.cache.directory, f"Reporte_TermoWallet_grafico_{name}_{period}.png")
+        self._write_atomically(path, lambda f: f.write(png))
+        self.cache.put(cache_key, data_version, path)
+        return png
+
+    def _iter_transaction_rows(
+        self, start_date: datetime, end_date: datetime, session=None
+    ) -> Iterator[Tuple]:
+        """Filas de la hoja de transacciones, formateadas desde el cursor de la BD"""
+        for row in self.db.iter_report_transactions(start_date, end_date, session=session):
+            yield self._format_transaction_row(*row)
+
+    @staticmethod
+    def _format_transaction_row(date, description, category, transaction_type, amount, notes) -> Tuple:
+        """Fila con el formato de TRANSACTION_HEADERS"""
+        return (
+            date.strftime("%d/%m/%Y"),
+            description,
+            category or "Sin Categoría",
+            "Ingreso" if transaction_type == "income" else "Gasto",
+            amount,
+            notes or "",
+        )
+
+    def _open_job_session(self, job):
+        """
+        Sesión propia para reportes en segundo plano
+
+        La sesión principal (self.db.session) pertenece al hilo de la UI;
+        sin job el reporte corre en ese hilo y la usa directamente.
+        """
+        if job is None:
+            return None
+        return self.db.session_factory(expire_on_commit=False, autoflush=False)
+
+    def _track_rows(self, rows: Iterable[Tuple], job, total: int) -> Iterator[Tuple]:
+        """Informa las filas escritas al job y atiende la cancelación"""
+        job.update(stage="Escribiendo transacciones", processed=0, total=total)
+        count = 0
+        for row in rows:
+            count += 1
+            if count % self.PROGRESS_EVERY_ROWS == 0:
+                job.check_cancelled()
+                job.update(processed=count)
+            yield row
+        job.check_cancelled()
+        job.update(stage="Guardando archivo", processed=count)
+
+    def _share_file(self, filepath: str):
+        """Abre/comparte el reporte con la app del sistema"""
+        if self.page:
+            print(f"  Intentando compartir archivo...")
+
+            try:
+                # Intentar con launch_url (mÃ¡s compatible)
+                self.page.launch_url(f"file://{filepath}")
+                print(f" Archivo compartido con launch_url")
+
+            except Exception as share_error:
+                print(f" Error con launch_url: {share_error}")
+
+                # Fallback: intentar con share_file si existe
+                if hasattr(self.page, "share_file"):
+                    try:
+                        self.page.share_file(filepath)
+                        print(f"  Archivo compartido con share_file")
+                    except Exception as share_error2:
+                        print(f"   Error con share_file: {share_error2}")
+
+    def _serve_cached(self, cache_key: str, data_version: int, callback_success) -> Dict:
+        """
+        Sirve el reporte desde la caché si no cambiaron los datos
+
+        Returns:
+            Dict de resultado (cached=True) o None si hay que generarlo
+        """
+        filepath = self.cache.get(cache_key, data_version)
+        if not filepath:
+            return None
+
+        print(f"♻️ Reporte servido desde caché: {filepath}")
+        self._share_file(filepath)
+
+        success_msg = f"Reporte generado: {os.path.basename(filepath)}"
+        if callback_success:
+            callback_success(filepath, success_msg)
+
+        return {
+            "success": True,
+            "filepath": filepath,
+            "message": success_msg,
+            "cached": True
+        }
 
     def _generate_and_share_report(
         self,
         filename: str,
         format: str,
-        transactions_data: List[Dict],
+        transaction_rows: Iterable[Tuple],
+        transaction_count: int,
         summary_data: List[Dict],
         expenses_data: List[Dict],
         income_data: List[Dict],
         callback_success,
-        callback_error
+        callback_error,
+        job = None,
+        cache_key: str = None,
+        data_version: int = None,
+        document: Dict = None
     ) -> Dict:
         """
         âNUEVO: Genera el archivo y lo comparte inmediatamente
         Sin FilePicker, directamente genera y abre
+
+        Con job (BackgroundJob) informa las filas escritas y permite
+        cancelar: JobCancelled se propaga y no queda archivo parcial.
+        Con cache_key el archivo queda en la caché para data_version.
+        document es el contexto del estado de cuenta (solo formato pdf).
         """
         print("\n" + "="*60)
         print("GENERANDO Y COMPARTIENDO REPORTE")
         print("="*60)
         print(f"    Archivo: {filename}")
         print(f"   Formato: {format}")
-        print(f"   Transacciones: {len(transactions_data)}")
+        print(f"   Transacciones: {transaction_count}")
         print("="*60 + "\n")
         
         try:
-            # 1. Limpiar reportes antiguos
-            self._clean_old_reports()
-            
-            # 2. Definir ruta en CACHÃ‰
-            from src.utils.android_permissions import get_app_storage_path
-            
-            if self.is_android:
-                target_path = os.path.join(
-                    get_app_storage_path().replace("/files", "/cache"), 
-                    filename
-                )
-            else:
-                target_path = os.path.join(
-                    tempfile.gettempdir(),
-                    filename
-                )
+            # 1-2. Definir ruta en CACHÃ‰ (la caché expulsa los reportes viejos)
+            target_path = os.path.join(self.cache.directory, filename)
             
             print(f"  Ruta destino: {target_path}")
             
+            if job:
+                transaction_rows = self._track_rows(transaction_rows, job, transaction_count)
+
             # 3. Generar archivo según formato
             if format == 'xlsx':
                 success = self._save_excel(
                     target_path,
-                    transactions_data,
+                    transaction_rows,
                     summary_data,
                     expenses_data,
                     income_data
                 )
             elif format == 'csv':
-                success = self._save_csv(target_path, transactions_data)
+                success = self._save_csv(target_path, transaction_rows)
+            elif format == 'pdf':
+                success = self._save_pdf(target_path, transaction_rows, document)
+            elif format in ('parquet', 'npz'):
+                success = self._save_columnar(target_path, transaction_rows, format)
             else:
                 success = False
             
@@ -451,25 +803,11 @@ class ReportGenerator:
             file_size = os.path.getsize(target_path)
             print(f" Archivo creado: {file_size} bytes")
             
+            if cache_key:
+                self.cache.put(cache_key, data_version, target_path)
+
             # 5. âœ… COMPARTIR/ABRIR el archivo
-            if self.page:
-                print(f"  Intentando compartir archivo...")
-                
-                try:
-                    # Intentar con launch_url (mÃ¡s compatible)
-                    self.page.launch_url(f"file://{target_path}")
-                    print(f" Archivo compartido con launch_url")
-                    
-                except Exception as share_error:
-                    print(f" Error con launch_url: {share_error}")
-                    
-                    # Fallback: intentar con share_file si existe
-                    if hasattr(self.page, "share_file"):
-                        try:
-                            self.page.share_file(target_path)
-                            print(f"  Archivo compartido con share_file")
-                        except Exception as share_error2:
-                            print(f"   Error con share_file: {share_error2}")
+            self._share_file(target_path)
 
             # 6. LLAMAR AL CALLBACK DE ÉXITO
             success_msg = f"Reporte generado: {filename}"
@@ -484,6 +822,8 @@ class ReportGenerator:
                 "message": success_msg
             }
             
+        except JobCancelled:
+            raise
         except Exception as e:
             print(f"Error en generación: {e}")
             import traceback
@@ -496,200 +836,279 @@ class ReportGenerator:
     def _save_excel(
         self,
         filepath: str,
-        trans_data: List[Dict],
+        trans_rows: Iterable[Tuple],
         summary_data: List[Dict],
         expenses_data: List[Dict],
         income_data: List[Dict]
     ) -> bool:
-        """Guarda Excel con metodo correcto según plataforma"""
-        wb = None
+        """
+        Guarda Excel en modo write_only: las filas se escriben en streaming
+        (memoria constante) y el archivo aparece completo o no aparece
+        """
         try:
-            if not openpyxl:
+            # openpyxl se importa al generar el primer Excel (no al arrancar)
+            try:
+                import openpyxl
+            except ImportError:
                 print(f"  openpyxl NO está disponible")
                 raise ImportError("openpyxl no disponible")
 
             print(f"  📊 Iniciando creación de Excel...")
 
-            # 1. Crear workbook en memoria
-            wb = openpyxl.Workbook()
+            # 1. Crear workbook en streaming
+            wb = openpyxl.Workbook(write_only=True)
             
             # 2. Hoja Resumen
-            ws_summary = wb.active
-            ws_summary.title = "Resumen"
-            self._write_data_to_sheet(ws_summary, summary_data)
-            
-            # 3. Hoja Transacciones
-            ws_trans = wb.create_sheet("Transacciones")
-            self._write_data_to_sheet(ws_trans, trans_data)
+            self._write_dicts_to_sheet(wb.create_sheet("Resumen"), summary_data)
+
+            # 3. Hoja Transacciones (desde el cursor de la BD)
+            rows_written = self._write_rows_to_sheet(
+                wb.create_sheet("Transacciones"), self.TRANSACTION_HEADERS, trans_rows
+            )
+            print(f"      ✅ {rows_written} transacciones escritas")
             
             # 4. Hoja Gastos
             if expenses_data:
-                ws_exp = wb.create_sheet("Gastos por Categoría")
-                self._write_data_to_sheet(ws_exp, expenses_data)
+                self._write_dicts_to_sheet(wb.create_sheet("Gastos por Categoría"), expenses_data)
             
             # 5. Hoja Ingresos
             if income_data:
-                ws_inc = wb.create_sheet("Ingresos por Categoría")
-                self._write_data_to_sheet(ws_inc, income_data)
+                self._write_dicts_to_sheet(wb.create_sheet("Ingresos por Categoría"), income_data)
             
-            # 6. Guardar archivo
+            # 6. Guardar (temporal + fsync + rename atómico)
             print(f"      💾 Guardando archivo...")
-            if self.is_android:
-                # ANDROID: Usar BytesIO intermedio
-                from io import BytesIO
-                buffer = BytesIO()
-                wb.save(buffer)
-                buffer.seek(0)
-                excel_bytes = buffer.read()
-                buffer.close()
-                
-                with open(filepath, 'wb') as f:
-                    f.write(excel_bytes)
-                    f.flush()
-                    os.fsync(f.fileno())
-            else:
-                # DESKTOP: MÃ©todo tradicional
-                wb.save(filepath)
-            
-            # 7. Cerrar workbook
-            try:
-                wb.close()
-            except:
-                pass
-            
-            # 8. Esperar (crÃ­tico en Android)
-            import time
-            time.sleep(0.5)
-            
-            # 9. Verificar archivo
-            if not os.path.exists(filepath):
-                print(f"      ❌ ERROR: Archivo NO existe")
-                return False
+            self._write_atomically(filepath, wb.save, verify=self._verify_xlsx)
             
             file_size = os.path.getsize(filepath)
-            print(f"      ðŸ“ TamaÃ±o del archivo: {file_size} bytes")
-            
-            if file_size == 0:
-                print(f"      ❌ ERROR: Archivo vacío (0 bytes)")
-                return False
-
-            # 10. Verificar que sea un Excel válido
-            try:
-                test_wb = openpyxl.load_workbook(filepath, read_only=True)
-                test_wb.close()
-                print(f"      ✅ Excel válido verificado")
-            except Exception as verify_err:
-                print(f"      ❌ ERROR: Excel corrupto: {verify_err}")
-                return False
-            
             print(f"      ✅ Excel guardado exitosamente: {file_size} bytes")
             return True
             
+        except JobCancelled:
+            raise
         except Exception as e:
             print(f"      ❌ EXCEPCIÓN en _save_excel: {e}")
             import traceback
             traceback.print_exc()
             
-            # Limpiar archivo corrupto
-            try:
-                if os.path.exists(filepath) and os.path.getsize(filepath) == 0:
-                    os.remove(filepath)
-            except:
-                pass
-            
             return False
-            
-        finally:
-            if wb:
-                try:
-                    wb.close()
-                except:
-                    pass
 
-    def _write_data_to_sheet(self, worksheet, data: List[Dict]):
-        """Escribe datos en hoja Excel"""
+    def _write_dicts_to_sheet(self, worksheet, data: List[Dict]) -> int:
+        """Escribe una lista de diccionarios (tablas pequeñas) en una hoja"""
         if not data:
-            return
-        
-        # Encabezados
+            return 0
         headers = list(data[0].keys())
+        return self._write_rows_to_sheet(
+            worksheet, headers, (tuple(row.get(h, "") for h in headers) for row in data)
+        )
+
+    def _write_rows_to_sheet(self, worksheet, headers: List[str], rows: Iterable[Tuple]) -> int:
+        """
+        Escribe encabezados y filas en una hoja write_only
+
+        El ancho de las columnas se calcula con las primeras
+        WIDTH_SAMPLE_ROWS filas (debe fijarse antes de escribir la primera).
+
+        Returns:
+            int: Filas de datos escritas
+        """
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill
+        from openpyxl.utils import get_column_letter
+
+        rows = iter(rows)
+        sample = list(islice(rows, self.WIDTH_SAMPLE_ROWS))
+
+        # Ajustar ancho
         for col_idx, header in enumerate(headers, start=1):
-            cell = worksheet.cell(row=1, column=col_idx)
-            cell.value = header
-            try:
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(
-                    start_color="CCCCCC",
-                    end_color="CCCCCC",
-                    fill_type="solid"
-                )
-            except:
-                pass
-        
+            max_length = len(str(header))
+            for row in sample:
+                value = row[col_idx - 1]
+                if value is not None and len(str(value)) > max_length:
+                    max_length = len(str(value))
+            worksheet.column_dimensions[get_column_letter(col_idx)].width = min(max_length + 2, 50)
+
+        # Encabezados
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(worksheet, value=header)
+            cell.font = Font(bold=True)
+            cell.fill = PatternFill(
+                start_color="CCCCCC",
+                end_color="CCCCCC",
+                fill_type="solid"
+            )
+            header_cells.append(cell)
+        worksheet.append(header_cells)
+
         # Datos
-        for row_idx, row_data in enumerate(data, start=2):
-            for col_idx, header in enumerate(headers, start=1):
-                cell = worksheet.cell(row=row_idx, column=col_idx)
-                cell.value = row_data.get(header, "")
-        
-        # Ajustar ancho
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if cell.value and len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
-
-    def _save_csv(self, filepath: str, trans_data: List[Dict]) -> bool:
-        """Guarda CSV con método correcto según plataforma"""
+        count = 0
+        for row in chain(sample, rows):
+            worksheet.append(row)
+            count += 1
+
+        return count
+
+    def _save_csv(self, filepath: str, trans_rows: Iterable[Tuple]) -> bool:
+        """Guarda CSV escribiendo las filas en streaming (escritura atómica)"""
         try:
-            print(f"      📊 Creando CSV con {len(trans_data)} transacciones...")
-            
-            if not trans_data:
-                return False
-            
-            if self.is_android:
-                # ANDROID: Escribir primero en StringIO
-                from io import StringIO
-                buffer = StringIO()
-                writer = csv.DictWriter(buffer, fieldnames=trans_data[0].keys())
-                writer.writeheader()
-                writer.writerows(trans_data)
-                csv_content = buffer.getvalue()
-                buffer.close()
-                
-                with open(filepath, 'w', encoding='utf-8-sig') as f:
-                    f.write(csv_content)
-                    f.flush()
-                    os.fsync(f.fileno())
-            else:
-                # DESKTOP: MÃ©todo tradicional
-                with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
-                    writer = csv.DictWriter(f, fieldnames=trans_data[0].keys())
-                    writer.writeheader()
-                    writer.writerows(trans_data)
-                    f.flush()
-                    os.fsync(f.fileno())
-            
-            # Verificar inmediatamente
-            import time
-            time.sleep(0.3)
-            
-            if os.path.exists(filepath):
-                size = os.path.getsize(filepath)
-                print(f"      ✅ CSV guardado: {size} bytes")
-                return size > 0
-            else:
-                print(f"      ❌ Archivo no existe después de guardar")
-                return False
+            print(f"      📊 Creando CSV...")
+            
+            count = 0
+
+            def write(f):
+                nonlocal count
+                writer = csv.writer(f)
+                writer.writerow(self.TRANSACTION_HEADERS)
+                for row in trans_rows:
+                    writer.writerow(row)
+                    count += 1
+                if count == 0:
+                    raise ValueError("No hay transacciones para exportar")
+
+            self._write_atomically(
+                filepath, write, mode="w", newline="", encoding="utf-8-sig",
+                buffering=self.CSV_BUFFER_BYTES
+            )
+            
+            size = os.path.getsize(filepath)
+            print(f"      ✅ CSV guardado: {count} transacciones, {size} bytes")
+            return True
                 
+        except JobCancelled:
+            raise
         except Exception as e:
             print(f"      ❌ Error creando CSV: {e}")
             import traceback
             traceback.print_exc()
-            return False
\ No newline at end of file
+            return False
+
+    def _save_columnar(self, filepath: str, trans_rows: Iterable[Tuple], format: str) -> bool:
+        """Guarda Parquet/.npz leyendo el cursor por bloques (escritura atómica)"""
+        try:
+            print(f"      📊 Creando archivo {format}...")
+
+            from src.business import columnar_export
+
+            rows = iter(trans_rows)
+            chunks = iter(lambda: list(islice(rows, self.EXPORT_CHUNK_ROWS)), [])
+            writer = columnar_export.write_parquet if format == "parquet" else columnar_export.write_npz
+            count = 0
+
+            def write(f):
+                nonlocal count
+                count = writer(f, chunks)
+                if count == 0:
+                    raise ValueError("No hay transacciones para exportar")
+
+            self._write_atomically(filepath, write)
+
+            size = os.path.getsize(filepath)
+            print(f"      ✅ {format} guardado: {count} transacciones, {size} bytes")
+            return True
+
+        except JobCancelled:
+            raise
+        except Exception as e:
+            print(f"      ❌ Error creando {format}: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+    def _save_pdf(self, filepath: str, trans_rows: Iterable[Tuple], document: Dict) -> bool:
+        """Guarda el estado de cuenta PDF escribiendo página a página (escritura atómica)"""
+        try:
+            print(f"      📊 Creando PDF...")
+
+            count = 0
+
+            def write(f):
+                nonlocal count
+                count = write_statement(f, document, trans_rows)
+
+            self._write_atomically(filepath, write, verify=self._verify_pdf)
+
+            size = os.path.getsize(filepath)
+            print(f"      ✅ PDF guardado: {count} transacciones, {size} bytes")
+            return True
+
+        except JobCancelled:
+            raise
+        except Exception as e:
+            print(f"      ❌ Error creando PDF: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+
+    def _write_atomically(self, filepath: str, write, verify=None, mode: str = "wb", **open_kwargs):
+        """
+        Escritura durable: temporal en el mismo directorio, fsync y rename
+
+        Si write() o verify() fallan, el temporal se elimina y el destino
+        queda intacto (nunca hay un reporte a medio escribir).
+
+        Args:
+            filepath: Ruta final
+            write: Callable(file) que escribe el contenido
+            verify: Callable(ruta_temporal) que lanza si el archivo es inválido
+            mode: Modo de apertura ("wb" o "w")
+        """
+        directory = os.path.dirname(filepath) or "."
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=os.path.basename(filepath) + ".", suffix=".tmp", dir=directory
+        )
+        try:
+            with os.fdopen(fd, mode, **open_kwargs) as f:
+                write(f)
+                f.flush()
+                os.fsync(f.fileno())
+
+            if os.path.getsize(tmp_path) == 0:
+                raise IOError("Archivo vacío (0 bytes)")
+            if verify:
+                verify(tmp_path)
+
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        # Persistir la entrada del directorio (POSIX)
+        if hasattr(os, "O_DIRECTORY"):
+            try:
+                dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+            except OSError:
+                pass
+
+    def _verify_pdf(self, path: str):
+        """Comprueba la cabecera y el marcador final de un PDF"""
+        with open(path, "rb") as f:
+            header = f.read(5)
+            f.seek(-32, os.SEEK_END)
+            tail = f.read()
+        if header != b"%PDF-" or b"%%EOF" not in tail:
+            raise IOError("PDF incompleto")
+
+    def _verify_xlsx(self, path: str):
+        """
+        Verificación estructural barata: lee solo el directorio central del
+        zip y comprueba que estén las partes mínimas del libro
+
+        Raises:
+            IOError: Si el archivo no es un .xlsx completo
+        """
+        try:
+            with zipfile.ZipFile(path) as zf:
+                names = set(zf.namelist())
+        except zipfile.BadZipFile as e:
+            raise IOError(f"Excel corrupto: {e}")
+
+        missing = [part for part in self.XLSX_REQUIRED_PARTS if part not in names]
+        if missing:
+            raise IOError(f"Excel incompleto, faltan: {', '.join(missing)}")
@@ -0,0 +1,181 @@
+"""
+Estado de cuenta mensual en PDF
+Archivo: src/business/statement_pdf.py
+
+Página 1: resumen, gastos por categoría y tendencia (gráficos PNG ya
+rasterizados). Páginas siguientes: tabla de transacciones, escrita página
+a página mientras se leen las filas del cursor.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, Tuple
+
+from src.business.pdf_writer import PDFWriter, fit_text, text_width
+
+
+MARGIN = 40
+ACCENT = "#667eea"
+MUTED = "#6b7280"
+RULE = "#d1d5db"
+ZEBRA = "#f3f4f6"
+
+CATEGORY_ROW = 18      # Alto de fila del gráfico de categorías (pt)
+TREND_HEIGHT = 120     # Alto del gráfico de tendencia (pt)
+TABLE_ROW = 14         # Alto de fila de la tabla (pt)
+
+# (título, x, ancho máximo) de las columnas de texto de la tabla
+TABLE_COLUMNS = [
+    ("Fecha", MARGIN, 55),
+    ("Descripción", MARGIN + 60, 215),
+    ("Categoría", MARGIN + 280, 110),
+    ("Tipo", MARGIN + 395, 50),
+]
+
+
+def write_statement(f, document: Dict, rows: Iterable[Tuple]) -> int:
+    """
+    Escribe el estado de cuenta completo
+
+    Args:
+        f: Archivo binario abierto
+        document: Contexto de ReportGenerator._build_statement():
+            title, period_label, currency, summary [(etiqueta, valor)],
+            categories [{name, total, percentage}], trend [(mes, ingresos,
+            gastos)], charts {"categories": png, "trend": png}
+        rows: Filas (fecha, descripción, categoría, tipo, monto, notas)
+
+    Returns:
+        int: Transacciones escritas
+    """
+    writer = PDFWriter(f, title=document["title"])
+    _write_summary_page(writer, document)
+    count = _write_transaction_pages(writer, document, rows)
+    writer.close()
+    return count
+
+
+def _footer(page, number: int):
+    page.line(MARGIN, MARGIN, page.width - MARGIN, MARGIN, RULE)
+    page.text(MARGIN, MARGIN - 14, "TermoWallet", 8, color=MUTED)
+    page.text_right(page.width - MARGIN, MARGIN - 14, f"Página {number}", 8, color=MUTED)
+
+
+def _heading(page, y: float, text: str) -> float:
+    page.text(MARGIN, y, text, 13, bold=True)
+    return y - 12
+
+
+def _write_summary_page(writer: PDFWriter, document: Dict):
+    page = writer.new_page()
+    width, right = page.width, page.width - MARGIN
+    currency = document["currency"]
+
+    y = page.height - 60
+    page.text(MARGIN, y, "TermoWallet", 20, bold=True, color=ACCENT)
+    page.text_right(right, y, document["title"], 14, bold=True)
+    y -= 22
+    page.text(MARGIN, y, f"Generado: {datetime.now().strftime('%d/%m/%Y %H:%M')}", 9, color=MUTED)
+    page.text_right(right, y, document["period_label"], 12)
+    y -= 14
+    page.line(MARGIN, y, right, y, RULE)
+
+    # Resumen
+    y -= 32
+    y = _heading(page, y, "Resumen") - 8
+    for label, value in document["summary"]:
+        page.text(MARGIN, y, label, 11)
+        page.text_right(MARGIN + 300, y, value, 11, bold=True)
+        y -= 18
+
+    # Gastos por categoría
+    y -= 16
+    y = _heading(page, y, "Gastos por categoría") - 4
+    categories = document["categories"]
+    if categories:
+        chart_height = len(categories) * CATEGORY_ROW
+        writer.add_png("categories", document["charts"]["categories"])
+        page.image("categories", MARGIN + 150, y - chart_height, 200, chart_height)
+        for i, item in enumerate(categories):
+            baseline = y - i * CATEGORY_ROW - CATEGORY_ROW / 2 - 3.5
+            page.text(MARGIN, baseline, fit_text(item["name"], 10, 145), 10)
+            page.text_right(
+                right, baseline,
+                f"{currency} {item['total']:,.2f}  ({item['percentage']:.1f}%)", 10
+            )
+        y -= chart_height
+    else:
+        y -= 14
+        page.text(MARGIN, y, "Sin gastos en el período", 10, color=MUTED)
+
+    # Tendencia
+    y -= 32
+    y = _heading(page, y, f"Tendencia (últimos {len(document['trend'])} meses)") - 6
+    writer.add_png("trend", document["charts"]["trend"])
+    chart_width = width - 2 * MARGIN
+    page.image("trend", MARGIN, y - TREND_HEIGHT, chart_width, TREND_HEIGHT)
+    y -= TREND_HEIGHT + 12
+
+    slot = chart_width / max(1, len(document["trend"]))
+    for i, (label, income, expenses) in enumerate(document["trend"]):
+        center = MARGIN + slot * i + slot / 2
+        page.text(center - text_width(label, 9) / 2, y, label, 9, color=MUTED)
+
+    y -= 20
+    for offset, (color, label) in enumerate((("#22c55e", "Ingresos"), ("#ef4444", "Gastos"))):
+        x = MARGIN + offset * 90
+        page.rect(x, y - 1, 8, 8, color)
+        page.text(x + 12, y, label, 9)
+
+    _footer(page, writer.page_count + 1)
+    writer.add_page(page)
+
+
+def _write_transaction_pages(writer: PDFWriter, document: Dict, rows: Iterable[Tuple]) -> int:
+    """Tabla de transacciones; cada página se escribe al llenarse"""
+    currency = document["currency"]
+    count = 0
+    page = None
+    y = 0
+
+    for date, description, category, transaction_type, amount, notes in rows:
+        if page is None or y < MARGIN + 20:
+            if page is not None:
+                _footer(page, writer.page_count + 1)
+                writer.add_page(page)
+            page = writer.new_page()
+            y = _table_header(page, document["period_label"])
+
+        if count % 2:
+            page.rect(MARGIN, y - 4, page.width - 2 * MARGIN, TABLE_ROW, ZEBRA)
+
+        values = (date, description or "", category or "", transaction_type)
+        for (_, x, max_width), value in zip(TABLE_COLUMNS, values):
+            page.text(x, y, fit_text(str(value), 9, max_width), 9)
+
+        is_income = transaction_type == "Ingreso"
+        page.text_right(
+            page.width - MARGIN, y,
+            f"{'+' if is_income else '-'}{currency} {amount:,.2f}", 9,
+            color="#15803d" if is_income else "#b91c1c",
+        )
+
+        y -= TABLE_ROW
+        count += 1
+
+    if page is not None:
+        _footer(page, writer.page_count + 1)
+        writer.add_page(page)
+
+    return count
+
+
+def _table_header(page, period_label: str) -> float:
+    """Encabezado de una página de la tabla; devuelve la y de la primera fila"""
+    y = page.height - 50
+    page.text(MARGIN, y, f"Transacciones - {period_label}", 12, bold=True)
+    y -= 22
+    for title, x, _ in TABLE_COLUMNS:
+        page.text(x, y, title, 9, bold=True)
+    page.text_right(page.width - MARGIN, y, "Monto", 9, bold=True)
+    page.line(MARGIN, y - 5, page.width - MARGIN, y - 5, RULE)
+    return y - TABLE_ROW - 4
@@ -3,205 +3,385 @@ Gestor de Base de Datos - VERSIÓN COMPLETA CON LIMPIEZA
 Archivo: src/data/database.py
 """
 
-from sqlalchemy import create_engine, func, extract
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, func, extract, text, event, select, inspect
+from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Iterator, Tuple
 import os
+import re
 import sys
-from sqlalchemy import and_
+from sqlalchemy import and_, or_
 
 # Agregar el directorio raíz del proyecto al path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.data.models import Base, Category, Transaction, MonthlyBudget
+from src.data.models import (
+    Base, Category, Transaction, MonthlyBudget, ImportProfile, ExportCursor,
+    TransactionRecord,
+)
 from src.utils.config import Config
+from src.data import seed
+from src.data.write_queue import WriteQueue
 
 
 class DatabaseManager:
-    """Gestor principal de la base de datos"""
+    """
+    Gestor principal de la base de datos
+
+    Contrato de hilos:
+    - self.session es de la UI: solo se usa desde los manejadores de
+      eventos de las vistas, nunca desde un BackgroundJob.
+    - Los hilos en segundo plano usan su propia sesión: session_scope()
+      para una unidad de trabajo, read_session() para lecturas o
+      thread_session() (liberándola con release_thread_session(); así
+      trabaja AuthManager durante el login).
+    - Los objetos ORM no se pasan entre hilos; se pasan ids o registros
+      (TransactionRecord).
+    - Todas las mutaciones de datos del usuario (transacciones, categorías
+      y sus keywords, presupuestos, limpiezas, formatos de importación,
+      cursores de exportación y la importación masiva) pasan por
+      write_queue: un único hilo escritor que agrupa commits.
+      Excepciones: la inicialización y migración del esquema al arrancar
+      (antes de que exista la cola) y AuthManager, que escribe en su
+      thread_session() con el bloqueo de SQLite (BEGIN IMMEDIATE).
+    - Las conexiones vienen de un pool del engine. Las lecturas no abren
+      transacción (WAL: nunca esperan a un escritor) y la primera escritura
+      abre BEGIN IMMEDIATE: un solo escritor a la vez, los demás esperan
+      en la cola de SQLite hasta BUSY_TIMEOUT_SECONDS.
+    """
+
+    # Espera máxima de un escritor por el bloqueo de escritura (segundos)
+    BUSY_TIMEOUT_SECONDS = 30
 
     def __init__(self, db_path: Optional[str] = None):
         """Inicializa la conexión a la base de datos"""
         self.db_path = db_path or Config.get_db_path()
-        self.engine = create_engine(f"sqlite:///{db_path}", echo=False)
+        self.engine = create_engine(
+            f"sqlite:///{self.db_path}",
+            echo=False,
+            connect_args={
+                "check_same_thread": False,
+                "timeout": self.BUSY_TIMEOUT_SECONDS,
+            },
+        )
+        self._configure_sqlite_transactions()
+        self._configure_data_version()
         Base.metadata.create_all(self.engine)
 
         Session = sessionmaker(bind=self.engine)
+        self.session_factory = Session
+        # Sesiones por hilo para tareas en segundo plano (thread_session)
+        self.scoped_sessions = scoped_session(Session)
+        # Sesión de la UI (los objetos de las vistas viven aquí)
         self.session = Session()
+        # Escritor único con group commit (se inicia con la primera escritura)
+        self._write_queue: Optional[WriteQueue] = None
+        # ¿Existe el índice FTS5? (ver _has_search_index)
+        self._search_index: Optional[bool] = None
 
-        # Inicializar categorías por defecto si es primera vez
-        self._initialize_default_categories()
-        
-        # ✅ NUEVO: Inicializar palabras clave después de categorías
-        self._initialize_default_keywords()
+        # ✅ NUEVO: Migrar columnas/índices en bases de datos existentes
+        self._migrate_schema()
+
+        # Categorías y palabras clave por defecto (solo si cambió SEED_VERSION)
+        self._seed_defaults()
     
         print("✅ Base de datos inicializada con categorías y palabras clave")
         
         
 
-    def _initialize_default_categories(self):
-        """Crea categorías predeterminadas si no existen"""
-        if self.session.query(Category).count() == 0:
-            default_categories = [
-                # Categorías de Gastos
-                Category(
-                    name="Alimentación",
-                    icon="🍔",
-                    color="#ef4444",
-                    category_type="expense",
-                    is_default=True,
-                    description="Comida, supermercado",
-                ),
-                Category(
-                    name="Transporte",
-                    icon="🚗",
-                    color="#f97316",
-                    category_type="expense",
-                    is_default=True,
-                    description="Uber, gasolina, taxi, bus",
-                ),
-                Category(
-                    name="Entretenimiento",
-                    icon="🎮",
-                    color="#a855f7",
-                    category_type="expense",
-                    is_default=True,
-                    description="Cine, streaming, juegos",
-                ),
-                Category(
-                    name="Servicios",
-                    icon="💡",
-                    color="#eab308",
-                    category_type="expense",
-                    is_default=True,
-                    description="Luz, agua, internet, teléfono",
-                ),
-                Category(
-                    name="Salud",
-                    icon="⚕️",
-                    color="#22c55e",
-                    category_type="expense",
-                    is_default=True,
-                    description="Farmacia, doctor, clínica",
-                ),
-                Category(
-                    name="Educación",
-                    icon="📚",
-                    color="#3b82f6",
-                    category_type="expense",
-                    is_default=True,
-                    description="Cursos, libros, universidad",
-                ),
-                Category(
-                    name="Vivienda y equipos",
-                    icon="🏠",
-                    color="#84cc16",
-                    category_type="expense",
-                    is_default=True,
-                    description="Alquiler, reparaciones, mantenimiento",
-                ),
-                Category(
-                    name="Vestimenta",
-                    icon="🛍️",
-                    color="#ec4899",
-                    category_type="expense",
-                    is_default=True,
-                    description="Ropa, zapatos, accesorios",
-                ),
-                
-                Category(
-                    name="Comunicaciones",
-                    icon="📱",
-                    color="#6648ec",
-                    category_type="expense",
-                    is_default=True,
-                    description="Telfonía, Internet, Cable",
-                ),
-                
-                Category(
-                    name="Restaurantes y gastronomía",
-                    icon="🍽️",
-                    color="#ec9a48",
-                    category_type="expense",
-                    is_default=True,
-                    description="Restaurantes, comida ambulante, gastronomía",
-                ),
-                
-                Category(
-                    name="Hospedaje y viajes",
-                    icon="✈️",
-                    color="#15a8d0",
-                    category_type="expense",
-                    is_default=True,
-                    description="Hoteles y viajes",
-                ),
-                
-                Category(
-                    name="Vicios y hobbies",
-                    icon="🎲",
-                    color="#15a8d0",
-                    category_type="expense",
-                    is_default=True,
-                    description="Alcohol, tabaco, juegos, hobbies",
-                ),
-                
-                Category(
-                    name="Higiene/Cuidado personal",
-                    icon="🧼",
-                    color="#b4e3f0",
-                    category_type="expense",
-                    is_default=True,
-                    description="Higiene, cuidado personal, belleza",
-                ),
-                
-                Category(
-                    name="Otros Gastos",
-                    icon="💸",
-                    color="#6b7280",
-                    category_type="expense",
-                    is_default=True,
-                    description="Gastos varios",
-                ),
-                
-                
-                
-                # Categorías de Ingresos
-                Category(
-                    name="Salario",
-                    icon="💰",
-                    color="#10b981",
-                    category_type="income",
-                    is_default=True,
-                    description="Sueldo mensual",
-                ),
-                Category(
-                    name="Freelance",
-                    icon="💼",
-                    color="#06b6d4",
-                    category_type="income",
-                    is_default=True,
-                    description="Trabajos independientes",
-                ),
-                Category(
-                    name="Inversiones",
-                    icon="📈",
-                    color="#8b5cf6",
-                    category_type="income",
-                    is_default=True,
-                    description="Dividendos, intereses",
-                ),
-                Category(
-                    name="Otros Ingresos",
-                    icon="💵",
-                    color="#14b8a6",
-                    category_type="income",
-                    is_default=True,
-                    description="Ingresos varios",
-                ),
+    # Sentencias que escriben (o abren un savepoint): inician la transacción
+    _WRITE_STATEMENT_RE = re.compile(
+        r"^\s*(?:INSERT|UPDATE|DELETE|REPLACE|SAVEPOINT|CREATE|DROP|ALTER)\b",
+        re.IGNORECASE,
+    )
+
+    def _configure_sqlite_transactions(self):
+        """
+        Transacciones de SQLite: lecturas sin bloqueo, un solo escritor
+
+        pysqlite abre transacciones de forma implícita y no soporta bien
+        SAVEPOINT: el primer RELEASE confirmaría todo. Por eso la conexión
+        queda en autocommit y la transacción se abre a mano con
+        BEGIN IMMEDIATE justo antes de la primera escritura (o SAVEPOINT),
+        así begin_nested() crea savepoints reales dentro de una sola
+        transacción.
+
+        - Las lecturas previas no mantienen una instantánea abierta: ven
+          lo último confirmado y nunca fallan al pasar a escritura por una
+          instantánea vieja (SQLITE_BUSY_SNAPSHOT).
+        - BEGIN IMMEDIATE toma el bloqueo de escritura al empezar; si otro
+          hilo está escribiendo, espera (busy timeout) en lugar de fallar
+          con "database is locked" a mitad de la transacción.
+        - journal_mode=WAL: los lectores no bloquean al escritor ni al revés.
+        """
+        @event.listens_for(self.engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+            dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+        @event.listens_for(self.engine, "before_cursor_execute")
+        def _on_before_execute(conn, cursor, statement, parameters, context, executemany):
+            if not cursor.connection.in_transaction and self._WRITE_STATEMENT_RE.match(statement):
+                cursor.execute("BEGIN IMMEDIATE")
+
+    # Sentencias que modifican datos que muestran reportes y vistas: las
+    # transacciones y las categorías (nombre, icono y color de cada fila)
+    _VERSIONED_WRITE_RE = re.compile(
+        r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|UPDATE|DELETE\s+FROM)\s+\"?(?:transactions|categories)\"?\b",
+        re.IGNORECASE,
+    )
+
+    def _configure_data_version(self):
+        """
+        Versión de datos de transacciones y categorías (tabla data_versions)
+
+        Cualquier escritura sobre transactions o categories (ORM, Core o SQL
+        textual, en cualquier sesión) marca la conexión; al confirmar se
+        incrementa el contador una sola vez, dentro de la misma transacción.
+        Un rollback descarta la marca. Es más barato que un trigger por fila
+        en las importaciones masivas.
+        """
+        @event.listens_for(self.engine, "after_cursor_execute")
+        def _on_execute(conn, cursor, statement, parameters, context, executemany):
+            if self._VERSIONED_WRITE_RE.match(statement):
+                conn.info["data_changed"] = True
+
+        @event.listens_for(self.engine, "commit")
+        def _on_commit(conn):
+            if conn.info.pop("data_changed", False):
+                conn.exec_driver_sql(
+                    "UPDATE data_versions SET version = version + 1 WHERE name = 'transactions'"
+                )
+
+        @event.listens_for(self.engine, "rollback")
+        def _on_rollback(conn):
+            conn.info.pop("data_changed", None)
+
+    def get_data_version(self, session=None) -> int:
+        """
+        Versión actual de los datos de transacciones y categorías
+
+        Cambia con cada commit que escribe transacciones o categorías; sirve
+        como clave de caché (p. ej. ReportCache, la lista de HistoryView).
+
+        Args:
+            session: Sesión a usar (default: self.session)
+        """
+        version = (session or self.session).execute(
+            text("SELECT version FROM data_versions WHERE name = 'transactions'")
+        ).scalar()
+        return version or 0
+
+    # Versión del esquema: incrementar al agregar un paso a _migrate_schema
+    SCHEMA_VERSION = 3
+
+    def get_meta(self, key: str, session=None) -> Optional[str]:
+        """Lee un valor de la tabla meta (None si no existe)"""
+        return (session or self.session).execute(
+            text("SELECT value FROM meta WHERE key = :key"), {"key": key}
+        ).scalar()
+
+    def set_meta(self, key: str, value, session=None):
+        """Guarda un valor en la tabla meta y confirma"""
+        session = session or self.session
+        session.execute(
+            text(
+                "INSERT INTO meta (key, value) VALUES (:key, :value) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value"
+            ),
+            {"key": key, "value": str(value)},
+        )
+        session.commit()
+
+    def _migrate_schema(self):
+        """
+        Agrega la columna fingerprint y su índice UNIQUE en bases de datos
+        creadas antes de la detección de duplicados.
+
+        Las transacciones importadas previamente reciben su huella; si ya
+        existían duplicados, solo la primera ocurrencia conserva la huella.
+
+        Si meta.schema_version ya es SCHEMA_VERSION no se revisa nada.
+        """
+        try:
+            self.session.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS meta ("
+                    "key VARCHAR(50) PRIMARY KEY, value TEXT NOT NULL)"
+                )
+            )
+            if self.get_meta("schema_version") == str(self.SCHEMA_VERSION):
+                self.session.commit()
+                return
+
+            columns = [
+                row[1]
+                for row in self.session.execute(text("PRAGMA table_info(transactions)"))
             ]
 
-            self.session.add_all(default_categories)
+            previous_version = int(self.get_meta("schema_version") or 0)
+            if "fingerprint" not in columns:
+                print("🔧 Migrando esquema: agregando columna fingerprint...")
+                self.session.execute(
+                    text("ALTER TABLE transactions ADD COLUMN fingerprint VARCHAR(64)")
+                )
+            if previous_version < 3:
+                # v3: la huella incluye el tipo de transacción
+                self._backfill_fingerprints()
+
+            self.session.execute(
+                text(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS ix_transactions_fingerprint "
+                    "ON transactions (fingerprint)"
+                )
+            )
+
+            # Contador de versión de datos (ver _configure_data_version).
+            # Empieza en el instante de creación (ms): una BD recreada no
+            # repite versiones ya guardadas en cachés externas.
+            self.session.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS data_versions ("
+                    "name VARCHAR(50) PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0)"
+                )
+            )
+            self.session.execute(
+                text("INSERT OR IGNORE INTO data_versions (name, version) VALUES ('transactions', :seed)"),
+                {"seed": int(datetime.now().timestamp() * 1000)},
+            )
+
+            self._migrate_search_index()
+
+            self.set_meta("schema_version", self.SCHEMA_VERSION)
+            print(f"✅ Esquema en versión {self.SCHEMA_VERSION}")
+
+        except Exception as e:
+            print(f"⚠️ Error al migrar esquema: {e}")
+            self.session.rollback()
+
+    def _backfill_fingerprints(self):
+        """
+        (Re)calcula la huella de las transacciones importadas
+
+        Si hay duplicados, solo la primera ocurrencia conserva la huella.
+        Las huellas previas se borran antes para no chocar con el índice
+        UNIQUE mientras se reasignan.
+        """
+        seen = set()
+        imported = self.session.execute(
+            text(
+                "SELECT id, date, amount, original_description, description, "
+                "transaction_type FROM transactions "
+                "WHERE source = 'imported' OR fingerprint IS NOT NULL ORDER BY id"
+            )
+        ).fetchall()
+        self.session.execute(text("UPDATE transactions SET fingerprint = NULL"))
+
+        updates = []
+        for row_id, date, amount, original_desc, desc, transaction_type in imported:
+            if isinstance(date, str):
+                date = datetime.fromisoformat(date)
+            fingerprint = Transaction.compute_fingerprint(
+                date, amount, original_desc or desc, transaction_type=transaction_type
+            )
+            if fingerprint in seen:
+                continue
+            seen.add(fingerprint)
+            updates.append({"id": row_id, "fp": fingerprint})
+
+        if updates:
+            self.session.execute(
+                text("UPDATE transactions SET fingerprint = :fp WHERE id = :id"),
+                updates,
+            )
+        print(f"  ✅ {len(updates)} transacciones importadas con huella")
+
+    # Columnas de transactions indexadas para búsqueda de texto
+    _SEARCH_COLUMNS = ("description", "original_description", "notes")
+
+    def _migrate_search_index(self):
+        """
+        Índice FTS5 de búsqueda (tabla transactions_fts)
+
+        Tabla de contenido externo: solo guarda el índice y lee el texto de
+        transactions. Tres triggers la mantienen al día con cada INSERT,
+        DELETE o UPDATE de las columnas indexadas, sin importar la sesión
+        ni si la escritura es ORM, Core o SQL textual. El tokenizador
+        unicode61 con remove_diacritics ignora tildes y mayúsculas.
+
+        Si SQLite no tiene FTS5, search_transactions usa LIKE.
+        """
+        columns = ", ".join(self._SEARCH_COLUMNS)
+        new_values = ", ".join(f"new.{c}" for c in self._SEARCH_COLUMNS)
+        old_values = ", ".join(f"old.{c}" for c in self._SEARCH_COLUMNS)
+
+        try:
+            with self.session.begin_nested():
+                exists = self.session.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE name = 'transactions_fts'")
+                ).scalar()
+
+                self.session.execute(text(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5("
+                    f"{columns}, content='transactions', content_rowid='id', "
+                    f"tokenize='unicode61 remove_diacritics 2')"
+                ))
+                self.session.execute(text(
+                    f"CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions BEGIN "
+                    f"INSERT INTO transactions_fts(rowid, {columns}) VALUES (new.id, {new_values}); END"
+                ))
+                self.session.execute(text(
+                    f"CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN "
+                    f"INSERT INTO transactions_fts(transactions_fts, rowid, {columns}) "
+                    f"VALUES ('delete', old.id, {old_values}); END"
+                ))
+                self.session.execute(text(
+                    f"CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE OF {columns} "
+                    f"ON transactions BEGIN "
+                    f"INSERT INTO transactions_fts(transactions_fts, rowid, {columns}) "
+                    f"VALUES ('delete', old.id, {old_values}); "
+                    f"INSERT INTO transactions_fts(rowid, {columns}) VALUES (new.id, {new_values}); END"
+                ))
+
+                if not exists:
+                    print("🔧 Migrando esquema: indexando transacciones para búsqueda...")
+                    self.session.execute(
+                        text("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')")
+                    )
+        except Exception as e:
+            print(f"⚠️ Búsqueda de texto completo no disponible: {e}")
+
+    def _seed_defaults(self):
+        """
+        Siembra categorías y palabras clave por defecto solo si la versión
+        de los datos iniciales (seed.SEED_VERSION) cambió: en un arranque
+        normal es una sola lectura de meta y no se lee default_seed.json.
+        """
+        if self.get_meta("seed_version") == str(seed.SEED_VERSION):
+            return
+
+        print(f"🌱 Sembrando datos iniciales (versión {seed.SEED_VERSION})...")
+        self._initialize_default_categories()
+        if self._initialize_default_keywords():
+            self.set_meta("seed_version", seed.SEED_VERSION)
+
+    def _initialize_default_categories(self):
+        """
+        Crea las categorías predeterminadas que falten (desde default_seed.json)
+
+        Se comparan por nombre y tipo: en una BD nueva se crean todas y al
+        subir SEED_VERSION solo se agregan las nuevas.
+        """
+        existing = set(self.session.query(Category.name, Category.category_type))
+        missing = [
+            data for data in seed.default_categories()
+            if (data["name"], data["category_type"]) not in existing
+        ]
+        if missing:
+            self.session.add_all([Category(is_default=True, **data) for data in missing])
             self.session.commit()
+            print(f"✅ {len(missing)} categorías predeterminadas creadas")
 
     """
     AGREGAR ESTOS MÉTODOS A DatabaseManager EN database.py
@@ -212,288 +392,13 @@ class DatabaseManager:
         """
         ✅ ACTUALIZADO: Inicializa palabras clave por defecto en categorías predeterminadas
         Se ejecuta automáticamente después de crear las categorías
+
+        Agrega a cada categoría las palabras clave por defecto que le falten
+        (conserva las que el usuario agregó).
+
+        Returns:
+            bool: True si terminó sin errores
         """
-        # Diccionario de palabras clave por defecto para GASTOS
-        default_expense_keywords = {
-            "Alimentación": [
-                "gr" ," kg ", " kilo ", "kilogramo", "kilogramos", "frutas y verduras",
-                "aceite de cocina", "acelga (criolla/serrana)", "agua", "aguaje", "aji amarillo seco", 
-                "aji escabeche fresco", "aji montaña", "aji paprika", "aji rocoto", "ajo", 
-                "ajo criollo", "ajo morado", "albahaca", "albaricoque", "alcachofa", "almuerzo", "atun"
-                "antojito", "antojitos", "apio", "arroz", "arveja verde", "atun", "azúcar", 
-                "bakery", "bases en sobre", "batido", "bebida", "beber", "bembos", "berenjena", 
-                "beterraga", "bodega", "brocoli", "butcher", "caigua", "camote", "camu camu", 
-                "carambola", "carne de res", "carniceria", "cebolla", "cebolla china", "cereales", 
-                "chifles", "chirimoya", "chizitos", "chocolate", "chocolateria", 
-                "chocolates", "chocolates y dulces", "choclo", "chuño", "ciruela", "coco", 
-                "cocona", "col china", "col corazon", "coliflor", "comida", "coronta de maíz", 
-                "culantro", "drink", "dulceria", "empanada", "esparrago fresco", "especias", 
-                "espinaca", "fideos", "food", "frejol", "frejolito chino", "fresa", "frijol", 
-                "frijol verde", "frozen yogurt", "frutas", "frutas tropicales", "galletas", 
-                "galletas dulces", "galletas saladas", "gaseosa", "golosina", "golosinas", 
-                "granadilla", "granada", "guanabana", "grocery", "haba verde", "harina", 
-                "hierba buena", "higo", "holantau", "horganica", "hortalizas", "hortalizas de fruto", 
-                "hortalizas de hoja o de tallo", "hortalizas de raíz", "hortalizas leguminosas verdes", 
-                "hot dog", "hotdog", "huacatay", "huevos", "juice", "jugo", "kion", "kiwi", 
-                "leche", "lechuga americana (criolla/serrana)", "lechuga criolla seda", 
-                "lechuga romana hidropónica", "lenteja", "lima", "limon", "longapa", "lunch", 
-                "lúcuma", "maiz marlo", "maiz morado", "mamey", "mandarina", "mango", "manzana", 
-                "maracuyá", "market", "mass", "membrillo", "melon", "melon coquito", "melones", 
-                "melocotón", "mercado", "metro", "milk", "nabo", "nachos", "naranja", "nueces", 
-                "olluco", "pacchoy", "palta", "pallar verde", "panaderia", "panes y derivados", 
-                "papa", "papa fritas", "papas a la francesa", "papas fritas", "papaya", "pepinillo", 
-                "pepino", "pera", "perejil", "pescado", "picarones", "pimiento", "piqueo", 
-                "piqueos", "piña", "platano", "plaza vea", "pollo", "poro", "rabanito", "refresco", 
-                "refrescos", "restaurant", "salchipapa", "salchipapas", "salsas", "sandwich", 
-                "sanguches", "sandia", "sazonadores", "smoothie", "snack", "snacks", "soda", 
-                "spaguetti", "supermercado", "tamarindo", "tienda", "tomate", "toronja", "tottus", 
-                "tuna", "uva", "vainita", "vegetales", "verduras", "water", "wong", "yacon", 
-                "yogur", "yogurt", "yuca", "zapallo", "zapallo italiano", "zapallo loche", 
-                "zapallo macre", "zanahoria", "zumo", "venturo", "Molitalia", "D'onofrio"
-                "costilla", "lomo", "pulpa de res", "carne molida", "bife", "asado", "chuleta",
-                "filete", "bistec", "entraña", "picanha", "churrasco", "roast beef", "benoti", "laive","ecco",
-                "Hamburguesa de pollo", "Pechuga de pollo", "Muslo de pollo", "Alitas de pollo",
-                "angel", "cereal", "granola", "muesli", "yogurt griego", "yogur griego"
-                "canela", "clavo de olor", "comino", "nuez moscada", "pimienta", "oregano", "romero",
-                "tomillo", "vainilla","aj-no-men","ajinomoto","sazonador maggi"
-                "aceituna", "aceitunas", "almendra", "anona", "avena", "baya", "costeño","plátano","Cabello de angel"
-                "Incasur", "sol del cusco", "san fernando", "don victoria", "laive","gloria","pascual","nestle"
-                "maracuya", "maracuya", "frambuesa", "arándano", "arándanos", "blueberry", "fresa", "frutilla"
-                "avena" , "mostaza", "ketchup", "mayonesa", "salsa de soja", "salsa inglesa", "aderezo"
-                "bondiola", "jamon", "jamón", "salchicha", "salchichón", "mortadela", "pepperoni", "chorizo"
-                "lechuga", "espinaca", "rúcula", "berro", "acelga", "canónigos", "radicchio", "endibia"
-                "Mc colin's anis", "Mc colin's hierba luisa", "Mc colin's manzanilla", "Mc colin's menta",  "Mc colin's boldo"
-                "lomo fino", "lomo saltado", "aji limo", "aji mirasol", "aji charapita", "aji panca"
-            ],
-            "Transporte": [
-                "uber", "taxi", "cabify","beat", "gasolina", "gas", "petroleo",
-                "grifo", "station", "parking", "estacionamiento", "peaje", "toll",
-                "bus", "metro", "tren", "train", "vuelo", "flight", "avianca",
-                "latam", "transporte", "transport", "movilidad", "pasaje", "ticket",
-                "combustible", "fuel", "mecanico", "mechanic", "repuesto", "llanta",
-                "tire", "revision", "tecnica" , "Metropolitano" 
-            ],
-            "Entretenimiento": [
-                "cine", "cinema", "movie", "netflix", "spotify", "amazon prime",
-                "disney", "hbo", "steam", "playstation", "xbox", "nintendo", "juego",
-                "game", "concierto", "concert", "teatro", "theater", "club",
-                "discoteca", "disco", "bar", "karaoke", "bowling", "gimnasio", "gym",
-                "deporte", "sport", "entrada", "ticket", "suscripcion",
-                "subscription", "youtube", "twitch",
-                "pelicula", "film", "videojuego", "gaming", "partido", "match",
-                "evento", "event", "festival", "festival de musica", "stand up",
-                "comedia", "comedy", "museo", "museum", "exposicion", "exhibition"  
-                
-            ],
-            "Servicios": [
-                "luz", "electricity", "agua", "water", "internet", "telefono",
-                "phone", "celular", "mobile", "cable", "tv", "netflix", "sedapal",
-                "enel", "luz del sur", "claro", "movistar", "entel", "bitel", "gas",
-                "natural", "mantenimiento", "maintenance", "reparacion", "repair",
-                "limpieza", "cleaning", "lavanderia", "laundry", "tintoreria",
-                "peluqueria", "salon", "barberia"
-            ],
-            "Salud": [
-                "analisis", "botica", "clinic", "clinica", "consulta", "consulta particular", 
-                "consultation", "dentist", "dentista", "doctor", "exam", "examen", "farmacia", 
-                "glasses", "hospital", "inkafarma", "laboratory", "laboratorio", "lentes", 
-                "medicina", "medicine", "medico", "mifarma", "odontologo", "optica", 
-                "pastilla", "pharmacy", "pill", "terapia", "therapy", "vitamin", "vitamina"
-                "Banda adhesiva", "Betadine", "Curitas", "Desenfriol", "Dolex", "Ibuprofeno",
-            ],
-            "Educación": [
-                "academia", "ADEX", "Alas Peruanas", "AprendeLibre", "book", "bookstore", 
-                "capacitacion", "Cayetano Heredia", "CENFOTEC", "certification", "certificacion", 
-                "César Vallejo", "CIBERTEC", "class", "clase", "colegio", "colegio primaria", 
-                "colegio secundaria", "course", "curso", "Crehana", "cuota", "Cursera", 
-                "Domestika", "estudios", "IDAT", "IESTP", "INFOCAP", "institute", "Instituto", 
-                "Instituto continental", "ISAT", "ISIL", "libreria", "libro", "materiales", 
-                "matricula", "mensualidad", "pension", "school", "SENATI", "SISE", "supplies", 
-                "tesis", "training", "tuition", "UCSP", "UCSM", "UCV", "UNALM", "UNE", 
-                "UNFV", "UNI", "UNMSM", "universidad", "university", "Universidad Nacional del Callao", 
-                "Universidad privada", "Universidad pública", "UNTELS", "UPN", "utiles", "UTP"
-            ],
-            "Vivienda": [
-                "aire acondicionado", "albanil", "albañil", "alicates", "alfombra", 
-                "alquiler", "apartment", "arrendamiento", "aspiradora", "bombilla", 
-                "cafetera", "calentador", "cama", "casa", "clavos", "cocina", "colchón", 
-                "condominio", "constructor", "copas", "cómoda", "cortinas", "cuadro", 
-                "cubiertos", "decoracion", "decoración", "departamento", "destornillador", 
-                "electrician", "electricista", "electrodomésticos", "enseres", "equipo de sonido", 
-                "equipos", "escalera", "escritorio", "espejo", "estante", "estufa", 
-                "ferreteria", "ferretería", "foco", "furniture", "gasfitero", "hardware", 
-                "herramientas", "hielera", "hipoteca", "hogar", "iluminación", "inmobiliaria", 
-                "jardinería", "lámpara", "lavadora", "licuadora", "librero", "limpieza", 
-                "llave inglesa", "mantenimiento", "martillo", "menajería", "mesa", 
-                "microondas", "mueble", "muebles", "ollas", "paint", "parlante", "pintado", 
-                "pintura", "platos", "plumber", "pyrex", "refrigeradora", "rent", "renta", 
-                "reparacion", "reparaciones", "ropero", "sartenes", "secadora", "silla", 
-                "sillón", "sofá", "taladro", "táper", "terma", "televisor", "tornillos", 
-                "utensilios", "vajilla", "vasos", "ventilador", "vivienda"
-                "clavos", "tornillos", "bisagras", "cemento", "arena", "ladrillos", "bloques",
-                "yeso", "pintura", "pintura impermeabilizante", "sellador", "poliuretano",
-                "pintura acrílica", "pintura esmalte", "pintura epóxica", "pintura vinílica",
-                "pintura látex", "pintura sintética", "pintura texturada"
-                
-            ],
-            "Vestimenta": [
-                "abrigo", "accesorio", "accesorios", "accessory", "amazon", "anillo", 
-                "aretes", "arreglo", "bañador", "bata", "bermuda", "bikini", "billetera", 
-                "blusa", "bolso", "botas", "botines", "boutique", "bóxer", "brasier", 
-                "bufanda", "buzo", "calcetines", "calzado", "calzoncillo", "camisa", 
-                "camiseta", "cartera", "casaca", "chaleco", "chaqueta", "chompa", 
-                "cinturón", "clothes", "collar", "corbata", "correa", "costura", "denim", 
-                "deporte", "ebay", "enterizo", "entrenamiento", "falabella", "falda", 
-                "forever21", "gafas", "gift", "gorra", "gorro", "guantes", "gym", "h&m", 
-                "jean", "jewelry", "jockey", "joya", "joyas", "joyería", "lavandería", 
-                "leggings", "lentes", "makeup", "mall", "mantenimiento", "medias", 
-                "mercadolibre", "moccasines", "mochila", "moda", "natación", "oechsle", 
-                "outfit", "pantalón", "pantuflas", "paris", "pijama", "plaza", "polera", 
-                "polo", "prenda", "pulsera", "real plaza", "regalo", "reloj", "ripley", 
-                "ropa", "ropa deportiva", "ropa interior", "saco", "saga", "sandalias", 
-                "sastre", "sastrería", "shoes", "short", "sombrero", "sostén", "store", 
-                "suéter", "tacos", "terno", "textil", "tienda", "tintorería", "traje", 
-                "truza", "vestido", "vestimenta", "vestir", "watch", "zapatillas", 
-                "zapatero", "zapateria", "zapatos", "zara"
-            ],
-
-            "Comunicaciones": [ 
-                "cable", "celular", "internet", "mobile", "phone", "telefono",
-                "tv", "telfonía", "claro", "entel", "bitel", "movistar", "starlink",
-                "cablevisión", "directv", 
-                "fibertel", "telecom", "telefonía", "telefonía móvil", "telefonía fija"
-            ],
-            
-            "Restaurantes y gastronomía": [
-                "alfresco", "almuerzo", "anticuchería", "anticuchos", "antojito", "asado", 
-                "bacán", "bar", "barra cevichera", "beber", "bembos", "blanca flor", 
-                "bodega", "breakfast", "burger", "burger king", "butifarra", "caminos del inca", 
-                "capriccio", "carl's jr", "carrito", "cebichería", "cevicheria", "ceviche", 
-                "chicha", "chicha morada", "chifa", "china wok", "chinawok", "chicharrones", 
-                "churros", "comida ambulante", "cena", "cerveza", "chicken", "d'onofrio", 
-                "delivery", "desayuno", "desayuno al paso", "didi food", "dinner", 
-                "domino's", "domo saltado", "don belisario", "donas", "donofrio", 
-                "donuts", "doomo saltado", "drink", "dunkin", "el buen gusto", "el chinito", 
-                "el muelle", "el pez on", "emoliente", "emolientero", "empanada", 
-                "empanadas", "empanadas paulistas", "food truck", "galletas", "grimanesa", 
-                "hamburguesa", "hamburguesería", "helados", "hikari", "ice cream", 
-                "jockey plaza", "kentucky", "kfc", "kiosko", "la casa de las empanadas", 
-                "la ibérica", "la iberica", "la leña", "la lucha", "la panca", "la rambla", 
-                "larcomar", "las canastas", "leche de tigre", "listo", "little caesars", 
-                "lunch", "macuca", "mall aventura", "mall del sur", "marisquería", 
-                "mcdonald's", "mcdonalds", "mediterraneo", "megaplaza", "mi barrunto", 
-                "minka", "minimarket", "munchis", "niqqu", "norky", "norkys", "open plaza", 
-                "otto grill", "oxxo", "pan con chicharrón", "papa john's", "papa rellena", 
-                "pardos chicken", "pasquale", "pecsa", "pedidosya", "perros y papas", 
-                "pescados capitales", "picanteria", "picarones", "piqueo", "piqueos", 
-                "pizza", "pizza hut", "plaza norte", "plaza san miguel", "pollo", 
-                "pollo a la brasa", "polleria", "popeyes", "pub", "punto azul", "puruchuco", 
-                "quiosco", "quinua", "rappi", "real plaza", "repsol shop", "restaurant", 
-                "rockys", "salaverry", "salchipapa", "salchipapas", "sanguchería", 
-                "sanguche", "sanguches", "santa anita", "sarita", "starbucks", "subway", 
-                "sushi", "taco bell", "tamales", "tambo", "terminal pesquero", 
-                "tía grimanesa", "tienda", "tío bobby", "villa chicken", "viva", "vlady"
-                "pyc", "turroncito", "turron","chocotejas", "la iberica", "helados baskin robbins"
-            ],
-            
-            "Hospedaje y viajes": [
-                "aeropuerto", "airbnb", "albergue", "alojamiento", "asia", "backpackers", 
-                "boleto", "booking", "cama", "canta", "churín", "cial", "clase ejecutiva", 
-                "costamar", "cruz del sur", "cusco", "despegar", "equipaje", "estancia", 
-                "excursión", "expedia", "full day", "habitación", "hospedaje", "hostal", 
-                "hotel", "inca rail", "itssa", "jetsmart", "jorge chávez", "lap", "latam", 
-                "lunahuaná", "machu picchu", "mancora", "motel", "móvil bus", "nuevo mundo", 
-                "oltursa", "paracas", "pasaje", "peru rail", "perubus", "posada", "redbus", 
-                "resort", "sky", "soyuz", "star perú", "suite", "tarapoto", "tepsa", 
-                "tour", "trivago", "turismo", "vacaciones", "viaje", "viva air", "vuelo"
-                
-            ],
-            
-            "Vicios y hobbies": [
-                "cerveza", "beer", "alcohol", "tabaco", "juegos", "hobbies",
-                "apuestas", "atlantic city", "bar", "betano", "betsson", "cartavio", 
-                "casino", "cerveza", "cigarro", "cigarrillo", "cocktail", "corona", 
-                "cristal", "cusqueña", "discoteca", "encendedor", "fiesta casino", 
-                "flor de caña", "ganadiario", "gin", "hamilton", "heineken", "inkabet", 
-                "inkabet", "johnnie walker", "licor", "lotería", "lucky strike", 
-                "majestic", "marlboro", "pilsen", "pisco", "queirolo", "ron", 
-                "tabaco", "tabernero", "tacama", "te apuesto", "tinka", "vape", 
-                "vapeador", "vino", "vodka", "whisky"
-                
-            ],
-            
-            "Higiene/Cuidado personal": [
-                "acondicionador", "afeitado", "algodón", "amarige", "aruma", "aussie", "avené", 
-                "avene", "avon", "axe", "babysec", "barba", "barber shop", "barbería", 
-                "belcorp", "belleza", "bioderma", "biogreen", "botica", "boticas perú", 
-                "burt's bees", "calvin klein", "cantu", "carefree", "carol's daughter", 
-                "cepa menstrual", "cepillo", "cerave", "cetaphil", "champú", "clean & clear", 
-                "clínica", "clinique", "colgate", "copa menstrual", "cortaúñas", "crema", 
-                "cuidado personal", "cyzone", "dentito", "dentífrico", "depilación", 
-                "desodorante", "dove", "dove men+care", "dr. bronner's", "e.l.f. cosmetics", 
-                "efasit", "elite", "elvive", "enjuague bucal", "ésika", "esika", "essence", 
-                "especialista", "eucerin", "farmacia", "fenty beauty", "garnier", "gillette", 
-                "glossier", "gnc", "h&s", "head & shoulders", "herbal essences", "herbivore", 
-                "hies", "higiene", "higiene femenina", "hinds", "huggies", "inkafarma", 
-                "isdin", "jabón", "johnson's", "johnsons", "kérastase", "kolynos", "kotex", 
-                "l'bel", "lbel", "l'oreal", "labnutrition", "lactacyd", "lady speed stick", 
-                "la roche posay", "laura mercier", "listerine", "loción", "lubriderm", 
-                "lush", "manicura", "maquillaje", "marco aldany", "maybelline", "mifarma", 
-                "montalvo", "moroccanoil", "natura", "neutrogena", "nivea", "nivea men", 
-                "nosotras", "nyx", "ob", "old spice", "oral-b", "oriflame", "pacifica", 
-                "pampers", "pantene", "pañales", "pañitos húmedos", "papel higiénico", 
-                "paracas", "pasta dental", "pedicura", "peluquería", "perfume", "philosophy", 
-                "pixi", "pro", "rekamier", "rexona", "sally beauty", "salón de belleza", 
-                "savital", "schick", "sedal", "sensodyne", "sephora", "shampoo", "soho", 
-                "spa", "speed stick", "st. ives", "suave", "talco", "tampones", "tarte", 
-                "the body shop", "toallas higiénicas", "too faced", "unique", "urban decay", 
-                "vasenol", "vichy", "yanbal", "yodora"
-                
-            ],
-            
-            "Otros Gastos": []
-        }
-        
-        # Diccionario de palabras clave por defecto para INGRESOS
-        default_income_keywords = {
-            "Salario": [
-                "salario", "sueldo", "salary", "pago", "nomina", "payroll",
-                "planilla", "remuneracion", "quincena", "mensualidad",
-                "pago mensual", "haberes", "emolumento", "stipend", "empresa",
-                "company", "employer", "empleador", "trabajo", "work", "job",
-                "aguinaldo", "gratificacion", "bonificacion", "bonus", "cts",
-                "compensacion"
-            ],
-            "Freelance": [
-                "freelance", "free lance", "independiente", "proyecto", "project",
-                "consultoria", "consulting", "honorarios", "fee", "fees",
-                "servicio", "service", "trabajo independiente", "contractor",
-                "contrato", "cliente", "client", "factura", "invoice",
-                "pago por proyecto", "diseño", "design", "desarrollo",
-                "development", "programacion", "programming", "redaccion",
-                "writing", "traduccion", "translation", "asesoria", "advisory"
-            ],
-            "Inversiones": [
-                "inversion", "investment", "dividendo", "dividend", "interes",
-                "interest", "rendimiento", "yield", "ganancia", "profit",
-                "utilidad", "acciones", "stocks", "bolsa", "mercado", "fondo",
-                "fund", "mutual", "etf", "bonos", "bonds", "cripto", "crypto",
-                "bitcoin", "ethereum", "trading", "forex", "plusvalia", "renta",
-                "pasiva", "passive income"
-            ],
-            "Otros Ingresos": [
-                "venta", "sale", "sold", "vendido", "regalo", "gift", "donacion",
-                "donation", "reembolso", "refund", "devolucion", "return",
-                "reintegro", "cashback", "premio", "prize", "award", "ganancia",
-                "loteria", "lottery", "rifa", "sorteo", "herencia", "inheritance",
-                "pension", "retirement", "jubilacion", "alquiler", "renta", "rent",
-                "arrendamiento", "prestamo", "loan", "transferencia", "transfer",
-                "deposito", "deposit", "ingreso extra", "extra income", "propina",
-                "tip", "comision", "commission", "incentivo", "incentive", "rebate",
-                "descuento"
-            ]
-        }
-        
         try:
             # Obtener todas las categorías predeterminadas
             default_categories = self.session.query(Category).filter(
@@ -503,30 +408,33 @@ class DatabaseManager:
             updated_count = 0
             
             for category in default_categories:
-                # ✅ CORRECCIÓN: Solo actualizar si NO tiene keywords O si están vacías
                 current_keywords = category.get_keywords_list()
                 
                 # Determinar qué diccionario usar según el tipo
-                if category.category_type == "income":
-                    keywords_dict = default_income_keywords
-                else:
-                    keywords_dict = default_expense_keywords
+                keywords_dict = seed.default_keywords(category.category_type)
                 
-                # Si la categoría existe en el diccionario y no tiene keywords válidas
-                if category.name in keywords_dict and len(current_keywords) == 0:
-                    category.set_keywords_list(keywords_dict[category.name])
+                # Completar con las keywords por defecto que falten
+                known = set(current_keywords)
+                missing = [
+                    keyword for keyword in keywords_dict.get(category.name, [])
+                    if keyword.lower().strip() not in known
+                ]
+                if missing:
+                    category.set_keywords_list(current_keywords + missing)
                     updated_count += 1
-                    print(f"  ✅ Keywords asignadas a: {category.name}")
+                    print(f"  ✅ {len(missing)} keywords agregadas a: {category.name}")
             
             if updated_count > 0:
                 self.session.commit()
                 print(f"✅ {updated_count} categorías actualizadas con palabras clave por defecto")
             else:
                 print("ℹ️  Las categorías ya tienen palabras clave asignadas")
+            return True
             
         except Exception as e:
             print(f"⚠️ Error al inicializar palabras clave: {e}")
             self.session.rollback()
+            return False
 
 
 
@@ -588,291 +496,7 @@ class DatabaseManager:
                 "message": str
             }
         """
-        # Diccionarios de palabras clave por defecto (mismo que en _initialize_default_keywords)
-        default_expense_keywords = {
-            "Alimentación": [
-                "gr" ," kg ", " kilo ", "kilogramo", "kilogramos", "frutas y verduras",
-                "aceite de cocina", "acelga (criolla/serrana)", "agua", "aguaje", "aji amarillo seco", 
-                "aji escabeche fresco", "aji montaña", "aji paprika", "aji rocoto", "ajo", 
-                "ajo criollo", "ajo morado", "albahaca", "albaricoque", "alcachofa", "almuerzo", "atun"
-                "antojito", "antojitos", "apio", "arroz", "arveja verde", "atun", "azúcar", 
-                "bakery", "bases en sobre", "batido", "bebida", "beber", "bembos", "berenjena", 
-                "beterraga", "bodega", "brocoli", "butcher", "caigua", "camote", "camu camu", 
-                "carambola", "carne de res", "carniceria", "cebolla", "cebolla china", "cereales", 
-                "chifles", "chirimoya", "chizitos", "chocolate", "chocolateria", 
-                "chocolates", "chocolates y dulces", "choclo", "chuño", "ciruela", "coco", 
-                "cocona", "col china", "col corazon", "coliflor", "comida", "coronta de maíz", 
-                "culantro", "drink", "dulceria", "empanada", "esparrago fresco", "especias", 
-                "espinaca", "fideos", "food", "frejol", "frejolito chino", "fresa", "frijol", 
-                "frijol verde", "frozen yogurt", "frutas", "frutas tropicales", "galletas", 
-                "galletas dulces", "galletas saladas", "gaseosa", "golosina", "golosinas", 
-                "granadilla", "granada", "guanabana", "grocery", "haba verde", "harina", 
-                "hierba buena", "higo", "holantau", "horganica", "hortalizas", "hortalizas de fruto", 
-                "hortalizas de hoja o de tallo", "hortalizas de raíz", "hortalizas leguminosas verdes", 
-                "hot dog", "hotdog", "huacatay", "huevos", "juice", "jugo", "kion", "kiwi", 
-                "leche", "lechuga americana (criolla/serrana)", "lechuga criolla seda", 
-                "lechuga romana hidropónica", "lenteja", "lima", "limon", "longapa", "lunch", 
-                "lúcuma", "maiz marlo", "maiz morado", "mamey", "mandarina", "mango", "manzana", 
-                "maracuyá", "market", "mass", "membrillo", "melon", "melon coquito", "melones", 
-                "melocotón", "mercado", "metro", "milk", "nabo", "nachos", "naranja", "nueces", 
-                "olluco", "pacchoy", "palta", "pallar verde", "panaderia", "panes y derivados", 
-                "papa", "papa fritas", "papas a la francesa", "papas fritas", "papaya", "pepinillo", 
-                "pepino", "pera", "perejil", "pescado", "picarones", "pimiento", "piqueo", 
-                "piqueos", "piña", "platano", "plaza vea", "pollo", "poro", "rabanito", "refresco", 
-                "refrescos", "restaurant", "salchipapa", "salchipapas", "salsas", "sandwich", 
-                "sanguches", "sandia", "sazonadores", "smoothie", "snack", "snacks", "soda", 
-                "spaguetti", "supermercado", "tamarindo", "tienda", "tomate", "toronja", "tottus", 
-                "tuna", "uva", "vainita", "vegetales", "verduras", "water", "wong", "yacon", 
-                "yogur", "yogurt", "yuca", "zapallo", "zapallo italiano", "zapallo loche", 
-                "zapallo macre", "zanahoria", "zumo", "venturo", "Molitalia", "D'onofrio"
-                "costilla", "lomo", "pulpa de res", "carne molida", "bife", "asado", "chuleta",
-                "filete", "bistec", "entraña", "picanha", "churrasco", "roast beef", "benoti", "laive","ecco",
-                "Hamburguesa de pollo", "Pechuga de pollo", "Muslo de pollo", "Alitas de pollo",
-                "angel", "cereal", "granola", "muesli", "yogurt griego", "yogur griego"
-                "canela", "clavo de olor", "comino", "nuez moscada", "pimienta", "oregano", "romero",
-                "tomillo", "vainilla","aj-no-men","ajinomoto","sazonador maggi"
-                "aceituna", "aceitunas", "almendra", "anona", "avena", "baya", "costeño","plátano","Cabello de angel"
-                "Incasur", "sol del cusco", "san fernando", "don victoria", "laive","gloria","pascual","nestle"
-                "maracuya", "maracuya", "frambuesa", "arándano", "arándanos", "blueberry", "fresa", "frutilla"
-                "avena" , "mostaza", "ketchup", "mayonesa", "salsa de soja", "salsa inglesa", "aderezo"
-                "bondiola", "jamon", "jamón", "salchicha", "salchichón", "mortadela", "pepperoni", "chorizo"
-                "lechuga", "espinaca", "rúcula", "berro", "acelga", "canónigos", "radicchio", "endibia"
-                "Mc colin's anis", "Mc colin's hierba luisa", "Mc colin's manzanilla", "Mc colin's menta",  "Mc colin's boldo"
-                "lomo fino", "lomo saltado", "aji limo", "aji mirasol", "aji charapita", "aji panca"
-            ],
-            "Transporte": [
-                "uber", "taxi", "cabify","beat", "gasolina", "gas", "petroleo",
-                "grifo", "station", "parking", "estacionamiento", "peaje", "toll",
-                "bus", "metro", "tren", "train", "vuelo", "flight", "avianca",
-                "latam", "transporte", "transport", "movilidad", "pasaje", "ticket",
-                "combustible", "fuel", "mecanico", "mechanic", "repuesto", "llanta",
-                "tire", "revision", "tecnica" , "Metropolitano" 
-            ],
-            "Entretenimiento": [
-                "cine", "cinema", "movie", "netflix", "spotify", "amazon prime",
-                "disney", "hbo", "steam", "playstation", "xbox", "nintendo", "juego",
-                "game", "concierto", "concert", "teatro", "theater", "club",
-                "discoteca", "disco", "bar", "karaoke", "bowling", "gimnasio", "gym",
-                "deporte", "sport", "entrada", "ticket", "suscripcion",
-                "subscription", "youtube", "twitch",
-                "pelicula", "film", "videojuego", "gaming", "partido", "match",
-                "evento", "event", "festival", "festival de musica", "stand up",
-                "comedia", "comedy", "museo", "museum", "exposicion", "exhibition"  
-                
-            ],
-            "Servicios": [
-                "luz", "electricity", "agua", "water", "internet", "telefono",
-                "phone", "celular", "mobile", "cable", "tv", "netflix", "sedapal",
-                "enel", "luz del sur", "claro", "movistar", "entel", "bitel", "gas",
-                "natural", "mantenimiento", "maintenance", "reparacion", "repair",
-                "limpieza", "cleaning", "lavanderia", "laundry", "tintoreria",
-                "peluqueria", "salon", "barberia"
-            ],
-            "Salud": [
-                "analisis", "botica", "clinic", "clinica", "consulta", "consulta particular", 
-                "consultation", "dentist", "dentista", "doctor", "exam", "examen", "farmacia", 
-                "glasses", "hospital", "inkafarma", "laboratory", "laboratorio", "lentes", 
-                "medicina", "medicine", "medico", "mifarma", "odontologo", "optica", 
-                "pastilla", "pharmacy", "pill", "terapia", "therapy", "vitamin", "vitamina"
-                "Banda adhesiva", "Betadine", "Curitas", "Desenfriol", "Dolex", "Ibuprofeno",
-            ],
-            "Educación": [
-                "academia", "ADEX", "Alas Peruanas", "AprendeLibre", "book", "bookstore", 
-                "capacitacion", "Cayetano Heredia", "CENFOTEC", "certification", "certificacion", 
-                "César Vallejo", "CIBERTEC", "class", "clase", "colegio", "colegio primaria", 
-                "colegio secundaria", "course", "curso", "Crehana", "cuota", "Cursera", 
-                "Domestika", "estudios", "IDAT", "IESTP", "INFOCAP", "institute", "Instituto", 
-                "Instituto continental", "ISAT", "ISIL", "libreria", "libro", "materiales", 
-                "matricula", "mensualidad", "pension", "school", "SENATI", "SISE", "supplies", 
-                "tesis", "training", "tuition", "UCSP", "UCSM", "UCV", "UNALM", "UNE", 
-                "UNFV", "UNI", "UNMSM", "universidad", "university", "Universidad Nacional del Callao", 
-                "Universidad privada", "Universidad pública", "UNTELS", "UPN", "utiles", "UTP"
-            ],
-            "Vivienda": [
-                "aire acondicionado", "albanil", "albañil", "alicates", "alfombra", 
-                "alquiler", "apartment", "arrendamiento", "aspiradora", "bombilla", 
-                "cafetera", "calentador", "cama", "casa", "clavos", "cocina", "colchón", 
-                "condominio", "constructor", "copas", "cómoda", "cortinas", "cuadro", 
-                "cubiertos", "decoracion", "decoración", "departamento", "destornillador", 
-                "electrician", "electricista", "electrodomésticos", "enseres", "equipo de sonido", 
-                "equipos", "escalera", "escritorio", "espejo", "estante", "estufa", 
-                "ferreteria", "ferretería", "foco", "furniture", "gasfitero", "hardware", 
-                "herramientas", "hielera", "hipoteca", "hogar", "iluminación", "inmobiliaria", 
-                "jardinería", "lámpara", "lavadora", "licuadora", "librero", "limpieza", 
-                "llave inglesa", "mantenimiento", "martillo", "menajería", "mesa", 
-                "microondas", "mueble", "muebles", "ollas", "paint", "parlante", "pintado", 
-                "pintura", "platos", "plumber", "pyrex", "refrigeradora", "rent", "renta", 
-                "reparacion", "reparaciones", "ropero", "sartenes", "secadora", "silla", 
-                "sillón", "sofá", "taladro", "táper", "terma", "televisor", "tornillos", 
-                "utensilios", "vajilla", "vasos", "ventilador", "vivienda"
-                "clavos", "tornillos", "bisagras", "cemento", "arena", "ladrillos", "bloques",
-                "yeso", "pintura", "pintura impermeabilizante", "sellador", "poliuretano",
-                "pintura acrílica", "pintura esmalte", "pintura epóxica", "pintura vinílica",
-                "pintura látex", "pintura sintética", "pintura texturada"
-                
-            ],
-            "Vestimenta": [
-                "abrigo", "accesorio", "accesorios", "accessory", "amazon", "anillo", 
-                "aretes", "arreglo", "bañador", "bata", "bermuda", "bikini", "billetera", 
-                "blusa", "bolso", "botas", "botines", "boutique", "bóxer", "brasier", 
-                "bufanda", "buzo", "calcetines", "calzado", "calzoncillo", "camisa", 
-                "camiseta", "cartera", "casaca", "chaleco", "chaqueta", "chompa", 
-                "cinturón", "clothes", "collar", "corbata", "correa", "costura", "denim", 
-                "deporte", "ebay", "enterizo", "entrenamiento", "falabella", "falda", 
-                "forever21", "gafas", "gift", "gorra", "gorro", "guantes", "gym", "h&m", 
-                "jean", "jewelry", "jockey", "joya", "joyas", "joyería", "lavandería", 
-                "leggings", "lentes", "makeup", "mall", "mantenimiento", "medias", 
-                "mercadolibre", "moccasines", "mochila", "moda", "natación", "oechsle", 
-                "outfit", "pantalón", "pantuflas", "paris", "pijama", "plaza", "polera", 
-                "polo", "prenda", "pulsera", "real plaza", "regalo", "reloj", "ripley", 
-                "ropa", "ropa deportiva", "ropa interior", "saco", "saga", "sandalias", 
-                "sastre", "sastrería", "shoes", "short", "sombrero", "sostén", "store", 
-                "suéter", "tacos", "terno", "textil", "tienda", "tintorería", "traje", 
-                "truza", "vestido", "vestimenta", "vestir", "watch", "zapatillas", 
-                "zapatero", "zapateria", "zapatos", "zara"
-            ],
-
-            "Comunicaciones": [ 
-                "cable", "celular", "internet", "mobile", "phone", "telefono",
-                "tv", "telfonía", "claro", "entel", "bitel", "movistar", "starlink",
-                "cablevisión", "directv", 
-                "fibertel", "telecom", "telefonía", "telefonía móvil", "telefonía fija"
-            ],
-            
-            "Restaurantes y gastronomía": [
-                "alfresco", "almuerzo", "anticuchería", "anticuchos", "antojito", "asado", 
-                "bacán", "bar", "barra cevichera", "beber", "bembos", "blanca flor", 
-                "bodega", "breakfast", "burger", "burger king", "butifarra", "caminos del inca", 
-                "capriccio", "carl's jr", "carrito", "cebichería", "cevicheria", "ceviche", 
-                "chicha", "chicha morada", "chifa", "china wok", "chinawok", "chicharrones", 
-                "churros", "comida ambulante", "cena", "cerveza", "chicken", "d'onofrio", 
-                "delivery", "desayuno", "desayuno al paso", "didi food", "dinner", 
-                "domino's", "domo saltado", "don belisario", "donas", "donofrio", 
-                "donuts", "doomo saltado", "drink", "dunkin", "el buen gusto", "el chinito", 
-                "el muelle", "el pez on", "emoliente", "emolientero", "empanada", 
-                "empanadas", "empanadas paulistas", "food truck", "galletas", "grimanesa", 
-                "hamburguesa", "hamburguesería", "helados", "hikari", "ice cream", 
-                "jockey plaza", "kentucky", "kfc", "kiosko", "la casa de las empanadas", 
-                "la ibérica", "la iberica", "la leña", "la lucha", "la panca", "la rambla", 
-                "larcomar", "las canastas", "leche de tigre", "listo", "little caesars", 
-                "lunch", "macuca", "mall aventura", "mall del sur", "marisquería", 
-                "mcdonald's", "mcdonalds", "mediterraneo", "megaplaza", "mi barrunto", 
-                "minka", "minimarket", "munchis", "niqqu", "norky", "norkys", "open plaza", 
-                "otto grill", "oxxo", "pan con chicharrón", "papa john's", "papa rellena", 
-                "pardos chicken", "pasquale", "pecsa", "pedidosya", "perros y papas", 
-                "pescados capitales", "picanteria", "picarones", "piqueo", "piqueos", 
-                "pizza", "pizza hut", "plaza norte", "plaza san miguel", "pollo", 
-                "pollo a la brasa", "polleria", "popeyes", "pub", "punto azul", "puruchuco", 
-                "quiosco", "quinua", "rappi", "real plaza", "repsol shop", "restaurant", 
-                "rockys", "salaverry", "salchipapa", "salchipapas", "sanguchería", 
-                "sanguche", "sanguches", "santa anita", "sarita", "starbucks", "subway", 
-                "sushi", "taco bell", "tamales", "tambo", "terminal pesquero", 
-                "tía grimanesa", "tienda", "tío bobby", "villa chicken", "viva", "vlady"
-                "pyc", "turroncito", "turron","chocotejas", "la iberica", "helados baskin robbins"
-            ],
-            
-            "Hospedaje y viajes": [
-                "aeropuerto", "airbnb", "albergue", "alojamiento", "asia", "backpackers", 
-                "boleto", "booking", "cama", "canta", "churín", "cial", "clase ejecutiva", 
-                "costamar", "cruz del sur", "cusco", "despegar", "equipaje", "estancia", 
-                "excursión", "expedia", "full day", "habitación", "hospedaje", "hostal", 
-                "hotel", "inca rail", "itssa", "jetsmart", "jorge chávez", "lap", "latam", 
-                "lunahuaná", "machu picchu", "mancora", "motel", "móvil bus", "nuevo mundo", 
-                "oltursa", "paracas", "pasaje", "peru rail", "perubus", "posada", "redbus", 
-                "resort", "sky", "soyuz", "star perú", "suite", "tarapoto", "tepsa", 
-                "tour", "trivago", "turismo", "vacaciones", "viaje", "viva air", "vuelo"
-                
-            ],
-            
-            "Vicios y hobbies": [
-                "cerveza", "beer", "alcohol", "tabaco", "juegos", "hobbies",
-                "apuestas", "atlantic city", "bar", "betano", "betsson", "cartavio", 
-                "casino", "cerveza", "cigarro", "cigarrillo", "cocktail", "corona", 
-                "cristal", "cusqueña", "discoteca", "encendedor", "fiesta casino", 
-                "flor de caña", "ganadiario", "gin", "hamilton", "heineken", "inkabet", 
-                "inkabet", "johnnie walker", "licor", "lotería", "lucky strike", 
-                "majestic", "marlboro", "pilsen", "pisco", "queirolo", "ron", 
-                "tabaco", "tabernero", "tacama", "te apuesto", "tinka", "vape", 
-                "vapeador", "vino", "vodka", "whisky"
-                
-            ],
-            
-            "Higiene/Cuidado personal": [
-                "acondicionador", "afeitado", "algodón", "amarige", "aruma", "aussie", "avené", 
-                "avene", "avon", "axe", "babysec", "barba", "barber shop", "barbería", 
-                "belcorp", "belleza", "bioderma", "biogreen", "botica", "boticas perú", 
-                "burt's bees", "calvin klein", "cantu", "carefree", "carol's daughter", 
-                "cepa menstrual", "cepillo", "cerave", "cetaphil", "champú", "clean & clear", 
-                "clínica", "clinique", "colgate", "copa menstrual", "cortaúñas", "crema", 
-                "cuidado personal", "cyzone", "dentito", "dentífrico", "depilación", 
-                "desodorante", "dove", "dove men+care", "dr. bronner's", "e.l.f. cosmetics", 
-                "efasit", "elite", "elvive", "enjuague bucal", "ésika", "esika", "essence", 
-                "especialista", "eucerin", "farmacia", "fenty beauty", "garnier", "gillette", 
-                "glossier", "gnc", "h&s", "head & shoulders", "herbal essences", "herbivore", 
-                "hies", "higiene", "higiene femenina", "hinds", "huggies", "inkafarma", 
-                "isdin", "jabón", "johnson's", "johnsons", "kérastase", "kolynos", "kotex", 
-                "l'bel", "lbel", "l'oreal", "labnutrition", "lactacyd", "lady speed stick", 
-                "la roche posay", "laura mercier", "listerine", "loción", "lubriderm", 
-                "lush", "manicura", "maquillaje", "marco aldany", "maybelline", "mifarma", 
-                "montalvo", "moroccanoil", "natura", "neutrogena", "nivea", "nivea men", 
-                "nosotras", "nyx", "ob", "old spice", "oral-b", "oriflame", "pacifica", 
-                "pampers", "pantene", "pañales", "pañitos húmedos", "papel higiénico", 
-                "paracas", "pasta dental", "pedicura", "peluquería", "perfume", "philosophy", 
-                "pixi", "pro", "rekamier", "rexona", "sally beauty", "salón de belleza", 
-                "savital", "schick", "sedal", "sensodyne", "sephora", "shampoo", "soho", 
-                "spa", "speed stick", "st. ives", "suave", "talco", "tampones", "tarte", 
-                "the body shop", "toallas higiénicas", "too faced", "unique", "urban decay", 
-                "vasenol", "vichy", "yanbal", "yodora"
-                
-            ],
-            
-            "Otros Gastos": []
-        }
-        
-        default_income_keywords = {
-            "Salario": [
-                "salario", "sueldo", "salary", "pago", "nomina", "payroll",
-                "planilla", "remuneracion", "quincena", "mensualidad",
-                "pago mensual", "haberes", "emolumento", "stipend", "empresa",
-                "company", "employer", "empleador", "trabajo", "work", "job",
-                "aguinaldo", "gratificacion", "bonificacion", "bonus", "cts",
-                "compensacion"
-            ],
-            "Freelance": [
-                "freelance", "free lance", "independiente", "proyecto", "project",
-                "consultoria", "consulting", "honorarios", "fee", "fees",
-                "servicio", "service", "trabajo independiente", "contractor",
-                "contrato", "cliente", "client", "factura", "invoice",
-                "pago por proyecto", "diseño", "design", "desarrollo",
-                "development", "programacion", "programming", "redaccion",
-                "writing", "traduccion", "translation", "asesoria", "advisory"
-            ],
-            "Inversiones": [
-                "inversion", "investment", "dividendo", "dividend", "interes",
-                "interest", "rendimiento", "yield", "ganancia", "profit",
-                "utilidad", "acciones", "stocks", "bolsa", "mercado", "fondo",
-                "fund", "mutual", "etf", "bonos", "bonds", "cripto", "crypto",
-                "bitcoin", "ethereum", "trading", "forex", "plusvalia", "renta",
-                "pasiva", "passive income"
-            ],
-            "Otros Ingresos": [
-                "venta", "sale", "sold", "vendido", "regalo", "gift", "donacion",
-                "donation", "reembolso", "refund", "devolucion", "return",
-                "reintegro", "cashback", "premio", "prize", "award", "ganancia",
-                "loteria", "lottery", "rifa", "sorteo", "herencia", "inheritance",
-                "pension", "retirement", "jubilacion", "alquiler", "renta", "rent",
-                "arrendamiento", "prestamo", "loan", "transferencia", "transfer",
-                "deposito", "deposit", "ingreso extra", "extra income", "propina",
-                "tip", "comision", "commission", "incentivo", "incentive", "rebate",
-                "descuento"
-            ]
-        }
-        
         try:
-            updated_count = 0
-            categories_updated = []
-            
-            # Determinar qué categorías procesar
             if category_id:
                 # Restaurar una categoría específica
                 category = self.get_category_by_id(category_id)
@@ -891,32 +515,14 @@ class DatabaseManager:
                         "categories_updated": [],
                         "message": "Solo se pueden restaurar categorías predeterminadas"
                     }
-                
-                categories_to_process = [category]
-            else:
-                # Restaurar todas las categorías predeterminadas
-                categories_to_process = self.session.query(Category).filter(
-                    Category.is_default == True
-                ).all()
-            
-            # Procesar categorías
-            for category in categories_to_process:
-                # Determinar qué diccionario usar
-                if category.category_type == "income":
-                    keywords_dict = default_income_keywords
-                else:
-                    keywords_dict = default_expense_keywords
-                
-                # Si la categoría existe en el diccionario de defaults
-                if category.name in keywords_dict:
-                    # Restaurar keywords (sobrescribir las actuales)
-                    category.set_keywords_list(keywords_dict[category.name])
-                    updated_count += 1
-                    categories_updated.append(category.name)
-                    print(f"  🔄 Keywords restauradas: {category.name}")
-            
+
+            categories_updated = self._write(self._write_restore_keywords, category_id)
+            for name in categories_updated:
+                print(f"  🔄 Keywords restauradas: {name}")
+            self._expire_ui_objects(Category, is_default=True)
+
+            updated_count = len(categories_updated)
             if updated_count > 0:
-                self.session.commit()
                 message = f"✅ {updated_count} categoría(s) restaurada(s) correctamente"
             else:
                 message = "ℹ️ No hay categorías para restaurar"
@@ -930,70 +536,198 @@ class DatabaseManager:
             
         except Exception as e:
             print(f"❌ Error al restaurar keywords: {e}")
-            self.session.rollback()
             return {
                 "success": False,
                 "updated_count": 0,
                 "categories_updated": [],
                 "message": f"Error: {str(e)}"
             }
+
+    @staticmethod
+    def _write_restore_keywords(session, category_id: Optional[int]) -> List[str]:
+        """Sobrescribe las keywords con las por defecto; devuelve los nombres"""
+        query = session.query(Category).filter(Category.is_default == True)
+        if category_id:
+            query = query.filter(Category.id == category_id)
+
+        updated = []
+        for category in query:
+            keywords_dict = seed.default_keywords(category.category_type)
+            if category.name in keywords_dict:
+                category.set_keywords_list(keywords_dict[category.name])
+                updated.append(category.name)
+        return updated
     
     
     
     
+    # ========== SESIONES ==========
+    #
+    # - self.session: sesión de larga vida de la UI, para lecturas. Las
+    #   vistas no confirman en ella: mutan con los métodos del gestor, que
+    #   encolan en write_queue y vencen los objetos afectados.
+    # - session_scope(): unidad de trabajo (commit al salir, rollback si hay
+    #   excepción, siempre cierra).
+    # - read_session(): lecturas cortas; al cerrar se descarta su identity map.
+    # - thread_session(): una sesión por hilo (registro compartido); el hilo
+    #   la libera con release_thread_session() al terminar.
+
+    @contextmanager
+    def session_scope(self):
+        """
+        Unidad de trabajo en una sesión propia
+
+        Uso:
+            with db.session_scope() as session:
+                session.execute(...)
+        """
+        session = self.session_factory()
+        try:
+            yield session
+            session.commit()
+        except BaseException:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    @contextmanager
+    def read_session(self):
+        """
+        Sesión corta de solo lectura
+
+        expire_on_commit=False y sin autoflush: los objetos leídos siguen
+        siendo legibles después de cerrarla (desligados) y no se recargan.
+        Al salir se cierra (la conexión vuelve al pool con su transacción
+        revertida) y el identity map se descarta.
+        """
+        session = self.session_factory(expire_on_commit=False, autoflush=False)
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def thread_session(self):
+        """Sesión del hilo actual (la misma en cada llamada desde ese hilo)"""
+        return self.scoped_sessions()
+
+    def release_thread_session(self):
+        """Cierra y descarta la sesión del hilo actual"""
+        self.scoped_sessions.remove()
+
+    def reset_session(self):
+        """
+        Descarta el estado de la sesión de la UI (identity map, transacción
+        abierta) para que las vistas lean los datos confirmados por otras
+        sesiones, p. ej. tras una importación masiva. La sesión sigue
+        siendo la misma y se puede usar de inmediato.
+        """
+        try:
+            self.session.rollback()
+        finally:
+            self.session.close()
+
+    @property
+    def write_queue(self) -> WriteQueue:
+        """Cola de escritura única (ver src/data/write_queue.py)"""
+        if self._write_queue is None:
+            self._write_queue = WriteQueue(self.session_factory)
+        return self._write_queue
+
+    def _write(self, operation, *args, wait: bool = True):
+        """
+        Encola una mutación en la cola de escritura
+
+        Con wait=True espera su commit y devuelve el resultado. Con
+        wait=False devuelve el Future enseguida: los handlers de la UI lo
+        resuelven con BaseView.when_written y no esperan el fsync, así una
+        ráfaga de ediciones se confirma en un solo commit.
+        """
+        future = self.write_queue.submit(operation, *args)
+        return future.result() if wait else future
+
+    def _expire_ui_objects(self, model, delete: bool = False, **match):
+        """
+        Vence (o descarta, si se eliminan) los objetos de la sesión de la
+        UI que una escritura encolada va a cambiar: se recargan en el
+        próximo acceso. Solo se comparan atributos ya cargados.
+        """
+        for obj in list(self.session.identity_map.values()):
+            if not isinstance(obj, model):
+                continue
+            loaded = inspect(obj).dict
+            if all(loaded.get(key) == value for key, value in match.items()):
+                if delete:
+                    self.session.expunge(obj)
+                else:
+                    self.session.expire(obj)
+
     # ========== LIMPIEZA DE BASE DE DATOS ==========
 
     def clear_all_transactions(self) -> bool:
         """Elimina TODAS las transacciones de la base de datos"""
         try:
-            self.session.query(Transaction).delete()
-            self.session.commit()
+            self._write(self._write_clear_transactions)
+            self._expire_ui_objects(Transaction, delete=True)
             return True
         except Exception as e:
-            self.session.rollback()
             print(f"Error al limpiar transacciones: {e}")
             return False
 
+    @staticmethod
+    def _write_clear_transactions(session) -> int:
+        return session.query(Transaction).delete(synchronize_session=False)
+
     def clear_custom_categories(self) -> bool:
         """Elimina SOLO las categorías personalizadas (mantiene las predeterminadas)"""
         try:
-            self.session.query(Category).filter(Category.is_default == False).delete()
-            self.session.commit()
+            self._write(self._write_clear_custom_categories)
+            self._expire_ui_objects(Category, delete=True, is_default=False)
             return True
         except Exception as e:
-            self.session.rollback()
             print(f"Error al limpiar categorías personalizadas: {e}")
             return False
 
+    @staticmethod
+    def _write_clear_custom_categories(session) -> int:
+        return (
+            session.query(Category)
+            .filter(Category.is_default == False)
+            .delete(synchronize_session=False)
+        )
+
     def reset_database(self) -> bool:
         """Resetea completamente la base de datos (transacciones + categorías personalizadas)"""
         try:
-            # Eliminar transacciones
-            self.session.query(Transaction).delete()
-            # Eliminar categorías personalizadas
-            self.session.query(Category).filter(Category.is_default == False).delete()
-            # Eliminar presupuestos
-            self.session.query(MonthlyBudget).delete()
-            
-            # ✅ NUEVO: Limpiar palabras clave de categorías predeterminadas
-            default_categories = self.session.query(Category).filter(
-                Category.is_default == True
-            ).all()
-            
-            for category in default_categories:
-                category.keywords = None  # Limpiar palabras clave existentes
-            
-            self.session.commit()
-            
-            # ✅ NUEVO: Re-inicializar palabras clave por defecto
-            self._initialize_default_keywords()
-            
+            self._write(self._write_reset_database)
+            # Nada de lo que tenía cargado la UI sigue vigente
+            self.reset_session()
+
             print("✅ Base de datos reseteada y palabras clave reinicializadas")
             return True
             
         except Exception as e:
             print(f"❌ Error al resetear base de datos: {e}")
-            self.session.rollback()
+            return False
+
+    @staticmethod
+    def _write_reset_database(session):
+        # Eliminar transacciones
+        session.query(Transaction).delete(synchronize_session=False)
+        # Eliminar categorías personalizadas
+        session.query(Category).filter(Category.is_default == False).delete(
+            synchronize_session=False
+        )
+        # Eliminar presupuestos
+        session.query(MonthlyBudget).delete(synchronize_session=False)
+
+        # ✅ Palabras clave por defecto en las categorías predeterminadas
+        for category in session.query(Category).filter(Category.is_default == True):
+            keywords_dict = seed.default_keywords(category.category_type)
+            if category.name in keywords_dict:
+                category.set_keywords_list(keywords_dict[category.name])
+            else:
+                category.keywords = None
 
     def get_database_stats(self) -> Dict:
         """Obtiene estadísticas de la base de datos"""
@@ -1032,105 +766,177 @@ class DatabaseManager:
         notes: Optional[str] = None,
         source: str = "manual",
         original_description: Optional[str] = None,
+        wait: bool = True,
     ) -> Transaction:
-        """Añade una nueva transacción"""
-        transaction = Transaction(
-            date=date,
-            description=description,
-            amount=amount,
-            category_id=category_id,
-            transaction_type=transaction_type,
-            notes=notes,
-            source=source,
-            original_description=original_description,
-        )
+        """
+        Añade una nueva transacción (vía la cola de escritura)
 
-        self.session.add(transaction)
-        self.session.commit()
+        Con wait=False devuelve el Future de la escritura (ver _write).
+        """
+        transaction = self._write(
+            self._write_add_transaction,
+            dict(
+                date=date,
+                description=description,
+                amount=amount,
+                category_id=category_id,
+                transaction_type=transaction_type,
+                notes=notes,
+                source=source,
+                original_description=original_description,
+            ),
+            wait=wait,
+        )
+        if not wait:
+            return transaction
+        # Devolverla ligada a la sesión de la UI, como antes
+        return self.session.merge(transaction, load=False)
+
+    @staticmethod
+    def _write_add_transaction(session, values: Dict) -> Transaction:
+        transaction = Transaction(**values)
+        session.add(transaction)
+        session.flush()
         return transaction
 
-    def add_transactions_bulk(self, transactions_data: List[Dict]) -> int:
+    @staticmethod
+    def _prepare_bulk_row(data: Dict, now: datetime) -> Optional[Dict]:
         """
-        ✅ CORREGIDO: Añade múltiples transacciones con manejo correcto de transacciones
-        
+        Valida y tipa una fila para el INSERT masivo
+
+        Returns:
+            Dict listo para executemany, o None si la fila es inválida
+        """
+        if not data.get("date") or not data.get("description") or not data.get("amount"):
+            return None
+
+        date = data["date"] if isinstance(data["date"], datetime) else now
+        amount = float(data["amount"])
+        description = str(data["description"])
+        original_description = data.get("original_description")
+
+        return {
+            "date": date,
+            "description": description,
+            "amount": amount,
+            "category_id": int(data["category_id"]),
+            "transaction_type": str(data.get("transaction_type", "expense")),
+            "notes": data.get("notes"),
+            "source": data.get("source", "imported"),
+            "original_description": original_description,
+            "fingerprint": data.get("fingerprint") or Transaction.compute_fingerprint(
+                date, amount, original_description or description, data.get("account"),
+                str(data.get("transaction_type", "expense")),
+            ),
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    def import_transactions_bulk(
+        self,
+        transactions_data: List[Dict],
+        batch_size: Optional[int] = None,
+        session=None,
+    ) -> Dict:
+        """
+        Inserta transacciones con executemany de Core dentro de una sola transacción
+
+        Cada lote se ejecuta en un SAVEPOINT: si un lote falla, solo se
+        revierte ese lote y el resto continúa. El INSERT usa
+        ON CONFLICT(fingerprint) DO NOTHING, así que las filas ya importadas
+        se omiten en la BD.
+
+        ⚠️ NO hace commit - el código que llama confirma una sola vez.
+
         Args:
             transactions_data: Lista de diccionarios con datos de transacciones
-        
+                (opcional: "account" para distinguir cuentas de origen)
+            batch_size: Filas por lote (default: Config.IMPORT_BATCH_SIZE)
+            session: Sesión a usar (default: self.session); la importación
+                en segundo plano pasa la de su operación en write_queue
+
         Returns:
-            int: Cantidad de transacciones insertadas exitosamente
+            Dict con resultado:
+            - inserted: int
+            - duplicates: int
+            - failed: int
+            - elapsed: float (segundos)
+            - rows_per_sec: float
         """
+        import time
+
+        stats = {
+            "inserted": 0,
+            "duplicates": 0,
+            "failed": 0,
+            "elapsed": 0.0,
+            "rows_per_sec": 0.0,
+        }
         if not transactions_data:
-            return 0
-        
-        count = 0
-        failed = 0
-        
-        print(f"\n{'='*60}")
-        print(f"📦 INSERTANDO {len(transactions_data)} TRANSACCIONES")
-        print(f"{'='*60}")
-        
-        try:
-            # ✅ Insertar todas a la vez usando bulk_insert_mappings (más eficiente)
-            from datetime import datetime
-            
-            # Preparar datos para bulk insert
-            bulk_data = []
-            for data in transactions_data:
-                try:
-                    # Asegurar que los datos sean válidos
-                    if not data.get("date") or not data.get("description") or not data.get("amount"):
-                        print(f"  ⚠️ Dato incompleto, saltando...")
-                        failed += 1
-                        continue
-                    
-                    # Convertir a formato adecuado
-                    bulk_data.append({
-                        "date": data["date"] if isinstance(data["date"], datetime) else datetime.now(),
-                        "description": str(data["description"]),
-                        "amount": float(data["amount"]),
-                        "category_id": int(data["category_id"]),
-                        "transaction_type": str(data.get("transaction_type", "expense")),
-                        "notes": data.get("notes"),
-                        "source": data.get("source", "imported"),
-                        "original_description": data.get("original_description"),
-                        "created_at": datetime.now(),
-                        "updated_at": datetime.now(),
-                    })
-                    
-                except Exception as item_error:
-                    print(f"  ❌ Error procesando item: {item_error}")
-                    failed += 1
-                    continue
-            
-            if bulk_data:
-                # ✅ Usar bulk_insert_mappings para inserción masiva eficiente
-                self.session.bulk_insert_mappings(Transaction, bulk_data)
-                count = len(bulk_data)
-                
-                print(f"  ✅ {count} transacciones preparadas para inserción")
-            
-            # ✅ NO HACER COMMIT AQUÍ - se hará en el código que llama
-            # Esto permite manejar lotes
-            
-            print(f"{'='*60}")
-            print(f"✅ BULK INSERT COMPLETADO")
-            print(f"   Insertadas: {count}")
-            print(f"   Fallidas: {failed}")
-            print(f"{'='*60}\n")
-            
-            return count
-            
-        except Exception as e:
-            print(f"\n{'='*60}")
-            print(f"❌ ERROR EN BULK INSERT")
-            print(f"{'='*60}")
-            print(f"Error: {e}")
-            import traceback
-            traceback.print_exc()
-            print(f"{'='*60}\n")
-            
-            # ✅ NO hacer rollback aquí - dejar que lo maneje el código superior
-            raise  # Re-lanzar la excepción para que se maneje arriba
+            return stats
+
+        batch_size = batch_size or Config.IMPORT_BATCH_SIZE
+        session = session or self.session
+        started = time.perf_counter()
+        now = datetime.now()
+
+        # 1. Validar y tipar todas las filas una sola vez
+        rows = []
+        for data in transactions_data:
+            try:
+                row = self._prepare_bulk_row(data, now)
+            except (TypeError, ValueError, KeyError) as item_error:
+                print(f"  ❌ Error procesando item: {item_error}")
+                row = None
+
+            if row is None:
+                stats["failed"] += 1
+            else:
+                rows.append(row)
+
+        # 2. INSERT ... ON CONFLICT(fingerprint) DO NOTHING por lotes
+        stmt = sqlite_insert(Transaction.__table__).on_conflict_do_nothing(
+            index_elements=["fingerprint"]
+        )
+
+        for start in range(0, len(rows), batch_size):
+            chunk = rows[start:start + batch_size]
+            savepoint = session.begin_nested()
+            try:
+                result = session.execute(stmt, chunk)
+                savepoint.commit()
+                inserted = result.rowcount if result.rowcount >= 0 else len(chunk)
+                stats["inserted"] += inserted
+                stats["duplicates"] += len(chunk) - inserted
+            except Exception as batch_error:
+                savepoint.rollback()
+                stats["failed"] += len(chunk)
+                print(f"  ❌ Error en lote {start // batch_size + 1}: {batch_error}")
+
+        stats["elapsed"] = time.perf_counter() - started
+        if stats["elapsed"] > 0:
+            stats["rows_per_sec"] = len(transactions_data) / stats["elapsed"]
+
+        print(
+            f"📦 Bulk insert: {stats['inserted']} insertadas, "
+            f"{stats['duplicates']} duplicadas, {stats['failed']} fallidas "
+            f"en {stats['elapsed']:.3f}s ({stats['rows_per_sec']:.0f} filas/s)"
+        )
+
+        return stats
+
+    def add_transactions_bulk(
+        self, transactions_data: List[Dict], batch_size: Optional[int] = None
+    ) -> int:
+        """
+        Añade múltiples transacciones omitiendo las ya importadas
+
+        Ver import_transactions_bulk() - NO hace commit.
+
+        Returns:
+            int: Cantidad de transacciones insertadas exitosamente
+        """
+        return self.import_transactions_bulk(transactions_data, batch_size)["inserted"]
 
     def get_all_transactions(self) -> List[Transaction]:
         """Obtiene todas las transacciones ordenadas por fecha descendente"""
@@ -1147,7 +953,180 @@ class DatabaseManager:
             .order_by(Transaction.date.desc())
             .all()
         )
-        
+
+    @staticmethod
+    def _month_bounds(year: int, month: int) -> Tuple[datetime, datetime]:
+        """Inicio del mes y del mes siguiente (rango semiabierto, usa el índice de date)"""
+        start = datetime(year, month, 1)
+        end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+        return start, end
+
+    def get_transaction_records_by_month(
+        self, year: int, month: int, limit: Optional[int] = None
+    ) -> List[TransactionRecord]:
+        """
+        Transacciones de un mes como registros de solo lectura
+
+        A diferencia de get_transactions_by_month, no crea objetos ORM: la
+        consulta selecciona columnas (con la categoría ya unida) en una
+        sesión corta, así que navegar por meses no hace crecer el identity
+        map de la sesión de la UI. Para editar o eliminar se usa record.id.
+
+        Args:
+            limit: Máximo de filas (las más recientes); None para todas
+        """
+        start, end = self._month_bounds(year, month)
+        stmt = self._transaction_records_select().where(
+            Transaction.date >= start, Transaction.date < end
+        )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        with self.read_session() as session:
+            return [TransactionRecord(*row) for row in session.execute(stmt)]
+
+    def get_transaction_records_page(
+        self,
+        year: int,
+        month: int,
+        limit: int,
+        after: Optional[Tuple[datetime, int]] = None,
+    ) -> List[TransactionRecord]:
+        """
+        Una página de transacciones del mes (más recientes primero)
+
+        Paginación por keyset sobre (date, id): cada página empieza justo
+        después de la última fila de la anterior, sin OFFSET, así que pedir
+        la página N cuesta lo mismo que la primera.
+
+        Args:
+            limit: Filas por página
+            after: (date, id) de la última fila ya mostrada; None para la primera
+
+        Returns:
+            List[TransactionRecord]: Menos de limit filas indica la última página
+        """
+        start, end = self._month_bounds(year, month)
+        stmt = self._transaction_records_select().where(
+            Transaction.date >= start, Transaction.date < end
+        )
+        stmt = stmt.where(*self._before_cursor_conditions(after))
+
+        with self.read_session() as session:
+            return [TransactionRecord(*row) for row in session.execute(stmt.limit(limit))]
+
+    # Palabras de la búsqueda (letras y números, con o sin tildes)
+    _SEARCH_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+    def search_transactions(
+        self,
+        query: str,
+        filters: Optional[Dict] = None,
+        limit: int = 50,
+        cursor: Optional[Tuple[datetime, int]] = None,
+    ) -> Dict:
+        """
+        Busca transacciones por descripción, descripción original y notas
+
+        Cada palabra se busca como prefijo ("caf" encuentra "Café") y deben
+        aparecer todas; no distingue mayúsculas ni tildes. Usa el índice
+        FTS5 (transactions_fts), así que no depende del tamaño del
+        historial. Los resultados van de la más reciente a la más antigua,
+        paginados por keyset como get_transaction_records_page.
+
+        Args:
+            query: Texto a buscar
+            filters: Filtros opcionales: transaction_type, category_id,
+                date_from, date_to (datetime, fin exclusivo), year y month
+            limit: Máximo de resultados por página
+            cursor: next_cursor de la página anterior; None para la primera
+
+        Returns:
+            Dict con:
+            - results: List[TransactionRecord]
+            - next_cursor: (date, id) para la siguiente página, o None si no hay más
+        """
+        tokens = self._SEARCH_TOKEN_RE.findall(query or "")
+        if not tokens:
+            return {"results": [], "next_cursor": None}
+
+        stmt = self._transaction_records_select()
+        if self._has_search_index():
+            match = " ".join(f'"{token}"*' for token in tokens)
+            stmt = stmt.where(Transaction.id.in_(
+                text("SELECT rowid FROM transactions_fts WHERE transactions_fts MATCH :match")
+                .bindparams(match=match)
+                .columns(Transaction.id)
+            ))
+        else:
+            for token in tokens:
+                pattern = f"%{token}%"
+                stmt = stmt.where(or_(*[
+                    getattr(Transaction, column).ilike(pattern)
+                    for column in self._SEARCH_COLUMNS
+                ]))
+
+        filters = filters or {}
+        if filters.get("transaction_type"):
+            stmt = stmt.where(Transaction.transaction_type == filters["transaction_type"])
+        if filters.get("category_id"):
+            stmt = stmt.where(Transaction.category_id == filters["category_id"])
+        if filters.get("year") and filters.get("month"):
+            start, end = self._month_bounds(filters["year"], filters["month"])
+            stmt = stmt.where(Transaction.date >= start, Transaction.date < end)
+        if filters.get("date_from"):
+            stmt = stmt.where(Transaction.date >= filters["date_from"])
+        if filters.get("date_to"):
+            stmt = stmt.where(Transaction.date < filters["date_to"])
+
+        stmt = stmt.where(*self._before_cursor_conditions(cursor))
+
+        with self.read_session() as session:
+            results = [TransactionRecord(*row) for row in session.execute(stmt.limit(limit))]
+
+        next_cursor = (results[-1].date, results[-1].id) if len(results) == limit else None
+        return {"results": results, "next_cursor": next_cursor}
+
+    def _has_search_index(self) -> bool:
+        """True si existe transactions_fts (se consulta una vez)"""
+        if self._search_index is None:
+            with self.read_session() as session:
+                self._search_index = bool(session.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE name = 'transactions_fts'")
+                ).scalar())
+        return self._search_index
+
+    @staticmethod
+    def _before_cursor_conditions(before: Optional[Tuple[datetime, int]]) -> list:
+        """Condición "(date, id) < before" para paginar en orden descendente"""
+        if before is None:
+            return []
+        last_date, last_id = before
+        return [
+            Transaction.date <= last_date,
+            or_(Transaction.date < last_date, Transaction.id < last_id),
+        ]
+
+    @staticmethod
+    def _transaction_records_select():
+        """SELECT de columnas para TransactionRecord, ordenado por (date, id) descendente"""
+        return (
+            select(
+                Transaction.id,
+                Transaction.date,
+                Transaction.description,
+                Transaction.amount,
+                Transaction.transaction_type,
+                Transaction.category_id,
+                Transaction.notes,
+                Category.name,
+                Category.icon,
+                Category.color,
+            )
+            .outerjoin(Category, Category.id == Transaction.category_id)
+            .order_by(Transaction.date.desc(), Transaction.id.desc())
+        )
+
     def get_transactions_by_date_range(
         self, 
         start_date: datetime, 
@@ -1207,17 +1186,20 @@ class DatabaseManager:
 
         return query.order_by(Transaction.date.desc()).all()
 
-    def delete_transaction(self, transaction_id: int) -> bool:
-        """Elimina una transacción"""
-        transaction = (
-            self.session.query(Transaction)
-            .filter(Transaction.id == transaction_id)
-            .first()
-        )
+    def delete_transaction(self, transaction_id: int, wait: bool = True) -> bool:
+        """
+        Elimina una transacción (vía la cola de escritura)
+
+        Con wait=False devuelve el Future de la escritura (ver _write).
+        """
+        self._expire_ui_objects(Transaction, delete=True, id=transaction_id)
+        return self._write(self._write_delete_transaction, transaction_id, wait=wait)
 
+    @staticmethod
+    def _write_delete_transaction(session, transaction_id: int) -> bool:
+        transaction = session.get(Transaction, transaction_id)
         if transaction:
-            self.session.delete(transaction)
-            self.session.commit()
+            session.delete(transaction)
             return True
         return False
 
@@ -1229,6 +1211,7 @@ class DatabaseManager:
             amount: float,
             category_id: int,
             notes: str = "",
+            wait: bool = True,
         ) -> bool:
             """
             Actualiza una transacción existente.
@@ -1240,38 +1223,263 @@ class DatabaseManager:
                 amount: Nuevo monto
                 category_id: Nuevo ID de categoría
                 notes: Nuevas notas
+                wait: False para recibir el Future de la escritura (ver _write)
                 
             Returns:
                 bool: True si se actualizó correctamente
             """
+            values = dict(
+                date=date,
+                description=description,
+                amount=amount,
+                category_id=category_id,
+                notes=notes,
+                updated_at=datetime.now(),
+            )
+            self._expire_ui_objects(Transaction, id=transaction_id)
+            if not wait:
+                return self._write(
+                    self._write_update_transaction, transaction_id, values, wait=False
+                )
+
             try:
-                # Buscar la transacción
-                transaction = self.session.query(Transaction).filter_by(id=transaction_id).first()
-                
-                if not transaction:
+                updated = self._write(self._write_update_transaction, transaction_id, values)
+
+                if not updated:
                     print(f"❌ Transacción {transaction_id} no encontrada")
                     return False
-                
-                # Actualizar campos
-                transaction.date = date
-                transaction.description = description
-                transaction.amount = amount
-                transaction.category_id = category_id
-                transaction.notes = notes
-                transaction.updated_at = datetime.now()
-                
-                # Guardar cambios
-                self.session.commit()
+
                 print(f"✅ Transacción {transaction_id} actualizada correctamente")
                 return True
                 
             except Exception as e:
-                self.session.rollback()
                 print(f"❌ Error al actualizar transacción: {e}")
                 import traceback
                 traceback.print_exc()
                 return False
 
+    @staticmethod
+    def _write_update_transaction(session, transaction_id: int, values: Dict) -> bool:
+        transaction = session.get(Transaction, transaction_id)
+        if not transaction:
+            return False
+        for field, value in values.items():
+            setattr(transaction, field, value)
+        return True
+
+
+    # ========== FORMATOS DE IMPORTACIÓN ==========
+
+    def get_import_profiles(self) -> List[Dict]:
+        """Obtiene los formatos de importación guardados por el usuario"""
+        profiles = []
+        for record in self.session.query(ImportProfile).order_by(ImportProfile.name).all():
+            profile = record.get_settings()
+            profile["name"] = record.name
+            profile["fingerprint"] = record.header_fingerprint
+            profiles.append(profile)
+        return profiles
+
+    def save_import_profile(self, profile: Dict) -> Dict:
+        """
+        Guarda (o reemplaza) un formato de importación
+
+        Args:
+            profile: Perfil creado con import_profiles.build_profile()
+
+        Returns:
+            Dict con success y message
+        """
+        try:
+            self._write(self._write_import_profile, profile)
+
+            print(f"✅ Formato de importación '{profile['name']}' guardado")
+            return {"success": True, "message": f"Formato '{profile['name']}' guardado"}
+
+        except Exception as e:
+            print(f"❌ Error al guardar formato de importación: {e}")
+            return {"success": False, "message": f"Error: {str(e)}"}
+
+    @staticmethod
+    def _write_import_profile(session, profile: Dict):
+        record = (
+            session.query(ImportProfile)
+            .filter(ImportProfile.header_fingerprint == profile["fingerprint"])
+            .first()
+        )
+        if record is None:
+            record = ImportProfile(header_fingerprint=profile["fingerprint"])
+            session.add(record)
+
+        record.name = profile["name"]
+        record.set_settings({
+            key: value
+            for key, value in profile.items()
+            if key not in ("name", "fingerprint")
+        })
+
+    def delete_import_profile(self, fingerprint: str) -> bool:
+        """Elimina un formato de importación guardado"""
+        self._expire_ui_objects(ImportProfile, delete=True, header_fingerprint=fingerprint)
+        return self._write(self._write_delete_import_profile, fingerprint)
+
+    @staticmethod
+    def _write_delete_import_profile(session, fingerprint: str) -> bool:
+        deleted = (
+            session.query(ImportProfile)
+            .filter(ImportProfile.header_fingerprint == fingerprint)
+            .delete(synchronize_session=False)
+        )
+        return deleted > 0
+
+    # ========== EXPORTACIÓN INCREMENTAL ==========
+
+    def get_export_cursor(self, name: str, session=None) -> Optional[Tuple[datetime, int]]:
+        """
+        Obtiene el cursor de la exportación con ese nombre
+
+        last_id es el mayor id exportado (la siguiente exportación continúa
+        desde ahí); last_date es la fecha de esa transacción.
+
+        Returns:
+            (last_date, last_id) o None si nunca se exportó
+        """
+        record = (
+            (session or self.session)
+            .query(ExportCursor)
+            .filter(ExportCursor.name == name)
+            .first()
+        )
+        if record is None:
+            return None
+        return record.last_date, record.last_id
+
+    def save_export_cursor(
+        self, name: str, last_date: datetime, last_id: int, exported: int
+    ) -> Dict:
+        """
+        Avanza el cursor de una exportación incremental (vía la cola de
+        escritura, también desde el hilo de la exportación)
+
+        Args:
+            name: Nombre de la exportación
+            last_date, last_id: Transacción de mayor id escrita en el archivo
+            exported: Transacciones escritas en esta exportación
+
+        Returns:
+            Dict con success y message
+        """
+        try:
+            self._write(self._write_export_cursor, name, last_date, last_id, exported)
+            return {"success": True, "message": f"Cursor '{name}' actualizado"}
+
+        except Exception as e:
+            print(f"❌ Error al guardar cursor de exportación: {e}")
+            return {"success": False, "message": f"Error: {str(e)}"}
+
+    @staticmethod
+    def _write_export_cursor(session, name: str, last_date: datetime, last_id: int, exported: int):
+        record = session.query(ExportCursor).filter(ExportCursor.name == name).first()
+        if record is None:
+            record = ExportCursor(name=name, exported_count=0)
+            session.add(record)
+
+        record.last_date = last_date
+        record.last_id = last_id
+        record.exported_count = (record.exported_count or 0) + exported
+
+    def reset_export_cursor(self, name: str) -> bool:
+        """Reinicia una exportación incremental (la próxima incluye todo)"""
+        self._expire_ui_objects(ExportCursor, delete=True, name=name)
+        return self._write(self._write_reset_export_cursor, name)
+
+    @staticmethod
+    def _write_reset_export_cursor(session, name: str) -> bool:
+        deleted = (
+            session.query(ExportCursor)
+            .filter(ExportCursor.name == name)
+            .delete(synchronize_session=False)
+        )
+        return deleted > 0
+
+    @staticmethod
+    def _after_cursor_conditions(after: Optional[Tuple[datetime, int]]) -> list:
+        """
+        Condición "(date, id) > after" (página siguiente) escrita de forma
+        que SQLite use el índice de date como rango (date >= d) y filtre el
+        empate por id
+        """
+        if after is None:
+            return []
+        last_date, last_id = after
+        return [
+            Transaction.date >= last_date,
+            (Transaction.date > last_date) | (Transaction.id > last_id),
+        ]
+
+    @staticmethod
+    def _since_id_conditions(since_id: Optional[int]) -> list:
+        """Condición "id > since_id" (transacciones dadas de alta después)"""
+        return [] if since_id is None else [Transaction.id > since_id]
+
+    def count_transactions_after(self, since_id: Optional[int], session=None) -> int:
+        """Cuenta las transacciones dadas de alta después del id since_id"""
+        stmt = select(func.count(Transaction.id)).where(*self._since_id_conditions(since_id))
+        return (session or self.session).execute(stmt).scalar() or 0
+
+    def iter_transactions_after(
+        self,
+        since_id: Optional[int],
+        batch_size: int = 1000,
+        session=None,
+    ) -> Iterator[Tuple]:
+        """
+        Recorre las transacciones dadas de alta después del id since_id
+
+        El cursor reanudable es el id (orden de alta): una transacción
+        agregada con fecha anterior a lo ya exportado, o importada tarde,
+        también entra en la siguiente exportación. Dentro de una exportación
+        las filas se ordenan y paginan por clave (date, id): cada página es
+        una consulta con LIMIT que continúa desde la última fila de la
+        anterior, así que no hay OFFSET ni un cursor abierto entre páginas.
+
+        Args:
+            since_id: Mayor id ya exportado, o None para todo
+            batch_size: Filas por página
+            session: Sesión a usar (default: self.session)
+
+        Yields:
+            Tuplas (id, date, description, category_name,
+            transaction_type, amount, notes) en orden (date, id)
+        """
+        session = session or self.session
+        after = None
+        while True:
+            stmt = (
+                select(
+                    Transaction.id,
+                    Transaction.date,
+                    Transaction.description,
+                    Category.name,
+                    Transaction.transaction_type,
+                    Transaction.amount,
+                    Transaction.notes,
+                )
+                .outerjoin(Category, Category.id == Transaction.category_id)
+                .where(
+                    *self._since_id_conditions(since_id),
+                    *self._after_cursor_conditions(after),
+                )
+                .order_by(Transaction.date.asc(), Transaction.id.asc())
+                .limit(batch_size)
+            )
+            page = session.execute(stmt).all()
+            for row in page:
+                yield tuple(row)
+
+            if len(page) < batch_size:
+                return
+            after = (page[-1][1], page[-1][0])
 
     # ========== CATEGORÍAS ==========
 
@@ -1305,42 +1513,73 @@ class DatabaseManager:
         color: str,
         category_type: str = "expense",
         description: Optional[str] = None,
+        keywords: Optional[List[str]] = None,
     ) -> Category:
-        """Añade una nueva categoría"""
-        category = Category(
-            name=name,
-            icon=icon,
-            color=color,
-            category_type=category_type,
-            description=description,
-            is_default=False,
+        """Añade una nueva categoría (vía la cola de escritura)"""
+        category = self._write(
+            self._write_add_category,
+            dict(
+                name=name,
+                icon=icon,
+                color=color,
+                category_type=category_type,
+                description=description,
+                is_default=False,
+            ),
+            keywords,
         )
-
-        self.session.add(category)
-        self.session.commit()
+        # Devolverla ligada a la sesión de la UI, como antes
+        return self.session.merge(category, load=False)
+
+    @staticmethod
+    def _write_add_category(session, values: Dict, keywords: Optional[List[str]]) -> Category:
+        category = Category(**values)
+        if keywords:
+            category.set_keywords_list(keywords)
+        session.add(category)
+        session.flush()
         return category
 
     def update_category(self, category_id: int, **kwargs) -> Optional[Category]:
-        """Actualiza una categoría"""
-        category = self.get_category_by_id(category_id)
-
-        if category:
-            for key, value in kwargs.items():
-                if hasattr(category, key):
-                    setattr(category, key, value)
-
-            self.session.commit()
-            return category
-
-        return None
+        """Actualiza una categoría (vía la cola de escritura)"""
+        values = {key: value for key, value in kwargs.items() if hasattr(Category, key)}
+        self._expire_ui_objects(Category, id=category_id)
+        if not self._write(self._write_update_category, category_id, values):
+            return None
+        return self.get_category_by_id(category_id)
+
+    @staticmethod
+    def _write_update_category(session, category_id: int, values: Dict) -> bool:
+        category = session.get(Category, category_id)
+        if not category:
+            return False
+        for key, value in values.items():
+            setattr(category, key, value)
+        return True
+
+    def set_category_keywords(self, category_id: int, keywords: List[str]) -> bool:
+        """Reemplaza las palabras clave de una categoría (vía la cola de escritura)"""
+        self._expire_ui_objects(Category, id=category_id)
+        return self._write(self._write_category_keywords, category_id, keywords)
+
+    @staticmethod
+    def _write_category_keywords(session, category_id: int, keywords: List[str]) -> bool:
+        category = session.get(Category, category_id)
+        if not category:
+            return False
+        category.set_keywords_list(keywords)
+        return True
 
     def delete_category(self, category_id: int) -> bool:
         """Elimina una categoría (solo si no es predeterminada)"""
-        category = self.get_category_by_id(category_id)
+        self._expire_ui_objects(Category, delete=True, id=category_id, is_default=False)
+        return self._write(self._write_delete_category, category_id)
 
+    @staticmethod
+    def _write_delete_category(session, category_id: int) -> bool:
+        category = session.get(Category, category_id)
         if category and category.is_default is False:
-            self.session.delete(category)
-            self.session.commit()
+            session.delete(category)
             return True
         return False
     
@@ -1505,64 +1744,96 @@ class DatabaseManager:
         Returns:
             bool: True si se actualizó correctamente
         """
-        from src.data.models import CategoryBudget
-        
         try:
             # Validar porcentaje
             if percentage < 0 or percentage > 100:
                 print(f"❌ Porcentaje inválido: {percentage}")
                 return False
-            
-            # Buscar si ya existe
-            existing = (
-                self.session.query(CategoryBudget)
-                .filter(
-                    CategoryBudget.year == year,
-                    CategoryBudget.month == month,
-                    CategoryBudget.category_id == category_id
-                )
-                .first()
-            )
-            
-            # Calcular monto sugerido
-            budget = self.get_monthly_budget(year, month)
-            summary = self.get_monthly_summary(year, month)
-            
-            if budget and budget.expense_limit > 0:
-                base = budget.expense_limit
-            elif summary["total_income"] > 0:
-                base = summary["total_income"]
-            else:
-                base = 0
-            
-            suggested_amount = (base * percentage / 100) if base > 0 else 0
-            
-            if existing:
-                # Actualizar existente
-                existing.percentage = percentage
-                existing.suggested_amount = suggested_amount
-                existing.notes = notes
-                existing.updated_at = datetime.now()
-            else:
-                # Crear nuevo
-                new_budget = CategoryBudget(
-                    year=year,
-                    month=month,
-                    category_id=category_id,
-                    percentage=percentage,
-                    suggested_amount=suggested_amount,
-                    notes=notes
-                )
-                self.session.add(new_budget)
-            
-            self.session.commit()
+
+            self._save_category_percentages(year, month, {category_id: percentage}, notes)
             return True
             
         except Exception as e:
             print(f"❌ Error al actualizar CategoryBudget: {e}")
-            self.session.rollback()
             return False
 
+    def _category_budget_base(self, year: int, month: int) -> float:
+        """Monto base de la distribución: límite de gastos o, si no hay, ingresos del mes"""
+        budget = self.get_monthly_budget(year, month)
+        if budget and budget.expense_limit > 0:
+            return budget.expense_limit
+
+        summary = self.get_monthly_summary(year, month)
+        if summary["total_income"] > 0:
+            return summary["total_income"]
+        return 0
+
+    @staticmethod
+    def _write_category_budgets(session, rows: List[Dict]) -> int:
+        """
+        Upsert de CategoryBudget en una sola sentencia (sin commit)
+
+        INSERT ... ON CONFLICT(year, month, category_id) DO UPDATE: sin
+        SELECT previo por categoría.
+
+        Returns:
+            int: Filas escritas
+        """
+        from src.data.models import CategoryBudget
+
+        if not rows:
+            return 0
+
+        stmt = sqlite_insert(CategoryBudget).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["year", "month", "category_id"],
+            set_={
+                "percentage": stmt.excluded.percentage,
+                "suggested_amount": stmt.excluded.suggested_amount,
+                "notes": stmt.excluded.notes,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        session.execute(stmt)
+        return len(rows)
+
+    def _save_category_percentages(
+        self,
+        year: int,
+        month: int,
+        percentages: Dict[int, float],
+        notes: Optional[str] = None,
+    ) -> int:
+        """
+        Guarda varios porcentajes con un solo upsert y un solo commit
+
+        El monto base se calcula una vez; los porcentajes fuera de 0-100
+        se omiten.
+
+        Returns:
+            int: Categorías actualizadas
+        """
+        base = self._category_budget_base(year, month)
+        now = datetime.now()
+        rows = [
+            {
+                "year": year,
+                "month": month,
+                "category_id": category_id,
+                "percentage": percentage,
+                "suggested_amount": (base * percentage / 100) if base > 0 else 0,
+                "notes": notes,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for category_id, percentage in percentages.items()
+            if 0 <= percentage <= 100
+        ]
+        from src.data.models import CategoryBudget
+
+        self._expire_ui_objects(CategoryBudget, year=year, month=month)
+        return self._write(self._write_category_budgets, rows)
+
 
     def update_category_budgets_bulk(
         self,
@@ -1612,11 +1883,8 @@ class DatabaseManager:
                         "message": f"La suma está muy por debajo, actualmente es {total:.1f}%"
                     }
             
-            # Actualizar cada categoría
-            updated_count = 0
-            for cat_id, percentage in percentages.items():
-                if self.update_category_budget(year, month, cat_id, percentage):
-                    updated_count += 1
+            # Actualizar todas las categorías en un solo commit
+            updated_count = self._save_category_percentages(year, month, percentages)
             
             # ✅ MENSAJE MEJORADO según el total
             if 99.0 <= total < 99.5:
@@ -1671,6 +1939,7 @@ class DatabaseManager:
             
             # ✅ CORRECCIÓN: Acumular correctamente
             total_assigned = 0.0
+            percentages = {}
             
             for idx, cat in enumerate(expense_categories):
                 if idx == num_categories - 1:
@@ -1683,8 +1952,10 @@ class DatabaseManager:
                     total_assigned += percentage  # ✅ CRÍTICO: Acumular AQUÍ
                     print(f"  📊 {cat.name}: {percentage}%")
                 
-                # Guardar en BD
-                self.update_category_budget(year, month, cat.id, percentage)
+                percentages[cat.id] = percentage
+            
+            # Guardar en BD (un solo commit)
+            self._save_category_percentages(year, month, percentages)
             
             print(f"✅ {num_categories} categorías inicializadas equitativamente")
             print(f"   Total asignado: {total_assigned + percentage:.2f}%")
@@ -1773,13 +2044,12 @@ class DatabaseManager:
                     )
                     print(f"  🔧 Ajuste de {difference:.2f}% aplicado a {percentages_list[0]['name']}")
             
-            # Asignar a BD
+            # Asignar a BD (un solo commit)
+            self._save_category_percentages(
+                year, month,
+                {item['id']: item['percentage'] for item in percentages_list}
+            )
             for item in percentages_list:
-                self.update_category_budget(
-                    year, month, 
-                    item['id'], 
-                    item['percentage']
-                )
                 print(f"  📊 {item['name']}: {item['percentage']}%")
             
             final_total = sum(item['percentage'] for item in percentages_list)
@@ -1832,26 +2102,160 @@ class DatabaseManager:
         from src.data.models import CategoryBudget
         
         try:
-            deleted = (
-                self.session.query(CategoryBudget)
-                .filter(
-                    CategoryBudget.year == year,
-                    CategoryBudget.month == month
-                )
-                .delete()
-            )
-            
-            self.session.commit()
+            self._expire_ui_objects(CategoryBudget, delete=True, year=year, month=month)
+            deleted = self._write(self._write_delete_category_budgets, year, month)
             print(f"✅ {deleted} configuraciones de categoría eliminadas")
             return True
             
         except Exception as e:
             print(f"❌ Error al eliminar: {e}")
-            self.session.rollback()
             return False
 
+    @staticmethod
+    def _write_delete_category_budgets(session, year: int, month: int) -> int:
+        from src.data.models import CategoryBudget
+
+        return (
+            session.query(CategoryBudget)
+            .filter(CategoryBudget.year == year, CategoryBudget.month == month)
+            .delete(synchronize_session=False)
+        )
+
     # ========== ANÁLISIS Y REPORTES ==========
 
+    @staticmethod
+    def _date_range_conditions(start_date: Optional[datetime], end_date: Optional[datetime]) -> list:
+        """Condiciones WHERE de un rango inclusive (None = sin límite)"""
+        conditions = []
+        if start_date is not None:
+            conditions.append(Transaction.date >= start_date)
+        if end_date is not None:
+            conditions.append(Transaction.date <= end_date)
+        return conditions
+
+    def iter_report_transactions(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        batch_size: int = 1000,
+        session=None,
+        newest_first: bool = True,
+    ) -> Iterator[Tuple]:
+        """
+        Recorre las transacciones de un rango con el nombre de su categoría,
+        leyendo del cursor por bloques (sin cargar objetos ORM)
+
+        Args:
+            start_date: Fecha de inicio (inclusive, None = sin límite)
+            end_date: Fecha de fin (inclusive, None = sin límite)
+            batch_size: Filas por bloque leído del cursor
+            session: Sesión a usar (default: self.session); los reportes
+                en segundo plano pasan una sesión propia
+            newest_first: Orden por fecha descendente (False = ascendente)
+
+        Yields:
+            Tuplas (date, description, category_name, transaction_type,
+            amount, notes)
+        """
+        if newest_first:
+            order = (Transaction.date.desc(), Transaction.id.desc())
+        else:
+            order = (Transaction.date.asc(), Transaction.id.asc())
+
+        stmt = (
+            select(
+                Transaction.date,
+                Transaction.description,
+                Category.name,
+                Transaction.transaction_type,
+                Transaction.amount,
+                Transaction.notes,
+            )
+            .outerjoin(Category, Category.id == Transaction.category_id)
+            .where(*self._date_range_conditions(start_date, end_date))
+            .order_by(*order)
+            .execution_options(yield_per=batch_size)
+        )
+
+        for row in (session or self.session).execute(stmt):
+            yield tuple(row)
+
+    def get_category_totals_by_range(
+        self, start_date: Optional[datetime], end_date: Optional[datetime], session=None
+    ) -> List[Dict]:
+        """
+        Totales por tipo y categoría de un rango con un solo GROUP BY
+
+        Args:
+            start_date: Fecha de inicio (inclusive, None = sin límite)
+            end_date: Fecha de fin (inclusive, None = sin límite)
+            session: Sesión a usar (default: self.session)
+
+        Returns:
+            Lista de dicts {transaction_type, category, icon, color, total,
+            count}, de mayor a menor total
+        """
+        total = func.sum(Transaction.amount)
+        results = (session or self.session).execute(
+            select(
+                Transaction.transaction_type,
+                Category.name,
+                Category.icon,
+                Category.color,
+                total.label("total"),
+                func.count(Transaction.id).label("count"),
+            )
+            .outerjoin(Category, Category.id == Transaction.category_id)
+            .where(*self._date_range_conditions(start_date, end_date))
+            .group_by(Transaction.transaction_type, Transaction.category_id)
+            .order_by(total.desc())
+        ).all()
+
+        return [
+            {
+                "transaction_type": r.transaction_type,
+                "category": r.name,
+                "icon": r.icon,
+                "color": r.color,
+                "total": float(r.total or 0.0),
+                "count": r.count,
+            }
+            for r in results
+        ]
+
+    def get_monthly_totals_by_range(
+        self, start_date: Optional[datetime], end_date: Optional[datetime], session=None
+    ) -> List[Dict]:
+        """
+        Ingresos y gastos por mes de un rango con un solo GROUP BY
+
+        Args:
+            start_date: Fecha de inicio (inclusive, None = sin límite)
+            end_date: Fecha de fin (inclusive, None = sin límite)
+            session: Sesión a usar (default: self.session)
+
+        Returns:
+            Lista de dicts {month: "YYYY-MM", total_income, total_expenses},
+            solo meses con movimientos, del más antiguo al más reciente
+        """
+        month = func.strftime("%Y-%m", Transaction.date)
+        results = (session or self.session).execute(
+            select(month.label("month"), Transaction.transaction_type, func.sum(Transaction.amount))
+            .where(*self._date_range_conditions(start_date, end_date))
+            .group_by(month, Transaction.transaction_type)
+            .order_by(month)
+        ).all()
+
+        months = {}
+        for month_key, transaction_type, total in results:
+            entry = months.setdefault(
+                month_key, {"month": month_key, "total_income": 0.0, "total_expenses": 0.0}
+            )
+            key = "total_income" if transaction_type == "income" else "total_expenses"
+            entry[key] = float(total or 0.0)
+
+        return list(months.values())
+
     def get_monthly_summary(self, year: int, month: int) -> Dict:
         """Obtiene resumen financiero del mes"""
         # ✅ IMPORTAR la función helper
@@ -2323,41 +2727,69 @@ class DatabaseManager:
         expense_limit: float = 0.0,
         savings_goal: float = 0.0,
         notes: Optional[str] = None,
+        wait: bool = True,
     ) -> MonthlyBudget:
-        """Crea o actualiza el presupuesto de un mes"""
-        budget = self.get_monthly_budget(year, month)
+        """
+        Crea o actualiza el presupuesto de un mes (vía la cola de escritura)
+
+        Con wait=False devuelve el Future de la escritura (ver _write).
+        """
+        self._expire_ui_objects(MonthlyBudget, year=year, month=month)
+        budget = self._write(
+            self._write_monthly_budget,
+            year,
+            month,
+            dict(
+                income_goal=income_goal,
+                expense_limit=expense_limit,
+                savings_goal=savings_goal,
+                notes=notes,
+            ),
+            wait=wait,
+        )
+        if not wait:
+            return budget
+        return self.session.merge(budget, load=False)
+
+    @staticmethod
+    def _write_monthly_budget(session, year: int, month: int, values: Dict) -> MonthlyBudget:
+        budget = (
+            session.query(MonthlyBudget)
+            .filter(MonthlyBudget.year == year, MonthlyBudget.month == month)
+            .first()
+        )
 
         if budget:
             # Actualizar existente
-            budget.income_goal = income_goal
-            budget.expense_limit = expense_limit
-            budget.savings_goal = savings_goal
-            budget.notes = notes
+            for field, value in values.items():
+                setattr(budget, field, value)
             budget.updated_at = datetime.now()
         else:
             # Crear nuevo
-            budget = MonthlyBudget(
-                year=year,
-                month=month,
-                income_goal=income_goal,
-                expense_limit=expense_limit,
-                savings_goal=savings_goal,
-                notes=notes,
-            )
-            self.session.add(budget)
+            budget = MonthlyBudget(year=year, month=month, **values)
+            session.add(budget)
 
-        self.session.commit()
+        session.flush()
         return budget
 
 
-    def delete_budget(self, year: int, month: int) -> bool:
-        """Elimina un presupuesto mensual"""
-        budget = self.get_monthly_budget(year, month)
-        if budget:
-            self.session.delete(budget)
-            self.session.commit()
-            return True
-        return False
+    def delete_budget(self, year: int, month: int, wait: bool = True) -> bool:
+        """
+        Elimina un presupuesto mensual (vía la cola de escritura)
+
+        Con wait=False devuelve el Future de la escritura (ver _write).
+        """
+        self._expire_ui_objects(MonthlyBudget, delete=True, year=year, month=month)
+        return self._write(self._write_delete_budget, year, month, wait=wait)
+
+    @staticmethod
+    def _write_delete_budget(session, year: int, month: int) -> bool:
+        deleted = (
+            session.query(MonthlyBudget)
+            .filter(MonthlyBudget.year == year, MonthlyBudget.month == month)
+            .delete(synchronize_session=False)
+        )
+        return deleted > 0
 
 
     def get_budget_status(self, year: int, month: int) -> Dict:
@@ -2706,4 +3138,9 @@ class DatabaseManager:
 
     def close(self):
         """Cierra la conexión a la base de datos"""
+        if self._write_queue is not None:
+            self._write_queue.close()
         self.session.close()
+        self.scoped_sessions.remove()
+        # Cerrar las conexiones del pool (checkpoint y limpieza del WAL)
+        self.engine.dispose()
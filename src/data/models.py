@@ -22,7 +22,7 @@ from sqlalchemy import (
     Text,  # ✅ NUEVO: Para almacenar keywords como JSON/texto
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import UniqueConstraint, Index
 
 class Base(DeclarativeBase):
     pass
@@ -93,6 +93,8 @@ class Transaction(Base):
     original_description: Mapped[Optional[str]] = mapped_column(
         String(255), default=None
     )
+    # ✅ NUEVO: Huella de la fila importada (NULL para transacciones manuales)
+    fingerprint: Mapped[Optional[str]] = mapped_column(String(64), default=None)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.now, onupdate=datetime.now
@@ -101,9 +103,48 @@ class Transaction(Base):
     # Relación
     category: Mapped["Category"] = relationship(back_populates="transactions")
 
+    # Constraint: Una fila importada solo puede existir una vez
+    __table_args__ = (
+        Index("ix_transactions_fingerprint", "fingerprint", unique=True),
+    )
+
     def __repr__(self):
         return f"<Transaction(date='{self.date}', type='{self.transaction_type}', amount={self.amount})>"
 
+    @staticmethod
+    def compute_fingerprint(
+        date: datetime,
+        amount: float,
+        original_description: Optional[str],
+        account: Optional[str] = None,
+        transaction_type: str = "expense",
+    ) -> str:
+        """
+        Calcula la huella de una fila importada
+
+        Usa fecha, monto, tipo (un cargo y su reembolso del mismo día no son
+        duplicados), descripción original normalizada (minúsculas, sin
+        tildes ni espacios repetidos) y la cuenta de origen.
+
+        Returns:
+            str: Hash SHA-256 en hexadecimal (64 caracteres)
+        """
+        import hashlib
+        import unicodedata
+
+        desc = unicodedata.normalize("NFKD", str(original_description or ""))
+        desc = "".join(c for c in desc if not unicodedata.combining(c))
+        desc = " ".join(desc.lower().split())
+
+        raw = "|".join([
+            date.strftime("%Y-%m-%d"),
+            f"{abs(float(amount)):.2f}",
+            str(transaction_type or "expense").strip().lower(),
+            desc,
+            str(account or "").strip().lower(),
+        ])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
 
 class MonthlyBudget(Base):
     """Modelo para presupuestos y metas de ahorro mensuales"""
@@ -168,3 +209,119 @@ class CategoryBudget(Base):
     
     def __repr__(self):
         return f"<CategoryBudget(year={self.year}, month={self.month}, category_id={self.category_id}, percentage={self.percentage}%)>"
+
+
+class ImportProfile(Base):
+    """
+    Formato de importación guardado por el usuario (mapeo de columnas)
+
+    Se selecciona automáticamente cuando la huella de los encabezados del
+    archivo coincide con header_fingerprint.
+    """
+
+    __tablename__ = "import_profiles"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(100))
+    header_fingerprint: Mapped[str] = mapped_column(String(64), unique=True)
+
+    # Se almacena como JSON string: columnas, formato de fecha, decimal y signo
+    settings: Mapped[str] = mapped_column(Text, default="{}")
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.now, onupdate=datetime.now
+    )
+
+    def __repr__(self):
+        return f"<ImportProfile(name='{self.name}')>"
+
+    def get_settings(self) -> dict:
+        """Retorna la configuración del formato como diccionario"""
+        if not self.settings:
+            return {}
+        try:
+            import json
+            return json.loads(self.settings)
+        except:
+            return {}
+
+    def set_settings(self, settings: dict):
+        """Establece la configuración del formato desde un diccionario"""
+        import json
+        self.settings = json.dumps(settings, ensure_ascii=False)
+
+
+class ExportCursor(Base):
+    """
+    Última posición exportada de una exportación incremental
+
+    La siguiente exportación incluye las transacciones con id mayor que
+    last_id (dadas de alta después, aunque tengan fecha anterior);
+    last_date es la fecha de esa última transacción.
+    """
+
+    __tablename__ = "export_cursors"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(50), unique=True)
+
+    last_date: Mapped[datetime] = mapped_column(DateTime)
+    last_id: Mapped[int] = mapped_column(Integer)
+    exported_count: Mapped[int] = mapped_column(Integer, default=0)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.now, onupdate=datetime.now
+    )
+
+    def __repr__(self):
+        return f"<ExportCursor(name='{self.name}', last_date={self.last_date}, last_id={self.last_id})>"
+
+
+# ========== REGISTROS DE SOLO LECTURA ==========
+# Filas planas para renderizar vistas: no pertenecen a ninguna sesión,
+# así que no crecen el identity map ni se recargan al hacer commit.
+
+
+class CategoryRecord:
+    """Datos de categoría necesarios para dibujar una transacción"""
+
+    __slots__ = ("id", "name", "icon", "color")
+
+    def __init__(self, id: int, name: str, icon: Optional[str], color: Optional[str]):
+        self.id = id
+        self.name = name
+        self.icon = icon
+        self.color = color
+
+    def __repr__(self):
+        return f"<CategoryRecord(name='{self.name}')>"
+
+
+class TransactionRecord:
+    """Instantánea de una transacción con su categoría ya resuelta"""
+
+    __slots__ = (
+        "id", "date", "description", "amount", "transaction_type",
+        "category_id", "notes", "category",
+    )
+
+    def __init__(self, id, date, description, amount, transaction_type,
+                 category_id, notes, category_name=None, category_icon=None,
+                 category_color=None):
+        self.id = id
+        self.date = date
+        self.description = description
+        self.amount = amount
+        self.transaction_type = transaction_type
+        self.category_id = category_id
+        self.notes = notes
+        self.category = (
+            CategoryRecord(category_id, category_name, category_icon, category_color)
+            if category_name is not None
+            else None
+        )
+
+    def __repr__(self):
+        return f"<TransactionRecord(date='{self.date}', type='{self.transaction_type}', amount={self.amount})>"
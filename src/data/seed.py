@@ -0,0 +1,37 @@
+"""
+Datos iniciales (categorías y palabras clave por defecto)
+Archivo: src/data/seed.py
+
+Los datos viven en default_seed.json y solo se leen cuando hay que
+sembrar o restaurar palabras clave; en un arranque normal basta con
+comparar SEED_VERSION con la versión guardada en la tabla meta.
+"""
+
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List
+
+# Incrementar al cambiar default_seed.json para que las BD existentes
+# vuelvan a sembrar: se crean las categorías que falten (por nombre y
+# tipo) y se agregan las palabras clave que falten a cada categoría
+SEED_VERSION = 1
+
+SEED_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "default_seed.json")
+
+
+@lru_cache(maxsize=1)
+def load_seed() -> Dict:
+    """Lee default_seed.json (una sola vez por proceso)"""
+    with open(SEED_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def default_categories() -> List[Dict]:
+    """Categorías predeterminadas: {name, icon, color, category_type, description}"""
+    return load_seed()["categories"]
+
+
+def default_keywords(category_type: str) -> Dict[str, List[str]]:
+    """Palabras clave por defecto por nombre de categoría ("expense" o "income")"""
+    return load_seed()["keywords"]["income" if category_type == "income" else "expense"]
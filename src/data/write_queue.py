@@ -0,0 +1,177 @@
+"""
+Cola de escritura única para SQLite (group commit)
+Archivo: src/data/write_queue.py
+
+Un hilo propio con su event loop de asyncio ejecuta todas las mutaciones
+en orden. Lo que se encoló mientras el escritor confirmaba el grupo
+anterior se confirma junto: una ráfaga de ediciones cuesta pocos commits
+(un fsync del WAL cada uno) en lugar de uno por operación. Una operación
+sola se confirma de inmediato, sin esperar a otras.
+
+Cada operación corre en su propio SAVEPOINT: si falla, solo se revierte
+ella y el resto del grupo se confirma. Los Future se resuelven después
+del commit, así que quien espera ya ve los datos en la BD.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class WriteQueue:
+    """
+    Escritor único con group commit
+
+    Uso:
+        queue = WriteQueue(db.session_factory)
+        future = queue.submit(operation, arg)       # desde cualquier hilo
+        result = queue.run(operation, arg)          # espera el commit
+        result = await queue.run_async(operation)   # desde una corrutina
+
+    operation(session, *args, **kwargs) se ejecuta en el hilo escritor y
+    no debe confirmar: la cola hace un commit por grupo. Una operación no
+    debe encolar y esperar otra escritura (bloquearía al escritor).
+    """
+
+    # Si ya hay una ráfaga encolada, tiempo que se sigue esperando por más
+    # operaciones antes de confirmar (una operación sola no espera)
+    WINDOW_SECONDS = 0.005
+    # Máximo de operaciones por commit
+    MAX_BATCH = 500
+
+    def __init__(self, session_factory, window: Optional[float] = None,
+                 max_batch: Optional[int] = None):
+        self.session_factory = session_factory
+        self.window = self.WINDOW_SECONDS if window is None else window
+        self.max_batch = max_batch or self.MAX_BATCH
+
+        # Estadísticas (commits confirmados y operaciones atendidas)
+        self.commits = 0
+        self.operations = 0
+
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+
+    # ========== CICLO DE VIDA ==========
+
+    def start(self):
+        """Inicia el hilo escritor (idempotente)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            ready = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run_loop, args=(ready,), name="db-writer", daemon=True
+            )
+            self._thread.start()
+            ready.wait()
+
+    def close(self):
+        """Confirma lo pendiente y detiene el hilo escritor"""
+        with self._lock:
+            if self._thread is None:
+                return
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, None)
+            self._thread.join()
+            self._thread = None
+            self._loop = None
+            self._queue = None
+
+    def _run_loop(self, ready: threading.Event):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        ready.set()
+        try:
+            loop.run_until_complete(self._writer())
+        finally:
+            loop.close()
+
+    # ========== ENCOLAR ==========
+
+    def submit(self, operation: Callable, *args, **kwargs) -> Future:
+        """Encola una operación; el Future se resuelve tras su commit"""
+        self.start()
+        future = Future()
+        self._loop.call_soon_threadsafe(
+            self._queue.put_nowait, (operation, args, kwargs, future)
+        )
+        return future
+
+    def run(self, operation: Callable, *args, **kwargs) -> Any:
+        """Encola una operación y espera su resultado (o su excepción)"""
+        return self.submit(operation, *args, **kwargs).result()
+
+    async def run_async(self, operation: Callable, *args, **kwargs) -> Any:
+        """Como run(), para manejadores async (no bloquea el loop de quien llama)"""
+        return await asyncio.wrap_future(self.submit(operation, *args, **kwargs))
+
+    # ========== ESCRITOR ==========
+
+    async def _writer(self):
+        """
+        Confirma cada grupo una vez
+
+        El grupo es lo que ya está encolado. Si la cola queda vacía tras la
+        primera operación se confirma enseguida; si hay una ráfaga en curso
+        se sigue juntando hasta la ventana o max_batch.
+        """
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            stop = False
+            deadline = self._loop.time() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - self._loop.time()
+                try:
+                    if timeout <= 0 or len(batch) == 1:
+                        item = self._queue.get_nowait()
+                    else:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._commit_batch(batch)
+            if stop:
+                return
+
+    def _commit_batch(self, batch: List[Tuple]):
+        """Ejecuta el grupo en una sesión (un SAVEPOINT por operación) y confirma una vez"""
+        outcomes = []
+        session = self.session_factory(expire_on_commit=False)
+        try:
+            for operation, args, kwargs, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    with session.begin_nested():
+                        result = operation(session, *args, **kwargs)
+                    outcomes.append((future, result, None))
+                except Exception as e:
+                    outcomes.append((future, None, e))
+
+            session.commit()
+            self.commits += 1
+        except Exception as e:
+            session.rollback()
+            outcomes = [(future, None, error or e) for future, _, error in outcomes]
+        finally:
+            session.close()
+
+        self.operations += len(outcomes)
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
@@ -5,6 +5,7 @@ Archivo: src/main.py
 
 import sys
 import os
+import importlib.util
 
 # Agregar el directorio raíz del proyecto al path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -46,16 +47,20 @@ def check_android():
     
     print(f"\n   🎯 Resultado: {'ANDROID' if is_android else 'DESKTOP'}")
     
-    # Check modules
+    # Check modules (find_spec solo los ubica, no los importa: openpyxl y
+    # compañía se cargan la primera vez que se usan)
     print("\n🔍 Verificando módulos críticos:")
     modules = ['flet', 'sqlalchemy', 'openpyxl', 'certifi', 'dateutil']
     for mod in modules:
         try:
-            __import__(mod)
+            found = importlib.util.find_spec(mod) is not None
+        except (ImportError, ValueError):
+            found = False
+        if found:
             print(f"   ✅ {mod}: OK")
-        except ImportError as e:
-            print(f"   ❌ {mod}: NO ENCONTRADO ({e})")
-            
+        else:
+            print(f"   ❌ {mod}: NO ENCONTRADO")
+
     return is_android
 
 IS_ANDROID = check_android()
@@ -95,23 +100,16 @@ DatabaseManager = safe_import('src.data.database', 'DatabaseManager')
 AuthManager = safe_import('src.business.auth_manager', 'AuthManager')
 LoginView = safe_import('src.ui.login_view', 'LoginView')
 
-# Importar vistas
-print("\n   📱 Cargando vistas...")
-try:
-    from src.ui import (
-        HomeView,
-        BudgetView,
-        AddTransactionView,
-        HistoryView,
-        ChartsView,
-        CategoriesView,
-        SettingsView
-    )
-    print("   ✅ Todas las vistas importadas")
-except Exception as e:
-    print(f"   ❌ Error importando vistas: {e}")
-    HomeView = BudgetView = AddTransactionView = None
-    HistoryView = ChartsView = CategoriesView = SettingsView = None
+# Vistas: se importan al navegar a ellas por primera vez (get_or_create_view)
+VIEW_MODULES = {
+    "home": ("src.ui.home_view", "HomeView"),
+    "add": ("src.ui.add_transaction_view", "AddTransactionView"),
+    "history": ("src.ui.history_view", "HistoryView"),
+    "charts": ("src.ui.charts_view", "ChartsView"),
+    "categories": ("src.ui.categories_view", "CategoriesView"),
+    "budget": ("src.ui.budget_view", "BudgetView"),
+    "settings": ("src.ui.settings_view", "SettingsView"),
+}
 
 print("\n" + "="*70)
 
@@ -605,6 +603,16 @@ class ExpenseTrackerApp:
         """Maneja cambios de mes"""
         self.current_month = month
         self.current_year = year
+
+        # Las vistas que lo soportan se actualizan en su lugar (solo los
+        # controles que cambian); el resto se reconstruye
+        view = self.views.get(self.current_view)
+        if view is not None and view.content is not None:
+            try:
+                if view.update_data(year, month):
+                    return
+            except Exception as e:
+                print(f"⚠️ Actualización incremental falló, reconstruyendo: {e}")
         self.refresh_current_view()
 
     def get_or_create_view(self, view_name: str):
@@ -613,17 +621,11 @@ class ExpenseTrackerApp:
             return self.views[view_name]
 
         try:
-            view_classes = {
-                "home": HomeView,
-                "add": AddTransactionView,
-                "history": HistoryView,
-                "charts": ChartsView,
-                "categories": CategoriesView,
-                "budget": BudgetView,
-                "settings": SettingsView,
-            }
-            
-            ViewClass = view_classes.get(view_name)
+            if view_name not in VIEW_MODULES:
+                return None
+
+            # Primera navegación: importar el módulo de la vista
+            ViewClass = safe_import(*VIEW_MODULES[view_name])
             if not ViewClass:
                 return None
             
@@ -666,11 +668,22 @@ class ExpenseTrackerApp:
             view = self.get_or_create_view(view_name)
             
             if view:
-                if hasattr(view, 'current_month'):
-                    view.current_month = self.current_month
-                    view.current_year = self.current_year
-                
-                content = view.build()
+                updated = False
+                if view.content is not None:
+                    try:
+                        updated = view.update_data(self.current_year, self.current_month)
+                    except Exception as e:
+                        print(f"⚠️ Actualización incremental falló, reconstruyendo: {e}")
+
+                if updated:
+                    # Vista en cache: se reutilizan sus controles
+                    content = view.content
+                else:
+                    if hasattr(view, 'current_month'):
+                        view.current_month = self.current_month
+                        view.current_year = self.current_year
+
+                    content = view.content = view.build()
                 self.main_container.content = content
                 print(f"✅ Vista {view_name} cargada")
             else:
@@ -734,15 +747,10 @@ class ExpenseTrackerApp:
             print(f"🔄 RECARGA COMPLETA DE VISTA: {self.current_view}")
             print(f"{'='*60}")
             
-            # ✅ PASO 1: Refrescar sesión de BD
+            # ✅ PASO 1: Descartar el estado de la sesión de BD
             try:
                 print(f"  💾 Refrescando sesión de base de datos...")
-                self.db.session.close()
-                
-                from sqlalchemy.orm import sessionmaker
-                Session = sessionmaker(bind=self.db.engine)
-                self.db.session = Session()
-                
+                self.db.reset_session()
                 print(f"  ✅ Sesión de BD refrescada")
             except Exception as db_error:
                 print(f"  ⚠️ Error al refrescar sesión BD: {db_error}")
@@ -799,10 +807,9 @@ class ExpenseTrackerApp:
         ✅ NUEVO: Fuerza actualización completa después de importación masiva
         
         Este es el método MÁS AGRESIVO para refrescar:
-        1. Cierra completamente la sesión de BD
-        2. Crea una nueva sesión desde cero (scoped_session)
-        3. Limpia cache de todas las vistas
-        4. Reconstruye la vista actual
+        1. Descarta el estado de la sesión de BD (db.reset_session)
+        2. Limpia cache de todas las vistas
+        3. Reconstruye la vista actual
         
         Úsalo cuando:
         - Se importan 100+ transacciones
@@ -814,36 +821,14 @@ class ExpenseTrackerApp:
             print(f"🔄 REFRESH COMPLETO POST-IMPORTACIÓN")
             print(f"{'='*60}")
             
-            # ✅ PASO 1: Cerrar sesión actual completamente
-            if hasattr(self.db, 'session'):
-                try:
-                    print(f"  💾 Cerrando sesión actual...")
-                    self.db.session.close()
-                    print(f"  ✅ Sesión cerrada")
-                except Exception as close_error:
-                    print(f"  ⚠️ Error al cerrar sesión: {close_error}")
-            
-            # ✅ PASO 2: Recrear sesión con scoped_session (thread-safe)
+            # ✅ PASO 1-2: Descartar el estado de la sesión (identity map)
             try:
-                print(f"  💾 Creando nueva sesión...")
-                from sqlalchemy.orm import sessionmaker, scoped_session
-                
-                # Crear nueva sesión con scope
-                Session = scoped_session(sessionmaker(bind=self.db.engine))
-                self.db.session = Session()
-                
-                print(f"  ✅ Nueva sesión creada (scoped)")
+                print(f"  💾 Refrescando sesión de base de datos...")
+                self.db.reset_session()
+                print(f"  ✅ Sesión de BD refrescada")
             except Exception as session_error:
-                print(f"  ⚠️ Error creando sesión: {session_error}")
-                # Intentar método simple como fallback
-                try:
-                    from sqlalchemy.orm import sessionmaker
-                    Session = sessionmaker(bind=self.db.engine)
-                    self.db.session = Session()
-                    print(f"  ✅ Nueva sesión creada (simple)")
-                except Exception as fallback_error:
-                    print(f"  ❌ No se pudo crear sesión: {fallback_error}")
-                    return False
+                print(f"  ❌ No se pudo refrescar la sesión: {session_error}")
+                return False
             
             # ✅ PASO 3: Limpiar TODAS las vistas del cache
             print(f"  🗑️ Limpiando cache de vistas...")
@@ -1,22 +1,28 @@
 """
 Módulo UI - Vistas de la aplicación TermoWallet
 Archivo: src/ui/__init__.py
+
+Las vistas se importan al pedirlas (from src.ui import HomeView): así
+importar src.ui.login_view no carga todas las vistas al arrancar.
 """
 
-from .home_view import HomeView
-from .budget_view import BudgetView
-from .add_transaction_view import AddTransactionView
-from .history_view import HistoryView
-from .charts_view import ChartsView
-from .categories_view import CategoriesView
-from .settings_view import SettingsView
+import importlib
+
+_VIEW_MODULES = {
+    'HomeView': '.home_view',
+    'BudgetView': '.budget_view',
+    'AddTransactionView': '.add_transaction_view',
+    'HistoryView': '.history_view',
+    'ChartsView': '.charts_view',
+    'CategoriesView': '.categories_view',
+    'SettingsView': '.settings_view',
+}
+
+__all__ = list(_VIEW_MODULES)
+
 
-__all__ = [
-    'HomeView',
-    "BudgetView",
-    'AddTransactionView',
-    'HistoryView',
-    'ChartsView',
-    'CategoriesView',
-    'SettingsView'
-]
+def __getattr__(name):
+    if name in _VIEW_MODULES:
+        module = importlib.import_module(_VIEW_MODULES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
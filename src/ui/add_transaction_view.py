@@ -7,6 +7,7 @@ import flet as ft
 from datetime import datetime
 from .base_view import BaseView
 from src.utils.config import Config
+from src.utils.background import BackgroundJob
 from src.business.processor import TransactionProcessor
 
 
@@ -157,7 +158,9 @@ class AddTransactionView(BaseView):
             print(f"   Tipo: {transaction_type}")
             print(f"   Categoría ID: {category_id}")
             
-            self.db.add_transaction(
+            # ✅ Encolar sin esperar el commit: guardar varias seguidas se
+            # agrupa en un solo commit; el resultado llega a _on_transaction_saved
+            future = self.db.add_transaction(
                 date=date,
                 description=description,
                 amount=amount,
@@ -165,25 +168,14 @@ class AddTransactionView(BaseView):
                 transaction_type=transaction_type,
                 notes=notes,
                 source="manual",
+                wait=False,
+            )
+            self.when_written(
+                future,
+                lambda saved: self._on_transaction_saved(saved.category_id, saved.date,
+                                                         saved.transaction_type),
+                self._on_transaction_save_error,
             )
-
-            # ✅ Verificar alertas de presupuesto SOLO para gastos
-            if transaction_type == "expense":
-                alert = self.db.check_category_budget_alert(
-                    category_id, 
-                    date.year, 
-                    date.month
-                )
-                
-                if alert["has_alert"]:
-                    # Mostrar diálogo de alerta
-                    self.show_budget_alert_dialog(alert)
-                else:
-                    # Si no hay alerta, mostrar mensaje normal
-                    self.show_snackbar("✅ Transacción guardada exitosamente")
-            else:
-                # Para ingresos, mostrar mensaje normal
-                self.show_snackbar("✅ Ingreso registrado exitosamente")
 
             # ✅ Limpiar campos después de guardar
             self.amount_field.value = ""
@@ -196,8 +188,6 @@ class AddTransactionView(BaseView):
             self.amount_field.focus()
             
             self.page.update()
-            
-            print("✅ Transacción guardada correctamente\n")
 
         except Exception as ex:
             import traceback
@@ -207,6 +197,32 @@ class AddTransactionView(BaseView):
         finally:
             self.is_saving = False
 
+    def _on_transaction_saved(self, category_id: int, date: datetime, transaction_type: str):
+        """La transacción ya está confirmada: alertas de presupuesto y aviso"""
+        print("✅ Transacción guardada correctamente\n")
+
+        # ✅ Verificar alertas de presupuesto SOLO para gastos
+        if transaction_type == "expense":
+            alert = self.db.check_category_budget_alert(
+                category_id, 
+                date.year, 
+                date.month
+            )
+            
+            if alert["has_alert"]:
+                # Mostrar diálogo de alerta
+                self.show_budget_alert_dialog(alert)
+            else:
+                # Si no hay alerta, mostrar mensaje normal
+                self.show_snackbar("✅ Transacción guardada exitosamente")
+        else:
+            # Para ingresos, mostrar mensaje normal
+            self.show_snackbar("✅ Ingreso registrado exitosamente")
+
+    def _on_transaction_save_error(self, error: Exception):
+        print(f"\n❌ ERROR AL GUARDAR TRANSACCIÓN: {error}")
+        self.show_snackbar(f"Error: {str(error)}", error=True)
+
 
     def show_budget_alert_dialog(self, alert: dict):
         """
@@ -493,8 +509,22 @@ class AddTransactionView(BaseView):
             )
 
         def on_file_result(e: ft.FilePickerResultEvent):
-            if e.files:
-                self.process_import_file(e.files[0].path)
+            if not e.files:
+                return
+
+            file_path = e.files[0].path
+            if self.processor.is_excel(file_path):
+                try:
+                    sheets = self.processor.get_excel_sheets(file_path)
+                except Exception as ex:
+                    self.show_snackbar(f"Error al leer el archivo: {str(ex)}", error=True)
+                    return
+
+                if len(sheets) > 1:
+                    self.show_sheet_picker_dialog(file_path, sheets)
+                    return
+
+            self.start_import(file_path)
 
         file_picker = ft.FilePicker(on_result=on_file_result)
         self.page.overlay.append(file_picker)
@@ -529,255 +559,500 @@ class AddTransactionView(BaseView):
         dialog.open = True
         self.page.update()
 
+    def show_sheet_picker_dialog(self, file_path: str, sheets: list):
+        """Permite elegir qué hoja del libro de Excel importar"""
+        sheet_dropdown = ft.Dropdown(
+            label="Hoja",
+            value=sheets[0],
+            options=[ft.dropdown.Option(name) for name in sheets],
+        )
+
+        def on_import(e):
+            self.start_import(file_path, sheet_dropdown.value)
+
+        dialog = ft.AlertDialog(
+            title=ft.Text("Seleccionar hoja"),
+            content=ft.Column(
+                [
+                    ft.Text("El archivo tiene varias hojas. ¿Cuál deseas importar?"),
+                    sheet_dropdown,
+                ],
+                tight=True,
+            ),
+            actions=[
+                ft.TextButton("Cancelar", on_click=lambda _: self.close_dialog()),
+                ft.ElevatedButton("Importar", on_click=on_import),
+            ],
+        )
+
+        self.show_dialog(dialog)
+
+    def start_import(self, file_path: str, sheet_name: str = None):
+        """
+        Reconoce el formato del archivo por sus encabezados
+
+        Si coincide con un formato conocido (banco o guardado por el usuario)
+        importa directamente; si no, pide confirmar el mapeo de columnas.
+        """
+        self.processor.register_profiles(self.db.get_import_profiles())
+
+        try:
+            headers = self.processor.read_headers(file_path, sheet_name)
+        except Exception as ex:
+            self.close_dialog()
+            self.show_snackbar(f"Error al leer el archivo: {str(ex)}", error=True)
+            return
+
+        if not any(headers):
+            self.close_dialog()
+            self.show_snackbar("El archivo está vacío", error=True)
+            return
+
+        profile = self.processor.match_profile(headers)
+        if profile:
+            print(f"🏦 Formato reconocido: {profile['name']}")
+            self.process_import_file(file_path, sheet_name)
+        else:
+            self.close_dialog()
+            self.show_column_mapping_dialog(file_path, sheet_name, headers)
+
+    def show_column_mapping_dialog(self, file_path: str, sheet_name: str, headers: list):
+        """Permite confirmar o corregir qué columna corresponde a cada campo"""
+        detected = self.processor.detect_column_indices(headers)
+        options = [
+            ft.dropdown.Option(key=str(idx), text=name or f"Columna {idx + 1}")
+            for idx, name in enumerate(headers)
+        ]
+
+        def field_dropdown(label, field, optional=False):
+            field_options = list(options)
+            if optional:
+                field_options.insert(0, ft.dropdown.Option(key="", text="— Ninguna —"))
+            value = detected.get(field)
+            return ft.Dropdown(
+                label=label,
+                value=str(value) if value is not None else ("" if optional else None),
+                options=field_options,
+            )
+
+        date_dropdown = field_dropdown("Fecha", "fecha")
+        desc_dropdown = field_dropdown("Descripción", "descripcion")
+        amount_dropdown = field_dropdown("Monto", "monto")
+        type_dropdown = field_dropdown("Tipo (opcional)", "tipo", optional=True)
+
+        save_checkbox = ft.Checkbox(label="Guardar este formato", value=False)
+        name_field = ft.TextField(label="Nombre del formato", hint_text="Ej: Mi banco")
+
+        def on_import(e):
+            required = {
+                "fecha": date_dropdown.value,
+                "descripcion": desc_dropdown.value,
+                "monto": amount_dropdown.value,
+            }
+            if not all(required.values()):
+                self.show_snackbar("Selecciona las columnas de fecha, descripción y monto", error=True)
+                return
+
+            column_indices = {field: int(value) for field, value in required.items()}
+            if type_dropdown.value:
+                column_indices["tipo"] = int(type_dropdown.value)
+
+            profile_name = None
+            if save_checkbox.value:
+                profile_name = (name_field.value or "").strip()
+                if not profile_name:
+                    self.show_snackbar("Escribe un nombre para el formato", error=True)
+                    return
+
+            self.process_import_file(file_path, sheet_name, column_indices, profile_name)
+
+        dialog = ft.AlertDialog(
+            title=ft.Text("Columnas del archivo"),
+            content=ft.Column(
+                [
+                    ft.Text(
+                        "No se reconoció el formato. Confirma qué columna corresponde a cada campo.",
+                        size=12,
+                    ),
+                    date_dropdown,
+                    desc_dropdown,
+                    amount_dropdown,
+                    type_dropdown,
+                    save_checkbox,
+                    name_field,
+                ],
+                tight=True,
+                scroll=ft.ScrollMode.AUTO,
+            ),
+            actions=[
+                ft.TextButton("Cancelar", on_click=lambda _: self.close_dialog()),
+                ft.ElevatedButton("Importar", on_click=on_import),
+            ],
+        )
+
+        self.show_dialog(dialog)
+
     """
-    ✅ REEMPLAZAR COMPLETAMENTE el método process_import_file 
-    EN: src/ui/add_transaction_view.py
-
-    Este método ahora:
-    1. Procesa en lotes de 100
-    2. Hace commit por lote
-    3. Refresca la sesión al finalizar
-    4. Recarga automáticamente la vista
+    Importación masiva en segundo plano:
+    1. process_import_file() prepara el categorizador (hilo de la UI) y
+       abre un diálogo de progreso con botón Cancelar
+    2. _import_worker() lee, limpia, categoriza e inserta por lotes
+       (Config.IMPORT_BATCH_SIZE) con una sesión propia y un único commit;
+       si se cancela, hace rollback y no queda nada guardado
+    3. _on_import_done() muestra el resumen y recarga la vista
     """
 
-    def process_import_file(self, file_path: str):
-        """✅ MEJORADO: Gestiona correctamente las transacciones masivas con recarga automática"""
+    def process_import_file(self, file_path: str, sheet_name: str = None,
+                            column_indices: dict = None, profile_name: str = None):
+        """
+        Lanza la importación del archivo en segundo plano
+
+        Args:
+            file_path: Archivo CSV o Excel
+            sheet_name: Hoja de Excel (default: hoja activa)
+            column_indices: Mapeo manual de columnas (default: automático)
+            profile_name: Si se indica, guarda el mapeo como formato al terminar
+        """
         self.close_dialog()
-        self.show_snackbar("Procesando archivo...")
+
+        if getattr(self, "import_job", None) is not None and not self.import_job.done:
+            self.show_snackbar("Ya hay una importación en curso", error=True)
+            return
 
         try:
-            # ============================================================
-            # PASO 1: CARGAR Y VALIDAR ARCHIVO
-            # ============================================================
-            
-            success, message = self.processor.load_file(file_path)
+            categories_map_expense, categories_map_income = self._prepare_import_categorizer()
+        except Exception as ex:
+            self.on_error(ex, "Error al preparar la importación")
+            return
+
+        self.import_job = BackgroundJob("importación", on_progress=self._on_import_progress)
+        self._show_import_progress_dialog()
+
+        self.import_job.start(
+            self._import_worker,
+            file_path,
+            sheet_name,
+            categories_map_expense,
+            categories_map_income,
+            column_indices,
+            profile_name,
+            page=self.page,
+            on_done=self._on_import_done,
+            on_error=self._on_import_error,
+            on_cancelled=self._on_import_cancelled,
+        )
+
+    def _prepare_import_categorizer(self):
+        """
+        Carga las palabras clave de la BD en el categorizador del procesador
+
+        Returns:
+            (categories_map_expense, categories_map_income)
+        """
+        categories_expense = self.db.get_all_categories("expense")
+        categories_income = self.db.get_all_categories("income")
+
+        from src.business.categorizer import TransactionCategorizer
+        categorizer = TransactionCategorizer()
+        
+        # Cargar palabras clave de gastos
+        for cat in categories_expense:
+            keywords_from_db = cat.get_keywords_list()
+            if keywords_from_db:
+                categorizer.set_keywords(cat.name, keywords_from_db, "expense")
+        
+        # Cargar palabras clave de ingresos
+        for cat in categories_income:
+            keywords_from_db = cat.get_keywords_list()
+            if keywords_from_db:
+                categorizer.set_keywords(cat.name, keywords_from_db, "income")
+        
+        self.processor.categorizer = categorizer
+
+        # Crear mapas de categorías
+        categories_map_expense = {}
+        for cat in categories_expense:
+            try:
+                categories_map_expense[int(cat.id)] = str(cat.name)
+            except:
+                continue
+
+        categories_map_income = {}
+        for cat in categories_income:
+            try:
+                categories_map_income[int(cat.id)] = str(cat.name)
+            except:
+                continue
+
+        return categories_map_expense, categories_map_income
+
+    def _import_worker(self, job: BackgroundJob, file_path: str, sheet_name: str,
+                       categories_map_expense: dict, categories_map_income: dict,
+                       column_indices: dict = None, profile_name: str = None) -> dict:
+        """
+        Ejecuta la importación completa (hilo en segundo plano)
+
+        Raises:
+            ValueError: Si el archivo no es válido
+            JobCancelled: Si el usuario canceló (tras hacer rollback)
+        """
+        processor = self.processor
+        streaming = processor.is_excel(file_path)
+
+        # ============================================================
+        # PASO 1: CARGAR Y VALIDAR ARCHIVO
+        # ============================================================
+
+        job.update(stage="Leyendo archivo...")
+
+        if streaming:
+            # Excel: solo se leen los encabezados; las filas se
+            # recorren en streaming durante la inserción
+            success, message = processor.prepare_excel_stream(file_path, sheet_name, column_indices)
             if not success:
-                self.show_snackbar(message, error=True)
-                return
+                raise ValueError(message)
 
-            success, message = self.processor.validate_columns()
+            job.update(total=processor.stream_source.get("estimated_rows"))
+            chunks = processor.iter_import_chunks(
+                categories_map_expense,
+                categories_map_income,
+                chunk_size=Config.IMPORT_BATCH_SIZE,
+            )
+        else:
+            success, message = processor.load_file(file_path)
             if not success:
-                self.show_snackbar(message, error=True)
-                return
+                raise ValueError(message)
 
-            success, message = self.processor.clean_data()
+            success, message = processor.validate_columns(column_indices)
             if not success:
-                self.show_snackbar(message, error=True)
-                return
+                raise ValueError(message)
 
-            # ============================================================
-            # PASO 2: CONFIGURAR CATEGORIZADOR
-            # ============================================================
-            
-            categories_expense = self.db.get_all_categories("expense")
-            categories_income = self.db.get_all_categories("income")
+            job.check_cancelled()
+            job.update(stage="Limpiando datos...")
+            success, message = processor.clean_data()
+            if not success:
+                raise ValueError(message)
 
-            from src.business.categorizer import TransactionCategorizer
-            categorizer = TransactionCategorizer()
-            
-            # Cargar palabras clave de gastos
-            for cat in categories_expense:
-                keywords_from_db = cat.get_keywords_list()
-                if keywords_from_db:
-                    categorizer.set_keywords(cat.name, keywords_from_db, "expense")
-            
-            # Cargar palabras clave de ingresos
-            for cat in categories_income:
-                keywords_from_db = cat.get_keywords_list()
-                if keywords_from_db:
-                    categorizer.set_keywords(cat.name, keywords_from_db, "income")
-            
-            self.processor.categorizer = categorizer
+            job.check_cancelled()
+            job.update(stage="Categorizando transacciones...")
+            processor.categorize_transactions(categories_map_expense, categories_map_income)
 
-            # Crear mapas de categorías
-            categories_map_expense = {}
-            for cat in categories_expense:
-                try:
-                    categories_map_expense[int(cat.id)] = str(cat.name)
-                except:
-                    continue
+            processed_data = processor.get_processed_data()
+            job.update(total=len(processed_data))
+            size = Config.IMPORT_BATCH_SIZE
+            chunks = (processed_data[i:i + size] for i in range(0, len(processed_data), size))
 
-            categories_map_income = {}
-            for cat in categories_income:
-                try:
-                    categories_map_income[int(cat.id)] = str(cat.name)
-                except:
-                    continue
-
-            # Categorizar
-            self.processor.categorize_transactions(
-                categories_map_expense, 
-                categories_map_income
-            )
+        # ============================================================
+        # PASO 2: INSERCIÓN MASIVA EN LOTES
+        # ============================================================
 
-            # ============================================================
-            # PASO 3: INSERCIÓN MASIVA EN LOTES
-            # ============================================================
-            
-            processed_data = self.processor.get_processed_data()
-            
-            print(f"\n{'='*60}")
-            print(f"📦 IMPORTACIÓN MASIVA")
-            print(f"{'='*60}")
-            print(f"   Total a insertar: {len(processed_data)}")
-            print(f"{'='*60}\n")
-            
-            BATCH_SIZE = 100
-            total_inserted = 0
-            total_failed = 0
-            
-            for i in range(0, len(processed_data), BATCH_SIZE):
-                batch = processed_data[i:i + BATCH_SIZE]
-                batch_num = (i // BATCH_SIZE) + 1
-                
-                try:
-                    print(f"  📦 Lote {batch_num}: Insertando {len(batch)} transacciones...")
-                    
-                    # Insertar el lote
-                    count = self.db.add_transactions_bulk(batch)
-                    
-                    # ✅ COMMIT EXPLÍCITO después de cada lote
-                    self.db.session.commit()
-                    
-                    total_inserted += count
-                    print(f"  ✅ Lote {batch_num}: {count} transacciones insertadas y confirmadas")
-                    
-                except Exception as batch_error:
-                    print(f"  ❌ Error en lote {batch_num}: {batch_error}")
-                    
-                    # Rollback del lote fallido
-                    try:
-                        self.db.session.rollback()
-                    except:
-                        pass
-                    
-                    total_failed += len(batch)
-                    continue
-            
-            # ============================================================
-            # PASO 4: REFRESCAR SESIÓN DE BD
-            # ============================================================
+        job.check_cancelled()
+        job.update(stage="Guardando transacciones...")
+
+        print(f"\n{'='*60}")
+        print(f"📦 IMPORTACIÓN MASIVA{' (streaming)' if streaming else ''}")
+        print(f"{'='*60}\n")
+
+        # ✅ Una sola operación de la cola de escritura con SAVEPOINT por
+        # lote: un lote fallido se revierte sin perder los demás, todo se
+        # confirma con un único commit del hilo escritor y cancelar (la
+        # excepción sale de la operación) revierte todo
+        result = {"inserted": 0, "failed": 0, "duplicates": 0}
+
+        def insert_chunks(session):
+            for chunk in chunks:
+                job.check_cancelled()
+                stats = self.db.import_transactions_bulk(chunk, session=session)
+                result["inserted"] += stats["inserted"]
+                result["failed"] += stats["failed"]
+                result["duplicates"] += stats["duplicates"]
+                job.update(processed=job.processed + len(chunk))
+
+            job.check_cancelled()
+            job.update(stage="Confirmando cambios...")
+
+        self.db.write_queue.run(insert_chunks)
+
+        summary = processor.stream_stats if streaming else processor.get_summary()
+        result["count_expenses"] = summary.get("count_expenses", 0)
+        result["count_income"] = summary.get("count_income", 0)
+        result["new_profile"] = processor.build_profile_from_mapping(profile_name) if profile_name else None
+
+        return result
+
+    def _show_import_progress_dialog(self):
+        """Muestra el diálogo de progreso de la importación"""
+        self.import_stage_text = ft.Text("Preparando importación...", weight=ft.FontWeight.BOLD)
+        self.import_progress_bar = ft.ProgressBar(value=None, width=300)
+        self.import_rows_text = ft.Text("", size=12, color=ft.Colors.GREY_600)
+        self.import_cancel_button = ft.TextButton("Cancelar", on_click=self._cancel_import)
+
+        dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("Importando transacciones"),
+            content=ft.Column(
+                [
+                    self.import_stage_text,
+                    self.import_progress_bar,
+                    self.import_rows_text,
+                ],
+                tight=True,
+            ),
+            actions=[self.import_cancel_button],
+        )
+
+        self.show_dialog(dialog)
+
+    def _cancel_import(self, e):
+        """Pide cancelar la importación en curso"""
+        if getattr(self, "import_job", None) is None or self.import_job.done:
+            return
+
+        self.import_job.cancel()
+        self.import_stage_text.value = "Cancelando..."
+        self.import_cancel_button.disabled = True
+        self.page.update()
+
+    def _on_import_progress(self, job: BackgroundJob):
+        """Refleja la etapa y las filas procesadas en el diálogo"""
+        if job.cancelled:
+            return
+
+        self.import_stage_text.value = job.stage
+        self.import_progress_bar.value = job.progress
+
+        if job.total:
+            self.import_rows_text.value = f"{job.processed:,} de ~{job.total:,} filas"
+        elif job.processed:
+            self.import_rows_text.value = f"{job.processed:,} filas"
+
+        try:
+            self.page.update()
+        except Exception:
+            pass
+
+    def _on_import_error(self, message: str):
+        """La importación falló: no se guardó nada"""
+        self.close_dialog()
+
+        # Rollback de seguridad
+        try:
+            self.db.session.rollback()
+        except:
+            pass
+
+        self.show_snackbar(f"Error al importar: {message}", error=True)
+
+    def _on_import_cancelled(self):
+        """La importación se canceló y se revirtió"""
+        self.close_dialog()
+        self.show_snackbar("Importación cancelada: no se guardó ninguna transacción")
+
+    def _on_import_done(self, result: dict):
+        """Muestra el resumen de la importación y recarga la interfaz"""
+        self.close_dialog()
+
+        total_inserted = result["inserted"]
+        total_failed = result["failed"]
+        total_duplicates = result["duplicates"]
+
+        # ============================================================
+        # PASO 4: DESCARTAR EL ESTADO DE LA SESIÓN DE LA UI
+        # ============================================================
+        
+        self.db.reset_session()
+        
+        # ============================================================
+        # PASO 5: MOSTRAR RESUMEN
+        # ============================================================
+        
+        print(f"\n{'='*60}")
+        print(f"✅ IMPORTACIÓN COMPLETADA")
+        print(f"{'='*60}")
+        print(f"   Insertadas: {total_inserted}")
+        print(f"   Fallidas: {total_failed}")
+        print(f"   Duplicadas omitidas: {total_duplicates}")
+        print(f"   Gastos: {result.get('count_expenses', 0)}")
+        print(f"   Ingresos: {result.get('count_income', 0)}")
+        print(f"{'='*60}\n")
+        
+        # Mensaje al usuario
+        # Guardar el mapeo manual como formato reconocible
+        if result.get("new_profile") and (total_inserted > 0 or total_duplicates > 0):
+            self.db.save_import_profile(result["new_profile"])
+
+        if total_inserted > 0:
+            message = f"✅ {total_inserted} transacciones importadas exitosamente\n"
+            message += f"📊 Gastos: {result.get('count_expenses', 0)} | "
+            message += f"Ingresos: {result.get('count_income', 0)}"
             
-            print(f"\n{'='*60}")
-            print(f"🔄 REFRESCANDO SESIÓN DE BASE DE DATOS")
-            print(f"{'='*60}")
+            if total_duplicates > 0:
+                message += f"\nℹ️ {total_duplicates} ya existían y se omitieron"
+            if total_failed > 0:
+                message += f"\n⚠️ {total_failed} transacciones fallaron"
             
-            try:
-                # Cerrar sesión actual
-                self.db.session.close()
-                print(f"  ✅ Sesión actual cerrada")
-                
-                # Crear nueva sesión
-                from sqlalchemy.orm import sessionmaker
-                Session = sessionmaker(bind=self.db.engine)
-                self.db.session = Session()
-                
-                print(f"  ✅ Nueva sesión creada")
+            self.show_snackbar(message)
+        elif total_duplicates > 0 and total_failed == 0:
+            self.show_snackbar(f"ℹ️ Las {total_duplicates} transacciones del archivo ya estaban importadas")
+            return
+        else:
+            self.show_snackbar("❌ No se pudo importar ninguna transacción", error=True)
+            return
+        
+        # ============================================================
+        # PASO 6: ✅ RECARGAR VISTA AUTOMÁTICAMENTE
+        # ============================================================
+        
+        print(f"\n{'='*60}")
+        print(f"🔄 RECARGANDO INTERFAZ")
+        print(f"{'='*60}")
+        
+        try:
+            # Método 1: Usar force_refresh_after_import (más agresivo, recomendado)
+            if hasattr(self.page, 'app') and hasattr(self.page.app, 'force_refresh_after_import'):
+                print(f"  🔨 Usando force_refresh_after_import...")
+                success = self.page.app.force_refresh_after_import()
                 
-            except Exception as refresh_error:
-                print(f"  ⚠️ Error al refrescar sesión: {refresh_error}")
-                # Continuar de todos modos
-            
-            # ============================================================
-            # PASO 5: MOSTRAR RESUMEN
-            # ============================================================
+                if success:
+                    print(f"  ✅ Vista recargada con force_refresh")
+                else:
+                    print(f"  ⚠️ force_refresh falló, intentando reload...")
+                    # Fallback a reload
+                    if hasattr(self.page.app, 'reload_current_view'):
+                        self.page.app.reload_current_view()
+                        print(f"  ✅ Vista recargada con reload")
             
-            summary = self.processor.get_summary()
+            # Método 2: Usar reload_current_view (moderado)
+            elif hasattr(self.page, 'app') and hasattr(self.page.app, 'reload_current_view'):
+                print(f"  🔨 Usando reload_current_view...")
+                self.page.app.reload_current_view()
+                print(f"  ✅ Vista recargada con reload")
             
-            print(f"\n{'='*60}")
-            print(f"✅ IMPORTACIÓN COMPLETADA")
-            print(f"{'='*60}")
-            print(f"   Insertadas: {total_inserted}")
-            print(f"   Fallidas: {total_failed}")
-            print(f"   Gastos: {summary.get('count_expenses', 0)}")
-            print(f"   Ingresos: {summary.get('count_income', 0)}")
-            print(f"{'='*60}\n")
+            # Método 3: Usar refresh simple (básico)
+            elif hasattr(self.page, 'app') and hasattr(self.page.app, 'refresh_current_view'):
+                print(f"  🔨 Usando refresh_current_view...")
+                self.page.app.refresh_current_view()
+                print(f"  ✅ Vista refrescada")
             
-            # Mensaje al usuario
-            if total_inserted > 0:
-                message = f"✅ {total_inserted} transacciones importadas exitosamente\n"
-                message += f"📊 Gastos: {summary.get('count_expenses', 0)} | "
-                message += f"Ingresos: {summary.get('count_income', 0)}"
-                
-                if total_failed > 0:
-                    message += f"\n⚠️ {total_failed} transacciones fallaron"
-                
-                self.show_snackbar(message)
+            # Fallback final: actualizar página
             else:
-                self.show_snackbar("❌ No se pudo importar ninguna transacción", error=True)
-                return
+                print(f"  ⚠️ Métodos de recarga no disponibles, usando page.update()...")
+                self.page.update()
+                print(f"  ✅ Página actualizada (básico)")
             
-            # ============================================================
-            # PASO 6: ✅ RECARGAR VISTA AUTOMÁTICAMENTE
-            # ============================================================
-            
-            print(f"\n{'='*60}")
-            print(f"🔄 RECARGANDO INTERFAZ")
-            print(f"{'='*60}")
+            print(f"{'='*60}\n")
             
-            try:
-                # Método 1: Usar force_refresh_after_import (más agresivo, recomendado)
-                if hasattr(self.page, 'app') and hasattr(self.page.app, 'force_refresh_after_import'):
-                    print(f"  🔨 Usando force_refresh_after_import...")
-                    success = self.page.app.force_refresh_after_import()
-                    
-                    if success:
-                        print(f"  ✅ Vista recargada con force_refresh")
-                    else:
-                        print(f"  ⚠️ force_refresh falló, intentando reload...")
-                        # Fallback a reload
-                        if hasattr(self.page.app, 'reload_current_view'):
-                            self.page.app.reload_current_view()
-                            print(f"  ✅ Vista recargada con reload")
-                
-                # Método 2: Usar reload_current_view (moderado)
-                elif hasattr(self.page, 'app') and hasattr(self.page.app, 'reload_current_view'):
-                    print(f"  🔨 Usando reload_current_view...")
-                    self.page.app.reload_current_view()
-                    print(f"  ✅ Vista recargada con reload")
-                
-                # Método 3: Usar refresh simple (básico)
-                elif hasattr(self.page, 'app') and hasattr(self.page.app, 'refresh_current_view'):
-                    print(f"  🔨 Usando refresh_current_view...")
-                    self.page.app.refresh_current_view()
-                    print(f"  ✅ Vista refrescada")
-                
-                # Fallback final: actualizar página
-                else:
-                    print(f"  ⚠️ Métodos de recarga no disponibles, usando page.update()...")
-                    self.page.update()
-                    print(f"  ✅ Página actualizada (básico)")
-                
-                print(f"{'='*60}\n")
-                
-            except Exception as reload_error:
-                print(f"  ⚠️ Error al recargar vista: {reload_error}")
-                import traceback
-                traceback.print_exc()
-                
-                # Último intento
-                try:
-                    self.page.update()
-                except:
-                    pass
-
-        except Exception as ex:
-            print(f"\n{'='*60}")
-            print(f"❌ ERROR CRÍTICO EN IMPORTACIÓN")
-            print(f"{'='*60}")
+        except Exception as reload_error:
+            print(f"  ⚠️ Error al recargar vista: {reload_error}")
             import traceback
             traceback.print_exc()
-            print(f"{'='*60}\n")
             
-            # Rollback de seguridad
+            # Último intento
             try:
-                self.db.session.rollback()
+                self.page.update()
             except:
                 pass
-            
-            self.show_snackbar(f"Error al importar: {str(ex)}", error=True)
-        
-        
+
     def build(self) -> ft.Control:
         """Construye la vista"""
         save_button = ft.ElevatedButton(
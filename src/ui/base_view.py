@@ -6,12 +6,16 @@ Esta clase abstracta proporciona funcionalidad común para todas las vistas:
 - Acceso a la base de datos
 - Manejo de snackbars
 - Gestión de diálogos
+- Actualización incremental (update_data + view-model)
 - Métodos abstractos que deben implementar las vistas hijas
 """
 
 import flet as ft
 from abc import ABC, abstractmethod
-from typing import Optional, Callable
+from typing import Optional, Callable, Dict, List
+
+# Marca para claves que aún no tienen valor en el view-model
+_MISSING = object()
 
 
 class BaseView(ABC):
@@ -41,6 +45,11 @@ class BaseView(ABC):
         self.show_snackbar = show_snackbar_callback
         self.content = None
 
+        # Actualización incremental: último view-model aplicado y, por
+        # clave, la función que actualiza sus controles
+        self._view_model: Dict = {}
+        self._binders: Dict[str, Callable] = {}
+
     @abstractmethod
     def build(self) -> ft.Control:
         """
@@ -75,6 +84,97 @@ class BaseView(ABC):
         """
         self.content = self.build()
 
+    # ========== ACTUALIZACIÓN INCREMENTAL ==========
+
+    def update_data(self, year: int, month: int) -> bool:
+        """
+        Actualiza en su lugar la vista ya construida con los datos de un mes.
+
+        Las vistas que lo soportan calculan un view-model (dict de valores
+        comparables), y apply_view_model cambia solo los controles de las
+        claves que difieren del anterior: Flet envía al cliente solo esas
+        propiedades en lugar de toda la vista.
+
+        Args:
+            year: Año a mostrar
+            month: Mes a mostrar (1-12)
+
+        Returns:
+            bool: False si la vista no lo soporta o aún no se construyó
+                  (quien llama debe usar build())
+        """
+        return False
+
+    def apply_view_model(self, model: Dict) -> List[str]:
+        """
+        Aplica un view-model nuevo comparándolo con el anterior.
+
+        Para cada clave que cambió llama a self._binders[clave](valor), que
+        modifica sus controles y devuelve el control a refrescar (o None).
+        Cada control se refresca una sola vez.
+
+        Returns:
+            List[str]: Claves que cambiaron
+        """
+        changed = [
+            key for key, value in model.items()
+            if self._view_model.get(key, _MISSING) != value
+        ]
+
+        dirty = []
+        for key in changed:
+            control = self._binders[key](model[key])
+            if control is not None and all(control is not c for c in dirty):
+                dirty.append(control)
+
+        self._view_model = dict(model)
+        for control in dirty:
+            if control.page:
+                control.update()
+        return changed
+
+    # ========== ESCRITURAS ENCOLADAS ==========
+
+    def when_written(self, future, on_done: Callable, on_error: Optional[Callable] = None):
+        """
+        Resuelve una escritura encolada sin bloquear el handler.
+
+        future viene de un método del DatabaseManager llamado con
+        wait=False. Al confirmarse, on_done(resultado) (u on_error(excepción))
+        corre en el pool de hilos de Flet vía page.run_thread, como un
+        handler de eventos: el hilo escritor queda libre para el siguiente
+        grupo.
+
+        Args:
+            future: concurrent.futures.Future de la escritura
+            on_done: Callback(resultado) tras el commit
+            on_error: Callback(excepción); por defecto on_error() de la vista
+        """
+        def deliver():
+            try:
+                result = future.result()
+            except Exception as e:
+                if on_error:
+                    on_error(e)
+                else:
+                    self.on_error(e, "Error al guardar")
+                return
+            on_done(result)
+
+        def schedule(_future):
+            if self.page is not None and hasattr(self.page, "run_thread"):
+                self.page.run_thread(deliver)
+            else:
+                deliver()
+
+        future.add_done_callback(schedule)
+
+    @staticmethod
+    def _patch_value(control: ft.Control, value) -> ft.Control:
+        """Binder simple: cambia control.value y lo devuelve para refrescarlo"""
+        control.value = value
+        return control
+
     def close_dialog(self):
         """
         ⭐ CORRECCIÓN: Cierra diálogos SIN remover del overlay
@@ -199,19 +199,25 @@ class BudgetView(BaseView):
 
                 self.is_saving = True
 
-                self.db.create_or_update_budget(
+                # Encolar sin esperar el commit; al confirmarse se recarga
+                future = self.db.create_or_update_budget(
                     year=self.current_year,
                     month=self.current_month,
                     income_goal=income_goal,
                     expense_limit=expense_limit,
                     savings_goal=savings_goal,
                     notes=notes_field.value.strip() if notes_field.value else None,
+                    wait=False,
+                )
+                self.when_written(
+                    future,
+                    lambda _budget: self._on_budget_written(
+                        True, "✅ Presupuesto guardado exitosamente", "Error al guardar"
+                    ),
+                    self._on_budget_save_error,
                 )
 
                 self.close_dialog()
-                self.show_snackbar("✅ Presupuesto guardado exitosamente")
-                
-                self.on_month_change(self.current_month, self.current_year)
 
             except ValueError:
                 self.show_snackbar("Valores inválidos", error=True)
@@ -266,16 +272,29 @@ class BudgetView(BaseView):
 
         self.show_dialog(dialog)
 
+    def _on_budget_written(self, success: bool, message: str, error_message: str):
+        """Callback de un guardado o eliminación ya confirmado"""
+        self.is_saving = False
+        if not success:
+            self.show_snackbar(error_message, error=True)
+            return
+        self.show_snackbar(message)
+        self.on_month_change(self.current_month, self.current_year)
+
+    def _on_budget_save_error(self, error: Exception):
+        self.is_saving = False
+        self.show_snackbar(f"Error: {str(error)}", error=True)
+
     def confirm_delete_budget(self, e):
         """Confirma eliminación del presupuesto"""
         def delete(e):
-            if self.db.delete_budget(self.current_year, self.current_month):
-                self.close_dialog()
-                self.show_snackbar("Presupuesto eliminado")
-                
-                self.on_month_change(self.current_month, self.current_year)
-            else:
-                self.show_snackbar("Error al eliminar", error=True)
+            future = self.db.delete_budget(self.current_year, self.current_month, wait=False)
+            self.when_written(
+                future,
+                lambda deleted: self._on_budget_written(
+                    deleted, "Presupuesto eliminado", "Error al eliminar"
+                ),
+            )
 
         self.confirm_action(
             "Eliminar Presupuesto",
@@ -211,8 +211,7 @@ class CategoriesView(BaseView):
                 return
             
             current_keywords.append(keyword)
-            category.set_keywords_list(current_keywords)
-            self.db.session.commit()
+            self.db.set_category_keywords(category.id, current_keywords)
             
             new_keyword_field.value = ""
             update_chips()
@@ -221,8 +220,7 @@ class CategoriesView(BaseView):
             current_keywords = category.get_keywords_list()
             if keyword in current_keywords:
                 current_keywords.remove(keyword)
-                category.set_keywords_list(current_keywords)
-                self.db.session.commit()
+                self.db.set_category_keywords(category.id, current_keywords)
                 update_chips()
         
         def restore_defaults(e):
@@ -721,19 +719,19 @@ class CategoriesView(BaseView):
                     self.is_saving = False
                     return
                 
+                keywords = None
+                if keywords_field.value and keywords_field.value.strip():
+                    keywords = [k.strip() for k in keywords_field.value.split(',') if k.strip()]
+
                 category = self.db.add_category(
                     name=name_field.value.strip(),
                     icon=current_state["emoji"],
                     color=current_state["color"],
                     category_type=type_dropdown.value or "expense",
                     description=desc_field.value.strip() if desc_field.value else "",
+                    keywords=keywords,
                 )
                 
-                if keywords_field.value and keywords_field.value.strip():
-                    keywords = [k.strip() for k in keywords_field.value.split(',') if k.strip()]
-                    category.set_keywords_list(keywords)
-                    self.db.session.commit()
-                
                 self.close_dialog()
                 self.show_snackbar("✅ Categoría creada exitosamente")
                 
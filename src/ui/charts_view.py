@@ -9,6 +9,8 @@ from .widgets import MonthSelector
 from src.utils.config import Config
 from src.utils.helpers import get_month_name
 from src.business.report_generator import ReportGenerator
+from src.business import columnar_export
+from src.utils.background import BackgroundJob
 
 
 class ChartsView(BaseView):
@@ -167,14 +169,22 @@ class ChartsView(BaseView):
                     value="custom",
                     label="📊 Rango personalizado"
                 ),
+                ft.Radio(
+                    value="delta",
+                    label="🔁 Solo lo nuevo desde la última exportación (CSV)"
+                ),
             ])
         )
 
+        columnar_format = columnar_export.available_format()
         format_type = ft.RadioGroup(
             value="xlsx",
             content=ft.Column([
                 ft.Radio(value="xlsx", label="📊 Excel (.xlsx) - Recomendado"),
                 ft.Radio(value="csv", label="📄 CSV (.csv) - Compatible con todo"),
+                ft.Radio(value="pdf", label="🧾 PDF (.pdf) - Estado de cuenta mensual"),
+                *([ft.Radio(value="columnar", label=f"🧮 Análisis (.{columnar_format}) - Todo el historial")]
+                  if columnar_format else []),
             ])
         )
 
@@ -193,6 +203,14 @@ class ChartsView(BaseView):
                 
                 self.custom_start_date = selected_start_date[0]
                 self.custom_end_date = selected_end_date[0]
+
+            if report_type.value == "delta" and format_type.value != "csv":
+                self.show_snackbar("❌ La exportación incremental solo está disponible en CSV", error=True)
+                return
+
+            if format_type.value == "pdf" and report_type.value != "monthly":
+                self.show_snackbar("❌ El estado de cuenta PDF solo está disponible para el mes actual", error=True)
+                return
             
             # Limpiar DatePickers
             try:
@@ -204,9 +222,6 @@ class ChartsView(BaseView):
             # Cerrar diálogo de selección
             self.close_dialog()
             
-            # Mostrar loading
-            self.show_loading("Generando reporte...")
-            
             print(f"\n{'='*60}")
             print(f"📋 GENERANDO REPORTE")
             print(f"{'='*60}")
@@ -217,30 +232,8 @@ class ChartsView(BaseView):
                 print(f"   Hasta: {self.custom_end_date.strftime('%d/%m/%Y')}")
             print(f"{'='*60}\n")
             
-            # ✅ Generar según tipo
-            if report_type.value == "monthly":
-                self.report_generator.generate_monthly_report(
-                    year=self.current_year,
-                    month=self.current_month,
-                    format=format_type.value,
-                    callback_success=self._on_report_success,
-                    callback_error=self._on_report_error
-                )
-            elif report_type.value == "annual":
-                self.report_generator.generate_annual_report(
-                    year=self.current_year,
-                    format=format_type.value,
-                    callback_success=self._on_report_success,
-                    callback_error=self._on_report_error
-                )
-            elif report_type.value == "custom":
-                self.report_generator.generate_custom_range_report(
-                    start_date=self.custom_start_date,
-                    end_date=self.custom_end_date,
-                    format=format_type.value,
-                    callback_success=self._on_report_success,
-                    callback_error=self._on_report_error
-                )
+            # ✅ Generar en segundo plano (la UI sigue respondiendo)
+            self.start_report(report_type.value, format_type.value)
 
         def close_dialog_and_cleanup(e):
             try:
@@ -284,6 +277,12 @@ class ChartsView(BaseView):
                                 size=11,
                                 color=ft.Colors.GREY_600,
                             ),
+                            ft.Text(
+                                "• Análisis: todo el historial en formato columnar compacto "
+                                "(ignora el período seleccionado)",
+                                size=11,
+                                color=ft.Colors.GREY_600,
+                            ) if columnar_format else ft.Container(),
                         ], spacing=5),
                         padding=10,
                         bgcolor=ft.Colors.BLUE_50,
@@ -310,6 +309,120 @@ class ChartsView(BaseView):
 
         self.show_dialog(dialog)
     
+    def start_report(self, report_type: str, format: str):
+        """
+        Lanza la generación del reporte en segundo plano
+
+        Args:
+            report_type: "monthly", "annual", "custom" o "delta" (CSV incremental)
+            format: "xlsx", "csv", "pdf" (solo mensual) o "columnar" (todo el historial)
+        """
+        if getattr(self, "report_job", None) is not None and not self.report_job.done:
+            self.show_snackbar("Ya se está generando un reporte", error=True)
+            return
+
+        # Período fijado al lanzar (el usuario puede cambiar de mes mientras tanto)
+        if report_type == "custom":
+            period = (self.custom_start_date, self.custom_end_date)
+        else:
+            period = (self.current_year, self.current_month)
+
+        self.report_job = BackgroundJob("reporte", on_progress=self._on_report_progress)
+        self._show_report_progress_dialog()
+
+        self.report_job.start(
+            self._report_worker,
+            report_type,
+            format,
+            period,
+            page=self.page,
+            on_done=self._on_report_done,
+            on_error=lambda message: self._on_report_error(f"Error: {message}"),
+            on_cancelled=self._on_report_cancelled,
+        )
+
+    def _report_worker(self, job: BackgroundJob, report_type: str, format: str, period: tuple) -> dict:
+        """Genera el reporte en el hilo de la tarea (sin tocar controles)"""
+        if format == "columnar":
+            return self.report_generator.generate_columnar_export(job=job)
+        if report_type == "delta":
+            return self.report_generator.generate_incremental_csv(job=job)
+        if report_type == "monthly":
+            year, month = period
+            return self.report_generator.generate_monthly_report(
+                year=year, month=month, format=format, job=job
+            )
+        if report_type == "annual":
+            year, _ = period
+            return self.report_generator.generate_annual_report(
+                year=year, format=format, job=job
+            )
+        start_date, end_date = period
+        return self.report_generator.generate_custom_range_report(
+            start_date=start_date, end_date=end_date, format=format, job=job
+        )
+
+    def _show_report_progress_dialog(self):
+        """Muestra el diálogo de progreso del reporte"""
+        self.report_stage_text = ft.Text("Preparando reporte...", weight=ft.FontWeight.BOLD)
+        self.report_progress_bar = ft.ProgressBar(value=None, width=300)
+        self.report_rows_text = ft.Text("", size=12, color=ft.Colors.GREY_600)
+        self.report_cancel_button = ft.TextButton("Cancelar", on_click=self._cancel_report)
+
+        dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("Generando reporte"),
+            content=ft.Column(
+                [
+                    self.report_stage_text,
+                    self.report_progress_bar,
+                    self.report_rows_text,
+                ],
+                tight=True,
+            ),
+            actions=[self.report_cancel_button],
+        )
+
+        self.show_dialog(dialog)
+
+    def _cancel_report(self, e):
+        """Pide cancelar el reporte en curso"""
+        if getattr(self, "report_job", None) is None or self.report_job.done:
+            return
+
+        self.report_job.cancel()
+        self.report_stage_text.value = "Cancelando..."
+        self.report_cancel_button.disabled = True
+        self.page.update()
+
+    def _on_report_progress(self, job: BackgroundJob):
+        """Refleja la etapa y las filas escritas en el diálogo"""
+        if job.cancelled:
+            return
+
+        self.report_stage_text.value = job.stage
+        self.report_progress_bar.value = job.progress
+
+        if job.total:
+            self.report_rows_text.value = f"{job.processed:,} de {job.total:,} transacciones"
+
+        try:
+            self.page.update()
+        except Exception:
+            pass
+
+    def _on_report_done(self, result: dict):
+        """Enruta el resultado de la tarea a los callbacks de éxito/error"""
+        if result.get("success"):
+            self._on_report_success(result["filepath"], result["message"])
+        else:
+            self._on_report_error(result.get("message") or "Error al generar el reporte")
+
+    def _on_report_cancelled(self):
+        """El reporte se canceló: no queda archivo parcial"""
+        self.close_dialog()
+        self.show_snackbar("Reporte cancelado")
+
     def _on_report_success(self, filepath: str, message: str):
         """✅ CORREGIDO: Callback cuando el reporte se genera exitosamente"""
         print(f"✅ _on_report_success llamado")
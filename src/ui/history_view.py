@@ -4,8 +4,9 @@ Archivo: src/ui/history_view.py
 """
 
 import flet as ft
+import threading
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List
 from .base_view import BaseView
 from .widgets import MonthSelector
 from src.utils.config import Config
@@ -13,7 +14,21 @@ from src.utils.helpers import get_month_name
 
 
 class HistoryView(BaseView):
-    """Vista de historial de transacciones"""
+    """
+    Vista de historial de transacciones
+
+    La lista es un ft.ListView que se llena por páginas (keyset sobre
+    date, id): al abrir el mes solo se consulta y dibuja la primera página,
+    y las siguientes se agregan al acercarse al final del scroll.
+
+    Con texto en el buscador, la misma lista muestra los resultados de
+    search_transactions en todo el historial.
+    """
+
+    # Transacciones por página
+    PAGE_SIZE = 50
+    # Distancia al final (px) a la que se pide la siguiente página
+    LOAD_MORE_THRESHOLD = 600
 
     def __init__(self, page: ft.Page, db_manager, show_snackbar_callback,
                  current_month: int, current_year: int,
@@ -23,6 +38,19 @@ class HistoryView(BaseView):
         self.current_year = current_year
         self.on_month_change = on_month_change
 
+        # Búsqueda activa ("" = lista del mes)
+        self.search_query = ""
+        self.list_container: ft.Container = None
+        self.summary_texts: Dict[str, ft.Text] = {}
+        self._summary: Dict = {}
+
+        # Estado de la lista paginada
+        self.transaction_list: ft.ListView = None
+        self._cursor = None
+        self._has_more = False
+        self._last_date_key = None
+        self._page_lock = threading.Lock()
+
     def previous_month(self, e):
         if self.current_month == 1:
             self.current_month = 12
@@ -133,28 +161,29 @@ class HistoryView(BaseView):
                     self.show_snackbar("⚠️ Debes seleccionar una categoría", error=True)
                     return
 
-                # ⭐ ORDEN CORRECTO:
-                # 1. Actualizar en la base de datos
-                success = self.db.update_transaction(
+                # 1. Encolar la actualización (sin esperar el commit)
+                future = self.db.update_transaction(
                     transaction_id=transaction.id,
                     date=datetime.strptime(date_field.value, "%Y-%m-%d"),
                     description=description_field.value.strip(),
                     amount=float(amount_field.value),
                     category_id=int(category_dropdown.value),
-                    notes=notes_field.value.strip() if notes_field.value else ""
+                    notes=notes_field.value.strip() if notes_field.value else "",
+                    wait=False,
                 )
 
-                if success:
-                    # 2. Recargar vista usando el callback
-                    self.on_month_change(self.current_month, self.current_year)
-                    
-                    # 3. Mostrar mensaje de éxito
-                    self.show_snackbar("✅ Transacción actualizada exitosamente")
-                    
-                    # 4. Cerrar diálogo AL FINAL
-                    self.close_dialog()
-                else:
-                    self.show_snackbar("❌ Error al actualizar la transacción", error=True)
+                # 2. Ya confirmada: recargar vista y avisar
+                self.when_written(
+                    future,
+                    lambda success: self._on_transaction_written(
+                        success,
+                        "✅ Transacción actualizada exitosamente",
+                        "❌ Error al actualizar la transacción",
+                    ),
+                )
+
+                # 3. Cerrar diálogo
+                self.close_dialog()
 
             except ValueError:
                 self.show_snackbar("⚠️ El monto debe ser un número válido", error=True)
@@ -239,7 +268,7 @@ class HistoryView(BaseView):
 
     def _create_detailed_transaction_tile(self, transaction):
         """Crea un tile detallado con opciones de edición y eliminación"""
-        category = self.db.get_category_by_id(transaction.category_id)
+        category = transaction.category
 
         if category is None:
             category_name = "Sin categoría"
@@ -270,21 +299,21 @@ class HistoryView(BaseView):
             """⭐ CORRECCIÓN: Elimina la transacción y recarga la vista"""
             def confirm_delete(e):
                 try:
-                    # ⭐ ORDEN CORRECTO:
-                    # 1. Eliminar de la base de datos
-                    success = self.db.delete_transaction(transaction.id)
-                    
-                    if success:
-                        # 2. Recargar vista usando el callback
-                        self.on_month_change(self.current_month, self.current_year)
-                        
-                        # 3. Mostrar mensaje de éxito
-                        self.show_snackbar("✅ Transacción eliminada")
-                        
-                        # 4. Cerrar diálogo AL FINAL
-                        self.close_dialog()
-                    else:
-                        self.show_snackbar("❌ Error al eliminar la transacción", error=True)
+                    # 1. Encolar la eliminación (sin esperar el commit)
+                    future = self.db.delete_transaction(transaction.id, wait=False)
+
+                    # 2. Ya confirmada: recargar vista y avisar
+                    self.when_written(
+                        future,
+                        lambda success: self._on_transaction_written(
+                            success,
+                            "✅ Transacción eliminada",
+                            "❌ Error al eliminar la transacción",
+                        ),
+                    )
+
+                    # 3. Cerrar diálogo
+                    self.close_dialog()
                         
                 except Exception as ex:
                     self.show_snackbar(f"❌ Error: {str(ex)}", error=True)
@@ -419,14 +448,234 @@ class HistoryView(BaseView):
             ),
         )
 
+    def _on_transaction_written(self, success: bool, message: str, error_message: str):
+        """Callback de una edición o eliminación ya confirmada"""
+        if not success:
+            self.show_snackbar(error_message, error=True)
+            return
+        self.on_month_change(self.current_month, self.current_year)
+        self.show_snackbar(message)
+
+    # ========== ACTUALIZACIÓN INCREMENTAL ==========
+
+    def update_data(self, year: int, month: int) -> bool:
+        """
+        Cambia de mes (o refresca) sin reconstruir la vista
+
+        Los textos del resumen se actualizan solo si cambiaron y la lista
+        solo se vuelve a paginar si cambió el mes, la búsqueda o los datos.
+        """
+        if self.list_container is None:
+            return False
+
+        self.current_year = year
+        self.current_month = month
+        self._summary = self.db.get_monthly_summary(year, month)
+        self.apply_view_model(self._build_view_model(self._summary))
+        return True
+
+    def _build_view_model(self, summary: Dict) -> Dict:
+        return {
+            "month_label": f"{get_month_name(self.current_month)} {self.current_year}",
+            "total_income": summary["total_income"],
+            "total_expenses": summary["total_expenses"],
+            "savings": summary["savings"],
+            "list": self._list_key(),
+        }
+
+    def _list_key(self):
+        """Qué muestra la lista: cambia con el mes, la búsqueda o los datos"""
+        source = self.search_query or (self.current_year, self.current_month)
+        return source, self.db.get_data_version()
+
+    @staticmethod
+    def _format_amount(amount: float) -> str:
+        return f"{Config.CURRENCY_SYMBOL} {amount:.2f}"
+
+    def _patch_amount(self, key: str, amount: float) -> ft.Control:
+        return self._patch_value(self.summary_texts[key], self._format_amount(amount))
+
+    def _patch_list(self, _key) -> ft.Control:
+        self.list_container.content = self._build_list_content()
+        return self.list_container
+
+    def _build_search_field(self) -> ft.TextField:
+        """Buscador de transacciones (descripción y notas)"""
+        def clear_search(e):
+            search_field.value = ""
+            search_field.update()
+            self._apply_search("")
+
+        search_field = ft.TextField(
+            value=self.search_query,
+            hint_text="Buscar en todo el historial...",
+            prefix_icon=ft.Icons.SEARCH,
+            suffix=ft.IconButton(
+                icon=ft.Icons.CLOSE,
+                icon_size=18,
+                tooltip="Limpiar búsqueda",
+                on_click=clear_search,
+            ),
+            on_submit=lambda e: self._apply_search(e.control.value),
+            bgcolor=ft.Colors.WHITE,
+            border_radius=10,
+            dense=True,
+        )
+        return search_field
+
+    def _apply_search(self, query: str):
+        """Cambia entre resultados de búsqueda y la lista del mes"""
+        query = (query or "").strip()
+        if query == self.search_query:
+            return
+        self.search_query = query
+        self.list_container.content = self._build_list_content()
+        self._view_model["list"] = self._list_key()
+        self.list_container.update()
+
+    def _build_list_content(self) -> ft.Control:
+        """Lista del mes o resultados de búsqueda, o el estado vacío"""
+        if self.search_query:
+            content = self._build_transaction_list(f"🔎 Resultados para «{self.search_query}»")
+            if len(self.transaction_list.controls) > 1:
+                return content
+            return self._build_empty_state(
+                ft.Icons.SEARCH_OFF,
+                "Sin resultados",
+                "Prueba con otra palabra o el inicio de una",
+            )
+
+        if self._summary["transaction_count"] == 0:
+            return self._build_empty_state(
+                ft.Icons.INBOX,
+                "No hay transacciones este mes",
+                "Agrega tu primera transacción",
+            )
+        return self._build_transaction_list(
+            f"📋 Transacciones ({self._summary['transaction_count']})"
+        )
+
+    def _build_empty_state(self, icon: str, title: str, subtitle: str) -> ft.Container:
+        return ft.Container(
+            content=ft.Column(
+                [
+                    ft.Icon(icon, size=64, color=ft.Colors.GREY_400),
+                    ft.Text(
+                        title,
+                        size=18,
+                        color=ft.Colors.GREY_600,
+                        text_align=ft.TextAlign.CENTER,
+                    ),
+                    ft.Container(height=10),
+                    ft.Text(
+                        subtitle,
+                        size=14,
+                        color=ft.Colors.GREY_500,
+                    ),
+                ],
+                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            ),
+            padding=40,
+            alignment=ft.alignment.center,
+        )
+
+    def _build_transaction_list(self, title: str) -> ft.ListView:
+        """Crea la lista virtualizada con la primera página"""
+        self._cursor = None
+        self._has_more = True
+        self._last_date_key = None
+
+        self.transaction_list = ft.ListView(
+            controls=[
+                ft.Container(
+                    content=ft.Row(
+                        [
+                            ft.Text(
+                                title,
+                                size=18,
+                                weight=ft.FontWeight.BOLD,
+                            ),
+                        ],
+                    ),
+                    padding=ft.padding.only(left=10, top=10, bottom=10),
+                )
+            ],
+            expand=True,
+            spacing=0,
+            on_scroll=self._on_list_scroll,
+            on_scroll_interval=100,
+        )
+        self._load_next_page()
+        return self.transaction_list
+
+    def _load_next_page(self) -> bool:
+        """
+        Agrega la siguiente página a la lista
+
+        Returns:
+            bool: True si se agregaron filas
+        """
+        # Los eventos de scroll llegan desde varios hilos; una página a la vez
+        if not self._page_lock.acquire(blocking=False):
+            return False
+        try:
+            if not self._has_more:
+                return False
+
+            if self.search_query:
+                page = self.db.search_transactions(
+                    self.search_query, limit=self.PAGE_SIZE, cursor=self._cursor
+                )
+                records = page["results"]
+                self._has_more = page["next_cursor"] is not None
+            else:
+                records = self.db.get_transaction_records_page(
+                    self.current_year, self.current_month, self.PAGE_SIZE, after=self._cursor
+                )
+                self._has_more = len(records) == self.PAGE_SIZE
+            if not records:
+                return False
+
+            last = records[-1]
+            self._cursor = (last.date, last.id)
+            self.transaction_list.controls.extend(self._build_page_controls(records))
+            return True
+        finally:
+            self._page_lock.release()
+
+    def _build_page_controls(self, records: List) -> List[ft.Control]:
+        """Tiles de una página, con un encabezado cada vez que cambia el día"""
+        controls = []
+        for t in records:
+            date_key = t.date.date()
+            if date_key != self._last_date_key:
+                self._last_date_key = date_key
+                controls.append(
+                    ft.Container(
+                        content=ft.Text(
+                            t.date.strftime("%d de %B, %Y"),
+                            size=14,
+                            weight=ft.FontWeight.BOLD,
+                            color=ft.Colors.GREY_700,
+                        ),
+                        padding=ft.padding.only(left=10, top=15, bottom=5),
+                    )
+                )
+            controls.append(self._create_detailed_transaction_tile(t))
+        return controls
+
+    def _on_list_scroll(self, e: ft.OnScrollEvent):
+        """Pide la siguiente página al acercarse al final de la lista"""
+        if not self._has_more or e.max_scroll_extent is None:
+            return
+        if e.pixels >= e.max_scroll_extent - self.LOAD_MORE_THRESHOLD:
+            if self._load_next_page():
+                self.transaction_list.update()
+
     def build(self) -> ft.Control:
         """Construye la vista de historial"""
         print(f"\n📜 CARGANDO HISTORIAL: {self.current_month}/{self.current_year}")
         
-        transactions = self.db.get_transactions_by_month(
-            self.current_year, self.current_month
-        )
-
         month_label = get_month_name(self.current_month)
         month_selector = MonthSelector(
             self.current_month,
@@ -438,6 +687,19 @@ class HistoryView(BaseView):
 
         # Resumen del mes
         summary = self.db.get_monthly_summary(self.current_year, self.current_month)
+        self.summary_texts = {
+            key: ft.Text(
+                self._format_amount(summary[key]),
+                size=16,
+                weight=ft.FontWeight.BOLD,
+                color=color,
+            )
+            for key, color in (
+                ("total_income", "#22c55e"),
+                ("total_expenses", "#ef4444"),
+                ("savings", "#3b82f6"),
+            )
+        }
         
         summary_card = ft.Container(
             content=ft.Row(
@@ -445,12 +707,7 @@ class HistoryView(BaseView):
                     ft.Column(
                         [
                             ft.Text("Ingresos", size=12, color=ft.Colors.GREY_600),
-                            ft.Text(
-                                f"{Config.CURRENCY_SYMBOL} {summary['total_income']:.2f}",
-                                size=16,
-                                weight=ft.FontWeight.BOLD,
-                                color="#22c55e"
-                            ),
+                            self.summary_texts["total_income"],
                         ],
                         horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                         expand=True,
@@ -459,12 +716,7 @@ class HistoryView(BaseView):
                     ft.Column(
                         [
                             ft.Text("Gastos", size=12, color=ft.Colors.GREY_600),
-                            ft.Text(
-                                f"{Config.CURRENCY_SYMBOL} {summary['total_expenses']:.2f}",
-                                size=16,
-                                weight=ft.FontWeight.BOLD,
-                                color="#ef4444"
-                            ),
+                            self.summary_texts["total_expenses"],
                         ],
                         horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                         expand=True,
@@ -473,12 +725,7 @@ class HistoryView(BaseView):
                     ft.Column(
                         [
                             ft.Text("Balance", size=12, color=ft.Colors.GREY_600),
-                            ft.Text(
-                                f"{Config.CURRENCY_SYMBOL} {summary['savings']:.2f}",
-                                size=16,
-                                weight=ft.FontWeight.BOLD,
-                                color="#3b82f6"
-                            ),
+                            self.summary_texts["savings"],
                         ],
                         horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                         expand=True,
@@ -492,87 +739,28 @@ class HistoryView(BaseView):
             margin=ft.margin.only(bottom=15),
         )
 
-        if not transactions:
-            content = ft.Container(
-                content=ft.Column(
-                    [
-                        ft.Icon(ft.Icons.INBOX, size=64, color=ft.Colors.GREY_400),
-                        ft.Text(
-                            "No hay transacciones este mes",
-                            size=18,
-                            color=ft.Colors.GREY_600,
-                            text_align=ft.TextAlign.CENTER,
-                        ),
-                        ft.Container(height=10),
-                        ft.Text(
-                            "Agrega tu primera transacción",
-                            size=14,
-                            color=ft.Colors.GREY_500,
-                        ),
-                    ],
-                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                ),
-                padding=40,
-                alignment=ft.alignment.center,
-            )
-        else:
-            # Agrupar por fecha
-            grouped = {}
-            for t in transactions:
-                date_key = t.date.strftime("%Y-%m-%d")
-                if date_key not in grouped:
-                    grouped[date_key] = []
-                grouped[date_key].append(t)
-
-            transaction_tiles = []
-            
-            # Encabezado de lista
-            transaction_tiles.append(
-                ft.Container(
-                    content=ft.Row(
-                        [
-                            ft.Text(
-                                f"📋 Transacciones ({len(transactions)})",
-                                size=18,
-                                weight=ft.FontWeight.BOLD,
-                            ),
-                        ],
-                    ),
-                    padding=ft.padding.only(left=10, top=10, bottom=10),
-                )
-            )
-            
-            for date_key in sorted(grouped.keys(), reverse=True):
-                transaction_tiles.append(
-                    ft.Container(
-                        content=ft.Text(
-                            datetime.strptime(date_key, "%Y-%m-%d").strftime(
-                                "%d de %B, %Y"
-                            ),
-                            size=14,
-                            weight=ft.FontWeight.BOLD,
-                            color=ft.Colors.GREY_700,
-                        ),
-                        padding=ft.padding.only(left=10, top=15, bottom=5),
-                    )
-                )
+        self._summary = summary
+        self.list_container = ft.Container(content=self._build_list_content(), expand=True)
 
-                for t in grouped[date_key]:
-                    transaction_tiles.append(self._create_detailed_transaction_tile(t))
-
-            content = ft.Column(
-                transaction_tiles,
-                scroll=ft.ScrollMode.AUTO,
-                expand=True,
-                spacing=0,
-            )
+        # Valores actuales y cómo actualizarlos (ver update_data)
+        month_text = month_selector.controls[1]
+        self._binders = {
+            "month_label": lambda value: self._patch_value(month_text, value),
+            "total_income": lambda value: self._patch_amount("total_income", value),
+            "total_expenses": lambda value: self._patch_amount("total_expenses", value),
+            "savings": lambda value: self._patch_amount("savings", value),
+            "list": self._patch_list,
+        }
+        self._view_model = self._build_view_model(summary)
 
         return ft.Column(
             [
                 month_selector,
                 ft.Container(height=10),
                 summary_card,
-                content,
+                self._build_search_field(),
+                ft.Container(height=10),
+                self.list_container,
                 ft.Container(height=20),
             ],
             expand=True,
@@ -52,13 +52,145 @@ class HomeView(BaseView):
             self.current_month += 1
         self.on_month_change(self.current_month, self.current_year)
 
+    # Secciones del dashboard, en orden (cada una vive en su propio slot)
+    SECTIONS = (
+        "balance", "mini_cards", "alerts", "budget",
+        "top_expenses", "projection", "categories", "recent",
+    )
+
     def build(self) -> ft.Control:
         """Construye la vista HOME"""
         print("\n" + "=" * 60)
         print("🏠 CARGANDO VISTA HOME")
         print("=" * 60)
 
-        # Obtener datos
+        self._data = self._load_data()
+
+        # Selector de mes
+        month_label = get_month_name(self.current_month)
+        month_selector = MonthSelector(
+            self.current_month,
+            self.current_year,
+            self.previous_month,
+            self.next_month,
+            month_label
+        )
+
+        # Un contenedor fijo por sección: update_data reemplaza solo el
+        # contenido de las secciones cuyo view-model cambió
+        self._slots = {
+            name: ft.Container(padding=ft.padding.only(top=10 if name == "balance" else 15))
+            for name in self.SECTIONS
+        }
+        for name in self.SECTIONS:
+            self._fill_slot(name)
+
+        month_text = month_selector.controls[1]
+        self._binders = {
+            "month_label": lambda value: self._patch_value(month_text, value),
+            "balance": self._patch_balance,
+            **{
+                name: (lambda _value, name=name: self._fill_slot(name))
+                for name in self.SECTIONS
+                if name != "balance"
+            },
+        }
+        self._view_model = self._build_view_model(self._data)
+
+        print("✅ Vista HOME ensamblada correctamente")
+
+        return ft.Column(
+            [
+                month_selector,
+                *[self._slots[name] for name in self.SECTIONS],
+                ft.Container(height=30),
+            ],
+            scroll=ft.ScrollMode.AUTO,
+            expand=True,
+            spacing=0,
+        )
+
+    # ========== ACTUALIZACIÓN INCREMENTAL ==========
+
+    def update_data(self, year: int, month: int) -> bool:
+        """
+        Cambia de mes (o refresca) sin reconstruir la vista
+
+        Vuelve a consultar los datos y solo toca lo que cambió: los textos
+        del balance y las secciones cuyo view-model es distinto.
+        """
+        if not self._binders:
+            return False
+
+        self.current_year = year
+        self.current_month = month
+        self._data = self._load_data()
+        changed = self.apply_view_model(self._build_view_model(self._data))
+        print(f"🏠 HOME actualizado ({month}/{year}): {', '.join(changed) or 'sin cambios'}")
+        return True
+
+    def _build_view_model(self, data: dict) -> dict:
+        """Valores comparables que determinan cada parte de la vista"""
+        summary = data["summary"]
+        daily_stats = data["daily_stats"]
+        week = data["week_comparison"]
+        return {
+            "month_label": f"{get_month_name(self.current_month)} {self.current_year}",
+            "balance": (
+                summary.get("savings", 0),
+                summary.get("total_income", 0),
+                summary.get("total_expenses", 0),
+            ),
+            "mini_cards": (
+                daily_stats.get("daily_average", 0),
+                week.get("change_percentage", 0),
+                week.get("is_increasing", False),
+            ),
+            "alerts": data["category_alerts"],
+            "budget": data["budget_status"],
+            "top_expenses": data["top_expenses"],
+            "projection": (daily_stats, summary),
+            "categories": data["expenses_by_category"],
+            "recent": [
+                (t.id, t.date, t.description, t.amount, t.transaction_type,
+                 t.category.name if t.category else None)
+                for t in data["recent_transactions"]
+            ],
+        }
+
+    def _fill_slot(self, name: str) -> ft.Control:
+        """(Re)construye una sección en su slot; las vacías se ocultan"""
+        section = getattr(self, f"_build_{name}")(self._data)
+        slot = self._slots[name]
+        slot.content = section
+        slot.visible = section is not None
+        return slot
+
+    def _patch_balance(self, values) -> ft.Control:
+        savings, total_income, total_expenses = values
+        for key, amount in (
+            ("savings", savings),
+            ("total_income", total_income),
+            ("total_expenses", total_expenses),
+        ):
+            self.balance_texts[key].value = f"{Config.CURRENCY_SYMBOL} {amount:.2f}"
+        self.balance_card.gradient = self._balance_gradient(savings)
+        return self.balance_card
+
+    @staticmethod
+    def _balance_gradient(savings: float) -> ft.LinearGradient:
+        return ft.LinearGradient(
+            begin=ft.alignment.top_left,
+            end=ft.alignment.bottom_right,
+            colors=(
+                ["#667eea", "#764ba2"] if savings >= 0 else ["#f093fb", "#f5576c"]
+            ),
+        )
+
+    # ========== DATOS Y SECCIONES ==========
+
+    def _load_data(self) -> dict:
+        """Consulta todo lo que muestra el dashboard para el mes actual"""
         try:
             print(f"📅 Consultando datos para: {self.current_month}/{self.current_year}")
 
@@ -78,9 +210,9 @@ class HomeView(BaseView):
             week_comparison = self.db.get_week_comparison(
                 self.current_year, self.current_month
             )
-            recent_transactions = self.db.get_transactions_by_month(
-                self.current_year, self.current_month
-            )[:3]
+            recent_transactions = self.db.get_transaction_records_by_month(
+                self.current_year, self.current_month, limit=3
+            )
             
             # ✅ NUEVO: Obtener alertas de presupuesto
             now = datetime.now()
@@ -116,19 +248,42 @@ class HomeView(BaseView):
             recent_transactions = []
             category_alerts = []
 
-        # Selector de mes
-        month_label = get_month_name(self.current_month)
-        month_selector = MonthSelector(
-            self.current_month,
-            self.current_year,
-            self.previous_month,
-            self.next_month,
-            month_label
-        )
+        return {
+            "summary": summary,
+            "expenses_by_category": expenses_by_category,
+            "budget_status": budget_status,
+            "top_expenses": top_expenses,
+            "daily_stats": daily_stats,
+            "week_comparison": week_comparison,
+            "recent_transactions": recent_transactions,
+            "category_alerts": category_alerts,
+        }
 
-        # Tarjeta principal de balance
+    def _build_balance(self, data: dict) -> ft.Control:
+        """Tarjeta principal de balance"""
+        summary = data["summary"]
         savings = summary.get("savings", 0)
-        savings_card = ft.Container(
+        self.balance_texts = {
+            "savings": ft.Text(
+                f"{Config.CURRENCY_SYMBOL} {savings:.2f}",
+                size=32,
+                weight=ft.FontWeight.BOLD,
+                color=ft.Colors.WHITE,
+            ),
+            "total_income": ft.Text(
+                f"{Config.CURRENCY_SYMBOL} {summary.get('total_income', 0):.2f}",
+                size=16,
+                weight=ft.FontWeight.BOLD,
+                color=ft.Colors.WHITE,
+            ),
+            "total_expenses": ft.Text(
+                f"{Config.CURRENCY_SYMBOL} {summary.get('total_expenses', 0):.2f}",
+                size=16,
+                weight=ft.FontWeight.BOLD,
+                color=ft.Colors.WHITE,
+            ),
+        }
+        self.balance_card = ft.Container(
             content=ft.Column(
                 [
                     ft.Row(
@@ -145,12 +300,7 @@ class HomeView(BaseView):
                                         size=14,
                                         color=ft.Colors.WHITE70,
                                     ),
-                                    ft.Text(
-                                        f"{Config.CURRENCY_SYMBOL} {savings:.2f}",
-                                        size=32,
-                                        weight=ft.FontWeight.BOLD,
-                                        color=ft.Colors.WHITE,
-                                    ),
+                                    self.balance_texts["savings"],
                                 ],
                                 expand=True,
                                 spacing=2,
@@ -166,12 +316,7 @@ class HomeView(BaseView):
                                     ft.Text(
                                         "Ingresos", size=12, color=ft.Colors.WHITE70
                                     ),
-                                    ft.Text(
-                                        f"{Config.CURRENCY_SYMBOL} {summary.get('total_income', 0):.2f}",
-                                        size=16,
-                                        weight=ft.FontWeight.BOLD,
-                                        color=ft.Colors.WHITE,
-                                    ),
+                                    self.balance_texts["total_income"],
                                 ],
                                 expand=True,
                             ),
@@ -179,12 +324,7 @@ class HomeView(BaseView):
                             ft.Column(
                                 [
                                     ft.Text("Gastos", size=12, color=ft.Colors.WHITE70),
-                                    ft.Text(
-                                        f"{Config.CURRENCY_SYMBOL} {summary.get('total_expenses', 0):.2f}",
-                                        size=16,
-                                        weight=ft.FontWeight.BOLD,
-                                        color=ft.Colors.WHITE,
-                                    ),
+                                    self.balance_texts["total_expenses"],
                                 ],
                                 expand=True,
                             ),
@@ -196,13 +336,7 @@ class HomeView(BaseView):
             ),
             padding=25,
             border_radius=15,
-            gradient=ft.LinearGradient(
-                begin=ft.alignment.top_left,
-                end=ft.alignment.bottom_right,
-                colors=(
-                    ["#667eea", "#764ba2"] if savings >= 0 else ["#f093fb", "#f5576c"]
-                ),
-            ),
+            gradient=self._balance_gradient(savings),
             shadow=ft.BoxShadow(
                 spread_radius=1,
                 blur_radius=15,
@@ -210,9 +344,12 @@ class HomeView(BaseView):
                 offset=ft.Offset(0, 5),
             ),
         )
+        return self.balance_card
 
-        # ✅ CORRECCIÓN: Mini cards como ft.Row directamente, no como tupla
-        mini_cards = ft.Row(
+    def _build_mini_cards(self, data: dict) -> ft.Control:
+        daily_stats = data["daily_stats"]
+        week_comparison = data["week_comparison"]
+        return ft.Row(
             [
                 MiniStatCard(
                     "Gasto Diario",
@@ -238,101 +375,92 @@ class HomeView(BaseView):
             spacing=10,
         )
 
-        # ✅ Ensamblar componentes correctamente
-        content_widgets = [
-            month_selector,
-            ft.Container(height=10),
-            savings_card,
-            ft.Container(height=15),
-            mini_cards,  # ✅ Ya no es tupla
-            ft.Container(height=15),
-        ]
-        
-        # ✅ NUEVO: Widget de alertas (si hay alertas)
-        if category_alerts:
-            content_widgets.append(
-                CategoryBudgetAlertWidget(
-                    category_alerts,
-                    on_click=lambda e: self.show_alerts_detail()
-                )
-            )
-            content_widgets.append(ft.Container(height=15))
-        
-        # Widget de presupuesto
-        content_widgets.append(BudgetSummaryCard(budget_status))
+    def _build_alerts(self, data: dict) -> ft.Control:
+        if not data["category_alerts"]:
+            return None
+        return CategoryBudgetAlertWidget(
+            data["category_alerts"],
+            on_click=lambda e: self.show_alerts_detail()
+        )
 
-        # Top 3 gastos
-        if top_expenses:
-            top_section = ft.Container(
-                content=ft.Column(
-                    [
-                        ft.Row(
-                            [
-                                ft.Icon(
-                                    ft.Icons.WORKSPACE_PREMIUM, size=22, color="#f59e0b"
-                                ),
-                                ft.Text(
-                                    "🏆 Top 3 Gastos",
-                                    size=18,
-                                    weight=ft.FontWeight.BOLD,
-                                ),
-                            ],
-                            spacing=8,
-                        ),
-                        ft.Container(height=5),
-                        *[
-                            TopExpenseTile(exp, idx + 1)
-                            for idx, exp in enumerate(top_expenses)
+    def _build_budget(self, data: dict) -> ft.Control:
+        return BudgetSummaryCard(data["budget_status"])
+
+    def _build_top_expenses(self, data: dict) -> ft.Control:
+        top_expenses = data["top_expenses"]
+        if not top_expenses:
+            return None
+        return ft.Container(
+            content=ft.Column(
+                [
+                    ft.Row(
+                        [
+                            ft.Icon(
+                                ft.Icons.WORKSPACE_PREMIUM, size=22, color="#f59e0b"
+                            ),
+                            ft.Text(
+                                "🏆 Top 3 Gastos",
+                                size=18,
+                                weight=ft.FontWeight.BOLD,
+                            ),
                         ],
+                        spacing=8,
+                    ),
+                    ft.Container(height=5),
+                    *[
+                        TopExpenseTile(exp, idx + 1)
+                        for idx, exp in enumerate(top_expenses)
                     ],
-                    spacing=8,
-                ),
-                padding=20,
-                bgcolor=ft.Colors.WHITE,
-                border_radius=12,
-            )
-            content_widgets.extend([ft.Container(height=15), top_section])
+                ],
+                spacing=8,
+            ),
+            padding=20,
+            bgcolor=ft.Colors.WHITE,
+            border_radius=12,
+        )
 
-        # Proyección
-        projection_section = ProjectionCard(daily_stats, summary)
-        content_widgets.extend([ft.Container(height=15), projection_section])
+    def _build_projection(self, data: dict) -> ft.Control:
+        return ProjectionCard(data["daily_stats"], data["summary"])
 
-        # Categorías
-        if expenses_by_category:
-            category_section = ft.Container(
-                content=ft.Column(
-                    [
-                        ft.Text(
-                            "📊 Distribución de Gastos",
-                            size=18,
-                            weight=ft.FontWeight.BOLD,
-                        ),
-                        ft.Container(height=5),
-                        *[
-                            CompactCategoryBar(cat)
-                            for cat in expenses_by_category[:4]
-                        ],
-                        (
-                            ft.TextButton(
-                                f"Ver todas ({len(expenses_by_category)})",
-                                on_click=lambda _: self.on_nav_change(3),
-                                icon=ft.Icons.ARROW_FORWARD,
-                            )
-                            if len(expenses_by_category) > 4
-                            else ft.Container()
-                        ),
+    def _build_categories(self, data: dict) -> ft.Control:
+        expenses_by_category = data["expenses_by_category"]
+        if not expenses_by_category:
+            return None
+        return ft.Container(
+            content=ft.Column(
+                [
+                    ft.Text(
+                        "📊 Distribución de Gastos",
+                        size=18,
+                        weight=ft.FontWeight.BOLD,
+                    ),
+                    ft.Container(height=5),
+                    *[
+                        CompactCategoryBar(cat)
+                        for cat in expenses_by_category[:4]
                     ],
-                    spacing=10,
-                ),
-                padding=20,
-                bgcolor=ft.Colors.WHITE,
-                border_radius=12,
-            )
-            content_widgets.extend([ft.Container(height=15), category_section])
+                    (
+                        ft.TextButton(
+                            f"Ver todas ({len(expenses_by_category)})",
+                            on_click=lambda _: self.on_nav_change(3),
+                            icon=ft.Icons.ARROW_FORWARD,
+                        )
+                        if len(expenses_by_category) > 4
+                        else ft.Container()
+                    ),
+                ],
+                spacing=10,
+            ),
+            padding=20,
+            bgcolor=ft.Colors.WHITE,
+            border_radius=12,
+        )
 
-        # Transacciones recientes
+    def _build_recent(self, data: dict) -> ft.Control:
+        """Transacciones recientes (o el estado vacío)"""
+        recent_transactions = data["recent_transactions"]
         if recent_transactions:
-            recent_section = ft.Container(
+            return ft.Container(
                 content=ft.Column(
                     [
                         ft.Row(
@@ -350,7 +478,7 @@ class HomeView(BaseView):
                             alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
                         ),
                         *[
-                            CompactTransactionTile(t, self.db.get_category_by_id(t.category_id))
+                            CompactTransactionTile(t, t.category)
                             for t in recent_transactions
                         ],
                     ],
@@ -360,45 +488,32 @@ class HomeView(BaseView):
                 bgcolor=ft.Colors.WHITE,
                 border_radius=12,
             )
-        else:
-            recent_section = ft.Container(
-                content=ft.Column(
-                    [
-                        ft.Icon(
-                            ft.Icons.RECEIPT_LONG_OUTLINED,
-                            size=64,
-                            color=ft.Colors.GREY_400,
-                        ),
-                        ft.Text(
-                            "No hay transacciones este mes",
-                            size=16,
-                            color=ft.Colors.GREY_600,
-                        ),
-                        ft.Container(height=10),
-                        ft.ElevatedButton(
-                            "Agregar primera transacción",
-                            icon=ft.Icons.ADD,
-                            on_click=lambda _: self.on_nav_change(1),
-                        ),
-                    ],
-                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+        return ft.Container(
+        content=ft.Column(
+            [
+                ft.Icon(
+                    ft.Icons.RECEIPT_LONG_OUTLINED,
+                    size=64,
+                    color=ft.Colors.GREY_400,
                 ),
-                padding=40,
-                bgcolor=ft.Colors.WHITE,
-                border_radius=12,
-            )
-
-        content_widgets.extend([ft.Container(height=15), recent_section])
-        content_widgets.append(ft.Container(height=30))
-
-        print("✅ Vista HOME ensamblada correctamente")
-
-        return ft.Column(
-            content_widgets,
-            scroll=ft.ScrollMode.AUTO,
-            expand=True,
-            spacing=0,
-        )
+                ft.Text(
+                    "No hay transacciones este mes",
+                    size=16,
+                    color=ft.Colors.GREY_600,
+                ),
+                ft.Container(height=10),
+                ft.ElevatedButton(
+                    "Agregar primera transacción",
+                    icon=ft.Icons.ADD,
+                    on_click=lambda _: self.on_nav_change(1),
+                ),
+            ],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+        ),
+        padding=40,
+        bgcolor=ft.Colors.WHITE,
+        border_radius=12,
+    )
 
     def show_alerts_detail(self):
         """
@@ -12,6 +12,8 @@ Pantalla de autenticación con:
 import flet as ft
 from typing import Callable
 
+from src.utils.background import BackgroundJob
+
 
 class LoginView:
     """Vista de autenticación"""
@@ -30,6 +32,8 @@ class LoginView:
         self.confirm_field = None
         self.message_text = None
         self.submit_button = None
+        self.progress_ring = None
+        self.auth_job = None
     
     def build(self) -> ft.Container:
         """Construye la vista de login"""
@@ -72,6 +76,8 @@ class LoginView:
             visible=False,
         )
         
+        self.progress_ring = ft.ProgressRing(width=24, height=24, visible=False)
+        
         self.submit_button = ft.ElevatedButton(
             "Configurar Contraseña",
             icon=ft.Icons.CHECK_CIRCLE,
@@ -158,8 +164,9 @@ class LoginView:
                         margin=ft.margin.only(bottom=20),
                     ),
                     
-                    # Botón
+                    # Botón (y spinner mientras se verifica)
                     self.submit_button,
+                    self.progress_ring,
                     
                     # Info de seguridad
                     ft.Container(
@@ -213,6 +220,8 @@ class LoginView:
             visible=False,
         )
         
+        self.progress_ring = ft.ProgressRing(width=24, height=24, visible=False)
+        
         self.submit_button = ft.ElevatedButton(
             "Iniciar Sesión",
             icon=ft.Icons.LOGIN,
@@ -275,8 +284,9 @@ class LoginView:
                         margin=ft.margin.only(bottom=20),
                     ),
                     
-                    # Botón
+                    # Botón (y spinner mientras se verifica)
                     self.submit_button,
+                    self.progress_ring,
                     
                     # Contador de intentos
                     ft.Container(
@@ -418,11 +428,15 @@ class LoginView:
             self._show_error("Las contraseñas no coinciden")
             return
         
-        # Configurar contraseña
-        if self.auth.set_password(password):
+        # Configurar contraseña (hash + calibración fuera del hilo de la UI)
+        self._run_auth(self.auth.set_password, password, on_done=self._on_setup_done)
+
+    def _on_setup_done(self, success: bool):
+        """Resultado de set_password (hilo de la tarea)"""
+        self._set_busy(False)
+        if success:
             self._show_success("✅ Contraseña configurada correctamente")
             # Esperar un momento y proceder
-            self.page.update()
             import time
             time.sleep(1)
             self.on_success()
@@ -438,13 +452,17 @@ class LoginView:
             self._show_error("Por favor ingrese su contraseña")
             return
         
-        # Verificar contraseña
-        success, message, failed_attempts = self.auth.verify_password(password)
+        # Verificar contraseña (PBKDF2 fuera del hilo de la UI)
+        self._run_auth(self.auth.verify_password, password, on_done=self._on_login_done)
+
+    def _on_login_done(self, result):
+        """Resultado de verify_password (hilo de la tarea)"""
+        success, message, failed_attempts = result
+        self._set_busy(False)
         
         if success:
             self._show_success(message)
             # Esperar un momento y proceder
-            self.page.update()
             import time
             time.sleep(0.5)
             self.on_success()
@@ -454,7 +472,6 @@ class LoginView:
             
             # Si es el 7º intento, resetear vista
             if "RESETEADA" in message or "reseteada" in message:
-                self.page.update()
                 import time
                 time.sleep(2)
                 # Recargar en modo setup
@@ -469,6 +486,46 @@ class LoginView:
                 self.page.clean()
                 self.page.add(self.build())
                 self.page.update()
+
+    def _run_auth(self, method: Callable, password: str, on_done: Callable):
+        """
+        Ejecuta method(password) en segundo plano con el spinner visible
+
+        Sin página en BackgroundJob: on_done corre en el hilo de la tarea,
+        como un handler de Flet, así sus pausas no bloquean el event loop.
+        AuthManager usa la sesión de BD de ese hilo, que se libera al
+        terminar el callback final.
+        """
+        if self.auth_job is not None and not self.auth_job.done:
+            return
+
+        def release_session_after(callback: Callable) -> Callable:
+            def run(*args):
+                try:
+                    callback(*args)
+                finally:
+                    self.auth.release_session()
+            return run
+
+        self._set_busy(True)
+        self.auth_job = BackgroundJob("autenticacion").start(
+            lambda job: method(password),
+            on_done=release_session_after(on_done),
+            on_error=release_session_after(self._on_auth_error),
+        )
+
+    def _on_auth_error(self, message: str):
+        self._set_busy(False)
+        self._show_error(f"Error: {message}")
+
+    def _set_busy(self, busy: bool):
+        """Deshabilita los controles y muestra el spinner durante la verificación"""
+        for control in (self.password_field, self.confirm_field, self.submit_button):
+            if control is not None:
+                control.disabled = busy
+        if self.progress_ring is not None:
+            self.progress_ring.visible = busy
+        self.page.update()
     
     def _show_error(self, message: str):
         """Muestra un mensaje de error"""
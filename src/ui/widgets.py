@@ -243,8 +243,8 @@ class CompactTransactionTile(ft.Container):
     ⭐ CORREGIDO: Detecta tipo de transacción y muestra color/signo correcto
     
     Args:
-        transaction: Objeto Transaction de la base de datos
-        category: Objeto Category de la base de datos (puede ser None)
+        transaction: Transaction o TransactionRecord
+        category: Category o CategoryRecord (puede ser None)
     """
 
     def __init__(self, transaction, category):
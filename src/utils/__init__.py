@@ -14,6 +14,7 @@ from src.utils.helpers import (
     calculate_percentage,
     truncate_text,
 )
+from src.utils.background import BackgroundJob, JobCancelled
 
 __all__ = [
     "Config",
@@ -28,6 +29,8 @@ __all__ = [
     "group_transactions_by_date",
     "calculate_percentage",
     "truncate_text",
+    "BackgroundJob",
+    "JobCancelled",
 ]
 # Nota: Asegúrate de que los módulos 'config' y 'helpers' existen en el directorio 'src/utils/'
 # y contienen las funciones y variables mencionadas en los imports.
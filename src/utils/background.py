@@ -0,0 +1,192 @@
+"""
+Tareas en segundo plano con progreso y cancelación
+Archivo: src/utils/background.py
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class JobCancelled(Exception):
+    """Se lanza dentro de una tarea cuando el usuario la cancela"""
+
+
+class BackgroundJob:
+    """
+    Estado compartido entre una tarea en segundo plano y la UI
+
+    La tarea recibe el job como primer argumento, informa su avance con
+    update() y llama a check_cancelled() entre pasos. Si se pasa una página
+    de Flet a start(), el progreso (cambios pequeños de controles) se
+    despacha al event loop de la página y los callbacks finales, que suelen
+    recargar vistas, al pool de hilos de Flet (como un handler de eventos),
+    siempre después del progreso ya encolado. Sin página todos se invocan
+    desde el hilo de la tarea.
+    """
+
+    # Intervalo mínimo entre notificaciones de progreso (segundos)
+    PROGRESS_INTERVAL = 0.1
+
+    def __init__(self, name: str, on_progress: Optional[Callable] = None):
+        self.name = name
+        self.stage = ""
+        self.processed = 0
+        self.total: Optional[int] = None
+        self.result = None
+        self.error: Optional[str] = None
+        self.on_progress = on_progress
+        self._cancel_event = threading.Event()
+        self._done_event = threading.Event()
+        self._last_notify = 0.0
+        self._page = None
+
+    @property
+    def cancelled(self) -> bool:
+        """Indica si se pidió cancelar la tarea"""
+        return self._cancel_event.is_set()
+
+    @property
+    def done(self) -> bool:
+        """Indica si la tarea terminó (con éxito, error o cancelada)"""
+        return self._done_event.is_set()
+
+    @property
+    def progress(self) -> Optional[float]:
+        """Fracción completada (0-1) o None si el total es desconocido"""
+        if not self.total:
+            return None
+        return min(self.processed / self.total, 1.0)
+
+    def cancel(self):
+        """Pide la cancelación; la tarea la atiende en su próximo check"""
+        self._cancel_event.set()
+
+    def check_cancelled(self):
+        """Lanza JobCancelled si se pidió cancelar"""
+        if self._cancel_event.is_set():
+            raise JobCancelled(self.name)
+
+    def update(
+        self,
+        stage: Optional[str] = None,
+        processed: Optional[int] = None,
+        total: Optional[int] = None,
+    ):
+        """Actualiza el avance y notifica (limitado a PROGRESS_INTERVAL)"""
+        stage_changed = stage is not None and stage != self.stage
+
+        if stage is not None:
+            self.stage = stage
+        if processed is not None:
+            self.processed = processed
+        if total is not None:
+            self.total = total
+
+        now = time.monotonic()
+        if self.on_progress and (stage_changed or now - self._last_notify >= self.PROGRESS_INTERVAL):
+            self._last_notify = now
+            self._dispatch(self._notify_progress)
+
+    def _notify_progress(self):
+        """Invoca on_progress sin dejar que un error detenga la tarea"""
+        try:
+            self.on_progress(self)
+        except Exception as e:
+            print(f"⚠️ Error notificando progreso de '{self.name}': {e}")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que la tarea termine (útil en tests)"""
+        return self._done_event.wait(timeout)
+
+    def start(
+        self,
+        target: Callable,
+        *args,
+        page=None,
+        on_done: Optional[Callable] = None,
+        on_error: Optional[Callable] = None,
+        on_cancelled: Optional[Callable] = None,
+    ):
+        """
+        Ejecuta target(job, *args) en segundo plano
+
+        Usa page.run_thread si hay página de Flet; si no, un hilo daemon.
+
+        Args:
+            target: Función de la tarea; su valor de retorno va a on_done
+            page: Página de Flet (opcional); el progreso se ejecuta en su
+                event loop y los callbacks finales en su pool de hilos
+            on_done: Callback(result) al terminar con éxito
+            on_error: Callback(mensaje) si la tarea lanza una excepción
+            on_cancelled: Callback() si la tarea se canceló
+        """
+
+        def run():
+            try:
+                self.result = target(self, *args)
+            except JobCancelled:
+                print(f"⏹️ Tarea '{self.name}' cancelada")
+                self._finish(on_cancelled)
+                return
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                self.error = str(e)
+                self._finish(on_error, self.error)
+                return
+
+            self._finish(on_done, self.result)
+
+        self._page = page
+
+        if page is not None and hasattr(page, "run_thread"):
+            page.run_thread(run)
+        else:
+            threading.Thread(target=run, name=f"job-{self.name}", daemon=True).start()
+
+        return self
+
+    def _finish(self, callback: Optional[Callable], *args):
+        """
+        Invoca el callback final y marca la tarea como terminada
+
+        Con página va por page.run_thread y no por el event loop: el loop
+        atiende el websocket y una recarga de vistas lo bloquearía. Como
+        run_thread también pasa por el loop, el callback empieza después de
+        las notificaciones de progreso pendientes.
+        """
+
+        def run_callback():
+            try:
+                if callback:
+                    callback(*args)
+            except Exception as e:
+                print(f"❌ Error en callback de '{self.name}': {e}")
+            finally:
+                self._done_event.set()
+
+        loop = getattr(self._page, "loop", None)
+        if loop is not None and loop.is_running() and hasattr(self._page, "run_thread"):
+            try:
+                self._page.run_thread(run_callback)
+                return
+            except RuntimeError:
+                pass
+        run_callback()
+
+    def _dispatch(self, func: Callable):
+        """
+        Ejecuta func en el event loop de la página (thread-safe)
+
+        Sin página, o si su loop ya no corre (app cerrándose), se ejecuta
+        directamente en el hilo actual.
+        """
+        loop = getattr(self._page, "loop", None)
+        if loop is not None and loop.is_running():
+            try:
+                loop.call_soon_threadsafe(func)
+                return
+            except RuntimeError:
+                pass
+        func()
@@ -17,11 +17,30 @@ class Config:
     APP_VERSION = "1.0.1"
     APP_ORG = "com.flet.termowallet"
 
-    # ✅ DETECCIÓN DE PLATAFORMA SIMPLE Y SEGURA (SIN JNIUS)
+    # ✅ SNAPSHOT DE PLATAFORMA Y RUTAS
+    # Se calculan una sola vez (initialize_paths al importar) y luego se leen
+    # como atributos; refresh_paths() los vuelve a calcular (tests).
+    IS_ANDROID = None
+    BASE_DIR = None
+    DATA_DIR = None
+    DB_NAME = "termowallet.db"
+    DB_PATH = None
+    DATABASE_URL = None
+    TEMP_DIR = None
+    CACHE_DIR = None
+
     @classmethod
     def is_android(cls):
+        """Indica si está ejecutándose en Android (detección memorizada)"""
+        if cls.IS_ANDROID is None:
+            cls.IS_ANDROID = cls.detect_android()
+        return cls.IS_ANDROID
+
+    # ✅ DETECCIÓN DE PLATAFORMA SIMPLE Y SEGURA (SIN JNIUS)
+    @classmethod
+    def detect_android(cls):
         """
-        Detecta si está ejecutándose en Android
+        Detecta si está ejecutándose en Android (sin memorizar)
         ⚠️ SIN usar jnius para evitar crashes
         """
         # Método 1: API Level (EL MÁS CONFIABLE)
@@ -57,7 +76,14 @@ class Config:
     # ✅ RUTAS SEGURAS SIN JNIUS
     @classmethod
     def get_base_dir(cls):
-        """Obtiene el directorio base - SIN JNIUS"""
+        """Obtiene el directorio base (memorizado)"""
+        if cls.BASE_DIR is None:
+            cls.BASE_DIR = cls._probe_base_dir()
+        return cls.BASE_DIR
+
+    @classmethod
+    def _probe_base_dir(cls):
+        """Busca el directorio base - SIN JNIUS"""
         
         if cls.is_android():
             print("📱 Plataforma: Android")
@@ -106,6 +132,13 @@ class Config:
     
     @classmethod
     def get_data_dir(cls):
+        """Directorio de datos (memorizado)"""
+        if cls.DATA_DIR is None:
+            cls.DATA_DIR = cls._probe_data_dir()
+        return cls.DATA_DIR
+
+    @classmethod
+    def _probe_data_dir(cls):
         """✅ Directorio de datos con creación segura"""
         base = cls.get_base_dir()
         
@@ -148,16 +181,36 @@ class Config:
     
     @classmethod
     def get_temp_dir(cls):
-        """✅ Directorio temporal - SIN JNIUS"""
+        """✅ Directorio temporal (memorizado) - SIN JNIUS"""
+        if cls.TEMP_DIR is not None:
+            return cls.TEMP_DIR
+
         temp_dir = tempfile.gettempdir()
         app_temp = os.path.join(temp_dir, "termowallet_temp")
         
         try:
             os.makedirs(app_temp, mode=0o755, exist_ok=True)
             print(f"✅ Temp dir: {app_temp}")
-            return app_temp
+            cls.TEMP_DIR = app_temp
         except:
-            return temp_dir
+            cls.TEMP_DIR = temp_dir
+        return cls.TEMP_DIR
+
+    @classmethod
+    def get_cache_dir(cls):
+        """
+        Directorio de caché donde se generan los reportes (memorizado)
+
+        En Android es la carpeta cache/ junto a files/ de la app (la que
+        expone el FileProvider); en desktop, el temporal del sistema.
+        """
+        if cls.CACHE_DIR is None:
+            if cls.is_android():
+                from src.utils.android_permissions import get_app_storage_path
+                cls.CACHE_DIR = get_app_storage_path().replace("/files", "/cache")
+            else:
+                cls.CACHE_DIR = tempfile.gettempdir()
+        return cls.CACHE_DIR
     
     @classmethod
     def get_reports_dir(cls):
@@ -176,11 +229,31 @@ class Config:
     
     @classmethod
     def get_db_path(cls):
-        """Retorna la ruta completa de la base de datos"""
-        data_dir = cls.get_data_dir()
-        db_path = os.path.join(data_dir, "termowallet.db")
-        print(f"📊 DB Path: {db_path}")
-        return db_path
+        """Retorna la ruta completa de la base de datos (memorizada)"""
+        if cls.DB_PATH is None:
+            cls.DB_PATH = os.path.join(cls.get_data_dir(), cls.DB_NAME)
+            print(f"📊 DB Path: {cls.DB_PATH}")
+        return cls.DB_PATH
+
+    @classmethod
+    def refresh_paths(cls):
+        """
+        Descarta el snapshot de plataforma/rutas y lo vuelve a calcular
+
+        Para tests (p. ej. tras cambiar variables de entorno) o si el
+        almacenamiento cambia en ejecución.
+
+        Returns:
+            bool: Resultado de initialize_paths()
+        """
+        cls.IS_ANDROID = None
+        cls.BASE_DIR = None
+        cls.DATA_DIR = None
+        cls.DB_PATH = None
+        cls.DATABASE_URL = None
+        cls.TEMP_DIR = None
+        cls.CACHE_DIR = None
+        return cls.initialize_paths()
 
     @classmethod
     def initialize_paths(cls):
@@ -259,13 +332,6 @@ class Config:
             
             return False
 
-    # Configuración básica
-    BASE_DIR = None
-    DATA_DIR = None
-    DB_NAME = "termowallet.db"
-    DB_PATH = None
-    DATABASE_URL = None
-
     # Moneda
     CURRENCY_SYMBOL = "S/"
     CURRENCY_NAME = "Soles"
@@ -278,6 +344,9 @@ class Config:
     # Límites
     MAX_FILE_SIZE_MB = 10
     MAX_TRANSACTIONS_IMPORT = 10000
+    IMPORT_BATCH_SIZE = 1000  # Filas por SAVEPOINT en importaciones masivas
+    REPORT_CACHE_MAX_MB = 50  # Tamaño máximo de la caché de reportes
+    REPORT_CACHE_MAX_ENTRIES = 20
     MAX_DESCRIPTION_LENGTH = 255
     MAX_NOTES_LENGTH = 500
 
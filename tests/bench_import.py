@@ -0,0 +1,86 @@
+"""
+Benchmark de importación masiva - filas/segundo
+Ejecutar con: python tests/bench_import.py [filas ...]
+
+Mide DatabaseManager.import_transactions_bulk() sobre una BD temporal
+(1k, 10k y 100k filas por defecto), incluyendo el commit final.
+"""
+
+import sys
+import os
+import time
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+# Agregar el directorio raíz del proyecto al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.database import DatabaseManager
+
+
+DESCRIPTIONS = [
+    "Supermercado Wong", "Uber viaje", "Netflix", "Farmacia Inkafarma",
+    "Restaurant Bembos", "Grifo Primax", "Luz del Sur", "Tottus",
+]
+
+
+def generate_rows(count: int, category_id: int) -> list:
+    """Genera filas sintéticas como las produce TransactionProcessor"""
+    start = datetime(2020, 1, 1)
+    rows = []
+    for i in range(count):
+        desc = f"{random.choice(DESCRIPTIONS)} #{i}"
+        rows.append({
+            "date": start + timedelta(minutes=i),
+            "description": desc,
+            "amount": round(random.uniform(1, 500), 2),
+            "category_id": category_id,
+            "transaction_type": "expense",
+            "source": "imported",
+            "original_description": desc,
+        })
+    return rows
+
+
+def bench(count: int) -> dict:
+    """Importa `count` filas en una BD nueva y mide el tiempo total"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "bench.db"))
+        try:
+            category_id = db.get_all_categories("expense")[0].id
+            rows = generate_rows(count, category_id)
+
+            started = time.perf_counter()
+            stats = db.import_transactions_bulk(rows)
+            db.session.commit()
+            elapsed = time.perf_counter() - started
+
+            return {
+                "rows": count,
+                "inserted": stats["inserted"],
+                "elapsed": elapsed,
+                "rows_per_sec": count / elapsed if elapsed > 0 else 0,
+            }
+        finally:
+            db.close()
+            db.engine.dispose()
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    results = [bench(size) for size in sizes]
+
+    print("\n" + "=" * 60)
+    print("📊 BENCHMARK DE IMPORTACIÓN MASIVA")
+    print("=" * 60)
+    for r in results:
+        print(
+            f"   {r['rows']:>7} filas: {r['elapsed']:.3f}s "
+            f"({r['rows_per_sec']:,.0f} filas/s, {r['inserted']} insertadas)"
+        )
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark de generación de reportes - dataset de 5 años
+Ejecutar con: python tests/bench_reports.py [transacciones_por_día]
+
+Genera 5 años de transacciones en una BD temporal y mide los reportes
+anuales y el de rango completo (xlsx y csv) y la exportación columnar
+(Parquet/npz): tiempo, tamaño y número de consultas SQL de cada uno.
+"""
+
+import sys
+import os
+import time
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+# Agregar el directorio raíz del proyecto al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+
+from src.data.database import DatabaseManager
+from src.business.report_generator import ReportGenerator
+
+
+YEARS = [2020, 2021, 2022, 2023, 2024]
+
+DESCRIPTIONS = [
+    "Supermercado Wong", "Uber viaje", "Netflix", "Farmacia Inkafarma",
+    "Restaurant Bembos", "Grifo Primax", "Luz del Sur", "Tottus",
+]
+
+
+def generate_rows(per_day: int, expense_ids: list, income_ids: list) -> list:
+    """Genera `per_day` transacciones diarias durante YEARS"""
+    start = datetime(YEARS[0], 1, 1)
+    days = (datetime(YEARS[-1] + 1, 1, 1) - start).days
+    rows = []
+    for day in range(days):
+        for n in range(per_day):
+            is_income = n == 0 and day % 15 == 0
+            desc = f"{random.choice(DESCRIPTIONS)} #{day}-{n}"
+            rows.append({
+                "date": start + timedelta(days=day, minutes=n * 7),
+                "description": desc,
+                "amount": round(random.uniform(1, 500), 2),
+                "category_id": random.choice(income_ids if is_income else expense_ids),
+                "transaction_type": "income" if is_income else "expense",
+                "source": "imported",
+                "original_description": desc,
+            })
+    return rows
+
+
+def bench(per_day: int) -> list:
+    """Mide cada reporte sobre una BD nueva con 5 años de datos"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "bench.db"))
+        try:
+            expense_ids = [c.id for c in db.get_all_categories("expense")]
+            income_ids = [c.id for c in db.get_all_categories("income")]
+            rows = generate_rows(per_day, expense_ids, income_ids)
+            db.import_transactions_bulk(rows)
+            db.session.commit()
+            print(f"📦 {len(rows)} transacciones generadas ({YEARS[0]}-{YEARS[-1]})")
+
+            statements = []
+            event.listen(
+                db.engine, "before_cursor_execute",
+                lambda conn, cursor, stmt, *args: statements.append(stmt)
+            )
+
+            generator = ReportGenerator(db)
+            jobs = [(f"Anual {year}", generator.generate_annual_report, (year,)) for year in YEARS]
+            jobs.append((
+                "Rango 5 años",
+                generator.generate_custom_range_report,
+                (datetime(YEARS[0], 1, 1), datetime(YEARS[-1], 12, 31, 23, 59, 59)),
+            ))
+
+            runs = [
+                (label, fmt, lambda m=method, a=args, f=fmt: m(*a, format=f))
+                for label, method, args in jobs
+                for fmt in ("xlsx", "csv")
+            ]
+            runs.append(("Historial", "columnar", generator.generate_columnar_export))
+
+            results = []
+            for label, fmt, run in runs:
+                statements.clear()
+                started = time.perf_counter()
+                result = run()
+                elapsed = time.perf_counter() - started
+
+                size = 0
+                if result["filepath"] and os.path.exists(result["filepath"]):
+                    size = os.path.getsize(result["filepath"])
+                    os.remove(result["filepath"])
+
+                results.append({
+                    "label": label,
+                    "format": os.path.splitext(result["filepath"])[1][1:] if result["filepath"] else fmt,
+                    "success": result["success"],
+                    "elapsed": elapsed,
+                    "size": size,
+                    "queries": len(statements),
+                })
+            return results
+        finally:
+            db.close()
+
+
+def main():
+    per_day = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    results = bench(per_day)
+
+    print("\n" + "=" * 60)
+    print("📊 BENCHMARK DE REPORTES (5 AÑOS)")
+    print("=" * 60)
+    for r in results:
+        status = "✅" if r["success"] else "❌"
+        print(
+            f"   {status} {r['label']:<13} {r['format']:<7}: {r['elapsed']:.3f}s, "
+            f"{r['size'] / 1024:,.0f} KB ({r['queries']} consultas SQL)"
+        )
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark de arranque - importación de src.main
+Ejecutar con: python tests/bench_startup.py [repeticiones]
+
+Importa src.main en un intérprete nuevo con `python -X importtime` (lo que
+ocurre antes de mostrar la pantalla de login) y reporta el tiempo total,
+los módulos más costosos y si se cargaron módulos que deberían esperar a
+su primer uso (vistas, openpyxl, numpy, ...).
+"""
+
+import sys
+import os
+import re
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos que no deberían cargarse antes del login
+DEFERRED_MODULES = [
+    "openpyxl",
+    "numpy",
+    "dateutil",
+    "src.business.processor",
+    "src.business.report_generator",
+    "src.ui.home_view",
+    "src.ui.widgets",
+    "src.ui.charts_view",
+    "src.ui.categories_view",
+]
+
+IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure() -> dict:
+    """Importa src.main en un proceso nuevo y devuelve {módulo: (propio, acumulado)} en µs"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            own, cumulative, _, name = match.groups()
+            modules[name] = (int(own), int(cumulative))
+    return modules
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    # La primera ejecución compila .pyc; no se cuenta
+    measure()
+    samples = [measure() for _ in range(runs)]
+    totals = [s["src.main"][1] / 1000 for s in samples]
+    last = samples[-1]
+
+    print("\n" + "=" * 60)
+    print("🚀 BENCHMARK DE ARRANQUE (import src.main)")
+    print("=" * 60)
+    print(f"   Mediana: {statistics.median(totals):.1f} ms "
+          f"(mín {min(totals):.1f}, máx {max(totals):.1f}, {runs} ejecuciones)")
+    print(f"   Módulos importados: {len(last)}")
+
+    print("\n   Módulos con más tiempo propio:")
+    for name, (own, _) in sorted(last.items(), key=lambda item: -item[1][0])[:10]:
+        print(f"      {own / 1000:7.1f} ms  {name}")
+
+    print("\n   Carga diferida:")
+    for name in DEFERRED_MODULES:
+        if name in last:
+            print(f"      ❌ {name} se carga al arrancar ({last[name][1] / 1000:.1f} ms)")
+        else:
+            print(f"      ✅ {name} no se carga al arrancar")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Tests para AuthManager (hash PBKDF2 con costo calibrado)
+Archivo: tests/test_auth_manager.py
+"""
+
+import unittest
+import os
+import sys
+import hashlib
+import binascii
+import threading
+
+# Agregar el directorio raíz del proyecto al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from src.data.database import DatabaseManager
+from src.business.auth_manager import AuthManager
+
+
+class TestAuthManager(unittest.TestCase):
+    """Tests para el hash de contraseñas y el recálculo al iniciar sesión"""
+
+    def setUp(self):
+        """Configuración antes de cada test"""
+        self.db = DatabaseManager("test_auth.db")
+        self.auth = AuthManager(self.db)
+        # Costo bajo para que los tests sean rápidos
+        self.auth.TARGET_SECONDS = 0.005
+        self.auth.MIN_ITERATIONS = 1000
+
+    def tearDown(self):
+        """Limpieza después de cada test"""
+        self.db.close()
+        if os.path.exists("test_auth.db"):
+            os.remove("test_auth.db")
+
+    def _stored_hash(self) -> str:
+        return self.db.session.execute(
+            text("SELECT password_hash FROM auth_config WHERE id = 1")
+        ).scalar()
+
+    def test_hash_stores_calibrated_cost(self):
+        """Test: El hash guarda sus iteraciones y verifica en tiempo constante"""
+        self.assertTrue(self.auth.set_password("clave123"))
+
+        algorithm, iterations, _, _ = self._stored_hash().split("$")
+        self.assertEqual(algorithm, AuthManager.HASH_ALGORITHM)
+        self.assertEqual(int(iterations), self.auth.get_target_iterations())
+        self.assertEqual(self.db.get_meta(AuthManager.ITERATIONS_META_KEY), iterations)
+
+        self.assertTrue(self.auth.verify_password("clave123")[0])
+        success, _, attempts = self.auth.verify_password("otra")
+        self.assertFalse(success)
+        self.assertEqual(attempts, 1)
+
+        print("✅ Hash con costo calibrado")
+
+    def test_legacy_hash_rehashed_on_login(self):
+        """Test: Un hash antiguo "salt$hash" se acepta y se recalcula al iniciar sesión"""
+        salt = os.urandom(16)
+        digest = hashlib.pbkdf2_hmac("sha256", b"clave123", salt, AuthManager.LEGACY_ITERATIONS)
+        legacy = f"{binascii.hexlify(salt).decode()}${binascii.hexlify(digest).decode()}"
+        self.db.session.execute(
+            text("INSERT INTO auth_config (id, password_hash) VALUES (1, :hash)"),
+            {"hash": legacy},
+        )
+        self.db.session.commit()
+
+        self.assertTrue(self.auth.needs_rehash(legacy))
+        self.assertTrue(self.auth.verify_password("clave123")[0])
+
+        rehashed = self._stored_hash()
+        self.assertTrue(rehashed.startswith(AuthManager.HASH_ALGORITHM + "$"))
+        self.assertEqual(int(rehashed.split("$")[1]), AuthManager.LEGACY_ITERATIONS)
+        self.assertFalse(self.auth.needs_rehash(rehashed))
+        self.assertTrue(self.auth.verify_password("clave123")[0])
+
+        print("✅ Hash antiguo recalculado al iniciar sesión")
+
+    def test_rehash_never_lowers_cost(self):
+        """Test: Un hash más costoso que la calibración no se debilita al iniciar sesión"""
+        target = self.auth.get_target_iterations()
+        self.assertTrue(self.auth.set_password("clave123"))
+        stronger = self.auth._hash_password("clave123", iterations=target + 1000)
+        self.db.session.execute(
+            text("UPDATE auth_config SET password_hash = :hash WHERE id = 1"),
+            {"hash": stronger},
+        )
+        self.db.session.commit()
+
+        self.assertFalse(self.auth.needs_rehash(stronger))
+        self.assertTrue(self.auth.verify_password("clave123")[0])
+        self.assertEqual(self._stored_hash(), stronger)
+
+        # La calibración nunca queda por debajo del costo de los hashes antiguos
+        self.assertEqual(AuthManager.MIN_ITERATIONS, AuthManager.LEGACY_ITERATIONS)
+
+        print("✅ El costo del hash nunca baja")
+
+    def test_background_login_uses_thread_session(self):
+        """Test: Verificar desde otro hilo no usa la sesión de la UI"""
+        self.assertTrue(self.auth.set_password("clave123"))
+        self.db.reset_session()
+
+        results = []
+        sessions = []
+
+        def login():
+            try:
+                results.append(self.auth.verify_password("clave123")[0])
+                sessions.append(self.auth.session)
+            finally:
+                self.auth.release_session()
+
+        worker = threading.Thread(target=login)
+        worker.start()
+        worker.join()
+
+        self.assertEqual(results, [True])
+        self.assertIsNot(sessions[0], self.db.session)
+        self.assertIsNot(sessions[0], self.auth.session)
+        self.auth.release_session()
+
+        print("✅ Login en segundo plano con su propia sesión")
+
+    def test_ui_checks_do_not_hold_thread_session(self):
+        """Test: Las consultas de LoginView no dejan una sesión de hilo abierta"""
+        self.assertTrue(self.auth.set_password("clave123"))
+        self.auth.release_session()
+
+        self.assertTrue(self.auth.is_password_set())
+        self.assertEqual(self.auth.get_failed_attempts(), 0)
+        self.assertFalse(self.db.scoped_sessions.registry.has())
+
+        print("✅ Consultas de la UI con sesiones cortas")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,161 @@
+"""
+Tests para tareas en segundo plano (importación cancelable)
+Archivo: tests/test_background.py
+"""
+
+import unittest
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import os
+import sys
+
+# Agregar el directorio raíz del proyecto al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.database import DatabaseManager
+from src.utils.background import BackgroundJob
+
+
+class TestBackgroundJob(unittest.TestCase):
+    """Tests para BackgroundJob"""
+
+    def setUp(self):
+        """Configuración antes de cada test"""
+        self.db = DatabaseManager("test_background.db")
+        self.category_id = self.db.get_all_categories("expense")[0].id
+
+    def tearDown(self):
+        """Limpieza después de cada test"""
+        self.db.close()
+        if os.path.exists("test_background.db"):
+            os.remove("test_background.db")
+
+    def _chunks(self, count, size):
+        """Genera lotes de filas como los produce TransactionProcessor"""
+        rows = [
+            {
+                "date": datetime(2025, 1, 1 + i % 28, 12, i % 60),
+                "description": f"Compra {i}",
+                "amount": 10.0 + i,
+                "category_id": self.category_id,
+                "transaction_type": "expense",
+                "source": "imported",
+                "original_description": f"Compra {i}",
+            }
+            for i in range(count)
+        ]
+        return [rows[i:i + size] for i in range(0, count, size)]
+
+    def _import_worker(self, job, chunks, gate=None):
+        """Inserta lotes en una sesión propia, como AddTransactionView"""
+        session = self.db.session_factory()
+        inserted = 0
+        try:
+            for index, chunk in enumerate(chunks):
+                job.check_cancelled()
+                inserted += self.db.import_transactions_bulk(chunk, session=session)["inserted"]
+                job.update(stage="Guardando", processed=job.processed + len(chunk))
+                if gate and index == 0:
+                    gate.wait(5)
+            job.check_cancelled()
+            session.commit()
+        except BaseException:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+        return inserted
+
+    def test_job_reports_progress_and_result(self):
+        """Test: La tarea informa su avance y entrega el resultado"""
+        results = []
+        progress = []
+        job = BackgroundJob("test", on_progress=lambda j: progress.append(j.processed))
+        job.PROGRESS_INTERVAL = 0
+
+        job.start(self._import_worker, self._chunks(50, 20), on_done=results.append)
+
+        self.assertTrue(job.wait(10))
+        self.assertEqual(results, [50])
+        self.assertEqual(progress[-1], 50)
+
+        # La sesión principal ve los datos tras cerrar su lectura abierta
+        self.db.session.close()
+        self.assertEqual(len(self.db.get_all_transactions()), 50)
+
+        print("✅ Tarea completada con progreso")
+
+    def test_cancel_rolls_back_everything(self):
+        """Test: Cancelar a mitad de la importación no guarda ningún lote"""
+        gate = threading.Event()
+        cancelled = []
+        job = BackgroundJob("test")
+
+        job.start(
+            self._import_worker, self._chunks(50, 20), gate,
+            on_done=lambda _: self.fail("No debía completarse"),
+            on_cancelled=lambda: cancelled.append(True),
+        )
+
+        job.cancel()
+        gate.set()
+
+        self.assertTrue(job.wait(10))
+        self.assertEqual(cancelled, [True])
+        self.db.session.close()
+        self.assertEqual(len(self.db.get_all_transactions()), 0)
+
+        print("✅ Cancelación con rollback")
+
+    def test_final_callback_runs_off_the_page_loop(self):
+        """Test: Con página, el progreso va al event loop y el callback final a un hilo"""
+
+        class FakePage:
+            """Event loop + pool de hilos, como una página de Flet"""
+
+            def __init__(self):
+                self.loop = asyncio.new_event_loop()
+                self.executor = ThreadPoolExecutor(max_workers=2)
+                self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+                self.thread.start()
+
+            def run_thread(self, handler, *args):
+                self.loop.call_soon_threadsafe(
+                    self.loop.run_in_executor, self.executor, handler, *args
+                )
+
+            def close(self):
+                self.loop.call_soon_threadsafe(self.loop.stop)
+                self.thread.join(5)
+                self.executor.shutdown()
+
+        page = FakePage()
+        events = []
+        job = BackgroundJob(
+            "test",
+            on_progress=lambda j: events.append(("progress", threading.current_thread())),
+        )
+        job.PROGRESS_INTERVAL = 0
+
+        try:
+            job.start(
+                self._import_worker, self._chunks(50, 20), page=page,
+                on_done=lambda _: events.append(("done", threading.current_thread())),
+            )
+            self.assertTrue(job.wait(10))
+        finally:
+            page.close()
+
+        kinds = [kind for kind, _ in events]
+        self.assertEqual(kinds[-1], "done")
+        self.assertEqual(kinds.count("done"), 1)
+        self.assertTrue(all(thread is page.thread for kind, thread in events if kind == "progress"))
+        self.assertIsNot(events[-1][1], page.thread)
+
+        print("✅ Callback final fuera del event loop")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,59 @@
+"""
+Tests para Config (snapshot de plataforma y rutas)
+Archivo: tests/test_config.py
+"""
+
+import unittest
+import os
+import sys
+from unittest import mock
+
+# Agregar el directorio raíz del proyecto al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.config import Config
+
+
+class TestConfig(unittest.TestCase):
+    """Tests para la detección memorizada de plataforma y rutas"""
+
+    def tearDown(self):
+        """Restaurar el snapshot real"""
+        Config.refresh_paths()
+
+    def test_platform_detected_once(self):
+        """Test: La plataforma y las rutas se calculan una sola vez"""
+        with mock.patch.object(Config, "detect_android", return_value=False) as detect:
+            Config.refresh_paths()
+            calls = detect.call_count
+
+            for _ in range(5):
+                Config.is_android()
+                Config.get_base_dir()
+                Config.get_db_path()
+
+            self.assertEqual(calls, 1)
+            self.assertEqual(detect.call_count, 1)
+
+        self.assertEqual(Config.get_db_path(), os.path.join(Config.DATA_DIR, Config.DB_NAME))
+        self.assertEqual(Config.DATABASE_URL, f"sqlite:///{Config.DB_PATH}")
+
+        print("✅ Plataforma detectada una sola vez")
+
+    def test_refresh_paths_recomputes(self):
+        """Test: refresh_paths descarta el snapshot y vuelve a detectar"""
+        with mock.patch.object(Config, "detect_android", return_value=False):
+            Config.refresh_paths()
+        self.assertFalse(Config.is_android())
+
+        with mock.patch.object(Config, "detect_android", return_value=True), \
+                mock.patch.object(Config, "_probe_base_dir", return_value="/tmp"):
+            Config.refresh_paths()
+            self.assertTrue(Config.is_android())
+            self.assertEqual(Config.BASE_DIR, "/tmp")
+
+        print("✅ refresh_paths recalcula el snapshot")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -8,12 +8,18 @@ from datetime import datetime
 from typing import List
 import os
 import sys
+import threading
 
 # Agregar el directorio raíz del proyecto al path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from unittest import mock
+
+from sqlalchemy import text
+
 from src.data.database import DatabaseManager
 from src.data.models import Category, Transaction
+from src.data import seed
 
 
 class TestDatabaseManager(unittest.TestCase):
@@ -116,6 +122,194 @@ class TestDatabaseManager(unittest.TestCase):
         
         print(f"✅ Keywords restauradas: {len(restored_keywords)}")
 
+    def test_seed_skipped_until_version_changes(self):
+        """Test: Al reabrir la BD no se vuelve a sembrar salvo que cambie SEED_VERSION"""
+        self.assertEqual(self.db.get_meta("seed_version"), str(seed.SEED_VERSION))
+        self.assertEqual(self.db.get_meta("schema_version"), str(DatabaseManager.SCHEMA_VERSION))
+        self.db.close()
+
+        with mock.patch.object(DatabaseManager, "_initialize_default_keywords") as init_keywords:
+            self.db = DatabaseManager("test_database.db")
+            init_keywords.assert_not_called()
+            self.db.close()
+
+        with mock.patch.object(seed, "SEED_VERSION", seed.SEED_VERSION + 1):
+            self.db = DatabaseManager("test_database.db")
+            self.assertEqual(self.db.get_meta("seed_version"), str(seed.SEED_VERSION))
+
+        print("✅ Datos iniciales sembrados solo al cambiar de versión")
+
+    def test_seed_version_bump_merges_missing_defaults(self):
+        """Test: Subir SEED_VERSION agrega categorías y keywords nuevas sin pisar las del usuario"""
+        transporte = self.db.get_category_by_name("Transporte", "expense")
+        transporte.set_keywords_list(["mi_keyword"])
+        self.db.session.commit()
+        self.db.close()
+
+        categories = seed.default_categories() + [
+            {"name": "Mascotas", "icon": "🐶", "color": "#10b981",
+             "category_type": "expense", "description": "Veterinario"},
+        ]
+        keywords = dict(seed.default_keywords("expense"), Mascotas=["veterinaria"])
+
+        with mock.patch.object(seed, "SEED_VERSION", seed.SEED_VERSION + 1), \
+                mock.patch.object(seed, "default_categories", return_value=categories), \
+                mock.patch.object(seed, "default_keywords",
+                                  side_effect=lambda t: keywords if t == "expense"
+                                  else seed.load_seed()["keywords"]["income"]):
+            self.db = DatabaseManager("test_database.db")
+
+        mascotas = self.db.get_category_by_name("Mascotas", "expense")
+        self.assertIsNotNone(mascotas)
+        self.assertEqual(mascotas.get_keywords_list(), ["veterinaria"])
+        self.assertEqual(len(self.db.get_all_categories()), len(categories))
+
+        merged = self.db.get_category_by_name("Transporte", "expense").get_keywords_list()
+        self.assertEqual(merged[0], "mi_keyword")
+        self.assertEqual(set(merged[1:]), {k.lower().strip() for k in keywords["Transporte"]})
+
+        print("✅ Datos iniciales nuevos completados al subir la versión")
+
+    def test_session_scopes(self):
+        """Test: session_scope confirma o revierte; read_session y reset_session no retienen estado"""
+        category_id = self.db.get_all_categories("expense")[0].id
+
+        def new_transaction(description):
+            return Transaction(date=datetime(2025, 1, 10), description=description,
+                               amount=5.0, category_id=category_id,
+                               transaction_type="expense")
+
+        with self.db.session_scope() as session:
+            session.add(new_transaction("Confirmada"))
+
+        with self.assertRaises(RuntimeError):
+            with self.db.session_scope() as session:
+                session.add(new_transaction("Revertida"))
+                session.flush()
+                raise RuntimeError("fallo a mitad de la unidad de trabajo")
+
+        with self.db.read_session() as session:
+            rows = session.query(Transaction).all()
+        self.assertEqual([t.description for t in rows], ["Confirmada"])
+
+        # La sesión de la UI se vacía pero sigue siendo utilizable
+        loaded = self.db.session.query(Transaction).all()
+        self.assertEqual(len(self.db.session.identity_map), len(loaded))
+        self.db.reset_session()
+        self.assertEqual(len(self.db.session.identity_map), 0)
+
+        # y tras reset_session lee lo que otra sesión confirmó
+        category = self.db.get_category_by_id(category_id)
+        with self.db.session_scope() as session:
+            session.get(Category, category_id).name = "Renombrada"
+        self.assertNotEqual(self.db.get_category_by_id(category_id).name, "Renombrada")
+        self.db.reset_session()
+        self.assertEqual(self.db.get_category_by_id(category_id).name, "Renombrada")
+        self.assertIsNot(self.db.get_category_by_id(category_id), category)
+
+        # Una sesión por hilo
+        sessions = []
+        self.assertIs(self.db.thread_session(), self.db.thread_session())
+        worker = threading.Thread(target=lambda: (sessions.append(self.db.thread_session()),
+                                                  self.db.release_thread_session()))
+        worker.start()
+        worker.join()
+        self.assertIsNot(sessions[0], self.db.thread_session())
+        self.db.release_thread_session()
+
+        print("✅ Ámbitos de sesión")
+
+    def test_transaction_records_skip_identity_map(self):
+        """Test: Los registros de solo lectura no crecen el identity map de la UI"""
+        category = self.db.get_category_by_name("Alimentación", "expense")
+        for day in (5, 20):
+            self.db.add_transaction(
+                date=datetime(2025, 3, day),
+                description=f"Compra {day}",
+                amount=10.0,
+                category_id=category.id,
+                transaction_type="expense",
+            )
+        self.db.add_transaction(
+            date=datetime(2025, 4, 1),
+            description="Otro mes",
+            amount=1.0,
+            category_id=category.id,
+            transaction_type="expense",
+        )
+        self.db.reset_session()
+
+        records = self.db.get_transaction_records_by_month(2025, 3)
+        self.assertEqual([r.description for r in records], ["Compra 20", "Compra 5"])
+        self.assertEqual(records[0].category.name, "Alimentación")
+        self.assertEqual(len(self.db.session.identity_map), 0)
+
+        recent = self.db.get_transaction_records_by_month(2025, 3, limit=1)
+        self.assertEqual(len(recent), 1)
+        self.assertEqual(self.db.get_transaction_records_by_month(2025, 12), [])
+
+        print("✅ Registros de solo lectura sin identity map")
+
+    def test_transaction_records_keyset_pages(self):
+        """Test: Las páginas por keyset cubren el mes sin repetir filas, aun con fechas iguales"""
+        category_id = self.db.get_all_categories("expense")[0].id
+        with self.db.session_scope() as session:
+            session.add_all([
+                Transaction(date=datetime(2025, 7, 1 + i // 3), description=f"Fila {i}",
+                            amount=1.0, category_id=category_id, transaction_type="expense")
+                for i in range(10)
+            ])
+
+        seen, cursor = [], None
+        while True:
+            page = self.db.get_transaction_records_page(2025, 7, limit=4, after=cursor)
+            seen.extend(page)
+            if len(page) < 4:
+                break
+            cursor = (page[-1].date, page[-1].id)
+
+        self.assertEqual(len(seen), 10)
+        self.assertEqual(len({r.id for r in seen}), 10)
+        keys = [(r.date, r.id) for r in seen]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+        print("✅ Paginación por keyset")
+
+    def test_search_transactions(self):
+        """Test: Búsqueda FTS por prefijo, sin tildes, con filtros, cursor y triggers"""
+        expense_id = self.db.get_all_categories("expense")[0].id
+        income_id = self.db.get_all_categories("income")[0].id
+        cafe = self.db.add_transaction(date=datetime(2025, 8, 3), description="Café Tostado",
+                                       amount=12.0, category_id=expense_id,
+                                       transaction_type="expense")
+        self.db.add_transaction(date=datetime(2025, 8, 2), description="Cafetería central",
+                                amount=8.0, category_id=expense_id, transaction_type="expense")
+        self.db.add_transaction(date=datetime(2025, 7, 1), description="Pago",
+                                amount=500.0, category_id=income_id, transaction_type="income",
+                                notes="reembolso cafe")
+
+        found = self.db.search_transactions("CAFE")["results"]
+        self.assertEqual([r.description for r in found], ["Café Tostado", "Cafetería central", "Pago"])
+
+        only_income = self.db.search_transactions("caf", {"transaction_type": "income"})
+        self.assertEqual([r.description for r in only_income["results"]], ["Pago"])
+        self.assertEqual(self.db.search_transactions("caf tostado")["results"][0].id, cafe.id)
+        self.assertEqual(self.db.search_transactions("  ")["results"], [])
+
+        first = self.db.search_transactions("caf", limit=2)
+        rest = self.db.search_transactions("caf", limit=2, cursor=first["next_cursor"])
+        self.assertEqual(len(first["results"]) + len(rest["results"]), 3)
+        self.assertIsNone(rest["next_cursor"])
+
+        # Los triggers mantienen el índice al editar y eliminar
+        self.db.update_transaction(cafe.id, cafe.date, "Té verde", 12.0, expense_id)
+        self.assertEqual(self.db.search_transactions("te")["results"][0].id, cafe.id)
+        self.assertEqual(len(self.db.search_transactions("cafe")["results"]), 2)
+        self.db.delete_transaction(cafe.id)
+        self.assertEqual(self.db.search_transactions("verde")["results"], [])
+
+        print("✅ Búsqueda de texto completo")
+
     def test_add_transaction(self):
         """Test: Añade una transacción"""
         categories = self.db.get_all_categories("expense")
@@ -306,6 +500,30 @@ class TestDatabaseManager(unittest.TestCase):
         
         print(f"✅ Presupuesto creado y verificado")
 
+    def test_category_budgets_upsert(self):
+        """Test: Los porcentajes por categoría se insertan y luego se actualizan en su lugar"""
+        from src.data.models import CategoryBudget
+
+        self.db.create_or_update_budget(2025, 6, expense_limit=1000.0)
+        first, second = self.db.get_all_categories("expense")[:2]
+
+        result = self.db.update_category_budgets_bulk(2025, 6, {first.id: 60.0, second.id: 40.0})
+        self.assertTrue(result["success"])
+        self.assertEqual(result["updated_count"], 2)
+
+        result = self.db.update_category_budgets_bulk(2025, 6, {first.id: 30.0, second.id: 70.0})
+        self.assertTrue(result["success"])
+
+        rows = {
+            row.category_id: row
+            for row in self.db.session.query(CategoryBudget).filter_by(year=2025, month=6)
+        }
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[first.id].percentage, 30.0)
+        self.assertEqual(rows[second.id].suggested_amount, 700.0)
+
+        print("✅ Upsert de porcentajes por categoría")
+
     def test_database_stats(self):
         """Test: Estadísticas de base de datos"""
         stats = self.db.get_database_stats()
@@ -322,6 +540,100 @@ class TestDatabaseManager(unittest.TestCase):
         print(f"✅ Estadísticas: {stats['total_categories']} categorías, "
               f"{stats['total_transactions']} transacciones")
 
+    def test_bulk_reimport_skips_duplicates(self):
+        """✅ NUEVO: Re-importar un extracto superpuesto solo inserta filas nuevas"""
+        category_id = self.db.get_all_categories("expense")[0].id
+
+        def row(day, desc, amount):
+            return {
+                "date": datetime(2025, 11, day),
+                "description": desc,
+                "amount": amount,
+                "category_id": category_id,
+                "transaction_type": "expense",
+                "source": "imported",
+                "original_description": desc,
+            }
+
+        first = [row(1, "Wong", 100.0), row(2, "Uber", 15.5), row(3, "Pizza Hut", 25.0)]
+        inserted = self.db.add_transactions_bulk(first)
+        self.db.session.commit()
+        self.assertEqual(inserted, 3)
+
+        # Misma fila con distinta capitalización/espacios + una fila nueva
+        second = [row(3, "  PIZZA   hut ", 25.0), row(2, "Uber", 15.5), row(4, "Tottus", 80.0)]
+        inserted = self.db.add_transactions_bulk(second)
+        self.db.session.commit()
+
+        self.assertEqual(inserted, 1, "Solo la fila nueva debe insertarse")
+        self.assertEqual(len(self.db.get_all_transactions()), 4)
+
+        print(f"✅ Re-importación idempotente: 1 nueva, 2 duplicadas omitidas")
+
+    def test_bulk_import_keeps_refund_of_same_charge(self):
+        """Test: Un cargo y su reembolso del mismo día no son duplicados"""
+        category_id = self.db.get_all_categories("expense")[0].id
+        rows = [
+            {
+                "date": datetime(2025, 3, 2),
+                "description": "AMAZON MKTPLACE",
+                "amount": 50.0,
+                "category_id": category_id,
+                "transaction_type": transaction_type,
+            }
+            for transaction_type in ("expense", "income")
+        ]
+
+        with self.db.session_scope() as session:
+            stats = self.db.import_transactions_bulk(rows, session=session)
+        self.assertEqual((stats["inserted"], stats["duplicates"]), (2, 0))
+
+        # Las huellas de bases anteriores (sin tipo) se recalculan al migrar
+        self.db.session.execute(text(
+            "DELETE FROM transactions WHERE transaction_type = 'income'"
+        ))
+        self.db.session.execute(text("UPDATE transactions SET fingerprint = 'sin-tipo'"))
+        self.db.session.execute(text("UPDATE meta SET value = '2' WHERE key = 'schema_version'"))
+        self.db.session.commit()
+        self.db.close()
+        self.db = DatabaseManager("test_database.db")
+
+        with self.db.session_scope() as session:
+            stats = self.db.import_transactions_bulk(rows, session=session)
+        self.assertEqual((stats["inserted"], stats["duplicates"]), (1, 1))
+
+        print("✅ Cargo y reembolso del mismo día importados")
+
+    def test_bulk_import_single_outer_transaction(self):
+        """✅ NUEVO: Los lotes usan SAVEPOINT dentro de una sola transacción"""
+        category_id = self.db.get_all_categories("expense")[0].id
+        rows = [
+            {
+                "date": datetime(2025, 10, day),
+                "description": f"Compra {day}",
+                "amount": 10.0 * day,
+                "category_id": category_id,
+                "original_description": f"Compra {day}",
+            }
+            for day in range(1, 6)
+        ]
+        rows.append({"date": datetime(2025, 10, 9), "description": "", "amount": 5.0,
+                     "category_id": category_id})
+
+        stats = self.db.import_transactions_bulk(rows, batch_size=2)
+        self.assertEqual(stats["inserted"], 5)
+        self.assertEqual(stats["failed"], 1, "La fila sin descripción debe fallar")
+
+        # Liberar los savepoints no debe confirmar: rollback descarta todo
+        self.db.session.rollback()
+        self.assertEqual(len(self.db.get_all_transactions()), 0)
+
+        self.db.import_transactions_bulk(rows, batch_size=2)
+        self.db.session.commit()
+        self.assertEqual(len(self.db.get_all_transactions()), 5)
+
+        print(f"✅ Bulk import: {stats['rows_per_sec']:.0f} filas/s")
+
     def test_clear_and_reset(self):
         """Test: Limpieza y reseteo de base de datos"""
         # Crear datos de prueba
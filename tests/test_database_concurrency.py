@@ -0,0 +1,172 @@
+"""
+Tests de concurrencia para DatabaseManager (lecturas de la UI durante una importación)
+Archivo: tests/test_database_concurrency.py
+"""
+
+import unittest
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+
+# Agregar el directorio raíz del proyecto al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select
+
+from src.data.database import DatabaseManager
+from src.data.models import Transaction
+
+
+class TestDatabaseConcurrency(unittest.TestCase):
+    """Stress test: lectores y escritores concurrentes sobre la misma BD"""
+
+    IMPORT_CHUNKS = 10
+    ROWS_PER_CHUNK = 200
+    MANUAL_WRITES = 30
+    READERS = 3
+
+    def setUp(self):
+        """Configuración antes de cada test"""
+        self.db = DatabaseManager("test_concurrency.db")
+        self.category_id = self.db.get_all_categories("expense")[0].id
+
+    def tearDown(self):
+        """Limpieza después de cada test"""
+        self.db.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists("test_concurrency.db" + suffix):
+                os.remove("test_concurrency.db" + suffix)
+
+    def _import_rows(self, chunk: int):
+        start = datetime(2025, 1, 1)
+        return [
+            {
+                "date": start + timedelta(hours=chunk * self.ROWS_PER_CHUNK + i),
+                "description": f"Importada {chunk}-{i}",
+                "original_description": f"Importada {chunk}-{i}",
+                "amount": 1.0 + i,
+                "category_id": self.category_id,
+                "transaction_type": "expense",
+                "source": "import",
+            }
+            for i in range(self.ROWS_PER_CHUNK)
+        ]
+
+    def test_reads_during_bulk_import(self):
+        """Test: Lecturas y escrituras concurrentes sin "database is locked" ni sesiones corruptas"""
+        errors = []
+        version_before = self.db.get_data_version()
+        import_done = threading.Event()
+        reads = [0] * self.READERS
+        ui_reads = [0]
+        # Las filas importadas solo crecen (las manuales también se eliminan)
+        imported_count = (
+            select(func.count(Transaction.id))
+            .where(Transaction.description.like("Importada %"))
+        )
+
+        def record_errors(target):
+            def run(*args):
+                try:
+                    target(*args)
+                except Exception as e:  # noqa: BLE001 - se reportan en el assert
+                    errors.append(f"{threading.current_thread().name}: {e!r}")
+            return run
+
+        @record_errors
+        def importer():
+            try:
+                for chunk in range(self.IMPORT_CHUNKS):
+                    with self.db.session_scope() as session:
+                        stats = self.db.import_transactions_bulk(
+                            self._import_rows(chunk), session=session
+                        )
+                        if stats["inserted"] != self.ROWS_PER_CHUNK:
+                            raise AssertionError(f"lote {chunk}: {stats}")
+            finally:
+                import_done.set()
+
+        @record_errors
+        def ui():
+            # self.session es de un solo hilo (el de la UI): aquí se
+            # intercalan, como en los handlers, las mutaciones públicas del
+            # gestor (vía write_queue) y lecturas con la sesión de la UI
+            last_count = 0
+            for i in range(self.MANUAL_WRITES):
+                transaction = self.db.add_transaction(
+                    date=datetime(2025, 2, 1),
+                    description=f"Manual {i}",
+                    amount=2.0,
+                    category_id=self.category_id,
+                    transaction_type="expense",
+                )
+                if not self.db.update_transaction(
+                    transaction.id, datetime(2025, 2, 2), f"Manual {i} editada",
+                    3.0, self.category_id,
+                ):
+                    raise AssertionError(f"no se actualizó la transacción {transaction.id}")
+                if i % 3 == 0 and not self.db.delete_transaction(transaction.id):
+                    raise AssertionError(f"no se eliminó la transacción {transaction.id}")
+
+                count = self.db.session.execute(imported_count).scalar()
+                if count < last_count:
+                    raise AssertionError(f"el conteo retrocedió: {last_count} -> {count}")
+                last_count = count
+                self.db.get_transactions_by_month(2025, 2)
+                ui_reads[0] += 1
+
+            while not import_done.is_set():
+                self.db.session.query(Transaction).count()
+                ui_reads[0] += 1
+
+        @record_errors
+        def reader(index):
+            session = self.db.thread_session()
+            try:
+                last_count = 0
+                while not import_done.is_set() or reads[index] == 0:
+                    self.db.get_transaction_records_by_month(2025, 1, limit=50)
+                    count = session.execute(imported_count).scalar()
+                    if count < last_count:
+                        raise AssertionError(f"el conteo retrocedió: {last_count} -> {count}")
+                    last_count = count
+                    session.commit()
+                    reads[index] += 1
+            finally:
+                self.db.release_thread_session()
+
+        threads = [threading.Thread(target=importer, name="import"),
+                   threading.Thread(target=ui, name="ui")]
+        threads += [threading.Thread(target=reader, args=(i,), name=f"reader-{i}")
+                    for i in range(self.READERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=120)
+            self.assertFalse(thread.is_alive(), f"{thread.name} no terminó")
+
+        self.assertEqual(errors, [])
+        self.assertTrue(all(reads))
+        self.assertGreater(ui_reads[0], 0)
+
+        # La sesión de la UI sigue utilizable y ve todo lo confirmado
+        deleted = len(range(0, self.MANUAL_WRITES, 3))
+        expected = self.IMPORT_CHUNKS * self.ROWS_PER_CHUNK + self.MANUAL_WRITES - deleted
+        self.assertEqual(self.db.session.query(Transaction).count(), expected)
+        self.assertEqual(
+            self.db.session.query(Transaction)
+            .filter(Transaction.description.like("Manual % editada"))
+            .count(),
+            self.MANUAL_WRITES - deleted,
+        )
+        # Un commit por lote importado y uno por cada mutación de la UI
+        self.assertEqual(self.db.get_data_version() - version_before,
+                         self.IMPORT_CHUNKS + 2 * self.MANUAL_WRITES + deleted)
+
+        print(f"✅ {expected} transacciones tras escrituras concurrentes, "
+              f"{sum(reads) + ui_reads[0]} lecturas sin bloqueos")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -445,6 +445,123 @@ class TestTransactionProcessor(unittest.TestCase):
         
         print("✅ Procesador reseteado correctamente")
 
+    def test_excel_stream_selected_sheet(self):
+        """Test: Lectura en streaming de una hoja elegida, por lotes y tipada"""
+        import openpyxl
+
+        excel_file = "test_transactions_stream.xlsx"
+        wb = openpyxl.Workbook()
+        wb.active.title = "Resumen"
+        wb.active.append(["Sin datos"])
+
+        ws = wb.create_sheet("Movimientos")
+        ws.append(["Nro", "Fecha", "Referencia", "Concepto", "Importe", "Tipo"])
+        ws.append([1, datetime(2025, 11, 1), "A1", "Supermercado Wong", 100.5, "gasto"])
+        ws.append([2, "02/11/2025", "A2", "Salario mensual", "3,000.00", "ingreso"])
+        ws.append([3, "fecha mala", "A3", "Taxi Uber", 15.5, "gasto"])
+        ws.append([4, datetime(2025, 11, 4), "A4", "Pizza Hut", -25, "gasto"])
+        # Filas vacías con formato al final (rango usado inflado)
+        for row in range(7, 7 + TransactionProcessor.MAX_BLANK_ROWS + 5):
+            ws.cell(row=row, column=1).number_format = "0.00"
+        wb.save(excel_file)
+
+        try:
+            self.assertEqual(
+                self.processor.get_excel_sheets(excel_file), ["Resumen", "Movimientos"]
+            )
+
+            success, message = self.processor.prepare_excel_stream(excel_file, "Movimientos")
+            self.assertTrue(success, message)
+            self.assertEqual(
+                self.processor.stream_source["indices"],
+                {"fecha": 1, "descripcion": 3, "monto": 4, "tipo": 5},
+            )
+
+            rows = list(self.processor.iter_excel_rows())
+            self.assertEqual(len(rows), 3)
+            self.assertEqual(rows[0], (datetime(2025, 11, 1), "Supermercado Wong", 100.5, "expense"))
+            self.assertEqual(rows[1], (datetime(2025, 11, 2), "Salario mensual", 3000.0, "income"))
+            self.assertEqual(rows[2][2], 25.0)
+            self.assertEqual(self.processor.original_count, 4)
+
+            chunks = list(self.processor.iter_import_chunks(
+                {1: "Alimentación", 2: "Otros Gastos"}, {10: "Salario"}, chunk_size=2
+            ))
+            self.assertEqual([len(c) for c in chunks], [2, 1])
+            self.assertEqual(chunks[0][1]["category_id"], 10)
+            self.assertEqual(self.processor.stream_stats["count_expenses"], 2)
+            self.assertEqual(self.processor.stream_stats["count_income"], 1)
+            self.assertEqual(self.processor.stream_stats["skipped"], 1)
+
+            success, _ = self.processor.prepare_excel_stream(excel_file, "Resumen")
+            self.assertFalse(success)
+        finally:
+            if os.path.exists(excel_file):
+                os.remove(excel_file)
+
+        print("✅ Hoja de Excel leída en streaming por lotes")
+
+    def test_bank_profile_detected_by_headers(self):
+        """Test: Un extracto BBVA (';' y coma decimal) se reconoce por sus encabezados"""
+        bank_file = "test_bbva.csv"
+        with open(bank_file, "w", encoding="utf-8") as f:
+            f.write("F. Operación;F. Valor;Código;Nº. Doc.;Concepto;Importe;Oficina\n")
+            f.write("05/11/2025;05/11/2025;001;123;Supermercado Wong;-1.234,50;0100\n")
+            f.write("06/11/2025;06/11/2025;002;124;Abono de haberes;3.000,00;0100\n")
+
+        try:
+            self.processor.load_file(bank_file)
+            success, message = self.processor.validate_columns()
+            self.assertTrue(success, message)
+            self.assertEqual(self.processor.profile["name"], "BBVA")
+
+            self.processor.clean_data()
+            rows = sorted(self.processor.data, key=lambda r: r["fecha"])
+            self.assertEqual(rows[0]["fecha"], datetime(2025, 11, 5))
+            self.assertEqual(rows[0]["monto"], 1234.50)
+            self.assertEqual(rows[0]["tipo"], "expense")
+            self.assertEqual(rows[1]["monto"], 3000.0)
+            self.assertEqual(rows[1]["tipo"], "income")
+        finally:
+            if os.path.exists(bank_file):
+                os.remove(bank_file)
+
+        print("✅ Formato BBVA reconocido sin inferencia")
+
+    def test_saved_profile_from_manual_mapping(self):
+        """Test: Un mapeo manual se guarda y reconoce en la siguiente importación"""
+        bank_file = "test_custom_bank.csv"
+        with open(bank_file, "w", encoding="utf-8") as f:
+            f.write("Total,Cuando,Comercio\n")
+            f.write("45.90,2025-11-07,Farmacia Inkafarma\n")
+
+        try:
+            self.processor.load_file(bank_file)
+            success, _ = self.processor.validate_columns(
+                {"fecha": 1, "descripcion": 2, "monto": 0}
+            )
+            self.assertTrue(success)
+            self.processor.clean_data()
+            self.assertEqual(self.processor.data[0]["monto"], 45.90)
+
+            profile = self.processor.build_profile_from_mapping("Mi banco")
+            self.assertEqual(profile["date_format"], "%Y-%m-%d")
+            self.assertTrue(self.db.save_import_profile(profile)["success"])
+
+            processor = TransactionProcessor()
+            processor.register_profiles(self.db.get_import_profiles())
+            self.assertEqual(processor.match_profile(processor.read_headers(bank_file))["name"], "Mi banco")
+
+            processor.load_file(bank_file)
+            success, message = processor.validate_columns()
+            self.assertTrue(success, message)
+            self.assertEqual(processor.profile["name"], "Mi banco")
+        finally:
+            if os.path.exists(bank_file):
+                os.remove(bank_file)
+
+        print("✅ Formato guardado y reconocido")
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
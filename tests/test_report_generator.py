@@ -0,0 +1,378 @@
+"""
+Tests para ReportGenerator
+Archivo: tests/test_report_generator.py
+"""
+
+import unittest
+import csv
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Agregar el directorio raíz del proyecto al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openpyxl
+
+from src.data.database import DatabaseManager
+from src.business.report_generator import ReportGenerator
+from src.business import columnar_export
+from src.utils.background import BackgroundJob
+
+
+class TestReportGenerator(unittest.TestCase):
+    """Tests para la generación de reportes Excel/CSV"""
+
+    def setUp(self):
+        """Configuración antes de cada test"""
+        self.db = DatabaseManager("test_reports.db")
+        self.generator = ReportGenerator(self.db)
+        self.files = []
+
+        expense_id = self.db.get_all_categories("expense")[0].id
+        income_id = self.db.get_all_categories("income")[0].id
+
+        # 2024 completo: una transacción cada 12 horas, 1 de cada 5 es ingreso
+        rows = []
+        for i in range(732):
+            is_income = i % 5 == 0
+            rows.append({
+                "date": datetime(2024, 1, 1) + timedelta(hours=12 * i),
+                "description": f"Movimiento {i}",
+                "amount": 10.0 + i % 40,
+                "category_id": income_id if is_income else expense_id,
+                "transaction_type": "income" if is_income else "expense",
+                "source": "imported",
+                "original_description": f"Movimiento {i}",
+            })
+        self.db.import_transactions_bulk(rows)
+        self.db.session.commit()
+
+    def tearDown(self):
+        """Limpieza después de cada test"""
+        for path in self.files:
+            if path and os.path.exists(path):
+                os.remove(path)
+        self.db.close()
+        if os.path.exists("test_reports.db"):
+            os.remove("test_reports.db")
+
+    def test_annual_excel_report(self):
+        """Test: El reporte anual en Excel contiene todas las transacciones"""
+        result = self.generator.generate_annual_report(2024, format="xlsx")
+        self.files.append(result["filepath"])
+
+        self.assertTrue(result["success"], result["message"])
+
+        wb = openpyxl.load_workbook(result["filepath"], read_only=True)
+        try:
+            self.assertIn("Transacciones", wb.sheetnames)
+            rows = list(wb["Transacciones"].iter_rows(values_only=True))
+        finally:
+            wb.close()
+
+        self.assertEqual(list(rows[0]), ReportGenerator.TRANSACTION_HEADERS)
+        self.assertEqual(len(rows) - 1, 732)
+        # Más reciente primero
+        self.assertEqual(rows[1][0], "31/12/2024")
+
+        print("✅ Reporte anual Excel generado")
+
+    def test_monthly_csv_report(self):
+        """Test: El reporte mensual en CSV solo incluye el mes pedido"""
+        result = self.generator.generate_monthly_report(2024, 2, format="csv")
+        self.files.append(result["filepath"])
+
+        self.assertTrue(result["success"], result["message"])
+
+        with open(result["filepath"], newline="", encoding="utf-8-sig") as f:
+            rows = list(csv.reader(f))
+
+        self.assertEqual(rows[0], ReportGenerator.TRANSACTION_HEADERS)
+        self.assertEqual(len(rows) - 1, 58)
+        self.assertTrue(all(row[0].endswith("/02/2024") for row in rows[1:]))
+
+        print("✅ Reporte mensual CSV generado")
+
+    def test_report_data_from_grouped_totals(self):
+        """Test: Resumen y tablas por categoría salen del GROUP BY del rango"""
+        data = self.generator._build_report_data(datetime(2024, 1, 1), datetime(2024, 12, 31, 23, 59))
+
+        incomes = [10.0 + i % 40 for i in range(732) if i % 5 == 0]
+        expenses = [10.0 + i % 40 for i in range(732) if i % 5 != 0]
+
+        self.assertEqual(data["transaction_count"], 732)
+        self.assertAlmostEqual(data["total_income"], sum(incomes))
+        self.assertAlmostEqual(data["total_expenses"], sum(expenses))
+        self.assertEqual(len(data["expenses_data"]), 1)
+        self.assertEqual(data["expenses_data"][0]["Porcentaje (%)"], 100.0)
+        self.assertAlmostEqual(data["income_data"][0]["Total"], sum(incomes))
+
+        print("✅ Datos del reporte agregados por categoría")
+
+    def test_background_report_progress(self):
+        """Test: El reporte en segundo plano informa filas escritas"""
+        results = []
+        progress = []
+        job = BackgroundJob("reporte", on_progress=lambda j: progress.append((j.stage, j.processed)))
+        job.PROGRESS_INTERVAL = 0
+
+        job.start(
+            lambda j: self.generator.generate_annual_report(2024, format="csv", job=j),
+            on_done=results.append,
+        )
+
+        self.assertTrue(job.wait(10))
+        self.files.append(results[0]["filepath"])
+        self.assertTrue(results[0]["success"], results[0]["message"])
+        self.assertEqual(job.total, 732)
+        self.assertIn(("Guardando archivo", 732), progress)
+
+        print("✅ Reporte en segundo plano con progreso")
+
+    def test_background_report_cancel(self):
+        """Test: Cancelar el reporte no deja archivo final ni temporal"""
+        import tempfile
+
+        target = os.path.join(tempfile.gettempdir(), "Reporte_TermoWallet_Anual_2024.xlsx")
+        if os.path.exists(target):
+            os.remove(target)
+
+        def cancel_midway(j):
+            if j.processed >= 100:
+                j.cancel()
+
+        self.generator.PROGRESS_EVERY_ROWS = 50
+        cancelled = []
+        job = BackgroundJob("reporte", on_progress=cancel_midway)
+        job.PROGRESS_INTERVAL = 0
+
+        job.start(
+            lambda j: self.generator.generate_annual_report(2024, format="xlsx", job=j),
+            on_done=lambda _: self.fail("No debía completarse"),
+            on_cancelled=lambda: cancelled.append(True),
+        )
+
+        self.assertTrue(job.wait(10))
+        self.assertEqual(cancelled, [True])
+        self.assertFalse(os.path.exists(target))
+        leftovers = [n for n in os.listdir(tempfile.gettempdir())
+                     if n.startswith("Reporte_TermoWallet_Anual_2024.xlsx.")]
+        self.assertEqual(leftovers, [])
+
+        print("✅ Reporte cancelado sin archivos parciales")
+
+    def test_cached_report_until_data_changes(self):
+        """Test: El mismo reporte se sirve de caché hasta que cambian los datos"""
+        first = self.generator.generate_monthly_report(2024, 3, format="csv")
+        self.files.append(first["filepath"])
+        second = self.generator.generate_monthly_report(2024, 3, format="csv")
+
+        self.assertTrue(second["success"])
+        self.assertTrue(second.get("cached"))
+        self.assertEqual(second["filepath"], first["filepath"])
+
+        # Cualquier escritura de transacciones invalida la entrada
+        self.db.add_transaction(
+            date=datetime(2024, 3, 15),
+            description="Nueva",
+            amount=99.0,
+            category_id=self.db.get_all_categories("expense")[0].id,
+            transaction_type="expense",
+        )
+        third = self.generator.generate_monthly_report(2024, 3, format="csv")
+
+        self.assertTrue(third["success"])
+        self.assertFalse(third.get("cached", False))
+        with open(third["filepath"], newline="", encoding="utf-8-sig") as f:
+            self.assertEqual(len(list(csv.reader(f))) - 1, 63)
+
+        # Renombrar una categoría también: el reporte muestra su nombre
+        category = self.db.get_all_categories("expense")[0]
+        self.db.update_category(category.id, name="RENOMBRADA")
+        fourth = self.generator.generate_monthly_report(2024, 3, format="csv")
+
+        self.assertFalse(fourth.get("cached", False))
+        with open(fourth["filepath"], encoding="utf-8-sig") as f:
+            self.assertIn("RENOMBRADA", f.read())
+
+        print("✅ Caché de reportes por versión de datos")
+
+    def test_incremental_csv_export(self):
+        """Test: La exportación incremental solo incluye lo nuevo desde el cursor"""
+        # Páginas pequeñas para recorrer varias páginas por clave
+        self.generator.EXPORT_CHUNK_ROWS = 100
+
+        first = self.generator.generate_incremental_csv()
+        self.files.append(first["filepath"])
+
+        self.assertTrue(first["success"], first["message"])
+        with open(first["filepath"], newline="", encoding="utf-8-sig") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ReportGenerator.TRANSACTION_HEADERS)
+        self.assertEqual(len(rows) - 1, 732)
+        # Más antigua primero (para agregar al final de una hoja existente)
+        self.assertEqual(rows[1][0], "01/01/2024")
+
+        last_date, _ = self.db.get_export_cursor(ReportGenerator.INCREMENTAL_EXPORT_NAME)
+        self.assertEqual(last_date, datetime(2024, 12, 31, 12))
+
+        # Sin cambios no hay delta
+        empty = self.generator.generate_incremental_csv()
+        self.assertFalse(empty["success"])
+
+        # Misma fecha que el cursor, una posterior y una con fecha atrasada
+        # (dada de alta después: también es nueva)
+        expense_id = self.db.get_all_categories("expense")[0].id
+        for date, description in (
+            (last_date, "Empate"),
+            (datetime(2025, 1, 2), "Enero"),
+            (datetime(2024, 6, 1), "Atrasada"),
+        ):
+            self.db.add_transaction(
+                date=date,
+                description=description,
+                amount=5.0,
+                category_id=expense_id,
+                transaction_type="expense",
+            )
+
+        second = self.generator.generate_incremental_csv()
+        self.files.append(second["filepath"])
+
+        self.assertTrue(second["success"], second["message"])
+        with open(second["filepath"], newline="", encoding="utf-8-sig") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual([row[1] for row in rows[1:]], ["Atrasada", "Empate", "Enero"])
+
+        # El cursor queda en la última dada de alta, no en la más reciente
+        self.assertEqual(
+            self.db.get_export_cursor(ReportGenerator.INCREMENTAL_EXPORT_NAME)[0],
+            datetime(2024, 6, 1),
+        )
+        self.assertFalse(self.generator.generate_incremental_csv()["success"])
+
+        print("✅ Exportación CSV incremental por cursor")
+
+    def test_report_cache_lru_eviction(self):
+        """Test: La caché expulsa el reporte menos usado al superar el tamaño"""
+        import tempfile
+        import shutil
+        from src.business.report_cache import ReportCache
+
+        directory = tempfile.mkdtemp()
+        try:
+            cache = ReportCache(directory, max_bytes=250, max_entries=10)
+            paths = []
+            for name in ("a", "b", "c"):
+                path = os.path.join(directory, f"Reporte_TermoWallet_{name}.csv")
+                with open(path, "w") as f:
+                    f.write("x" * 100)
+                paths.append(path)
+
+            cache.put("a", 1, paths[0])
+            cache.put("b", 1, paths[1])
+            self.assertEqual(cache.get("a", 1), paths[0])  # "a" pasa a ser reciente
+            cache.put("c", 1, paths[2])
+
+            self.assertIsNone(cache.get("b", 1))
+            self.assertFalse(os.path.exists(paths[1]))
+            self.assertEqual(cache.get("a", 1), paths[0])
+            self.assertIsNone(cache.get("a", 2))  # otra versión de datos
+
+            # El índice sobrevive a un reinicio
+            reloaded = ReportCache(directory, max_bytes=250, max_entries=10)
+            self.assertEqual(reloaded.get("c", 1), paths[2])
+        finally:
+            shutil.rmtree(directory)
+
+        print("✅ Expulsión LRU de la caché de reportes")
+
+    @unittest.skipIf(columnar_export.available_format() is None, "Requiere pyarrow o numpy")
+    def test_columnar_export_full_history(self):
+        """Test: La exportación columnar incluye todo el historial en orden"""
+        result = self.generator.generate_columnar_export()
+        self.files.append(result["filepath"])
+
+        self.assertTrue(result["success"], result["message"])
+
+        if result["filepath"].endswith(".npz"):
+            columns = columnar_export.load_npz_export(result["filepath"])
+        else:
+            import pyarrow.parquet as pq
+            columns = pq.read_table(result["filepath"]).to_pydict()
+
+        self.assertEqual(len(columns["amount"]), 732)
+        self.assertEqual(str(columns["type"][0]), "income")
+        self.assertEqual(columns["description"][0], "Movimiento 0")
+        self.assertEqual(columns["description"][-1], "Movimiento 731")
+        self.assertAlmostEqual(float(sum(columns["amount"])), sum(10.0 + i % 40 for i in range(732)))
+
+        print("✅ Exportación columnar generada")
+
+    def test_import_does_not_load_columnar_libraries(self):
+        """Test: Importar el generador no carga pyarrow ni numpy"""
+        import subprocess
+
+        code = (
+            "import sys; import src.business.report_generator; "
+            "print(sorted({'numpy', 'pyarrow'} & set(sys.modules)))"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True
+        ).stdout
+        self.assertEqual(output.strip().splitlines()[-1], "[]")
+
+        print("✅ pyarrow/numpy se cargan solo al exportar")
+
+    def test_monthly_pdf_statement(self):
+        """Test: El estado de cuenta PDF pagina la tabla y cachea los gráficos"""
+        from src.business.report_cache import ReportCache
+
+        result = self.generator.generate_monthly_report(2024, 2, format="pdf")
+        self.files.append(result["filepath"])
+
+        self.assertTrue(result["success"], result["message"])
+
+        with open(result["filepath"], "rb") as f:
+            content = f.read()
+        self.assertTrue(content.startswith(b"%PDF-"))
+        # Resumen + 58 filas en dos páginas de tabla
+        self.assertIn(b"/Count 3", content)
+
+        version = self.db.get_data_version()
+        for chart in ("categorias", "tendencia"):
+            key = ReportCache.make_key(f"chart-{chart}", "2024-02", "png")
+            self.assertIsNotNone(self.generator.cache.get(key, version))
+
+        print("✅ Estado de cuenta PDF generado")
+
+    def test_failed_write_leaves_no_partial_file(self):
+        """Test: Si la escritura falla no queda archivo destino ni temporal"""
+        import tempfile
+
+        directory = tempfile.mkdtemp()
+        target = os.path.join(directory, "Reporte_TermoWallet_test.xlsx")
+
+        def broken_rows():
+            yield ("01/01/2024", "Compra", "Otros", "Gasto", 10.0, "")
+            raise RuntimeError("cursor interrumpido")
+
+        success = self.generator._save_excel(target, broken_rows(), [], [], [])
+
+        self.assertFalse(success)
+        self.assertEqual(os.listdir(directory), [])
+
+        # Un archivo que no es zip no pasa la verificación estructural
+        with self.assertRaises(IOError):
+            self.generator._write_atomically(target, lambda f: f.write(b"no es un zip"),
+                                             verify=self.generator._verify_xlsx)
+        self.assertEqual(os.listdir(directory), [])
+        os.rmdir(directory)
+
+        print("✅ Escritura atómica sin archivos parciales")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
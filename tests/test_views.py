@@ -0,0 +1,84 @@
+"""
+Tests para la actualización incremental de vistas (update_data + view-model)
+Archivo: tests/test_views.py
+"""
+
+import unittest
+import os
+import sys
+from datetime import datetime
+
+# Agregar el directorio raíz del proyecto al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.database import DatabaseManager
+from src.ui.history_view import HistoryView
+from src.ui.home_view import HomeView
+
+
+class TestIncrementalViews(unittest.TestCase):
+    """Las vistas se actualizan en su lugar tocando solo lo que cambió"""
+
+    def setUp(self):
+        """Configuración antes de cada test"""
+        self.db = DatabaseManager("test_views.db")
+        category_id = self.db.get_all_categories("expense")[0].id
+        self.db.add_transaction(
+            date=datetime(2025, 3, 10),
+            description="Supermercado",
+            amount=50.0,
+            category_id=category_id,
+            transaction_type="expense",
+        )
+
+    def tearDown(self):
+        """Limpieza después de cada test"""
+        self.db.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists("test_views.db" + suffix):
+                os.remove("test_views.db" + suffix)
+
+    def _noop(self, *args, **kwargs):
+        pass
+
+    def test_history_view_patches_only_changed_keys(self):
+        """Test: HistoryView solo aplica las claves que cambian"""
+        view = HistoryView(None, self.db, self._noop, 3, 2025, self._noop)
+        self.assertFalse(view.update_data(2025, 3))
+
+        content = view.build()
+        expense_text = view.summary_texts["total_expenses"]
+
+        # Mismo mes, mismos datos: nada que tocar
+        self.assertTrue(view.update_data(2025, 3))
+        self.assertEqual(view.apply_view_model(view._build_view_model(view._summary)), [])
+
+        # Otro mes: cambian los controles existentes, no se reconstruye nada
+        view.update_data(2025, 4)
+        self.assertIs(view.summary_texts["total_expenses"], expense_text)
+        self.assertIn("0.00", expense_text.value)
+        self.assertEqual(view._view_model["month_label"].split()[-1], "2025")
+        self.assertIsNotNone(content)
+
+        print("✅ HistoryView actualizada en su lugar")
+
+    def test_home_view_rebuilds_only_changed_sections(self):
+        """Test: HomeView reemplaza solo las secciones cuyo view-model cambió"""
+        view = HomeView(None, self.db, self._noop, 3, 2025, self._noop, self._noop)
+        view.build()
+        slots = dict(view._slots)
+        recent = slots["recent"].content
+
+        view.update_data(2025, 3)
+        self.assertIs(slots["recent"].content, recent)
+
+        view.update_data(2025, 4)
+        self.assertEqual(view._slots, slots)
+        self.assertIsNot(slots["recent"].content, recent)
+        self.assertIn("0.00", view.balance_texts["total_expenses"].value)
+
+        print("✅ HomeView actualizada por secciones")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,222 @@
+"""
+Tests para WriteQueue (escritor único con group commit)
+Archivo: tests/test_write_queue.py
+"""
+
+import unittest
+import os
+import sys
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+# Agregar el directorio raíz del proyecto al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.database import DatabaseManager
+from src.data.models import Category, CategoryBudget, Transaction
+from src.data.write_queue import WriteQueue
+from src.ui.base_view import BaseView
+
+
+def add_row(session, description):
+    """Operación de prueba: inserta una transacción y devuelve su id"""
+    category_id = session.query(Transaction.category_id).first()
+    transaction = Transaction(
+        date=datetime(2025, 5, 1),
+        description=description,
+        amount=1.0,
+        category_id=category_id[0] if category_id else 1,
+        transaction_type="expense",
+    )
+    session.add(transaction)
+    session.flush()
+    return transaction.id
+
+
+def fail(session):
+    """Operación de prueba que siempre falla"""
+    session.add(Transaction(date=datetime(2025, 5, 1), description="x",
+                            amount=1.0, category_id=1, transaction_type="expense"))
+    session.flush()
+    raise ValueError("operación inválida")
+
+
+class TestWriteQueue(unittest.TestCase):
+    """Tests para el agrupamiento de commits y la resolución de futures"""
+
+    def setUp(self):
+        """Configuración antes de cada test"""
+        self.db = DatabaseManager("test_write_queue.db")
+        self.queue = WriteQueue(self.db.session_factory, window=0.05)
+
+    def tearDown(self):
+        """Limpieza después de cada test"""
+        self.queue.close()
+        self.db.close()
+        if os.path.exists("test_write_queue.db"):
+            os.remove("test_write_queue.db")
+
+    def _count(self, description_prefix):
+        with self.db.read_session() as session:
+            return (
+                session.query(Transaction)
+                .filter(Transaction.description.like(f"{description_prefix}%"))
+                .count()
+            )
+
+    def test_burst_is_group_committed(self):
+        """Test: Una ráfaga encolada mientras el escritor trabaja se confirma en un commit"""
+        running, gate = threading.Event(), threading.Event()
+        busy = self.queue.submit(lambda session: running.set() or gate.wait(10))
+        running.wait(10)
+        futures = [self.queue.submit(add_row, f"Ráfaga {i}") for i in range(25)]
+        gate.set()
+        ids = [future.result(timeout=10) for future in futures]
+
+        self.assertTrue(busy.result(timeout=10))
+        self.assertEqual(len(set(ids)), 25)
+        self.assertEqual(self.queue.operations, 26)
+        self.assertEqual(self.queue.commits, 2)
+        self.assertEqual(self._count("Ráfaga"), 25)
+
+        print(f"✅ 25 escrituras en 1 commit")
+
+    def test_lone_write_does_not_wait_for_window(self):
+        """Test: Una escritura sola se confirma sin esperar la ventana"""
+        slow = WriteQueue(self.db.session_factory, window=1.0)
+        try:
+            started = time.perf_counter()
+            slow.run(add_row, "Sola")
+            elapsed = time.perf_counter() - started
+        finally:
+            slow.close()
+
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(self._count("Sola"), 1)
+
+        print(f"✅ Escritura sola en {elapsed * 1000:.1f} ms")
+
+    def test_failed_operation_only_reverts_itself(self):
+        """Test: Una operación que falla no revierte al resto del grupo"""
+        ok = self.queue.submit(add_row, "Válida")
+        bad = self.queue.submit(fail)
+
+        self.assertIsInstance(ok.result(timeout=10), int)
+        with self.assertRaises(ValueError):
+            bad.result(timeout=10)
+        self.assertEqual(self._count("Válida"), 1)
+        self.assertEqual(self._count("x"), 0)
+
+        print("✅ Error aislado en su savepoint")
+
+    def test_run_async(self):
+        """Test: run_async resuelve el resultado en una corrutina"""
+        transaction_id = asyncio.run(self.queue.run_async(add_row, "Async"))
+        self.assertIsInstance(transaction_id, int)
+        self.assertEqual(self._count("Async"), 1)
+
+        print("✅ run_async")
+
+    def test_bulk_budget_update_single_commit(self):
+        """Test: Guardar la distribución de presupuesto confirma una sola vez"""
+        now = datetime.now()
+        categories = self.db.get_all_categories("expense")
+        share = round(100.0 / len(categories), 2)
+        percentages = {cat.id: share for cat in categories}
+        percentages[categories[-1].id] = round(100.0 - share * (len(categories) - 1), 2)
+
+        result = self.db.update_category_budgets_bulk(now.year, now.month, percentages)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["updated_count"], len(categories))
+        self.assertEqual(self.db.write_queue.commits, 1)
+        saved = self.db.session.query(CategoryBudget).filter_by(
+            year=now.year, month=now.month
+        ).count()
+        self.assertEqual(saved, len(categories))
+
+        print(f"✅ {len(categories)} porcentajes en {self.db.write_queue.commits} commit")
+
+    def test_ui_writes_without_waiting_are_grouped(self):
+        """Test: Escrituras de la UI con wait=False no bloquean y se agrupan"""
+        category_id = self.db.get_all_categories("expense")[0].id
+        running, gate = threading.Event(), threading.Event()
+        self.db.write_queue.submit(lambda session: running.set() or gate.wait(10))
+        running.wait(10)
+
+        futures = [
+            self.db.add_transaction(
+                date=datetime(2025, 5, 2), description=f"UI {i}", amount=1.0,
+                category_id=category_id, transaction_type="expense", wait=False,
+            )
+            for i in range(10)
+        ]
+        self.assertFalse(any(future.done() for future in futures))
+        gate.set()
+
+        saved = []
+        for future in futures:
+            future.result(timeout=10)
+        BaseViewStub(self.db).when_written(futures[-1], saved.append)
+
+        self.assertEqual(saved[0].description, "UI 9")
+        self.assertEqual(self.db.write_queue.commits, 2)
+        self.assertEqual(self._count("UI"), 10)
+
+        print("✅ 10 escrituras de la UI en 1 commit")
+
+    def test_queued_write_leaves_ui_session_alone(self):
+        """Test: Encolar una escritura no confirma cambios pendientes de la UI"""
+        category = self.db.get_all_categories("expense")[0]
+        category.name = "Sin confirmar"
+
+        self.db.add_transaction(
+            date=datetime(2025, 5, 3), description="Encolada", amount=1.0,
+            category_id=category.id, transaction_type="expense",
+        )
+
+        self.assertIn(category, self.db.session.dirty)
+        with self.db.read_session() as session:
+            stored = session.get(Category, category.id).name
+        self.assertNotEqual(stored, "Sin confirmar")
+        self.db.session.rollback()
+
+        print("✅ La sesión de la UI no se confirma al encolar")
+
+    def test_category_mutators_use_queue(self):
+        """Test: Categorías y keywords se escriben en el hilo escritor"""
+        queue = self.db.write_queue
+        operations = queue.operations
+
+        category = self.db.add_category(
+            name="Mascotas", icon="🐶", color="#000000", keywords=["veterinaria"],
+        )
+        self.db.set_category_keywords(category.id, ["veterinaria", "pienso"])
+        self.db.update_category(category.id, name="Mascotas y más")
+
+        # La sesión de la UI ve lo confirmado sin haber confirmado nada
+        self.assertEqual(category.name, "Mascotas y más")
+        self.assertEqual(category.get_keywords_list(), ["veterinaria", "pienso"])
+        self.assertFalse(self.db.session.dirty)
+
+        self.assertTrue(self.db.delete_category(category.id))
+        self.assertIsNone(self.db.get_category_by_id(category.id))
+        self.assertEqual(queue.operations - operations, 4)
+
+        print("✅ Mutaciones de categorías encoladas")
+
+
+class BaseViewStub(BaseView):
+    """Vista mínima para probar when_written sin página"""
+
+    def __init__(self, db):
+        super().__init__(None, db, lambda *args, **kwargs: None)
+
+    def build(self):
+        return None
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)